@@ -23,7 +23,7 @@ from dissect.target.helpers.logging import get_logger
 TarFilesystem = import_lazy("dissect.target.filesystems.tar").TarFilesystem
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterator
+    from collections.abc import Callable, Iterable, Iterator
 
     from typing_extensions import Self
 
@@ -312,6 +312,17 @@ class Filesystem:
         else:
             yield from fsutil.glob_ext(entry, pattern)
 
+    def glob_ext_multi(self, patterns: Iterable[str]) -> Iterator[tuple[FilesystemEntry, list[str]]]:
+        """Match multiple patterns in a single walk, returning each matching entry once with the patterns it matches.
+
+        Args:
+            patterns: The patterns to match.
+
+        Returns:
+            An iterator of tuples of a :class:`FilesystemEntry` and the patterns it matches.
+        """
+        return fsutil.glob_ext_multi(self.get("/"), patterns)
+
     def exists(self, path: str) -> bool:
         """Determines whether ``path`` exists on a filesystem.
 
@@ -667,6 +678,18 @@ class FilesystemEntry:
         """
         yield from fsutil.glob_ext(self, pattern)
 
+    def glob_ext_multi(self, patterns: Iterable[str]) -> Iterator[tuple[Self, list[str]]]:
+        """Match multiple patterns relative to this entry in a single walk, returning each matching entry once with the
+        patterns it matches.
+
+        Args:
+            patterns: The patterns to glob for.
+
+        Returns:
+            An iterator of tuples of a :class:`FilesystemEntry` and the patterns it matches.
+        """
+        yield from fsutil.glob_ext_multi(self, patterns)
+
     def exists(self, path: str) -> bool:
         """Determines whether a ``path``, relative to this entry, exists.
 
@@ -974,6 +997,7 @@ class VirtualDirectory(FilesystemEntry):
             name = name.lower()
 
         self.entries[name] = entry
+        VirtualFilesystem._generation += 1
 
     def get(self, path: str) -> FilesystemEntry:
         return self.fs.get(path, relentry=self)
@@ -1179,6 +1203,9 @@ class VirtualSymlink(FilesystemEntry):
 class VirtualFilesystem(Filesystem):
     __type__ = "virtual"
 
+    _generation = 0
+    """Incremented on every change to any :class:`VirtualFilesystem`, used to invalidate path indexes."""
+
     def __init__(self, **kwargs):
         super().__init__(None, **kwargs)
         self.root = VirtualDirectory(self, "/")
@@ -1255,6 +1282,7 @@ class VirtualFilesystem(Filesystem):
         """Mount a dissect filesystem to a directory in the VFS."""
         directory = self.makedirs(vfspath)
         directory.top = fs.get(base)
+        VirtualFilesystem._generation += 1
 
     mount = map_fs
 
@@ -1321,6 +1349,7 @@ class VirtualFilesystem(Filesystem):
         vfspath = fsutil.normalize(vfspath, alt_separator=self.alt_separator).strip("/")
         if not vfspath:
             self.root.top = entry
+            VirtualFilesystem._generation += 1
         else:
             if "/" in vfspath:
                 sub_dirs = fsutil.dirname(vfspath, alt_separator=self.alt_separator)
@@ -1399,6 +1428,14 @@ class LayerFilesystem(Filesystem):
         self._alt_separator = "/"
         self._case_sensitive = True
         self._root_entry = LayerFilesystemEntry(self, "/", [])
+
+        # Optional index of resolved paths, see enable_index()
+        self._index: dict[str, EntryList] | None = None
+        self._index_size = 0
+        self._index_generation = 0
+        self.index_hits = 0
+        self.index_misses = 0
+
         self.root = self.append_layer()
         super().__init__(None, **kwargs)
 
@@ -1441,6 +1478,7 @@ class LayerFilesystem(Filesystem):
 
         root.map_fs(path, fs)
         self.mounts[path] = fs
+        self.invalidate_index()
 
     def link(self, dst: str, src: str) -> None:
         """Hard link a :class:`FilesystemEntry` to another location."""
@@ -1474,6 +1512,7 @@ class LayerFilesystem(Filesystem):
         # We could reverse the list of layers upon iteration, but that is a hot path
         self.layers.insert(0, fs)
         self._root_entry.entries.insert(0, fs.get("/"))
+        self.invalidate_index()
 
     def prepend_fs_layer(self, fs: Filesystem) -> None:
         """Prepend a filesystem as a layer.
@@ -1485,6 +1524,7 @@ class LayerFilesystem(Filesystem):
         # We could reverse the list of layers upon iteration, but that is a hot path
         self.layers.append(fs)
         self._root_entry.entries.append(fs.get("/"))
+        self.invalidate_index()
 
     def remove_fs_layer(self, fs: Filesystem) -> None:
         """Remove a filesystem layer.
@@ -1502,6 +1542,7 @@ class LayerFilesystem(Filesystem):
         """
         del self.layers[idx]
         del self._root_entry.entries[idx]
+        self.invalidate_index()
 
     @property
     def case_sensitive(self) -> bool:
@@ -1520,6 +1561,7 @@ class LayerFilesystem(Filesystem):
         self.root.case_sensitive = value
         for layer in self.layers:
             layer.case_sensitive = value
+        self.invalidate_index()
 
     @alt_separator.setter
     def alt_separator(self, value: str) -> None:
@@ -1528,6 +1570,43 @@ class LayerFilesystem(Filesystem):
         self.root.alt_separator = value
         for layer in self.layers:
             layer.alt_separator = value
+        self.invalidate_index()
+
+    def enable_index(self, max_size: int = 100_000) -> None:
+        """Enable the path index of this filesystem.
+
+        The path index maps absolute (and case-folded, if the filesystem is case insensitive) paths to the entries
+        they resolved to in the different layers, so repeated lookups of the same path don't have to walk every layer
+        and path component again. Only successful lookups are indexed.
+
+        The index is cleared when mounts or layers change, or when any :class:`VirtualFilesystem` is modified.
+        Changes to other filesystems require an explicit call to :meth:`invalidate_index`.
+
+        Args:
+            max_size: The maximum number of paths to keep in the index, the oldest paths are evicted first.
+        """
+        self._index = {}
+        self._index_size = max_size
+        self._index_generation = VirtualFilesystem._generation
+
+    def disable_index(self) -> None:
+        """Disable and clear the path index of this filesystem."""
+        self._index = None
+
+    def invalidate_index(self) -> None:
+        """Clear the path index of this filesystem, if enabled."""
+        if self._index:
+            self._index.clear()
+        self._index_generation = VirtualFilesystem._generation
+
+    @property
+    def index_stats(self) -> dict[str, int]:
+        """The hit and miss counters and current size of the path index."""
+        return {
+            "hits": self.index_hits,
+            "misses": self.index_misses,
+            "size": len(self._index) if self._index is not None else 0,
+        }
 
     def get(self, path: str, relentry: LayerFilesystemEntry | None = None) -> LayerFilesystemEntry:
         """Get a :class:`FilesystemEntry` from the filesystem."""
@@ -1538,6 +1617,28 @@ class LayerFilesystem(Filesystem):
         if not path:
             return entry
 
+        if self._index is not None and entry is self._root_entry:
+            if self._index_generation != VirtualFilesystem._generation:
+                self.invalidate_index()
+
+            key = full_path if self.case_sensitive else full_path.lower()
+            if (entries := self._index.get(key)) is not None:
+                self.index_hits += 1
+                return LayerFilesystemEntry(self, full_path, entries)
+
+            self.index_misses += 1
+            result = self._get_from_layers(path, full_path, entry)
+
+            if self._index and len(self._index) >= self._index_size:
+                del self._index[next(iter(self._index))]
+            self._index[key] = result.entries
+
+            return result
+
+        return self._get_from_layers(path, full_path, entry)
+
+    def _get_from_layers(self, path: str, full_path: str, entry: LayerFilesystemEntry) -> LayerFilesystemEntry:
+        """Resolve a relative ``path`` from ``entry`` in each of the layers."""
         exc = []
         entries = []
 
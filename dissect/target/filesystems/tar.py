@@ -22,6 +22,7 @@ from dissect.target.filesystem import (
 )
 from dissect.target.helpers import fsutil
 from dissect.target.helpers.logging import get_logger
+from dissect.target.helpers.tarindex import TarIndex
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
@@ -48,6 +49,9 @@ class TarFilesystem(Filesystem):
 
         if tarfile:
             self.tar = tarfile
+        elif tarinfo is None:
+            # Read compressed tar files through seek points instead of decompressing from the start for every member
+            _, self.tar = TarIndex.build(fh)
         else:
             fh.seek(0)
             self.tar = tf.open(mode="r", fileobj=fh, tarinfo=tarinfo)  # noqa: SIM115
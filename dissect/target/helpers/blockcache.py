@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import io
+import itertools
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, BinaryIO
+
+from dissect.util.stream import AlignedStream
+
+if TYPE_CHECKING:
+    from dissect.target.target import Target
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_MAX_READAHEAD = 16
+
+_stream_ids = itertools.count()
+
+
+class BlockCache:
+    """A size bounded, least recently used cache of blocks of data, shared by multiple streams.
+
+    Streams opened through :meth:`open` read their data in blocks of ``block_size`` bytes and keep the blocks in
+    this cache, so repeated reads of the same region, like filesystem metadata that is parsed over and over again,
+    don't have to be read (and possibly decompressed) from the source again.
+
+    Streams detect sequential reads and then read ahead an increasing number of blocks at once, up to
+    ``max_readahead`` blocks.
+
+    Args:
+        max_size: The maximum total size in bytes of the cached blocks.
+        block_size: The size of a single block in bytes.
+        max_readahead: The maximum number of blocks to read ahead when sequential reads are detected.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        max_readahead: int = DEFAULT_MAX_READAHEAD,
+    ):
+        if block_size <= 0:
+            raise ValueError("block_size must be a positive number")
+
+        self.max_size = max_size
+        self.block_size = block_size
+        self.max_readahead = max_readahead
+
+        self.hits = 0
+        self.misses = 0
+        self.readahead = 0
+        self.evictions = 0
+
+        self._blocks: OrderedDict[tuple[int, int], bytes] = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"<BlockCache size={self._size} max_size={self.max_size} block_size={self.block_size} "
+            f"hits={self.hits} misses={self.misses}>"
+        )
+
+    @classmethod
+    def from_target(cls, target: Target) -> BlockCache | None:
+        """Create a block cache from the configuration of a target.
+
+        The cache is only created if ``BLOCK_CACHE_SIZE`` is configured. The block size and readahead can be changed
+        with ``BLOCK_CACHE_BLOCK_SIZE`` and ``BLOCK_CACHE_READAHEAD``.
+        """
+        config = target._config
+        if not config or not (max_size := getattr(config, "BLOCK_CACHE_SIZE", None)):
+            return None
+
+        return cls(
+            int(max_size),
+            block_size=int(getattr(config, "BLOCK_CACHE_BLOCK_SIZE", DEFAULT_BLOCK_SIZE)),
+            max_readahead=int(getattr(config, "BLOCK_CACHE_READAHEAD", DEFAULT_MAX_READAHEAD)),
+        )
+
+    @property
+    def size(self) -> int:
+        """The total size in bytes of the cached blocks."""
+        return self._size
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        """The hit, miss, readahead and eviction counters, the hit rate and the current size of the cache."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "readahead": self.readahead,
+            "evictions": self.evictions,
+            "size": self._size,
+            "blocks": len(self._blocks),
+        }
+
+    def open(self, fh: BinaryIO, size: int | None = None) -> CachedStream:
+        """Open a stream on ``fh`` that reads through this cache.
+
+        Args:
+            fh: The file-like object to read from.
+            size: The size of ``fh``, determined by seeking to the end if not given.
+        """
+        return CachedStream(fh, self, size=size)
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        with self._lock:
+            return key in self._blocks
+
+    def get(self, key: tuple[int, int]) -> bytes | None:
+        """Return a cached block and count it as a hit or a miss."""
+        with self._lock:
+            if (data := self._blocks.get(key)) is not None:
+                self._blocks.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return data
+
+    def put(self, key: tuple[int, int], data: bytes, readahead: bool = False) -> None:
+        """Add a block to the cache, ``readahead`` counts it as a block that was read ahead."""
+        with self._lock:
+            if readahead:
+                self.readahead += 1
+
+            if (old := self._blocks.pop(key, None)) is not None:
+                self._size -= len(old)
+
+            self._blocks[key] = data
+            self._size += len(data)
+
+            while self._size > self.max_size and self._blocks:
+                _, evicted = self._blocks.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all blocks from the cache."""
+        with self._lock:
+            self._blocks.clear()
+            self._size = 0
+
+
+class CachedStream(AlignedStream):
+    """A stream that reads the blocks of a source file-like object through a :class:`BlockCache`.
+
+    Args:
+        fh: The file-like object to read from.
+        cache: The block cache to use.
+        size: The size of ``fh``, determined by seeking to the end if not given.
+    """
+
+    def __init__(self, fh: BinaryIO, cache: BlockCache, size: int | None = None):
+        self.fh = fh
+        self.cache = cache
+
+        if size is None:
+            offset = fh.tell()
+            size = fh.seek(0, io.SEEK_END)
+            fh.seek(offset)
+
+        self._id = next(_stream_ids)
+        self._next_block = None
+        self._readahead = 0
+
+        super().__init__(size, align=cache.block_size)
+
+    def _read(self, offset: int, length: int) -> bytes:
+        block_size = self.cache.block_size
+        block_count = (self.size + block_size - 1) // block_size
+
+        first = offset // block_size
+        last = min((offset + length + block_size - 1) // block_size, block_count)
+
+        # Sequential reads double the number of blocks that are read ahead, any other read resets it
+        if first == self._next_block:
+            self._readahead = min(max(self._readahead * 2, 1), self.cache.max_readahead)
+        else:
+            self._readahead = 0
+        self._next_block = last
+
+        result = []
+        idx = first
+        while idx < last:
+            if (data := self.cache.get((self._id, idx))) is not None:
+                result.append(data)
+                idx += 1
+                continue
+
+            # Read a run of consecutive missing blocks at once, every block is only looked up once
+            hit = None
+            end = idx + 1
+            while end < last and (hit := self.cache.get((self._id, end))) is None:
+                end += 1
+
+            readahead_end = end
+            if end == last:
+                readahead_end = min(end + self._readahead, block_count)
+                while readahead_end > end and (self._id, readahead_end - 1) in self.cache:
+                    readahead_end -= 1
+
+            self.fh.seek(idx * block_size)
+            buf = self.fh.read((readahead_end - idx) * block_size)
+
+            for block in range(idx, readahead_end):
+                data = buf[(block - idx) * block_size : (block - idx + 1) * block_size]
+                if not data:
+                    break
+
+                self.cache.put((self._id, block), data, readahead=block >= end)
+                if block < end:
+                    result.append(data)
+
+            # The block that ended the run of missing blocks was already looked up
+            if hit is not None:
+                result.append(hit)
+                end += 1
+            idx = end
+
+        return b"".join(result)
@@ -2,8 +2,13 @@ from __future__ import annotations
 
 import base64
 import functools
+import hashlib
 import inspect
 import os
+import time
+import uuid
+from dataclasses import dataclass
+from importlib.metadata import PackageNotFoundError, version
 from itertools import tee
 from pathlib import Path
 from types import GeneratorType
@@ -17,6 +22,7 @@ if TYPE_CHECKING:
 
     from flow.record.adapter.stream import StreamReader, StreamWriter
 
+    from dissect.target.filesystem import Filesystem
     from dissect.target.target import Target
 
 Tee = type(tee([], 1)[0])
@@ -25,6 +31,155 @@ IGNORE_CACHE = os.getenv("IGNORE_CACHE", "0") == "1"
 ONLY_READ_CACHE = os.getenv("ONLY_READ_CACHE", "0") == "1"
 REWRITE_CACHE = os.getenv("REWRITE_CACHE", "0") == "1"
 
+# Temporary cache files older than this amount of seconds are considered abandoned
+STALE_TEMP_AGE = 24 * 60 * 60
+
+# Minimum amount of seconds between two size based prunes of the same cache directory
+PRUNE_INTERVAL = 60
+
+# Attributes that hold the serial or UUID of a filesystem, by filesystem type
+FILESYSTEM_ID_ATTRIBUTES = {
+    "ntfs": ("ntfs", "serial"),
+    "ext": ("extfs", "uuid"),
+    "xfs": ("xfs", "uuid"),
+    "btrfs": ("btrfs", "uuid"),
+    "fat": ("fatfs", "volume_id"),
+}
+
+_FINGERPRINT_CACHE_KEY = f"{__name__}.fingerprint"
+
+# Time of the last size based prune, by cache directory
+_last_prune: dict[Path, float] = {}
+
+try:
+    _VERSION = version("dissect.target")
+except PackageNotFoundError:
+    _VERSION = "unknown"
+
+
+def _filesystem_id(fs: Filesystem) -> str | None:
+    if not (attributes := FILESYSTEM_ID_ATTRIBUTES.get(fs.__type__)):
+        return None
+
+    obj, attr = attributes
+    value = getattr(getattr(fs, obj, None), attr, None)
+    return None if value is None else str(value)
+
+
+def fingerprint(target: Target) -> str:
+    """Return a fingerprint of the evidence of a target and the version of the plugins.
+
+    The fingerprint is based on the loader type, the size of every disk, the type and serial or UUID of every
+    filesystem and the version of ``dissect.target``. Cached results are stored per fingerprint, so they are no longer
+    used once the evidence or the plugins that produced them change.
+    """
+    if (value := target._cache.get(_FINGERPRINT_CACHE_KEY)) is not None:
+        return value
+
+    components = [
+        _VERSION,
+        type(target._loader).__name__ if target._loader else None,
+        [getattr(disk, "size", None) for disk in target.disks],
+        [(fs.__type__, _filesystem_id(fs)) for fs in target.filesystems],
+    ]
+
+    value = hashlib.sha1(repr(components).encode()).hexdigest()[:16]
+    target._cache[_FINGERPRINT_CACHE_KEY] = value
+    return value
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    path: Path
+    target: str
+    fingerprint: str
+    function: str
+    size: int
+    last_used: float
+
+
+def iter_entries(cache_dir: Path | str) -> Iterator[CacheEntry]:
+    """Yield all cache entries in a cache directory.
+
+    Entries are stored as ``<cache_dir>/<target name>/<fingerprint>/<function>.<key>.<ext>``.
+    """
+    for path in Path(cache_dir).glob("*/*/*"):
+        if not path.is_file() or path.name.startswith("_"):
+            continue
+
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+
+        yield CacheEntry(
+            path=path,
+            target=path.parent.parent.name,
+            fingerprint=path.parent.name,
+            function=path.name.rsplit(".", 2)[0],
+            size=stat.st_size,
+            last_used=stat.st_mtime,
+        )
+
+
+def prune(
+    cache_dir: Path | str,
+    max_size: int | None = None,
+    max_age: float | None = None,
+    target: str | None = None,
+) -> list[CacheEntry]:
+    """Remove cache entries, least recently used first.
+
+    Abandoned temporary cache files are always removed.
+
+    Args:
+        cache_dir: The cache directory to prune.
+        max_size: The maximum total size in bytes of all remaining entries.
+        max_age: The maximum amount of seconds since an entry was last used.
+        target: Only remove the entries of the target with this name.
+
+    Returns:
+        The removed cache entries.
+    """
+    now = time.time()
+
+    for path in Path(cache_dir).glob("*/*/_*"):
+        try:
+            if now - path.stat().st_mtime > STALE_TEMP_AGE:
+                path.unlink()
+        except OSError:  # noqa: PERF203
+            pass
+
+    entries = sorted(iter_entries(cache_dir), key=lambda entry: entry.last_used)
+    total_size = sum(entry.size for entry in entries)
+
+    removed = []
+    for entry in entries:
+        if target is not None and entry.target != target:
+            continue
+
+        expired = max_age is not None and now - entry.last_used > max_age
+        oversized = max_size is not None and total_size > max_size
+        if not expired and not oversized:
+            continue
+
+        try:
+            entry.path.unlink()
+        except OSError:
+            continue
+
+        total_size -= entry.size
+        removed.append(entry)
+
+        # Clean up directories of fingerprints that are no longer in use
+        for directory in (entry.path.parent, entry.path.parent.parent):
+            try:
+                directory.rmdir()
+            except OSError:  # noqa: PERF203
+                break
+
+    return removed
+
 
 class LineWriter:
     def __init__(self, path: Path):
@@ -48,25 +203,53 @@ class LineReader:
 
 
 class CacheWriter:
-    def __init__(self, path: Path, temp: Path, reader: Iterator[Any], writer: StreamWriter | LineWriter):
+    def __init__(
+        self,
+        path: Path,
+        temp: Path,
+        reader: Iterator[Any],
+        writer: StreamWriter | LineWriter,
+        max_size: int | None = None,
+    ):
         self.path = path
         self.temp = temp
         self.reader = reader
         self.writer = writer
+        self.max_size = max_size
 
     def __iter__(self) -> Iterator[Any]:
-        for obj in self.reader:
-            self.writer.write(obj)
-            yield obj
+        try:
+            for obj in self.reader:
+                self.writer.write(obj)
+                yield obj
+        except BaseException:
+            # The results are incomplete if the function failed or wasn't iterated until the end
+            self.discard()
+            raise
+
         self.close()
 
     def close(self) -> None:
         self.writer.close()
         try:
-            self.temp.rename(self.path)
+            # Replacing is atomic, so concurrent readers and writers of the same entry never see a partial file
+            self.temp.replace(self.path)
         except OSError:
             pass
 
+        if self.max_size is not None:
+            cache_dir = self.path.parent.parent.parent
+            now = time.monotonic()
+            if now - _last_prune.get(cache_dir, -PRUNE_INTERVAL) >= PRUNE_INTERVAL:
+                _last_prune[cache_dir] = now
+                prune(cache_dir, max_size=self.max_size)
+
+    def discard(self) -> None:
+        try:
+            self.writer.close()
+        finally:
+            self.temp.unlink(missing_ok=True)
+
 
 class Cache:
     def __init__(self, func: Callable, no_cache: bool = False, cls: type | None = None):
@@ -102,7 +285,7 @@ class Cache:
         path_key = base64.b64encode(repr(key).encode()).decode("utf8")
         ext = "zstd" if HAS_ZSTD else "rec"
         fname = f"{self.fname}.{path_key}.{ext}"
-        return Path(cache_dir).joinpath(Path(target.path).name, fname)
+        return Path(cache_dir).joinpath(Path(target.path).name, fingerprint(target), fname)
 
     def call(self, *args, **kwargs) -> Any:
         target: Target = args[0].target
@@ -166,6 +349,11 @@ class Cache:
                         target.log.debug("", exc_info=e)
                     else:
                         target.log.info("Using cache for function: %s", self.fname)
+                        try:
+                            # Mark the entry as recently used
+                            os.utime(cache_file)
+                        except OSError:
+                            pass
                         return reader
                 else:
                     target.log.warning("Cache will NOT be used. File is empty: %s", cache_file)
@@ -174,29 +362,21 @@ class Cache:
         elif write_file_cache:
             dir_mode = getattr(target._config, "CACHE_DIR_MODE", 0o777) if target._config else 0o777
             file_mode = getattr(target._config, "CACHE_FILE_MODE", 0o666) if target._config else 0o666
+            max_size = getattr(target._config, "CACHE_MAX_SIZE", None) if target._config else None
 
             temp_dir = cache_file.parent
-            temp_path = cache_file.with_name(f"_{cache_file.name}")
+            # Use a unique temp file, multiple processes may be writing the same cache file at the same time
+            temp_path = cache_file.with_name(f"_{uuid.uuid4().hex[:8]}_{cache_file.name}")
 
             if not temp_dir.exists():
                 try:
-                    temp_dir.mkdir(mode=dir_mode, parents=True)
+                    temp_dir.mkdir(mode=dir_mode, parents=True, exist_ok=True)
                 except Exception as e:
                     target.log.warning(
                         "Cache will NOT be written. Unable to create cache directory: %s (%s)", temp_dir, e
                     )
 
             if os.access(temp_dir, os.W_OK | os.R_OK | os.X_OK, effective_ids=bool(os.supports_effective_ids)):
-                if temp_path.exists():
-                    try:
-                        temp_path.unlink()
-                    except Exception as e:
-                        target.log.warning(
-                            "Cache will NOT be written. Unable to remove pre-existing cache temp file: %s (%s)",
-                            temp_path,
-                            e,
-                        )
-
                 if not temp_path.exists():
                     try:
                         writer = self.open_writer(temp_path, output)
@@ -211,7 +391,7 @@ class Cache:
                                 e,
                             )
                         target.log.debug("Caching to file: %s", temp_path)
-                        return CacheWriter(cache_file, temp_path, self.func(*args, **kwargs), writer)
+                        return CacheWriter(cache_file, temp_path, self.func(*args, **kwargs), writer, max_size)
                     except Exception as e:
                         target.log.error("Cache will NOT be written. Failed to cache to file: %s (%s)", cache_file, e)  # noqa: TRY400
                         target.log.debug("", exc_info=e)
@@ -57,7 +57,7 @@ from dissect.target.helpers.polypath import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterator, Sequence
+    from collections.abc import Callable, Iterable, Iterator, Sequence
 
     from typing_extensions import Self
 
@@ -90,6 +90,8 @@ __all__ = [
     "fs_attrs",
     "generate_addr",
     "glob_ext",
+    "glob_ext_multi",
+    "glob_multi",
     "glob_split",
     "has_glob_magic",
     "isabs",
@@ -453,6 +455,179 @@ def glob_ext0(direntry: filesystem.FilesystemEntry, path: str) -> Iterator[files
             pass
 
 
+class _GlobNode:
+    """A node in the tree of path parts of the patterns given to :func:`glob_ext_multi`."""
+
+    __slots__ = ("_regex", "_regex_ci", "dir_patterns", "globs", "literals", "patterns")
+
+    def __init__(self):
+        self.patterns: list[tuple[int, str]] = []
+        self.dir_patterns: list[tuple[int, str]] = []
+        self.literals: dict[str, _GlobNode] = {}
+        self.globs: dict[str, _GlobNode] = {}
+        self._regex = None
+        self._regex_ci = None
+
+    def add(self, parts: list[str], pattern: tuple[int, str]) -> None:
+        node = self
+        for i, part in enumerate(parts):
+            if part == "" and i == len(parts) - 1:
+                # Patterns ending with a slash should match only directories
+                node.dir_patterns.append(pattern)
+                return
+
+            if not part:
+                continue
+
+            children = node.globs if has_glob_magic(part) else node.literals
+            node = children.setdefault(part, _GlobNode())
+
+        node.patterns.append(pattern)
+
+    def match_globs(self, name: str, case_sensitive: bool, include_hidden: bool = False) -> Iterator[_GlobNode]:
+        """Yield the child nodes of all glob parts that match ``name``.
+
+        Hidden names only match glob parts that start with a dot, unless ``include_hidden`` is set.
+        """
+        if case_sensitive:
+            if self._regex is None:
+                self._regex = _compile_globs(self.globs)
+            regex = self._regex
+        else:
+            if self._regex_ci is None:
+                self._regex_ci = _compile_globs({part.lower(): node for part, node in self.globs.items()})
+            regex = self._regex_ci
+            name = name.lower()
+
+        # A single combined regex rejects non-matching names in one go, the individual parts are only checked
+        # for names that match at least one of them
+        combined, parts = regex
+        if not combined.match(name):
+            return
+
+        for part_regex, node, dotted in parts:
+            if (include_hidden or dotted or name[0] != ".") and part_regex.match(name):
+                yield node
+
+
+def _compile_globs(globs: dict[str, _GlobNode]) -> tuple[re.Pattern, list[tuple[re.Pattern, _GlobNode, bool]]]:
+    translated = [(fnmatch.translate(part), node, part[0] == ".") for part, node in globs.items()]
+    combined = re.compile("|".join(f"(?:{regex})" for regex, _, _ in translated))
+    return combined, [(re.compile(regex), node, dotted) for regex, node, dotted in translated]
+
+
+def _compile_patterns(patterns: Iterable[str], alt_separator: str = "") -> _GlobNode:
+    root = _GlobNode()
+    for idx, pattern in enumerate(patterns):
+        normalized = normalize(pattern, alt_separator=alt_separator).lstrip("/")
+        root.add(normalized.split("/"), (idx, pattern))
+    return root
+
+
+def glob_ext_multi(
+    direntry: filesystem.FilesystemEntry, patterns: Iterable[str]
+) -> Iterator[tuple[filesystem.FilesystemEntry, list[str]]]:
+    """Search filesystem entries matching any of the given glob patterns in a single walk.
+
+    The patterns are compiled into a tree of path parts, so every directory is listed at most once, regardless of
+    the number of patterns that traverse it. Each name in a directory is matched against all glob parts at that
+    level at once. The results are the same as those of :func:`glob_ext` for every individual pattern, but every
+    entry is only yielded once, together with all the patterns it matches (in the order they were given).
+
+    Args:
+        direntry: The filesystem entry relative to which to search.
+        patterns: Glob patterns to match names of filesystem entries against.
+
+    Yields:
+        Tuples of a matching filesystem entry (file or directory) and the list of patterns it matches.
+    """
+    root = _compile_patterns(patterns, direntry.fs.alt_separator)
+    for entry, _, matched in _glob_ext_multi(direntry, (), [root]):
+        yield entry, matched
+
+
+def glob_multi(path: TargetPath, patterns: Iterable[str]) -> Iterator[tuple[TargetPath, list[str]]]:
+    """Search paths matching any of the given glob patterns relative to ``path`` in a single walk.
+
+    Like :func:`glob_ext_multi`, but starting from and returning :class:`TargetPath` instances. Like
+    :meth:`TargetPath.glob`, glob parts also match hidden names that start with a dot.
+
+    Args:
+        path: The path relative to which to search.
+        patterns: Glob patterns to match names of filesystem entries against.
+
+    Yields:
+        Tuples of a matching path and the list of patterns it matches.
+    """
+    try:
+        direntry = path.get()
+    except FileNotFoundError:
+        return
+
+    root = _compile_patterns(patterns, direntry.fs.alt_separator)
+    for entry, parts, matched in _glob_ext_multi(direntry, (), [root], include_hidden=True):
+        match_path = path.joinpath(*parts)
+        match_path._entry = entry
+        yield match_path, matched
+
+
+def _glob_ext_multi(
+    entry: filesystem.FilesystemEntry, parts: tuple[str, ...], nodes: list[_GlobNode], include_hidden: bool = False
+) -> Iterator[tuple[filesystem.FilesystemEntry, tuple[str, ...], list[str]]]:
+    matched = [pattern for node in nodes for pattern in node.patterns]
+    is_dir = entry.is_dir()
+
+    if is_dir:
+        matched.extend(pattern for node in nodes for pattern in node.dir_patterns)
+
+    if matched:
+        yield entry, parts, [pattern for _, pattern in sorted(matched)]
+
+    if not is_dir:
+        return
+
+    case_sensitive = entry.fs.case_sensitive
+    children: dict[str, tuple[filesystem.FilesystemEntry, str, list[_GlobNode]]] = {}
+    missing = set()
+
+    # Path parts without globs are retrieved directly by name
+    for node in nodes:
+        for part, child_node in node.literals.items():
+            key = part if case_sensitive else part.lower()
+            if key in children:
+                children[key][2].append(child_node)
+                continue
+
+            if key in missing:
+                continue
+
+            try:
+                children[key] = (entry.get(part), part, [child_node])
+            except FileNotFoundError:
+                missing.add(key)
+
+    # Path parts with globs are matched against a single listing of the directory
+    glob_nodes = [node for node in nodes if node.globs]
+    if glob_nodes:
+        for dir_entry in entry.scandir():
+            child_nodes = [
+                child_node
+                for node in glob_nodes
+                for child_node in node.match_globs(dir_entry.name, case_sensitive, include_hidden)
+            ]
+            if not child_nodes:
+                continue
+
+            key = dir_entry.name if case_sensitive else dir_entry.name.lower()
+            if key in children:
+                children[key][2].extend(child_nodes)
+            else:
+                children[key] = (dir_entry.get(), dir_entry.name, child_nodes)
+
+    for child, name, child_nodes in children.values():
+        yield from _glob_ext_multi(child, (*parts, name), child_nodes, include_hidden)
+
+
 def has_glob_magic(s: str) -> bool:
     return re_glob_magic.search(s) is not None
 
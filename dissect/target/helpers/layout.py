@@ -0,0 +1,256 @@
+"""Snapshots of the resolved layout of a target.
+
+Applying a target probes every volume for nested volume systems, LVM, encryption and filesystems, and calls
+``detect`` on every OS plugin. A :class:`LayoutSnapshot` records the outcome of this probing: what kind of volume
+every volume is, which filesystem was found on it, and which OS plugin and filesystem were selected.
+
+When ``LAYOUT_SNAPSHOT_DIR`` is configured, a snapshot is written after a target is applied, and replayed on the
+next open of the same evidence, so the probing can be skipped. A snapshot is only replayed if the loader, the
+types and sizes of the disks and a hash of the start of every disk are unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from dissect.target.helpers.logging import get_logger
+from dissect.target.helpers.utils import atomic_write
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from dissect.target.filesystem import Filesystem
+    from dissect.target.plugin import OSPlugin
+    from dissect.target.target import Target
+    from dissect.target.volume import Volume
+
+log = get_logger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".layout.json"
+
+# Amount of data at the start of every disk that is hashed to detect changes of the evidence
+HEADER_SIZE = 1024 * 1024
+
+# The kinds of volumes, see VolumeCollection.apply()
+VOLUME_LVM = "lvm"
+VOLUME_ENCRYPTED = "encrypted"
+VOLUME_PLAIN = "plain"
+
+
+def _class_path(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _load_class(path: str) -> type:
+    module, _, qualname = path.rpartition(".")
+    obj = importlib.import_module(module)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def fingerprint(target: Target) -> str | None:
+    """Return a fingerprint of the evidence of a target, or ``None`` if the target has no disks.
+
+    The fingerprint consists of the loader, the type and size of every disk and a hash of the first
+    :data:`HEADER_SIZE` bytes of every disk.
+    """
+    if not len(target.disks):
+        return None
+
+    disks = []
+    for disk in target.disks:
+        disk.seek(0)
+        header = disk.read(HEADER_SIZE)
+        disks.append((disk.__type__, disk.size, hashlib.sha256(header).hexdigest()))
+
+    data = json.dumps([_class_path(type(target._loader)) if target._loader else None, disks])
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def snapshot_path(target: Target, fingerprint: str) -> Path | None:
+    """Return the path of the layout snapshot of a target, or ``None`` if ``LAYOUT_SNAPSHOT_DIR`` isn't configured."""
+    if not (snapshot_dir := getattr(target._config, "LAYOUT_SNAPSHOT_DIR", None)):
+        return None
+
+    name = target.path.name if target.path else "target"
+    return Path(snapshot_dir).joinpath(f"{name}.{fingerprint[:16]}{SNAPSHOT_SUFFIX}")
+
+
+class LayoutSnapshot:
+    """The resolved layout of a target, either recorded while applying the target or loaded to be replayed.
+
+    Volumes are identified by the index of their disk, their number, offset, size and name.
+
+    Args:
+        fingerprint: The fingerprint of the evidence, see :func:`fingerprint`.
+        volumes: The kind, nested volume system and filesystem of every volume, by volume key.
+        os_plugin: The path of the selected OS plugin class.
+        os_filesystem: The index of the filesystem the OS plugin was detected on.
+        replay: Whether this snapshot is replayed instead of recorded.
+    """
+
+    def __init__(
+        self,
+        fingerprint: str,
+        volumes: dict[str, dict[str, Any]] | None = None,
+        os_plugin: str | None = None,
+        os_filesystem: int | None = None,
+        replay: bool = False,
+    ):
+        self.fingerprint = fingerprint
+        self.volumes = volumes or {}
+        self.os_plugin = os_plugin
+        self.os_filesystem = os_filesystem
+        self.replay = replay
+
+        # Set if the evidence doesn't match the snapshot while replaying it
+        self.invalid = False
+
+    def __repr__(self) -> str:
+        return f"<LayoutSnapshot volumes={len(self.volumes)} os_plugin={self.os_plugin} replay={self.replay}>"
+
+    @staticmethod
+    def volume_key(target: Target, vol: Volume) -> str:
+        disk_index = next((idx for idx, disk in enumerate(target.disks) if disk is vol.disk), None)
+        return f"{disk_index}:{vol.number}:{vol.offset}:{vol.size}:{vol.name}"
+
+    def get_volume(self, target: Target, vol: Volume) -> dict[str, Any] | None:
+        """Return the recorded layout of a volume while replaying, or ``None`` if it needs to be probed."""
+        if not self.replay or self.invalid:
+            return None
+
+        if (entry := self.volumes.get(self.volume_key(target, vol))) is None:
+            target.log.info("Volume %s is missing from the layout snapshot, probing all volumes", vol)
+            self.invalid = True
+        return entry
+
+    def record_volume(self, target: Target, vol: Volume, **kwargs) -> None:
+        """Record the ``kind``, nested volume system (``vs``) or ``filesystem`` of a volume."""
+        if self.replay:
+            return
+        self.volumes.setdefault(self.volume_key(target, vol), {}).update(kwargs)
+
+    def record_filesystem(self, target: Target, vol: Volume, fs: Filesystem) -> None:
+        """Record the filesystem class that was identified on a volume."""
+        self.record_volume(target, vol, filesystem=_class_path(type(fs)))
+
+    def open_filesystem(self, target: Target, vol: Volume, entry: dict[str, Any]) -> Filesystem | None:
+        """Open the recorded filesystem of a volume."""
+        if not (fs_path := entry.get("filesystem")):
+            return None
+
+        try:
+            return _load_class(fs_path)(vol)
+        except Exception as e:
+            target.log.info("Failed to open filesystem %s from the layout snapshot on %s", fs_path, vol)
+            target.log.debug("", exc_info=e)
+            self.invalid = True
+            return None
+
+    def record_os(self, target: Target, os_plugin: type[OSPlugin], fs: Filesystem | None) -> None:
+        if self.replay:
+            return
+        self.os_plugin = _class_path(os_plugin)
+        self.os_filesystem = next((idx for idx, entry in enumerate(target.filesystems) if entry is fs), None)
+
+    def get_os(self, target: Target) -> tuple[type[OSPlugin], Filesystem | None] | None:
+        """Return the recorded OS plugin and the filesystem it was detected on while replaying."""
+        if not self.replay or self.invalid or not self.os_plugin:
+            return None
+
+        try:
+            os_plugin = _load_class(self.os_plugin)
+        except Exception as e:
+            target.log.info("Failed to load OS plugin %s from the layout snapshot", self.os_plugin)
+            target.log.debug("", exc_info=e)
+            return None
+
+        fs = None
+        if self.os_filesystem is not None:
+            if self.os_filesystem >= len(target.filesystems):
+                return None
+            fs = target.filesystems.entries[self.os_filesystem]
+
+        return os_plugin, fs
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "version": SNAPSHOT_VERSION,
+            "fingerprint": self.fingerprint,
+            "volumes": self.volumes,
+            "os_plugin": self.os_plugin,
+            "os_filesystem": self.os_filesystem,
+        }
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> Self | None:
+        """Load the snapshot at ``path`` to replay it, if it exists and matches ``fingerprint``."""
+        try:
+            data = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning("Ignoring invalid layout snapshot %s", path)
+            log.debug("", exc_info=e)
+            return None
+
+        if data.get("version") != SNAPSHOT_VERSION or data.get("fingerprint") != fingerprint:
+            return None
+
+        return cls(fingerprint, data["volumes"], data["os_plugin"], data["os_filesystem"], replay=True)
+
+    def save(self, path: Path) -> None:
+        with atomic_write(path) as temp:
+            temp.write_text(json.dumps(self.as_dict(), indent=4))
+
+
+def open_snapshot(target: Target) -> LayoutSnapshot | None:
+    """Load the layout snapshot of a target to replay, or start recording a new one.
+
+    Returns ``None`` if layout snapshots aren't configured or the target has no disks.
+    """
+    if not getattr(target._config, "LAYOUT_SNAPSHOT_DIR", None):
+        return None
+
+    try:
+        if (target_fingerprint := fingerprint(target)) is None:
+            return None
+    except Exception as e:
+        target.log.warning("Failed to fingerprint target for layout snapshot: %s", e)
+        target.log.debug("", exc_info=e)
+        return None
+
+    path = snapshot_path(target, target_fingerprint)
+    if (snapshot := LayoutSnapshot.load(path, target_fingerprint)) is not None:
+        target.log.debug("Replaying layout snapshot %s", path)
+        return snapshot
+
+    return LayoutSnapshot(target_fingerprint)
+
+
+def save_snapshot(target: Target, snapshot: LayoutSnapshot) -> None:
+    """Write a recorded layout snapshot of a target."""
+    if snapshot.replay and not snapshot.invalid:
+        return
+
+    if snapshot.replay:
+        # The evidence didn't match the snapshot, it can't be trusted anymore
+        path = snapshot_path(target, snapshot.fingerprint)
+        target.log.info("Removing outdated layout snapshot %s", path)
+        path.unlink(missing_ok=True)
+        return
+
+    path = snapshot_path(target, snapshot.fingerprint)
+    try:
+        snapshot.save(path)
+    except Exception as e:
+        target.log.warning("Failed to write layout snapshot %s: %s", path, e)
+        target.log.debug("", exc_info=e)
+    else:
+        target.log.debug("Wrote layout snapshot %s", path)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import dataclasses
 import errno
+import threading
+from collections import OrderedDict
 from ctypes import c_void_p
 from functools import lru_cache
 from typing import TYPE_CHECKING, BinaryIO
@@ -24,31 +27,149 @@ log = get_logger(__name__)
 CACHE_SIZE = 64 * 1024  # Tuned for ~0.7GB of memory usage on extFS
 
 
+@dataclasses.dataclass
+class MountStats:
+    """Statistics of the FUSE requests handled by a :class:`DissectMount`.
+
+    FUSE requests are handled concurrently, so the statistics are only updated through :meth:`add`.
+    """
+
+    reads: int = 0
+    read_hits: int = 0
+    bytes_requested: int = 0
+    bytes_read: int = 0
+    readdirs: int = 0
+    readdir_hits: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def add(self, **counts: int) -> None:
+        """Increment the given statistics."""
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+    def as_dict(self) -> dict[str, int]:
+        with self._lock:
+            return {field.name: getattr(self, field.name) for field in dataclasses.fields(self)}
+
+
+class ReadaheadFile:
+    """A file opened through FUSE that reads ahead when it's read sequentially.
+
+    FUSE splits reads in requests of at most 128 KiB. Every request that misses the buffer reads ``window`` bytes,
+    which doubles on every sequential request up to ``max_readahead`` bytes and resets on a random read.
+
+    Args:
+        fh: The file-like object to read from.
+        max_readahead: The maximum size of the readahead buffer.
+        io_lock: The lock that serializes all access to the underlying filesystem.
+        stats: The statistics to update.
+    """
+
+    def __init__(self, fh: BinaryIO, max_readahead: int, io_lock: threading.RLock, stats: MountStats):
+        self.fh = fh
+        self.max_readahead = max_readahead
+        self.io_lock = io_lock
+        self.stats = stats
+
+        self.window = 0
+        self.buf = b""
+        self.buf_offset = 0
+        self.eof = False
+        self.next_offset = None
+
+        self._lock = threading.Lock()
+
+    def read(self, size: int, offset: int) -> bytes:
+        with self._lock:
+            sequential = offset == self.next_offset
+            self.next_offset = offset + size
+
+            buf_end = self.buf_offset + len(self.buf)
+            if self.buf_offset <= offset and (offset + size <= buf_end or (self.eof and offset <= buf_end)):
+                self.stats.add(read_hits=1)
+                start = offset - self.buf_offset
+                return self.buf[start : start + size]
+
+            self.window = min(max(self.window * 2, size * 2), self.max_readahead) if sequential else size
+            read_size = max(size, self.window)
+
+            with self.io_lock:
+                self.fh.seek(offset)
+                data = self.fh.read(read_size)
+
+            self.stats.add(bytes_read=len(data))
+            self.buf = data
+            self.buf_offset = offset
+            self.eof = len(data) < read_size
+            return data[:size]
+
+    def close(self) -> None:
+        self.buf = b""
+        self.fh.close()
+
+
 class DissectMount(Operations):
-    def __init__(self, fs: Filesystem):
+    """FUSE operations to mount a dissect :class:`Filesystem`.
+
+    All access to the filesystem is serialized, as the underlying streams aren't thread-safe. When mounted with
+    multiple threads, requests that are served from the caches are handled concurrently.
+
+    Args:
+        fs: The filesystem to mount.
+        cache_size: The maximum number of entries and attributes to cache.
+        readahead: The maximum size of the readahead buffer of every open file, ``0`` disables readahead.
+        dir_cache_size: The maximum number of directory listings to cache, ``0`` disables the directory cache.
+    """
+
+    def __init__(self, fs: Filesystem, cache_size: int = CACHE_SIZE, readahead: int = 0, dir_cache_size: int = 0):
         self.fs = fs
-        self.file_handles: dict[int, BinaryIO] = {}
+        self.file_handles: dict[int, BinaryIO | ReadaheadFile] = {}
         self.dir_handles: dict[int, FilesystemEntry] = {}
 
-        self._get = lru_cache(CACHE_SIZE)(self._get)
-        self.getattr = lru_cache(CACHE_SIZE)(self.getattr)
+        self.readahead = readahead
+        self.dir_cache_size = dir_cache_size
+        self.stats = MountStats()
+
+        self._io_lock = threading.RLock()
+        self._dir_cache: OrderedDict[str, list[str]] = OrderedDict()
+        self._dir_cache_lock = threading.Lock()
+
+        self._get = lru_cache(cache_size)(self._get)
+        self.getattr = lru_cache(cache_size)(self.getattr)
 
     def _get(self, path: str) -> FilesystemEntry:
         try:
-            return self.fs.get(path)
+            with self._io_lock:
+                return self.fs.get(path)
         except Exception:
             raise FuseOSError(errno.ENOENT)
 
+    def get_stats(self) -> dict[str, int]:
+        """Return the statistics of this mount, including those of the entry and attribute caches."""
+        stats = self.stats.as_dict()
+        for name, func in (("entry", self._get), ("getattr", self.getattr)):
+            info = func.cache_info()
+            stats[f"{name}_hits"] = info.hits
+            stats[f"{name}_misses"] = info.misses
+        return stats
+
     def init(self, path: str, conn: fuse_conn_info_p | None = None, cfg: fuse_config_p | None = None) -> None:
         if cfg:
             # Enables the use of inodes in getattr
             cfg.contents.use_ino = 1
 
+    def destroy(self, path: str) -> None:
+        log.info("Mount statistics: %s", ", ".join(f"{key}={value}" for key, value in self.get_stats().items()))
+
     def getattr(self, path: str, fh: int | None = None) -> dict:
         fe = self._get(path)
 
         try:
-            st = fe.lstat()
+            with self._io_lock:
+                st = fe.lstat()
 
             return {
                 key: getattr(st, key)
@@ -76,10 +197,14 @@ class DissectMount(Operations):
         entry = self._get(path)
 
         try:
-            fh = entry.open()
+            with self._io_lock:
+                fh = entry.open()
         except Exception:
             raise FuseOSError(errno.ENOENT)
 
+        if self.readahead:
+            fh = ReadaheadFile(fh, self.readahead, self._io_lock, self.stats)
+
         fno = id(fh)
         self.file_handles[fno] = fh
         return fno
@@ -96,40 +221,72 @@ class DissectMount(Operations):
             raise FuseOSError(errno.EBADFD)
 
         fobj = self.file_handles[fh]
+        self.stats.add(reads=1, bytes_requested=size)
 
         try:
-            fobj.seek(offset)
-            return fobj.read(size)
+            if isinstance(fobj, ReadaheadFile):
+                return fobj.read(size, offset)
+
+            with self._io_lock:
+                fobj.seek(offset)
+                data = fobj.read(size)
         except Exception:
             log.exception("Exception in fuse::read")
             raise FuseOSError(errno.EIO)
 
+        self.stats.add(bytes_read=len(data))
+        return data
+
     def readdir(self, path: str, fh: int, flags: int = 0) -> Iterator[str]:
         if fh not in self.dir_handles:
             raise FuseOSError(errno.EBADFD)
 
         fobj = self.dir_handles[fh]
+        self.stats.add(readdirs=1)
 
         try:
             yield "."
             yield ".."
 
-            yield from fobj.iterdir()
+            yield from self._listdir(path, fobj)
         except Exception:
             log.exception("Exception in fuse::readdir")
             raise FuseOSError(errno.EIO)
 
+    def _listdir(self, path: str, entry: FilesystemEntry) -> list[str]:
+        if not self.dir_cache_size:
+            with self._io_lock:
+                return list(entry.iterdir())
+
+        with self._dir_cache_lock:
+            if (names := self._dir_cache.get(path)) is not None:
+                self._dir_cache.move_to_end(path)
+                self.stats.add(readdir_hits=1)
+                return names
+
+        with self._io_lock:
+            names = list(entry.iterdir())
+
+        with self._dir_cache_lock:
+            self._dir_cache[path] = names
+            while len(self._dir_cache) > self.dir_cache_size:
+                self._dir_cache.popitem(last=False)
+
+        return names
+
     def readlink(self, path: str) -> str:
         fe = self._get(path)
 
         try:
-            return fe.readlink()
+            with self._io_lock:
+                return fe.readlink()
         except Exception:
             raise FuseOSError(errno.EIO)
 
     def release(self, path: str, fh: int) -> int:
         if file := self.file_handles.get(fh):
-            file.close()
+            with self._io_lock:
+                file.close()
 
         del self.file_handles[fh]
         return 0
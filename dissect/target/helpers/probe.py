@@ -0,0 +1,134 @@
+"""Concurrent probing of disks and volumes.
+
+Identifying the volume systems, volumes and filesystems of a target takes many small reads, which are slow on
+high-latency backends such as network evidence. When ``PROBE_WORKERS`` is configured with a value larger than ``1``,
+the probes of different disks and volumes are run concurrently in a bounded thread pool with :func:`map_probes`.
+Probing is sequential by default.
+
+File-like objects are not thread-safe, so disks and volumes that (indirectly) read from the same container, stream
+or connection are never probed concurrently, but sequentially in the same thread. Shared streams are only recognized
+through the attributes in :data:`SOURCE_ATTRIBUTES`, so only enable concurrent probing for containers of which the
+streams are known to be independent. The disks of the remote and MQTT loaders share a single connection, so they are
+always probed sequentially.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from dissect.target.container import Container
+from dissect.target.volume import Volume
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from dissect.target.target import Target
+
+T = TypeVar("T")
+
+DEFAULT_PROBE_WORKERS = 1
+
+# The attributes through which containers and streams refer to the objects they read from, e.g. the file-like object
+# of a container, the connection of a remote stream, the file of a tar member or the filesystem of a path
+SOURCE_ATTRIBUTES = ("fh", "_fh", "fileobj", "raw", "stream", "_fs")
+
+
+def probe_workers(target: Target) -> int:
+    """Return the maximum number of probe threads of a target, configured with ``PROBE_WORKERS``.
+
+    Defaults to ``1``, which disables concurrent probing.
+    """
+    return max(1, int(getattr(target._config, "PROBE_WORKERS", DEFAULT_PROBE_WORKERS)))
+
+
+def stream_roots(obj: Any) -> set[int] | None:
+    """Return the identities of the containers a disk or volume reads from, and the streams they read from.
+
+    Containers provided by a loader can share an underlying stream or connection, e.g. the disks of a remote target
+    or the disks inside an OVA file. Every container is followed through the attributes in
+    :data:`SOURCE_ATTRIBUTES` to the objects it (indirectly) reads from, so containers that share one of them end up
+    in the same group.
+
+    Returns ``None`` if they can't be determined, e.g. for volumes that were added by a loader.
+    """
+    roots = set()
+
+    todo = [obj]
+    while todo:
+        obj = todo.pop()
+        if isinstance(obj, Container):
+            roots |= _sources(obj)
+        elif isinstance(obj, Volume) and obj.disk is not None:
+            todo.append(obj.disk)
+        elif isinstance(obj, (list, tuple)):
+            todo.extend(obj)
+        else:
+            return None
+
+    return roots or None
+
+
+def _sources(obj: Any) -> set[int]:
+    """Return the identities of ``obj`` and all objects it reads from through :data:`SOURCE_ATTRIBUTES`."""
+    sources = set()
+
+    todo = [obj]
+    while todo:
+        obj = todo.pop()
+        if obj is None or isinstance(obj, (str, bytes, int)) or id(obj) in sources:
+            continue
+
+        sources.add(id(obj))
+        todo.extend(getattr(obj, attr, None) for attr in SOURCE_ATTRIBUTES)
+
+    return sources
+
+
+def map_probes(func: Callable[[T], Any], items: Sequence[T], workers: int) -> list[Any]:
+    """Call ``func`` on all disks or volumes in ``items`` concurrently and return the results in the same order.
+
+    Items that read from the same containers or streams are grouped, and the items of a group are probed sequentially
+    in a single thread. Items of which the containers can't be determined are probed sequentially after all other
+    items.
+
+    Args:
+        func: The probe function to call on every item.
+        items: The disks or volumes to probe.
+        workers: The maximum number of threads to probe with.
+    """
+    results = [None] * len(items)
+
+    # Every group is a tuple of the identities of its containers and the indices of its items
+    groups: list[tuple[set[int], list[int]]] = []
+    sequential = []
+
+    for idx, item in enumerate(items):
+        if (roots := stream_roots(item)) is None:
+            sequential.append(idx)
+            continue
+
+        # Merge all groups that share a container with this item
+        indices = [idx]
+        for group in [group for group in groups if group[0] & roots]:
+            groups.remove(group)
+            roots |= group[0]
+            indices.extend(group[1])
+
+        groups.append((roots, sorted(indices)))
+
+    def probe(indices: list[int]) -> None:
+        for idx in indices:
+            results[idx] = func(items[idx])
+
+    if workers > 1 and len(groups) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(groups)), thread_name_prefix="probe") as pool:
+            # Raise the first exception, if any, after all probes are done
+            for future in [pool.submit(probe, indices) for _, indices in groups]:
+                future.result()
+    else:
+        for _, indices in groups:
+            probe(indices)
+
+    probe(sequential)
+    return results
@@ -0,0 +1,374 @@
+"""Profiling of the plugin execution path.
+
+When a :class:`Profiler` is enabled with :func:`enable`, the loading of targets and the execution of plugin functions
+is instrumented with :func:`phase` and :func:`iterate`. For every combination of target, phase and plugin the wall
+time, the number of calls and produced records, the number of bytes read from the underlying containers and,
+optionally, the peak traced memory are collected.
+
+When no profiler is enabled, the instrumentation is a no-op.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+try:
+    import resource
+
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from dissect.target.target import Target
+
+# The phases in the order they are executed, used to order the summary table
+PHASES = (
+    "import",
+    "map",
+    "disks",
+    "volumes",
+    "filesystems",
+    "os",
+    "detect",
+    "mount",
+    "init",
+    "check_compatible",
+    "execute",
+    "records",
+)
+
+SUMMARY_FIELDS = ("wall_time", "calls", "records", "bytes_read", "peak_memory")
+
+_NULL_CONTEXT = nullcontext()
+_MISSING = object()
+
+_profiler: Profiler | None = None
+
+
+@dataclasses.dataclass
+class PhaseStats:
+    calls: int = 0
+    wall_time: float = 0.0
+    records: int = 0
+    bytes_read: int = 0
+    peak_memory: int | None = None
+
+    def update(self, other: PhaseStats) -> None:
+        self.calls += other.calls
+        self.wall_time += other.wall_time
+        self.records += other.records
+        self.bytes_read += other.bytes_read
+        if other.peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, other.peak_memory)
+
+
+class Profiler:
+    """Collect the wall time, record counts, bytes read and peak memory of the phases of plugin execution.
+
+    Wall time, bytes read and peak memory are inclusive, e.g. the ``execute`` phase of a function includes the
+    ``check_compatible`` phase of the plugins that are loaded for it.
+
+    Args:
+        trace_memory: Trace the peak memory usage of every phase with :mod:`tracemalloc`, which slows down the
+                      execution considerably.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stats: dict[tuple[str, str, str], PhaseStats] = {}
+        self.bytes_read = 0
+
+        self._start = time.perf_counter()
+        self._wall_time = None
+        self._peaks: list[int] = []
+        self._tracked: list[tuple[BinaryIO, dict[str, Any]]] = []
+
+    def start(self) -> None:
+        self._start = time.perf_counter()
+        self._wall_time = None
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self) -> None:
+        self._wall_time = time.perf_counter() - self._start
+        self.untrack()
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @property
+    def wall_time(self) -> float:
+        """The total wall time since the profiler was started."""
+        if self._wall_time is not None:
+            return self._wall_time
+        return time.perf_counter() - self._start
+
+    def get_stats(self, name: str, target: Target | str | None = None, plugin: str | None = None) -> PhaseStats:
+        key = (_target_name(target), name, plugin or "")
+        if (stats := self.stats.get(key)) is None:
+            stats = self.stats[key] = PhaseStats()
+        return stats
+
+    def _enter(self) -> tuple[float, int]:
+        if self.trace_memory and tracemalloc.is_tracing():
+            # Account the peak so far to the enclosing phase, before measuring the peak of this one
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._peaks.append(0)
+
+        return time.perf_counter(), self.bytes_read
+
+    def _exit(self, stats: PhaseStats, start: float, bytes_read: int) -> None:
+        stats.wall_time += time.perf_counter() - start
+        stats.bytes_read += self.bytes_read - bytes_read
+
+        if self.trace_memory and self._peaks:
+            peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+            stats.peak_memory = max(stats.peak_memory or 0, peak)
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+
+    @contextmanager
+    def phase(self, name: str, target: Target | str | None = None, plugin: str | None = None) -> Iterator[PhaseStats]:
+        """Measure the execution of the enclosed block as a phase.
+
+        Args:
+            name: The name of the phase, e.g. ``map`` or ``check_compatible``.
+            target: The target the phase is executed for.
+            plugin: The plugin, function or loader the phase is executed for.
+        """
+        stats = self.get_stats(name, target, plugin)
+        stats.calls += 1
+
+        start, bytes_read = self._enter()
+        try:
+            yield stats
+        finally:
+            self._exit(stats, start, bytes_read)
+
+    def iterate(
+        self,
+        iterable: Iterable,
+        name: str,
+        target: Target | str | None = None,
+        plugin: str | None = None,
+        count: Callable[[Any], int] | None = None,
+    ) -> Iterator:
+        """Measure the time spent producing the items of ``iterable`` and count them as records.
+
+        Only the time spent in the iterable itself is measured, not the time spent by the consumer of the items.
+        Every item counts as a single record, unless ``count`` returns the number of records in an item.
+        """
+        stats = self.get_stats(name, target, plugin)
+        stats.calls += 1
+
+        it = iter(iterable)
+        while True:
+            start, bytes_read = self._enter()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                self._exit(stats, start, bytes_read)
+
+            stats.records += count(item) if count else 1
+            yield item
+
+    def track(self, fh: BinaryIO) -> None:
+        """Count the bytes that are read from ``fh``, usually a container, in :attr:`bytes_read`.
+
+        Both ``read`` and ``readinto`` are counted. The original methods are restored when the profiler is stopped.
+        """
+        if getattr(fh, "_profiler_tracked", False) or not hasattr(fh, "__dict__"):
+            # Some file-like objects (e.g. the ones implemented in C) don't allow overriding their methods
+            return
+
+        # Only count the outermost call, e.g. ``readinto`` of a stream may be implemented using ``read``
+        depth = 0
+        originals = {name: vars(fh).get(name, _MISSING) for name in ("read", "readinto")}
+
+        def counted(method: Callable, count: Callable[[Any], int]) -> Callable:
+            def wrapper(*args, **kwargs) -> Any:
+                nonlocal depth
+                depth += 1
+                try:
+                    result = method(*args, **kwargs)
+                finally:
+                    depth -= 1
+
+                if not depth and result is not None:
+                    self.bytes_read += count(result)
+                return result
+
+            return wrapper
+
+        if (read := getattr(fh, "read", None)) is not None:
+            fh.read = counted(read, len)
+        if (readinto := getattr(fh, "readinto", None)) is not None:
+            fh.readinto = counted(readinto, int)
+        fh._profiler_tracked = True
+
+        self._tracked.append((fh, originals))
+
+    def untrack(self) -> None:
+        """Restore the original methods of all file-like objects tracked with :meth:`track`."""
+        for fh, originals in self._tracked:
+            for name, method in originals.items():
+                if method is _MISSING:
+                    vars(fh).pop(name, None)
+                else:
+                    setattr(fh, name, method)
+            del fh._profiler_tracked
+
+        self._tracked = []
+
+    def merge(self, data: dict[str, Any]) -> None:
+        """Merge the phases of a profile from :meth:`as_dict`, e.g. from a worker process, into this profiler."""
+        for entry in data.get("phases", []):
+            stats = self.get_stats(entry["phase"], entry["target"], entry["plugin"])
+            stats.update(PhaseStats(**{field: entry[field] for field in SUMMARY_FIELDS}))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "wall_time": self.wall_time,
+            "peak_rss": peak_rss(),
+            "trace_memory": self.trace_memory,
+            "phases": [
+                {"target": target, "phase": name, "plugin": plugin, **dataclasses.asdict(stats)}
+                for (target, name, plugin), stats in sorted(self.stats.items(), key=_sort_key)
+            ],
+        }
+
+    def format_summary(self, limit: int | None = 25) -> str:
+        """Format a summary table of the phases of all targets, ordered by wall time.
+
+        Args:
+            limit: The maximum number of rows of the table.
+        """
+        totals: dict[tuple[str, str], PhaseStats] = {}
+        for (_, name, plugin), stats in self.stats.items():
+            totals.setdefault((name, plugin), PhaseStats()).update(stats)
+
+        rows = sorted(totals.items(), key=lambda item: item[1].wall_time, reverse=True)
+        if limit is not None:
+            rows = rows[:limit]
+
+        table = [("phase", "plugin", "wall time", "calls", "records", "bytes read", "peak memory")]
+        for (name, plugin), stats in rows:
+            table.append(
+                (
+                    name,
+                    plugin or "-",
+                    f"{stats.wall_time:.3f}s",
+                    str(stats.calls),
+                    str(stats.records),
+                    _format_size(stats.bytes_read),
+                    _format_size(stats.peak_memory) if stats.peak_memory is not None else "-",
+                )
+            )
+
+        widths = [max(len(row[idx]) for row in table) for idx in range(len(table[0]))]
+        lines = [
+            "  ".join(
+                value.ljust(width) if idx < 2 else value.rjust(width)
+                for idx, (value, width) in enumerate(zip(row, widths, strict=True))
+            )
+            for row in table
+        ]
+        lines.insert(1, "  ".join("-" * width for width in widths))
+
+        total = f"total wall time {self.wall_time:.3f}s"
+        if (rss := peak_rss()) is not None:
+            total += f", peak rss {_format_size(rss)}"
+        lines.append(total)
+
+        return "\n".join(lines)
+
+
+def _target_name(target: Target | str | None) -> str:
+    if target is None:
+        return "-"
+    if isinstance(target, str):
+        return target
+    # The name of a target may execute plugins, so use the path instead
+    return str(target.path) if target.path is not None else repr(target)
+
+
+def _sort_key(item: tuple[tuple[str, str, str], PhaseStats]) -> tuple:
+    (target, name, plugin), _ = item
+    return (target, PHASES.index(name) if name in PHASES else len(PHASES), name, plugin)
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "K", "M", "G"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}T"
+
+
+def peak_rss() -> int | None:
+    """Return the peak resident set size of the current process in bytes, if it can be determined."""
+    if not HAS_RESOURCE:
+        return None
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports the peak in kilobytes, macOS in bytes
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def enable(trace_memory: bool = False) -> Profiler:
+    """Enable and start a new global profiler."""
+    global _profiler
+    _profiler = Profiler(trace_memory=trace_memory)
+    _profiler.start()
+    return _profiler
+
+
+def disable() -> Profiler | None:
+    """Stop and disable the global profiler, if any, and return it."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def get_profiler() -> Profiler | None:
+    """Return the global profiler, if enabled."""
+    return _profiler
+
+
+def phase(name: str, target: Target | str | None = None, plugin: str | None = None) -> Any:
+    """Measure the enclosed block as a phase of the global profiler, see :meth:`Profiler.phase`."""
+    if _profiler is None:
+        return _NULL_CONTEXT
+    return _profiler.phase(name, target, plugin)
+
+
+def iterate(
+    iterable: Iterable,
+    name: str,
+    target: Target | str | None = None,
+    plugin: str | None = None,
+    count: Callable[[Any], int] | None = None,
+) -> Iterable:
+    """Measure the production of the items of ``iterable`` with the global profiler, see :meth:`Profiler.iterate`."""
+    if _profiler is None:
+        return iterable
+    return _profiler.iterate(iterable, name, target, plugin, count)
+
+
+def track(fh: BinaryIO) -> None:
+    """Count the bytes read from ``fh`` with the global profiler, see :meth:`Profiler.track`."""
+    if _profiler is not None:
+        _profiler.track(fh)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import random
-from typing import TYPE_CHECKING
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
 
 from flow.record import RecordDescriptor
-from flow.record.base import Record, parse_def
+from flow.record.base import RECORD_VERSION, Record, parse_def
 
 from dissect.target.helpers.descriptor_extensions import (
     RecordDescriptorExtensionBase,
@@ -12,7 +13,10 @@ from dissect.target.helpers.descriptor_extensions import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Iterator, Sequence
+
+# Default number of rows in a RecordBatch
+RECORD_BATCH_SIZE = 1024
 
 
 class ExtendableRecordDescriptor(RecordDescriptor):
@@ -112,6 +116,143 @@ def DynamicDescriptor(types: Sequence[str]) -> RecordDescriptor:
     return RecordDescriptor(name, [(t, t) for t in types])
 
 
+class RecordBatch:
+    """A batch of records of a single descriptor, stored as columns of values.
+
+    High-volume plugins can produce batches instead of single records, so the default fields of a
+    :class:`TargetRecordDescriptor` are filled once per batch instead of once per record. Writers that support
+    batches, such as the Parquet writer of ``target-query``, write the columns directly without creating a record
+    for every row. Iterating a batch yields its rows as records.
+
+    Args:
+        descriptor: The record descriptor of the rows.
+        columns: The values of every row, by field name. All columns must have the same length.
+        **kwargs: Values for the input fields of the descriptor, like ``_target``, that apply to all rows.
+    """
+
+    def __init__(self, descriptor: RecordDescriptor, columns: dict[str, list[Any]], **kwargs):
+        if len({len(values) for values in columns.values()}) > 1:
+            raise ValueError("All columns of a record batch must have the same length")
+
+        self.descriptor = descriptor
+        self.columns = columns
+        self.num_rows = len(next(iter(columns.values()), []))
+
+        if isinstance(descriptor, ExtendableRecordDescriptor):
+            for filler in descriptor.field_fillers:
+                kwargs = filler(descriptor, kwargs)
+
+            for input_field in descriptor.input_fields:
+                kwargs.pop(input_field, None)
+
+        # The values of the default fields are the same for all rows
+        self.defaults = kwargs
+        self.generated = datetime.now(timezone.utc)
+
+    def __repr__(self) -> str:
+        return f"<RecordBatch descriptor={self.descriptor.name} rows={self.num_rows}>"
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __iter__(self) -> Iterator[Record]:
+        record_type = self.descriptor.recordType
+        names = list(self.columns)
+        for values in zip(*self.columns.values(), strict=True):
+            yield record_type(**self.defaults, **dict(zip(names, values, strict=True)))
+
+    def column(self, name: str) -> list[Any]:
+        """Return the values of a field for all rows, converted to the field type like a record would."""
+        if name == "_generated":
+            return [self.generated] * self.num_rows
+
+        if name == "_version":
+            return [RECORD_VERSION] * self.num_rows
+
+        if name in self.columns:
+            values = self.columns[name]
+        elif name in self.defaults:
+            values = [self.defaults[name]] * self.num_rows
+        else:
+            return [None] * self.num_rows
+
+        if (field_type := self.descriptor.recordType._field_types.get(name)) is None:
+            return list(values)
+        return [value if value is None or isinstance(value, field_type) else field_type(value) for value in values]
+
+
+class BatchedRecords:
+    """The result of a plugin function that produces :class:`RecordBatch` objects.
+
+    Iterating this result yields single records, so callers that expect records don't notice the batching. Writers
+    that support batches can consume the batches directly with :meth:`batches`.
+
+    Args:
+        batches: An iterable of record batches, which may also contain single records.
+    """
+
+    def __init__(self, batches: Iterable[RecordBatch | Record]):
+        self._batches = batches
+        self._iter = None
+
+    def __iter__(self) -> Iterator[Record]:
+        return self
+
+    def __next__(self) -> Record:
+        if self._iter is None:
+            self._iter = self._records()
+        return next(self._iter)
+
+    def _records(self) -> Iterator[Record]:
+        for item in self._batches:
+            if isinstance(item, RecordBatch):
+                yield from item
+            else:
+                yield item
+
+    def batches(self) -> Iterator[RecordBatch | Record]:
+        """Return the batches of this result, which can't be iterated as records anymore afterwards."""
+        if self._iter is not None:
+            raise ValueError("Can't consume batches after the records have been iterated")
+
+        self._iter = iter(())
+        return iter(self._batches)
+
+
+def batched(
+    descriptor: RecordDescriptor, rows: Iterable[dict[str, Any]], size: int = RECORD_BATCH_SIZE, **kwargs
+) -> Iterator[RecordBatch]:
+    """Collect rows of field values into :class:`RecordBatch` objects of at most ``size`` rows.
+
+    The columns of a batch are the union of the fields of its rows, fields that are missing from a row are ``None``.
+
+    Args:
+        descriptor: The record descriptor of the rows.
+        rows: The field values of every row.
+        size: The maximum number of rows of a batch.
+        **kwargs: Values for the input fields of the descriptor, like ``_target``, that apply to all rows.
+    """
+    columns = {}
+    num_rows = 0
+
+    for row in rows:
+        for name in row:
+            if name not in columns:
+                columns[name] = [None] * num_rows
+
+        for name, values in columns.items():
+            values.append(row.get(name))
+
+        num_rows += 1
+        if num_rows >= size:
+            yield RecordBatch(descriptor, columns, **kwargs)
+            columns = {}
+            num_rows = 0
+
+    if num_rows:
+        yield RecordBatch(descriptor, columns, **kwargs)
+
+
 ChildTargetRecord = TargetRecordDescriptor(
     "target/child",
     [
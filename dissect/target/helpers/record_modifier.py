@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import logging
+import threading
+from collections import OrderedDict
 from collections.abc import Callable
-from functools import partial
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial, update_wrapper
+from itertools import islice
+from typing import TYPE_CHECKING, BinaryIO
 
 from flow.record import GroupedRecord, Record, RecordDescriptor, fieldtypes
 
 from dissect.target.exceptions import FileNotFoundError, FilesystemError
+from dissect.target.filesystem import LayerFilesystemEntry
 from dissect.target.helpers.hashutil import common
 from dissect.target.helpers.utils import StrEnum
 from dissect.target.target import Target
@@ -15,14 +20,24 @@ from dissect.target.target import Target
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator
 
+    from dissect.target.filesystem import FilesystemEntry
     from dissect.target.helpers.fsutil import TargetPath
 
-__all__ = ("Modifier", "ModifierFunc", "get_modifier_function")
+__all__ = ("FileHasher", "Modifier", "ModifierFunc", "get_modifier_function", "modify_records")
 
 RECORD_NAME = "filesystem/file/digest"
 NAME_SUFFIXES = ["_resolved", "_digest"]
 RECORD_TYPES = ["path", "digest"]
 
+# Max. number of file digests that are kept by a FileHasher
+DIGEST_CACHE_SIZE = 16384
+
+# Number of threads that hash the distinct files of a window of records concurrently
+HASH_WORKERS = 4
+
+# Number of records of which the files are hashed together
+HASH_WINDOW = 16
+
 ModifierFunc = Callable[[Target, Record], GroupedRecord]
 
 
@@ -41,22 +56,145 @@ def _create_modified_record(
         record_kwargs.update({extended_field_name: data})
         record_def.append((type, extended_field_name))
 
-    _record = RecordDescriptor(record_name, record_def)
+    _record = _create_descriptor(record_name, tuple(record_def))
     return _record(**record_kwargs)
 
 
+@lru_cache(4096)
+def _create_descriptor(record_name: str, record_def: tuple[tuple[str, str], ...]) -> RecordDescriptor:
+    return RecordDescriptor(record_name, list(record_def))
+
+
+class FileHasher:
+    """Computes the digests of files, reading every distinct file only once.
+
+    Files are identified by their filesystem, inode, size and modification time, so the digest of a file that is
+    referenced by many records is computed once. Files that can't be identified are hashed every time.
+
+    The files of a window of records can be hashed concurrently with :meth:`prefetch`. The filesystems of a target
+    aren't thread-safe, so the threads take turns reading from the target while the digests are computed
+    concurrently. The caller must not access the target while prefetching.
+
+    Args:
+        workers: The number of threads that hash files concurrently, ``0`` disables concurrent hashing.
+        cache_size: The maximum number of digests to keep.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, cache_size: int = DIGEST_CACHE_SIZE):
+        self.workers = workers
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+
+        self._cache: OrderedDict[tuple, tuple[str, str, str]] = OrderedDict()
+        self._io_lock = threading.RLock()
+        self._cache_lock = threading.Lock()
+
+    def digest(self, path: TargetPath) -> tuple[str, str, str]:
+        """Return the MD5, SHA1 and SHA256 digests of the file at ``path``.
+
+        Raises:
+            FileNotFoundError: If ``path`` does not exist or is not a file.
+        """
+        with self._io_lock:
+            if not path.exists() or not path.is_file():
+                raise FileNotFoundError(f"Path not found or is not a file: '{path}'")
+
+            key = _file_key(path)
+
+        with self._cache_lock:
+            if key is not None and (digest := self._cache.get(key)) is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return digest
+            self.misses += 1
+
+        with self._io_lock:
+            fh = path.open()
+
+        with fh:
+            digest = common(_LockedReader(fh, self._io_lock))
+
+        if key is not None:
+            with self._cache_lock:
+                self._cache[key] = digest
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return digest
+
+    def prefetch(self, paths: Iterable[TargetPath]) -> None:
+        """Hash the distinct files of ``paths`` that haven't been hashed yet, concurrently."""
+        if self.workers < 2:
+            return
+
+        pending = {}
+        for path in paths:
+            with self._io_lock:
+                key = _file_key(path)
+
+            if key is not None and key not in self._cache and key not in pending:
+                pending[key] = path
+
+        if len(pending) < 2:
+            return
+
+        with ThreadPoolExecutor(min(self.workers, len(pending))) as executor:
+            # Errors are raised again when the digest of the file is requested
+            for future in [executor.submit(self.digest, path) for path in pending.values()]:
+                future.exception()
+
+
+class _LockedReader:
+    """Reads from a file while holding a lock, so multiple files of a target can be read from multiple threads."""
+
+    def __init__(self, fh: BinaryIO, lock: threading.RLock):
+        self.fh = fh
+        self.lock = lock
+
+    def read(self, n: int = -1) -> bytes:
+        with self.lock:
+            return self.fh.read(n)
+
+
+def _file_key(path: TargetPath) -> tuple | None:
+    try:
+        entry = path.get()._resolve()
+        st = entry.stat()
+    except Exception:
+        return None
+
+    # Entries without an inode, or without a size and modification time, can't be told apart from other versions
+    if not st.st_ino or not (st.st_size or st.st_mtime):
+        return None
+
+    return (_entry_filesystems(entry), st.st_ino, st.st_size, st.st_mtime)
+
+
+def _entry_filesystems(entry: FilesystemEntry) -> tuple[int, ...]:
+    """Return the identities of the filesystems an entry is read from.
+
+    Entries of layered filesystems, like the root filesystem of a target, all belong to the layered filesystem
+    itself, so the filesystems of the underlying entries are used instead.
+    """
+    if not isinstance(entry, LayerFilesystemEntry):
+        return (id(entry.fs),)
+    return tuple(fs_id for sub_entry in entry.entries for fs_id in _entry_filesystems(sub_entry))
+
+
 def _resolve_path_records(field_name: str, resolved_path: TargetPath) -> Record:
     """Resolve files from path fields inside the record."""
     type_info = [("path", "_resolved", resolved_path)]
     return _create_modified_record("filesystem/file/resolved", field_name, type_info)
 
 
-def _hash_path_records(field_name: str, resolved_path: TargetPath) -> Record:
+def _hash_path_records(field_name: str, resolved_path: TargetPath, hasher: FileHasher | None = None) -> Record:
     """Hash files from path fields inside the record.
 
     Args:
         field_name: Name of the field.
         resolved_path: Path to the file we should hash.
+        hasher: The :class:`FileHasher` that keeps the digests of files that were hashed before.
 
     Raises:
         FileNotFoundError: Raised if the provided ``resolved_path`` does not exist or is not a file on the target.
@@ -64,12 +202,15 @@ def _hash_path_records(field_name: str, resolved_path: TargetPath) -> Record:
     Returns:
         Modified record with digests of path field types.
     """
+    if hasher is not None:
+        path_hash = hasher.digest(resolved_path)
 
-    if not resolved_path.exists() or not resolved_path.is_file():
-        raise FileNotFoundError(f"Path not found or is not a file: '{resolved_path}'")
+    else:
+        if not resolved_path.exists() or not resolved_path.is_file():
+            raise FileNotFoundError(f"Path not found or is not a file: '{resolved_path}'")
 
-    with resolved_path.open() as fh:
-        path_hash = common(fh)
+        with resolved_path.open() as fh:
+            path_hash = common(fh)
 
     type_info = zip(RECORD_TYPES, NAME_SUFFIXES, [resolved_path, path_hash], strict=False)
 
@@ -97,10 +238,18 @@ def _resolve_path_types(target: Target, record: Record) -> Iterator[tuple[str, T
         yield field_name, target.resolve(str(path))
 
 
-def modify_record(target: Target, record: Record, modifier_function: ModifierFunc) -> GroupedRecord:
+def modify_record(
+    target: Target,
+    record: Record,
+    modifier_function: ModifierFunc,
+    resolved_paths: list[tuple[str, TargetPath]] | None = None,
+) -> GroupedRecord:
     additional_records = []
 
-    for field_name, resolved_path in _resolve_path_types(target, record):
+    if resolved_paths is None:
+        resolved_paths = _resolve_path_types(target, record)
+
+    for field_name, resolved_path in resolved_paths:
         try:
             _record = modifier_function(field_name, resolved_path)
         except FilesystemError as e:  # noqa: PERF203
@@ -129,6 +278,35 @@ def _noop(_target: Target, record: Record) -> Record:
 
 def get_modifier_function(modifier_type: Modifier) -> ModifierFunc:
     if func := MODIFIER_MAPPING.get(modifier_type):
+        if modifier_type == Modifier.HASH:
+            # Every modifier function keeps the digests of the files it hashed
+            hasher = FileHasher()
+            func = update_wrapper(partial(func, hasher=hasher), func)
+            modifier = partial(modify_record, modifier_function=func)
+            modifier.hasher = hasher
+            return modifier
+
         return partial(modify_record, modifier_function=func)
 
     return _noop
+
+
+def modify_records(target: Target, records: Iterable[Record], modifier_func: ModifierFunc) -> Iterator[Record]:
+    """Modify ``records`` with ``modifier_func``, in order.
+
+    For the hash modifier, the distinct files of a window of records are hashed concurrently before the records of
+    the window are modified. The window is small, so modified records are produced soon after the records they
+    originate from.
+    """
+    if (hasher := getattr(modifier_func, "hasher", None)) is None or hasher.workers < 2:
+        for record in records:
+            yield modifier_func(target, record)
+        return
+
+    records = iter(records)
+    while window := list(islice(records, HASH_WINDOW)):
+        resolved = [list(_resolve_path_types(target, record)) for record in window]
+        hasher.prefetch(resolved_path for paths in resolved for _, resolved_path in paths)
+
+        for record, resolved_paths in zip(window, resolved, strict=True):
+            yield modifier_func(target, record, resolved_paths=resolved_paths)
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import heapq
 import io
 import re
 import string
+from operator import itemgetter
 from typing import TYPE_CHECKING, BinaryIO
 
+try:
+    import ahocorasick
+
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
 if TYPE_CHECKING:
     import logging
     from collections.abc import Callable, Iterator
@@ -14,10 +23,110 @@ if TYPE_CHECKING:
 
 Needle = bytes | re.Pattern
 
+# The amount of bytes needles from which an Aho-Corasick automaton is used instead of searching for every needle
+# individually, if available
+AUTOMATON_THRESHOLD = 32
+
+
+class NeedleSet:
+    """A precompiled set of needles that can be searched for in a buffer.
+
+    Searching for a needle set yields the same results as searching for every needle individually, but every needle
+    is only searched for again once its previous hit has been consumed. If ``pyahocorasick`` is installed and there are
+    enough bytes needles, all bytes needles are found in a single pass over the buffer using an Aho-Corasick automaton.
+    Regular expression needles are always searched for individually.
+
+    Args:
+        needles: The needle or list of needles to search for.
+        ignore_case: Whether to match bytes needles case insensitively (ASCII only).
+    """
+
+    def __init__(self, needles: Needle | list[Needle], *, ignore_case: bool = False):
+        if not isinstance(needles, list):
+            needles = [needles]
+
+        if not needles:
+            raise ValueError("At least one needle value must be provided")
+
+        self.needles = needles
+        self.ignore_case = ignore_case
+        self.max_len = max(len(n.pattern if isinstance(n, re.Pattern) else n) for n in needles)
+
+        self._patterns: list[re.Pattern] = []
+        # Maps the bytes that are searched for to the original needle
+        self._literals: dict[bytes, bytes] = {}
+
+        for needle in needles:
+            if isinstance(needle, re.Pattern):
+                self._patterns.append(needle)
+            else:
+                self._literals.setdefault(needle.lower() if ignore_case else needle, needle)
+
+        self._automaton = None
+        if HAS_AHOCORASICK and len(self._literals) >= AUTOMATON_THRESHOLD:
+            self._automaton = ahocorasick.Automaton()
+            for key in self._literals:
+                self._automaton.add_word(key.decode("latin-1"), key)
+            self._automaton.make_automaton()
+
+    def __len__(self) -> int:
+        return len(self.needles)
+
+    def search(self, buf: bytes, pos: int = 0) -> Iterator[tuple[int, Needle, re.Match | None]]:
+        """Yields offsets, needles and optional regex match found in ``buf``, ordered by offset.
+
+        Only a single needle is yielded per offset. If multiple bytes needles match at the same offset, the shortest
+        one is yielded.
+
+        Args:
+            buf: The buffer to search in.
+            pos: The offset in ``buf`` to start searching from.
+        """
+        iterators = [self._search_pattern(pattern, buf, pos) for pattern in self._patterns]
+
+        if self._literals:
+            literal_buf = buf.lower() if self.ignore_case else buf
+            if self._automaton is not None:
+                iterators.insert(0, self._search_automaton(literal_buf, pos))
+            else:
+                iterators.insert(0, self._search_literals(literal_buf, pos))
+
+        last_offset = -1
+        for offset, needle, match in heapq.merge(*iterators, key=itemgetter(0)):
+            if offset == last_offset:
+                continue
+
+            yield offset, needle, match
+            last_offset = offset
+
+    def _search_literals(self, buf: bytes, pos: int) -> Iterator[tuple[int, bytes, None]]:
+        heap = [(offset, key) for key in self._literals if (offset := buf.find(key, pos)) != -1]
+        heapq.heapify(heap)
+
+        while heap:
+            offset, key = heap[0]
+            yield offset, self._literals[key], None
+
+            if (next_offset := buf.find(key, offset + 1)) != -1:
+                heapq.heapreplace(heap, (next_offset, key))
+            else:
+                heapq.heappop(heap)
+
+    def _search_automaton(self, buf: bytes, pos: int) -> Iterator[tuple[int, bytes, None]]:
+        # The automaton yields hits ordered by their end offset, so sort them by their start offset
+        hits = sorted((end - len(key) + 1, key) for end, key in self._automaton.iter(buf.decode("latin-1"), pos))
+        for offset, key in hits:
+            yield offset, self._literals[key], None
+
+    def _search_pattern(self, pattern: re.Pattern, buf: bytes, pos: int) -> Iterator[tuple[int, re.Pattern, re.Match]]:
+        while match := pattern.search(buf, pos):
+            yield match.start(0), pattern, match
+            pos = match.start(0) + 1
+
 
 def find_needles(
     fh: BinaryIO,
-    needles: Needle | list[Needle],
+    needles: Needle | list[Needle] | NeedleSet,
     *,
     start: int | None = None,
     end: int | None = None,
@@ -29,7 +138,7 @@ def find_needles(
 
     Args:
         fh: The byte stream to search for needles.
-        needles: The list of bytes needles to search for.
+        needles: The needle, list of needles or precompiled :class:`NeedleSet` to search for.
         start: The offset to start searching from.
         end: The offset to stop searching at.
         lock_seek: Whether the file position is maintained by the scraper or the consumer.
@@ -38,16 +147,13 @@ def find_needles(
         progress: A function to call with the current offset.
     """
 
-    if not isinstance(needles, list):
-        needles = [needles]
-
-    if not needles:
-        raise ValueError("At least one needle value must be provided")
+    if not isinstance(needles, NeedleSet):
+        needles = NeedleSet(needles)
 
     if start is not None and end is not None and start >= end:
         raise ValueError("Start offset must be less than end offset")
 
-    max_needle_len = max(len(n.pattern if isinstance(n, re.Pattern) else n) for n in needles)
+    max_needle_len = needles.max_len
     overlap_len = max_needle_len
 
     offset = fh.tell() if start is None else start
@@ -70,29 +176,11 @@ def find_needles(
         current_block = overlap + next_block
         current_block_offset = offset - len(overlap)
 
-        # Look for a needle in a current block
-        last_needle_pos = -1
+        # Look for needles in the current block
         last_needle_end = 0
-        while True:
-            needle_positions = []
-
-            for needle in needles:
-                match = None
-                if (
-                    pos := (match.start(0) if (match := needle.search(current_block, last_needle_pos + 1)) else -1)
-                    if isinstance(needle, re.Pattern)
-                    else current_block.find(needle, last_needle_pos + 1)
-                ) > -1:
-                    needle_positions.append((pos, needle, match))
-
-            if not needle_positions:
-                break
-
-            closest_needle_pos, closest_needle, match = min(needle_positions)
-            yield closest_needle, current_block_offset + closest_needle_pos, match
-
-            last_needle_pos = closest_needle_pos
-            last_needle_end = last_needle_pos + 1
+        for needle_pos, needle, match in needles.search(current_block):
+            yield needle, current_block_offset + needle_pos, match
+            last_needle_end = needle_pos + 1
 
         # The size of the data from the current block that will be prepended to the next block
         overlap_len = min(len(current_block) - last_needle_end, max_needle_len)
@@ -125,7 +213,7 @@ def find_needle_chunks(
     """
     chunk_reader = chunk_reader or _read_plain_chunk
 
-    needles = list(needle_chunk_size_map.keys())
+    needles = NeedleSet(list(needle_chunk_size_map.keys()))
     for needle, offset, match in find_needles(fh, needles, lock_seek=lock_seek, block_size=block_size):
         yield (needle, offset, chunk_reader(fh, needle, offset, needle_chunk_size_map[needle]), match)
 
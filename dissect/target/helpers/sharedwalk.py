@@ -0,0 +1,166 @@
+"""Shared filesystem walks.
+
+Functions such as ``walkfs``, ``suid_binaries``, ``capability_binaries`` and ``yara`` all recursively walk the
+filesystem of a target. When several of them are executed together, walking the filesystem for every function reads
+the same directories and inodes multiple times, which is slow on large or remote evidence.
+
+These functions return a :class:`WalkResult` with a :class:`WalkConsumer` that turns filesystem entries into records.
+Iterating a single result walks the filesystem for that consumer alone, while :func:`merge` combines the results of
+multiple functions into a single walk per path that dispatches every entry to all consumers.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from dissect.target.helpers import fsutil
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from flow.record import Record
+
+    from dissect.target.filesystem import FilesystemEntry
+    from dissect.target.target import Target
+
+
+class WalkConsumer:
+    """Turns the entries of a filesystem walk into records.
+
+    Args:
+        target: The target to walk.
+        path: The path to recursively walk.
+    """
+
+    def __init__(self, target: Target, path: str = "/"):
+        self.target = target
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} path={self.path}>"
+
+    @property
+    def walk_path(self) -> str:
+        """The normalized path to walk, consumers with the same walk path share a walk."""
+        path = fsutil.normalize(self.path, alt_separator=self.target.fs.alt_separator)
+        return "/" + path.strip("/")
+
+    def start(self) -> bool:
+        """Prepare the consumer before the walk starts, returns ``False`` if this consumer can't run."""
+        return True
+
+    def consume(self, entry: FilesystemEntry) -> Iterator[Record]:
+        """Return the records of a single entry of the walk."""
+        raise NotImplementedError
+
+    def finish(self) -> Iterator[Record]:
+        """Return any remaining records after the walk has finished."""
+        return iter(())
+
+
+class WalkResult:
+    """The records of a :class:`WalkConsumer`, produced by walking the filesystem once this result is iterated.
+
+    Args:
+        consumer: The consumer to produce the records with.
+    """
+
+    def __init__(self, consumer: WalkConsumer):
+        self.consumer = consumer
+        self._iter = None
+
+    def __repr__(self) -> str:
+        return f"<WalkResult consumer={self.consumer}>"
+
+    def __iter__(self) -> Iterator[Record]:
+        return self
+
+    def __next__(self) -> Record:
+        if self._iter is None:
+            self._iter = walk(self.consumer.target, [self.consumer])
+        return next(self._iter)
+
+    @property
+    def started(self) -> bool:
+        return self._iter is not None
+
+
+def merge(results: Iterable[WalkResult]) -> Iterator[Record]:
+    """Produce the records of multiple walk results with a single walk per path.
+
+    The records of the consumers are interleaved in the order of the walk. The results can't be iterated anymore
+    after merging them.
+    """
+    consumers = []
+    for result in results:
+        if result.started:
+            raise ValueError(f"Can't merge {result} after it has been iterated")
+        # Iterating the result from here on will produce nothing, its records are produced by the merged walk
+        result._iter = iter(())
+        consumers.append(result.consumer)
+
+    if not consumers:
+        return iter(())
+
+    return walk(consumers[0].target, consumers)
+
+
+def walk(target: Target, consumers: list[WalkConsumer]) -> Iterator[Record]:
+    """Walk the filesystem of ``target`` once per distinct walk path and dispatch every entry to ``consumers``.
+
+    An exception raised by a consumer for an entry is logged and doesn't affect the other consumers.
+    """
+    paths: dict[str, list[WalkConsumer]] = {}
+    for consumer in consumers:
+        if consumer.start():
+            paths.setdefault(consumer.walk_path, []).append(consumer)
+
+    for path, path_consumers in paths.items():
+        try:
+            root = target.fs.get(path)
+        except Exception as e:
+            target.log.error("Unable to walk %s: %s", path, e)  # noqa: TRY400
+            target.log.debug("", exc_info=e)
+            continue
+
+        for entry in _recurse(target, root):
+            for consumer in path_consumers:
+                try:
+                    yield from consumer.consume(entry)
+                except Exception as e:  # noqa: PERF203
+                    target.log.warning("Exception in %s for %s: %s", consumer, entry, e)
+                    target.log.debug("", exc_info=e)
+
+    for path_consumers in paths.values():
+        for consumer in path_consumers:
+            yield from consumer.finish()
+
+
+def _recurse(target: Target, entry: FilesystemEntry) -> Iterator[FilesystemEntry]:
+    """Recursively walk ``entry`` like :func:`~dissect.target.helpers.fsutil.recurse`, skipping unreadable
+    directories instead of aborting the walk.
+    """
+    yield entry
+
+    try:
+        if not entry.is_dir():
+            return
+
+        children = [(direntry.is_dir(follow_symlinks=False), direntry) for direntry in entry.scandir()]
+    except Exception as e:
+        target.log.warning("Unable to list directory %s: %s", entry, e)
+        target.log.debug("", exc_info=e)
+        return
+
+    for is_dir, direntry in children:
+        try:
+            child = direntry.get()
+        except Exception as e:
+            target.log.warning("Unable to open %s: %s", direntry, e)
+            target.log.debug("", exc_info=e)
+            continue
+
+        if is_dir:
+            yield from _recurse(target, child)
+        else:
+            yield child
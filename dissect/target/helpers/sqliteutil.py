@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from dissect.database.sqlite3.c_sqlite3 import c_sqlite3
+from dissect.database.sqlite3.sqlite3 import Row
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from dissect.database.sqlite3.sqlite3 import Index, Page, SQLite3, Table
+
+# Default number of rows a RowLookup keeps cached
+ROW_CACHE_SIZE = 4096
+
+
+class RowLookup:
+    """Look up rows of a SQLite3 table by their rowid, without reading the whole table.
+
+    Every lookup descends the B-tree of the table, so joining a large table to another table only reads the pages
+    of the rows that are needed. The most recently used rows are kept in a bounded cache, since joined rows are
+    often looked up repeatedly. For tables with an ``INTEGER PRIMARY KEY`` column, that column is the rowid.
+
+    Args:
+        table: The table to look up rows in.
+        cache_size: The maximum number of rows to keep cached.
+    """
+
+    def __init__(self, table: Table, cache_size: int = ROW_CACHE_SIZE):
+        self.table = table
+        self.get = lru_cache(cache_size)(self.get)
+
+    def __repr__(self) -> str:
+        return f"<RowLookup table={self.table.name}>"
+
+    def get(self, rowid: int | None) -> Row | None:
+        """Return the row with the given rowid, or ``None`` if the table doesn't contain it."""
+        if rowid is None:
+            return None
+
+        sqlite = self.table.sqlite
+        page = sqlite.page(self.table.page)
+
+        # The key of a cell in an interior page is the largest rowid in the subtree left of it
+        while page.header.flags == c_sqlite3.PAGE_TYPE_INTERIOR_TABLE:
+            idx = _bisect_key(page, rowid)
+            page = sqlite.page(page.cell(idx).left_page if idx < page.header.cell_count else page.right_page)
+
+        if page.header.flags != c_sqlite3.PAGE_TYPE_LEAF_TABLE:
+            return None
+
+        idx = _bisect_key(page, rowid)
+        if idx < page.header.cell_count and (cell := page.cell(idx)).key == rowid:
+            return Row(self.table, cell)
+
+        return None
+
+
+def _bisect_key(page: Page, rowid: int) -> int:
+    """Return the index of the first cell of a table page with a key equal to or larger than ``rowid``."""
+    lo, hi = 0, page.header.cell_count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if page.cell(mid).key < rowid:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def index_entries(sqlite: SQLite3, index: Index) -> Iterator[list[Any]]:
+    """Yield the entries of a SQLite3 index in the order of the index.
+
+    Every entry is a list of the values of the indexed columns, followed by the rowid of the row. Since the entries
+    are sorted, the rows of two tables can be joined on the indexed columns by walking both at the same time,
+    without keeping either table in memory.
+    """
+    yield from _walk_index(sqlite, sqlite.page(index.page))
+
+
+def _walk_index(sqlite: SQLite3, page: Page) -> Iterator[list[Any]]:
+    if page.header.flags == c_sqlite3.PAGE_TYPE_LEAF_INDEX:
+        for cell in page.cells():
+            yield cell.values
+        return
+
+    # Unlike table B-trees, the cells of the interior pages of an index are entries of the index themselves
+    for cell in page.cells():
+        yield from _walk_index(sqlite, sqlite.page(cell.left_page))
+        yield cell.values
+
+    yield from _walk_index(sqlite, sqlite.page(page.right_page))
@@ -0,0 +1,499 @@
+"""Member indexes and random access for (compressed) tar files.
+
+Opening a tar file with :mod:`tarfile` requires reading every member header in the archive, which for compressed
+archives means decompressing the whole archive. Reading a member of a compressed archive afterwards decompresses
+the archive from the start again, up to the member.
+
+A :class:`TarIndex` is built in a single pass over the archive. It contains the headers of all members and a list
+of seek points, positions in the compressed archive where decompression can be resumed. Indexes can be persisted
+next to the archive or in an index directory, so later opens of the same archive don't have to read it at all.
+
+Seek points are created at:
+
+- gzip member and zstd frame boundaries, for archives that consist of multiple independently compressed parts.
+- regular intervals of single member gzip archives, if :mod:`indexed_gzip` is installed.
+"""
+
+from __future__ import annotations
+
+import bisect
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+import tarfile as tf
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from dissect.util.stream import AlignedStream
+
+from dissect.target.helpers.logging import get_logger
+from dissect.target.helpers.utils import atomic_write
+
+try:
+    if sys.version_info >= (3, 14):
+        from compression import zstd  # novermin
+    else:
+        from backports import zstd
+
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+try:
+    import indexed_gzip
+
+    HAS_INDEXED_GZIP = True
+except ImportError:
+    HAS_INDEXED_GZIP = False
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+log = get_logger(__name__)
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".dtindex"
+ZRAN_SUFFIX = ".zran"
+
+# Environment variable with the default index location, see open_tar()
+INDEX_ENV = "DISSECT_TAR_INDEX"
+
+# Amount of compressed data that is decompressed at once
+READ_SIZE = 64 * 1024
+# Minimal amount of uncompressed data between two seek points at member or frame boundaries
+SEEK_POINT_SPACING = 1024 * 1024
+# Amount of uncompressed data between two seek points created by indexed_gzip
+ZRAN_SPACING = 4 * 1024 * 1024
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+OTHER_MAGIC = (
+    # bzip2
+    b"BZh",
+    # xz
+    b"\xfd7zXZ\x00",
+    # lzma
+    b"\x5d\x00\x00",
+)
+
+# The TarInfo attributes that are stored in the index, in order
+MEMBER_FIELDS = (
+    "name",
+    "type",
+    "mode",
+    "uid",
+    "gid",
+    "size",
+    "mtime",
+    "linkname",
+    "uname",
+    "gname",
+    "devmajor",
+    "devminor",
+    "offset",
+    "offset_data",
+    "pax_headers",
+    "sparse",
+)
+
+
+def detect_compression(fh: BinaryIO) -> str | None:
+    """Detect the compression of a tar file.
+
+    Returns:
+        ``gzip``, ``zstd`` or ``other`` for a compressed file, ``None`` for an uncompressed file.
+    """
+    offset = fh.tell()
+    try:
+        fh.seek(0)
+        magic = fh.read(6)
+    finally:
+        fh.seek(offset)
+
+    if magic.startswith(GZIP_MAGIC):
+        return "gzip"
+    if magic.startswith(ZSTD_MAGIC):
+        return "zstd"
+    if magic.startswith(OTHER_MAGIC):
+        return "other"
+    return None
+
+
+def supports_random_access(compression: str | None) -> bool:
+    """Return whether archives with the given compression can be read through seek points."""
+    return compression is None or compression == "gzip" or (compression == "zstd" and HAS_ZSTD)
+
+
+class SeekPointStream(AlignedStream):
+    """Decompress a gzip or zstd file, using seek points to resume decompression close to the requested offset.
+
+    Seek points are ``(compressed_offset, uncompressed_offset)`` tuples of positions where a new gzip member or zstd
+    frame starts. New seek points are added while the file is read.
+
+    Args:
+        fh: The compressed file-like object.
+        compression: Either ``gzip`` or ``zstd``.
+        seek_points: Known seek points of the file.
+        size: The uncompressed size of the file, if known.
+    """
+
+    def __init__(
+        self,
+        fh: BinaryIO,
+        compression: str,
+        seek_points: list[tuple[int, int]] | None = None,
+        size: int | None = None,
+    ):
+        if compression not in ("gzip", "zstd"):
+            raise ValueError(f"Unsupported compression: {compression}")
+
+        if compression == "zstd" and not HAS_ZSTD:
+            raise ValueError("zstd compressed files require the backports.zstd module")
+
+        self.fh = fh
+        self.compression = compression
+        self.seek_points = sorted(seek_points or [(0, 0)])
+        self._uncompressed_offsets = [uncompressed for _, uncompressed in self.seek_points]
+
+        self._decompressor = None
+        self._compressed_pos = 0
+        self._decompressed_pos = 0
+        self._chunk = b""
+        self._chunk_offset = 0
+        self._chunk_pos = 0
+        self._eof = False
+
+        self._reset(self.seek_points[0])
+        super().__init__(size)
+
+    def _new_decompressor(self) -> Any:
+        if self.compression == "gzip":
+            return zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        return zstd.ZstdDecompressor()
+
+    def _reset(self, seek_point: tuple[int, int]) -> None:
+        self._decompressor = self._new_decompressor()
+        self._compressed_pos, self._decompressed_pos = seek_point
+        self._chunk = b""
+        self._chunk_offset = 0
+        self._chunk_pos = self._decompressed_pos
+        self._eof = False
+
+    def _add_seek_point(self, compressed: int, uncompressed: int) -> None:
+        idx = bisect.bisect_right(self._uncompressed_offsets, uncompressed)
+        if idx and uncompressed - self._uncompressed_offsets[idx - 1] < SEEK_POINT_SPACING:
+            return
+
+        self.seek_points.insert(idx, (compressed, uncompressed))
+        self._uncompressed_offsets.insert(idx, uncompressed)
+
+    def _read_compressed(self) -> bytes:
+        self.fh.seek(self._compressed_pos)
+        data = self.fh.read(READ_SIZE)
+        self._compressed_pos += len(data)
+        return data
+
+    def _decompress(self) -> bytes | None:
+        """Decompress the next piece of data, or return ``None`` at the end of the file."""
+        while not self._eof:
+            if self._decompressor.eof:
+                # A new gzip member or zstd frame starts after the end of the previous one
+                data = self._decompressor.unused_data
+                start = self._compressed_pos - len(data)
+                if len(data) < len(GZIP_MAGIC):
+                    data += self._read_compressed()
+
+                if not data or (self.compression == "gzip" and not data.startswith(GZIP_MAGIC)):
+                    # Trailing padding or garbage
+                    self._eof = True
+                    break
+
+                self._add_seek_point(start, self._decompressed_pos)
+                self._decompressor = self._new_decompressor()
+            elif not (data := self._read_compressed()):
+                log.debug("Unexpected end of compressed data at offset %d", self._compressed_pos)
+                self._eof = True
+                break
+
+            try:
+                result = self._decompressor.decompress(data)
+            except Exception as e:
+                log.debug("Failed to decompress data at offset %d", self._compressed_pos, exc_info=e)
+                self._eof = True
+                break
+
+            if result:
+                self._decompressed_pos += len(result)
+                return result
+
+        if self.size is None:
+            self.size = self._decompressed_pos
+        return None
+
+    def _read(self, offset: int, length: int) -> bytes:
+        # Resume from the closest seek point if that's closer than the current position of the decompressor
+        idx = bisect.bisect_right(self._uncompressed_offsets, offset) - 1
+        if offset < self._chunk_pos or self._uncompressed_offsets[idx] > self._decompressed_pos:
+            self._reset(self.seek_points[idx])
+
+        result = []
+        remaining = length
+        while remaining != 0:
+            if self._chunk_offset >= len(self._chunk):
+                if (data := self._decompress()) is None:
+                    break
+                self._chunk = data
+                self._chunk_offset = 0
+
+            available = len(self._chunk) - self._chunk_offset
+            if self._chunk_pos < offset:
+                # Skip the decompressed data up to the requested offset
+                skip = min(offset - self._chunk_pos, available)
+                self._chunk_offset += skip
+                self._chunk_pos += skip
+                continue
+
+            count = available if remaining == -1 else min(remaining, available)
+            result.append(self._chunk[self._chunk_offset : self._chunk_offset + count])
+            self._chunk_offset += count
+            self._chunk_pos += count
+            if remaining != -1:
+                remaining -= count
+
+        return b"".join(result)
+
+
+def _member_to_list(member: tf.TarInfo) -> list[Any]:
+    values = [getattr(member, field) for field in MEMBER_FIELDS]
+    values[MEMBER_FIELDS.index("type")] = member.type.decode("latin-1")
+    return values
+
+
+def _member_from_list(values: list[Any]) -> tf.TarInfo:
+    member = tf.TarInfo()
+    for field, value in zip(MEMBER_FIELDS, values, strict=True):
+        setattr(member, field, value)
+
+    member.type = member.type.encode("latin-1")
+    if member.sparse is not None:
+        member.sparse = [tuple(entry) for entry in member.sparse]
+    return member
+
+
+class TarIndex:
+    """The member headers and seek points of a tar file.
+
+    Args:
+        members: The members of the tar file.
+        compression: The compression of the tar file, see :func:`detect_compression`.
+        size: The uncompressed size of the tar file.
+        seek_points: The seek points of a gzip or zstd compressed tar file.
+        source: The ``(size, mtime)`` of the tar file the index belongs to.
+    """
+
+    def __init__(
+        self,
+        members: list[tf.TarInfo],
+        compression: str | None,
+        size: int | None = None,
+        seek_points: list[tuple[int, int]] | None = None,
+        source: tuple[int, int] | None = None,
+    ):
+        self.members = members
+        self.compression = compression
+        self.size = size
+        self.seek_points = seek_points or []
+        self.source = source
+
+        # An indexed_gzip file with its seek points, if used
+        self.zran = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<TarIndex members={len(self.members)} compression={self.compression} seek_points={len(self.seek_points)}>"
+        )
+
+    @classmethod
+    def build(cls, fh: BinaryIO) -> tuple[Self, tf.TarFile]:
+        """Build the index of a tar file by reading it once.
+
+        Returns:
+            The index and a :class:`~tarfile.TarFile` that reads through its seek points.
+        """
+        compression = detect_compression(fh)
+        source = _source(fh)
+
+        index = cls([], compression, source=source)
+        tar = index.open(fh)
+        index.members = tar.getmembers()
+
+        if isinstance(tar.fileobj, SeekPointStream):
+            index.seek_points = tar.fileobj.seek_points
+            index.size = tar.fileobj.size
+        elif index.zran is not None:
+            # Only the end of the file remains to be read after reading all members
+            index.zran.build_full_index()
+
+        return index, tar
+
+    def open(self, fh: BinaryIO) -> tf.TarFile:
+        """Open the tar file of this index, with the members of the index if there are any."""
+        fh.seek(0)
+
+        if self.compression == "gzip" and HAS_INDEXED_GZIP:
+            if self.zran is None:
+                self.zran = indexed_gzip.IndexedGzipFile(fileobj=fh, spacing=ZRAN_SPACING)
+            tar = tf.TarFile(fileobj=self.zran)
+        elif self.compression in ("gzip", "zstd") and supports_random_access(self.compression):
+            tar = tf.TarFile(fileobj=SeekPointStream(fh, self.compression, self.seek_points or None, self.size))
+        else:
+            tar = tf.open(mode="r:*", fileobj=fh)  # noqa: SIM115
+
+        if self.members:
+            tar.members = self.members
+            tar._loaded = True
+
+        return tar
+
+    @classmethod
+    def load(cls, path: Path, fh: BinaryIO | None = None) -> Self | None:
+        """Load an index from ``path``.
+
+        Returns ``None`` if the index doesn't exist, is invalid or doesn't belong to the (unchanged) tar file ``fh``.
+        """
+        try:
+            with gzip.open(path, "rt") as index_fh:
+                data = json.load(index_fh)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning("Ignoring invalid tar index %s", path)
+            log.debug("", exc_info=e)
+            return None
+
+        if data.get("version") != INDEX_VERSION:
+            log.info("Ignoring tar index %s with unsupported version %s", path, data.get("version"))
+            return None
+
+        source = tuple(data["source"]) if data["source"] else None
+        if fh is not None and (source is None or source != _source(fh)):
+            log.info("Ignoring outdated tar index %s", path)
+            return None
+
+        index = cls(
+            [_member_from_list(values) for values in data["members"]],
+            data["compression"],
+            data["size"],
+            [tuple(seek_point) for seek_point in data["seek_points"]],
+            source,
+        )
+
+        if data.get("zran"):
+            zran_path = path.with_name(path.name + ZRAN_SUFFIX)
+            if not HAS_INDEXED_GZIP or not zran_path.exists():
+                log.info("Not using the gzip seek points of tar index %s", path)
+            elif fh is not None:
+                fh.seek(0)
+                index.zran = indexed_gzip.IndexedGzipFile(fileobj=fh, spacing=ZRAN_SPACING)
+                index.zran.import_index(filename=str(zran_path))
+
+        return index
+
+    def save(self, path: Path) -> None:
+        """Save the index to ``path``.
+
+        Raises:
+            ValueError: If the index has no source, since it could never be validated when it's loaded.
+        """
+        if self.source is None:
+            raise ValueError("Can't save a tar index without a source file")
+
+        data = {
+            "version": INDEX_VERSION,
+            "source": self.source,
+            "compression": self.compression,
+            "size": self.size,
+            "seek_points": self.seek_points,
+            "members": [_member_to_list(member) for member in self.members],
+            "zran": self.zran is not None,
+        }
+
+        if self.zran is not None:
+            with atomic_write(path.with_name(path.name + ZRAN_SUFFIX)) as zran_temp:
+                self.zran.export_index(filename=str(zran_temp))
+
+        with atomic_write(path) as temp, gzip.open(temp, "wt") as index_fh:
+            json.dump(data, index_fh)
+
+
+def _source(fh: BinaryIO) -> tuple[int, int] | None:
+    """Return the ``(size, mtime)`` of the file of ``fh``, used to detect changes of the indexed file."""
+    try:
+        st = os.fstat(fh.fileno())
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def index_path(path: Path, location: str | None = None) -> Path:
+    """Return the path of the index of the tar file at ``path``.
+
+    Args:
+        path: The path of the tar file.
+        location: An index directory, or ``None`` to store the index next to the tar file.
+    """
+    if location is None:
+        return path.with_name(path.name + INDEX_SUFFIX)
+
+    # Archives with the same name in different directories get their own index
+    digest = hashlib.sha1(str(path.resolve()).encode(), usedforsecurity=False).hexdigest()[:16]
+    return Path(location).joinpath(f"{path.name}.{digest}{INDEX_SUFFIX}")
+
+
+def open_tar(path: Path, fh: BinaryIO, location: str | None = None) -> tf.TarFile:
+    """Open the tar file at ``path`` using its index, building the index if it doesn't exist yet.
+
+    The ``location`` determines where indexes are read from and written to:
+
+    - ``None``: use an existing index next to the tar file, but don't write one.
+    - ``"0"``: don't use indexes at all, open the tar file with :func:`tarfile.open`.
+    - ``"1"``: read and write the index next to the tar file.
+    - Any other value: read and write the index in this directory.
+
+    If not given, the location is read from the ``DISSECT_TAR_INDEX`` environment variable.
+    Compressed tar files are read through seek points regardless of whether the index is written.
+
+    Args:
+        path: The path of the tar file.
+        fh: The opened tar file.
+        location: Where to read and write the index.
+    """
+    location = location if location is not None else os.getenv(INDEX_ENV)
+
+    if location == "0":
+        return tf.open(mode="r:*", fileobj=fh)
+
+    index_dir = None if location in (None, "", "1") else location
+    target_path = index_path(path, index_dir)
+
+    if (index := TarIndex.load(target_path, fh)) is not None:
+        log.debug("Using tar index %s", target_path)
+        return index.open(fh)
+
+    index, tar = TarIndex.build(fh)
+    if location is not None and index.source is None:
+        log.debug("Not writing tar index %s, %r is not a regular file", target_path, fh)
+    elif location is not None:
+        try:
+            index.save(target_path)
+        except Exception as e:
+            log.warning("Failed to write tar index %s: %s", target_path, e)
+            log.debug("", exc_info=e)
+        else:
+            log.info("Wrote tar index %s", target_path)
+
+    return tar
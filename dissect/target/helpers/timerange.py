@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from dissect.util.ts import from_unix
+
+from dissect.target.plugin import arg
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+def parse_datetime(value: str | datetime) -> datetime:
+    """Parse an ISO 8601 date or datetime, datetimes without a timezone are in UTC."""
+    dt = value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _datetime_arg(value: str) -> datetime:
+    return parse_datetime(value)
+
+
+# The name argparse uses in the usage error of an invalid value, e.g. "invalid datetime value: 'yesterday'"
+_datetime_arg.__name__ = "datetime"
+
+
+def time_range_args(func: Callable) -> Callable:
+    """Add the standard ``--since`` and ``--until`` arguments to a plugin function.
+
+    Plugin functions with these arguments only parse the parts of their logs that fall within the time range,
+    instead of producing every event and leaving the filtering to the consumer. The arguments are parsed with
+    :func:`parse_datetime`, so invalid values result in a usage error.
+    """
+    func = arg("--until", type=_datetime_arg, help="only return events up to this ISO 8601 (UTC) date or time")(func)
+    return arg("--since", type=_datetime_arg, help="only return events from this ISO 8601 (UTC) date or time")(func)
+
+
+@dataclass(frozen=True)
+class TimeRange:
+    """An inclusive time range, an unset bound is unbounded.
+
+    The bounds can be given as ISO 8601 strings, like the ``--since`` and ``--until`` arguments.
+    """
+
+    since: datetime | None = None
+    until: datetime | None = None
+
+    def __post_init__(self):
+        for name in ("since", "until"):
+            if (value := getattr(self, name)) is not None:
+                object.__setattr__(self, name, parse_datetime(value))
+
+        if self.since and self.until and self.since > self.until:
+            raise ValueError("--since must be before --until")
+
+    def __bool__(self) -> bool:
+        return self.since is not None or self.until is not None
+
+    def __contains__(self, ts: datetime | None) -> bool:
+        if ts is None:
+            return not self
+
+        return (self.since is None or ts >= self.since) and (self.until is None or ts <= self.until)
+
+    def before(self, ts: datetime) -> bool:
+        """Return whether ``ts`` lies before the start of this range."""
+        return self.since is not None and ts < self.since
+
+    def after(self, ts: datetime) -> bool:
+        """Return whether ``ts`` lies after the end of this range."""
+        return self.until is not None and ts > self.until
+
+    def overlaps(self, start: datetime | None, end: datetime | None) -> bool:
+        """Return whether the events between ``start`` and ``end`` can fall within this range."""
+        return not ((end is not None and self.before(end)) or (start is not None and self.after(start)))
+
+    def excludes_file(self, path: Path) -> bool:
+        """Return whether a log file was last written before the start of this range.
+
+        A log file that hasn't been modified since the start of the range can't contain events from within the range,
+        so it doesn't have to be opened at all. Files without a modification time are never excluded.
+        """
+        if self.since is None:
+            return False
+
+        try:
+            mtime = path.stat().st_mtime
+        except Exception:
+            return False
+
+        return bool(mtime) and self.before(from_unix(mtime))
+
+    @property
+    def since_us(self) -> int | None:
+        return None if self.since is None else _to_unix_us(self.since)
+
+    @property
+    def until_us(self) -> int | None:
+        return None if self.until is None else _to_unix_us(self.until)
+
+
+def _to_unix_us(dt: datetime) -> int:
+    delta = dt - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import os
 import re
+from contextlib import contextmanager
 from datetime import datetime, timezone, tzinfo
 from enum import Enum, IntEnum
 from typing import TYPE_CHECKING, BinaryIO, TypeVar
@@ -104,6 +106,31 @@ def readinto(buffer: bytearray, fh: BinaryIO) -> int:
     return size
 
 
+@contextmanager
+def atomic_write(path: Path) -> Iterator[Path]:
+    """Write a file through a temporary file that replaces ``path`` when the enclosed block completes.
+
+    Concurrent readers of ``path`` never see a partially written file. The temporary file is removed if the
+    enclosed block raises.
+
+    Args:
+        path: The path of the file to write, its parent directories are created if needed.
+
+    Returns:
+        The path of the temporary file to write to.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        yield temp
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+
+    temp.replace(path)
+
+
 STRIP_RE = re.compile(r"^[\s\x00]*|[\s\x00]*$")
 
 
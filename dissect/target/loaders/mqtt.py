@@ -15,7 +15,7 @@ from functools import lru_cache
 from getpass import getpass
 from pathlib import Path
 from struct import pack, unpack_from
-from threading import Thread
+from threading import Condition, Thread
 from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
 
 from dissect.util.stream import AlignedStream
@@ -175,11 +175,17 @@ class MqttDiagnosticLine:
             now = time.time()
             transfer = transfer_rate.record(now, recv).value(now) / 1000  # convert to KB/s
             failures = self.connection.retries
+            reads = self.connection.hits + self.connection.misses
+            hit_rate = 100 * self.connection.hits / reads if reads else 0
+            inflight = self.connection.inflight
             seconds_elapsed = round(now - start) % 60
             minutes_elapsed = math.floor((now - start) / 60) % 60
             hours_elapsed = math.floor((now - start) / 60**2)
             timer = f"{hours_elapsed:02d}:{minutes_elapsed:02d}:{seconds_elapsed:02d}"
-            display = f"{timer} {peers}/{self.total_peers} peers {transfer:>8.2f} KB p/s {failures:>4} failures"
+            display = (
+                f"{timer} {peers}/{self.total_peers} peers {transfer:>8.2f} KB p/s {hit_rate:>5.1f}% hits "
+                f"{inflight:>3} in flight {failures:>4} failures"
+            )
             rest = self._columns - len(display)
             padding = (rest - len(logo)) * " "
 
@@ -214,12 +220,43 @@ class MqttConnection:
     prefetch_factor_inc = 10
     retries = 0
 
+    # Max. number of blocks that are requested at once for a sequential access pattern
+    max_prefetch_factor = 500
+    # Number of blocks that are requested ahead for a strided access pattern
+    stride_prefetch = 8
+    # Strided blocks are requested as a single range if the stride is at most this many blocks
+    max_coalesce_stride = 4
+    # Number of seconds after which a request is sent again if no response has been received
+    resend_timeout = 30
+
     def __init__(self, broker: Broker, host: str):
         self.broker = broker
         self.host = str(host)
         self.info = lru_cache(128)(self.info)
         self.read = lru_cache(128)(self.read)
 
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+
+        # Requested ranges without a response, (disk_id, offset, range length) -> block length
+        self._pending: dict[tuple[int, int, int], int] = {}
+        # Last read offset and stride per disk
+        self._history: dict[int, tuple[int, int | None]] = {}
+        # Last requested range of a sequential run and the next offset of a strided run per disk
+        self._runs: dict[int, tuple[int, int]] = {}
+        self._stride_next: dict[int, int] = {}
+        self._sizes: dict[int, int] = {}
+
+    @property
+    def inflight(self) -> int:
+        """The number of requests that are sent without having received a response."""
+        return sum(
+            1
+            for (disk_id, offset, _), length in list(self._pending.items())
+            if not self.broker.read(self.host, disk_id, offset, length)
+        )
+
     def topo(self, peers: int) -> list[str]:
         self.broker.topology(self.host)
 
@@ -237,6 +274,7 @@ class MqttConnection:
             message = self.broker.disk(self.host)
 
         for idx, disk in enumerate(message.disks):
+            self._sizes[idx] = disk.total_size
             disks.append(MqttStream(self, idx, disk.total_size))
 
         return disks
@@ -246,34 +284,123 @@ class MqttConnection:
 
         message = self.broker.read(self.host, disk_id, offset, length)
         if message:
+            self.hits += 1
+            self._predict(disk_id, offset, length, optimization_strategy)
             return message.data
 
-        if self.prev == offset - (length * self.factor):
-            if self.factor < 500:
-                self.factor += self.prefetch_factor_inc
+        self.misses += 1
+        if self._is_pending(disk_id, offset, length):
+            # The block is requested already, e.g. by a prefetch, so only wait for its response
+            self.deduplicated += 1
+            flength = length
         else:
-            self.factor = 1
-
-        self.prev = offset
-        flength = length * self.factor
-        self.broker.factor = self.factor
-        self.broker.seek(self.host, disk_id, offset, flength, optimization_strategy)
-        attempts = 0
+            if self.prev == offset - (length * self.factor):
+                if self.factor < self.max_prefetch_factor:
+                    self.factor += self.prefetch_factor_inc
+            else:
+                self.factor = 1
+
+            self.prev = offset
+            flength = length * self.factor
+            self._seek(disk_id, offset, flength, length, optimization_strategy)
+            self._runs[disk_id] = (offset, offset + flength)
+
+        resend = time.monotonic() + self.resend_timeout
         while True:
             if message := self.broker.read(self.host, disk_id, offset, length):
                 # don't waste time with sleep if we have a response
                 break
 
-            attempts += 1
-            time.sleep(0.1)
-            if attempts > 300:
+            self.broker.wait(0.1)
+            if time.monotonic() > resend:
                 # message might have not reached agent, resend...
-                self.broker.seek(self.host, disk_id, offset, flength, optimization_strategy)
-                attempts = 0
+                self._seek(disk_id, offset, flength, length, optimization_strategy)
+                resend = time.monotonic() + self.resend_timeout
                 self.retries += 1
 
+        self._predict(disk_id, offset, length, optimization_strategy)
         return message.data
 
+    def _seek(self, disk_id: int, offset: int, flength: int, length: int, optimization_strategy: int) -> None:
+        """Request ``flength`` bytes at ``offset``, which are stored as blocks of ``length`` bytes."""
+        self._pending[disk_id, offset, flength] = length
+        self.broker.factor = flength // length
+        self.broker.seek(self.host, disk_id, offset, flength, optimization_strategy)
+
+    def _is_pending(self, disk_id: int, offset: int, length: int) -> bool:
+        """Return whether a block is part of a requested range that has no response yet."""
+        for key, block_length in list(self._pending.items()):
+            request_disk_id, request_offset, request_length = key
+            if self.broker.read(self.host, request_disk_id, request_offset, block_length):
+                # The response has been received
+                self._pending.pop(key, None)
+                continue
+
+            if (
+                request_disk_id == disk_id
+                and block_length == length
+                and request_offset <= offset < request_offset + request_length
+                and (offset - request_offset) % length == 0
+            ):
+                return True
+        return False
+
+    def _predict(self, disk_id: int, offset: int, length: int, optimization_strategy: int) -> None:
+        """Request the blocks that are likely read next, based on the access pattern of the disk.
+
+        For a sequential pattern, the next range is requested once half of the previous range has been read, with
+        twice its size. For a strided pattern, the next ``stride_prefetch`` blocks are requested, as a single range
+        if they're close.
+        """
+        last_offset, last_stride = self._history.get(disk_id, (None, None))
+        stride = None if last_offset is None else offset - last_offset
+        self._history[disk_id] = (offset, stride)
+
+        size = self._sizes.get(disk_id)
+
+        if stride == length and disk_id in self._runs:
+            start, end = self._runs[disk_id]
+            if not (start + end) // 2 <= offset < end:
+                return
+
+            # Grow the range for as long as the disk is read sequentially
+            flength = min(2 * (end - start), length * self.max_prefetch_factor)
+            if size is not None and (flength := min(flength, (size - end) // length * length)) <= 0:
+                return
+
+            if not self._is_pending(disk_id, end, length):
+                self._seek(disk_id, end, flength, length, optimization_strategy)
+            self._runs[disk_id] = (end, end + flength)
+
+        elif stride is not None and stride > 0 and stride != length and stride == last_stride:
+            count = self.stride_prefetch
+            next_offset = self._stride_next.get(disk_id)
+            if next_offset is None or not offset < next_offset <= offset + 2 * stride * count:
+                # Start a new run
+                next_offset = offset + stride
+            elif next_offset > offset + stride * (count // 2):
+                # Enough blocks of this run are requested already
+                return
+
+            offsets = [
+                block_offset
+                for block_offset in range(next_offset, next_offset + stride * count, stride)
+                if size is None or block_offset + length <= size
+            ]
+            self._stride_next[disk_id] = next_offset + stride * count
+            if not offsets:
+                return
+
+            if stride % length == 0 and stride <= length * self.max_coalesce_stride:
+                # Coalesce the blocks into a single range, of which the strided blocks are a part
+                flength = offsets[-1] + length - offsets[0]
+                if not self._is_pending(disk_id, offsets[0], length):
+                    self._seek(disk_id, offsets[0], flength, length, optimization_strategy)
+            else:
+                for block_offset in offsets:
+                    if not self._is_pending(disk_id, block_offset, length):
+                        self._seek(disk_id, block_offset, length, length, optimization_strategy)
+
 
 class Broker:
     broker_host = None
@@ -307,6 +434,10 @@ class Broker:
         self.password = password
         self.command = kwargs.get("command")
 
+        # Block length of every requested range, so responses are split into the requested blocks
+        self.pending: dict[str, int] = {}
+        self._received = Condition()
+
         if not HAS_PAHO:
             raise ImportError("Required dependency 'paho' is missing, install with 'pip install dissect.target[mqtt]'")
 
@@ -342,15 +473,25 @@ class Broker:
         seek_address = int(tokens[4], 16)
         read_length = int(tokens[5], 16)
 
-        for i in range(self.factor):
+        sublength = self.pending.pop(f"{hostname}-{disk_id}-{seek_address}-{read_length}", None)
+        if sublength is None:
             sublength = int(read_length / self.factor)
-            start = i * sublength
+
+        for start in range(0, read_length, sublength):
             key = f"{hostname}-{disk_id}-{seek_address + start}-{sublength}"
             if key in self.index:
                 continue
 
             self.index[key] = SeekMessage(data=payload[start : start + sublength])
 
+        with self._received:
+            self._received.notify_all()
+
+    def wait(self, timeout: float) -> None:
+        """Wait until a read response is received, or at most ``timeout`` seconds."""
+        with self._received:
+            self._received.wait(timeout)
+
     def _on_id(self, hostname: str, payload: bytes) -> None:
         key = hostname
         host = payload.decode("utf-8")
@@ -402,6 +543,7 @@ class Broker:
         if key in self.index:
             return
 
+        self.pending[f"{host}-{disk_id}-{offset}-{flength}"] = length
         self.mqtt_client.publish(
             f"{self.case}/{host}/SEEK/{disk_id}/{hex(offset)}/{hex(flength)}", pack("<I", optimization_strategy)
         )
@@ -4,6 +4,7 @@ import socket
 import ssl
 import time
 import warnings
+from collections import OrderedDict, deque
 from io import DEFAULT_BUFFER_SIZE
 from struct import pack, unpack
 from typing import TYPE_CHECKING
@@ -52,6 +53,16 @@ class RemoteStreamConnection:
     # previous connection! So it must be at least 10s.
     SOCKET_TIMEOUT = 30
 
+    # Max. number of read requests that are sent to the agent before their responses are received,
+    # 0 sends a single request at a time
+    PIPELINE_DEPTH = 0
+
+    # Size of a single prefetch request for sequential reads when pipelining
+    PREFETCH_SIZE = 256 * 1024
+
+    # Max. number of received blocks that are kept for later reads when pipelining
+    MAX_CACHED_BLOCKS = 64
+
     # Remote agent understands 3 commands:
     # 1      INFO: return disk size and sector size for each remote disk
     # 2      QUIT: stops the agent on the remote machine
@@ -85,6 +96,14 @@ class RemoteStreamConnection:
         self._max_shortreads = self.MAX_SHORT_READS
         self._reconnect_wait = self.RECONNECT_WAIT
         self._socket_timeout = self.SOCKET_TIMEOUT
+        self._pipeline_depth = self.PIPELINE_DEPTH
+
+        # State of pipelined reads, see _read_pipelined()
+        self._inflight: deque[tuple[int, int, int]] = deque()
+        self._blocks: OrderedDict[tuple[int, int], bytes] = OrderedDict()
+        self._next_offset: dict[int, int] = {}
+        self._prefetch_offset: dict[int, int] = {}
+        self._disk_sizes: dict[int, int] = {}
 
         flag_cert_chain_loaded = False
         flag_verify_locations_loaded = False
@@ -107,6 +126,7 @@ class RemoteStreamConnection:
             self._max_shortreads = options.get("shortreads", max(0, self._max_shortreads))
             self._reconnect_wait = options.get("reconnectwait", max(0, self._reconnect_wait))
             self._socket_timeout = options.get("sockettimeout", max(0, self._socket_timeout))
+            self._pipeline_depth = int(options.get("pipeline", max(0, self._pipeline_depth)))
 
         if (
             flag_cert_chain_loaded is False
@@ -133,11 +153,7 @@ class RemoteStreamConnection:
             self.log.debug("Connecting to agent")
             # Even during the handshake things can go wrong with unreliable connections
             try:
-                self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self._socket.settimeout(self._socket_timeout)
-                ssl_sock = self._context.wrap_socket(self._socket, server_hostname=self.hostname)
-                ssl_sock.connect((self.hostname, self.port))
-                self._ssl_sock = ssl_sock
+                self._ssl_sock = self._open_socket()
                 self._is_connected = True
                 self.log.debug("Connection established with agent")
             except Exception:
@@ -156,6 +172,24 @@ class RemoteStreamConnection:
                 time.sleep(self._reconnect_wait)
                 reconnects += 1
 
+    def _open_socket(self) -> ssl.SSLSocket:
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.settimeout(self._socket_timeout)
+        ssl_sock = self._context.wrap_socket(self._socket, server_hostname=self.hostname)
+        ssl_sock.connect((self.hostname, self.port))
+        return ssl_sock
+
+    def _disconnect(self) -> None:
+        if self._ssl_sock is not None:
+            self._ssl_sock.close()
+        if self._socket is not None:
+            self._socket.close()
+        self._is_connected = False
+
+        # Responses to requests that were sent over this connection are lost
+        self._inflight.clear()
+        self._prefetch_offset.clear()
+
     def _receive_bytes(self, length: int) -> bytes:
         data = b""
         received = 0
@@ -181,6 +215,9 @@ class RemoteStreamConnection:
         if length == 0:
             return b""
 
+        if self._pipeline_depth:
+            return self._read_pipelined(disk_id, offset, length)
+
         data = b""
         received = 0
         while received < length:
@@ -191,12 +228,95 @@ class RemoteStreamConnection:
                 received += length
             except Exception:
                 self.log.debug("Unable to read data from agent, re-connecting")
-                self._ssl_sock.close()
-                self._socket.close()
-                self._is_connected = False
+                self._disconnect()
 
         return data
 
+    def _read_pipelined(self, disk_id: int, offset: int, length: int) -> bytes:
+        """Read data while keeping up to ``PIPELINE_DEPTH`` read requests in flight.
+
+        The agent answers requests in the order they are sent, so requests don't have to wait for the response to
+        the previous request. When a disk is read sequentially, the data after the current read is requested ahead
+        in blocks of ``PREFETCH_SIZE`` bytes. The latency of these requests overlaps with the processing of the
+        current data, and adjacent small reads are served from the received blocks.
+        """
+        sequential = self._next_offset.get(disk_id) == offset
+        self._next_offset[disk_id] = offset + length
+
+        retries = 0
+        while True:
+            # Raises a ConnectionError if the agent can't be reached anymore
+            self.connect()
+
+            try:
+                if (data := self._get_block(disk_id, offset, length)) is None and not self._is_inflight(
+                    disk_id, offset, length
+                ):
+                    self._send_read(disk_id, offset, length)
+
+                if sequential:
+                    self._prefetch(disk_id, offset + length)
+
+                while data is None:
+                    self._receive_next()
+                    data = self._get_block(disk_id, offset, length)
+            except Exception as e:
+                self._disconnect()
+
+                retries += 1
+                if retries > self._max_reconnects:
+                    raise ConnectionError("Unable to read data from remote agent.") from e
+
+                self.log.debug("Unable to read data from agent, re-connecting")
+            else:
+                return data
+
+    def _send_read(self, disk_id: int, offset: int, length: int) -> None:
+        self._ssl_sock.send(pack(">BQQ", self.COMMAND_READ + disk_id, offset, length))
+        self._inflight.append((disk_id, offset, length))
+
+    def _receive_next(self) -> None:
+        disk_id, offset, length = self._inflight[0]
+        data = self._receive_bytes(length)
+        self._inflight.popleft()
+
+        self._blocks[disk_id, offset] = data
+        while len(self._blocks) > self.MAX_CACHED_BLOCKS:
+            self._blocks.popitem(last=False)
+
+    def _get_block(self, disk_id: int, offset: int, length: int) -> bytes | None:
+        """Return the requested range from a received block, if any block contains it."""
+        for (block_disk_id, block_offset), data in reversed(self._blocks.items()):
+            if block_disk_id == disk_id and block_offset <= offset and offset + length <= block_offset + len(data):
+                self._blocks.move_to_end((block_disk_id, block_offset))
+                start = offset - block_offset
+                return data[start : start + length]
+        return None
+
+    def _is_inflight(self, disk_id: int, offset: int, length: int) -> bool:
+        return any(
+            request[0] == disk_id and request[1] <= offset and offset + length <= request[1] + request[2]
+            for request in self._inflight
+        )
+
+    def _prefetch(self, disk_id: int, offset: int) -> None:
+        """Request the data after ``offset`` ahead, until ``PIPELINE_DEPTH`` requests are in flight."""
+        if (size := self._disk_sizes.get(disk_id)) is None:
+            return
+
+        # Continue where the previous prefetch of this sequential run stopped, or start a new run
+        prefetch_offset = self._prefetch_offset.get(disk_id, offset)
+        if not offset <= prefetch_offset <= offset + self._pipeline_depth * self.PREFETCH_SIZE:
+            prefetch_offset = offset
+
+        while len(self._inflight) < self._pipeline_depth and prefetch_offset < size:
+            length = min(self.PREFETCH_SIZE, size - prefetch_offset)
+            if self._get_block(disk_id, prefetch_offset, length) is None:
+                self._send_read(disk_id, prefetch_offset, length)
+            prefetch_offset += length
+
+        self._prefetch_offset[disk_id] = prefetch_offset
+
     def close(self) -> None:
         if self.is_connected:
             self._ssl_sock.send(pack(">BQQ", self.COMMAND_QUIT, 0, 0))
@@ -212,6 +332,7 @@ class RemoteStreamConnection:
         for i in range(0, number_of_disks * response_size, response_size):
             part = data[i : i + response_size]
             (disk_size, _) = unpack("<QQ", part)
+            self._disk_sizes[i // response_size] = disk_size
             disks.append(RemoteStream(self, i // response_size, disk_size))
 
         return disks
@@ -225,6 +346,7 @@ class RemoteStreamConnection:
 @arg("--remote-shortreads", dest="shortreads", help="max limit shortreads")
 @arg("--remote-reconnectwait", dest="reconnectwait", help="max time before reconnection attempt")
 @arg("--remote-sockettimeout", dest="sockettimeout", help="socket timeout")
+@arg("--remote-pipeline", dest="pipeline", help="max number of read requests in flight, enables prefetching")
 class RemoteLoader(Loader):
     """Load a remote target that runs a compatible Dissect agent."""
 
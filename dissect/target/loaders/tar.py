@@ -9,7 +9,7 @@ from dissect.target.filesystems.tar import (
     TarFilesystemDirectoryEntry,
     TarFilesystemEntry,
 )
-from dissect.target.helpers import fsutil, loaderutil
+from dissect.target.helpers import fsutil, loaderutil, tarindex
 from dissect.target.helpers.lazy import import_lazy
 from dissect.target.helpers.logging import get_logger
 from dissect.target.loader import Loader, SubLoader
@@ -151,7 +151,8 @@ class TarLoader(Loader):
             )
 
         self.fh = path.open("rb")
-        self.tar = tf.open(mode="r:*", fileobj=self.fh)  # noqa: SIM115
+        # The member index of the tar file is used and written according to the ``index`` option, see open_tar()
+        self.tar = tarindex.open_tar(path, self.fh, self.parsed_query.get("index"))
         self.subloader = None
 
     @staticmethod
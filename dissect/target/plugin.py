@@ -5,10 +5,13 @@ See ``dissect/target/plugins/general/example.py`` for an example plugin.
 
 from __future__ import annotations
 
+import dataclasses
 import fnmatch
 import functools
+import hashlib
 import importlib
 import importlib.util
+import json
 import os
 import sys
 import traceback
@@ -22,11 +25,11 @@ from flow.record import Record, RecordDescriptor
 
 import dissect.target.plugins.os.default as default
 from dissect.target.exceptions import PluginError, PluginNotFoundError, UnsupportedPluginError
-from dissect.target.helpers import cache
+from dissect.target.helpers import cache, profiler
 from dissect.target.helpers.fsutil import has_glob_magic
 from dissect.target.helpers.logging import get_logger
 from dissect.target.helpers.record import EmptyRecord
-from dissect.target.helpers.utils import StrEnum
+from dissect.target.helpers.utils import StrEnum, atomic_write
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
@@ -97,6 +100,9 @@ class FunctionDescriptor:
     method_name: str
     module: str
     qualname: str
+    # A summary of the arguments and the docstring of the function, so they're available without importing the plugin
+    arguments: list[dict[str, Any]] | None = field(default=None, hash=False, compare=False)
+    description: str | None = field(default=None, hash=False, compare=False)
 
     @property
     def cls(self) -> type[Plugin]:
@@ -173,6 +179,10 @@ An exception is made for :class:`FailureDescriptor`, :class:`FunctionDescriptor`
 
 GENERATED = False
 
+MANIFEST_VERSION = 1
+MANIFEST_ENV = "DISSECT_PLUGIN_MANIFEST"
+"""The environment variable with the path of the plugin manifest, see :func:`load_manifest`."""
+
 
 def export(*args, **kwargs) -> Callable[..., Any]:
     """Decorator to be used on Plugin functions that should be exported.
@@ -549,6 +559,7 @@ def register(plugincls: type[Plugin]) -> None:
                 clone_alias(plugincls, attr, alias)
 
         for attr in _get_nonprivate_attributes(plugincls):
+            func = attr
             if isinstance(attr, property):
                 attr = attr.fget
 
@@ -582,6 +593,8 @@ def register(plugincls: type[Plugin]) -> None:
                         method_name=attr.__name__,
                         module=plugincls.__module__,
                         qualname=plugincls.__qualname__,
+                        arguments=get_function_arguments(func),
+                        description=get_function_description(func),
                     )
 
                     # Register the functions in the lookup
@@ -607,6 +620,8 @@ def register(plugincls: type[Plugin]) -> None:
                 method_name="__call__",
                 module=plugincls.__module__,
                 qualname=plugincls.__qualname__,
+                arguments=get_function_arguments(plugincls.__call__),
+                description=get_function_description(plugincls.__call__),
             )
 
             function_index.setdefault(plugincls.__namespace__, {})[module_key] = descriptor
@@ -644,21 +659,175 @@ def register(plugincls: type[Plugin]) -> None:
         log.trace("Plugin registered: %s", module_key)
 
 
+def get_function_arguments(func: Callable | property) -> list[dict[str, Any]]:
+    """Summarize the arguments of a plugin function, as set with :func:`arg`, in a serializable form."""
+    arguments = []
+
+    for name, _arg in getattr(func, "__args__", []):
+        is_bool_action = _arg.get("action", "") in ("store_true", "store_false")
+        default = _arg.get("action") == "store_false" if is_bool_action else (_arg.get("default") or _arg.get("const"))
+        if not isinstance(default, (str, int, float, bool, list, type(None))):
+            default = str(default)
+
+        arguments.append(
+            {
+                "name": name[0],
+                # infer the type either by store_*, type argument and fallback to default str.
+                # See: https://docs.python.org/3/library/argparse.html#type
+                "type": "bool" if is_bool_action else getattr(_arg.get("type"), "__name__", "str"),
+                "help": _arg.get("help"),
+                "default": default,
+                # required can either be set explicitly or is implied with '--' style arguments.
+                "required": _arg.get("required", False),
+            }
+        )
+
+    return arguments
+
+
+def get_function_description(func: Callable | property) -> str | None:
+    """Return the first paragraph of the docstring of a plugin function."""
+    return func.__doc__.split("\n\n", 1)[0].strip() if func.__doc__ else None
+
+
 def _get_plugins() -> PluginRegistry:
-    """Load the plugin registry, or generate it if it doesn't exist yet."""
+    """Load the plugin registry, or generate it if it doesn't exist yet.
+
+    The registry is loaded from the ``_pluginlist`` module that is generated when building a package. If it doesn't
+    exist and the :data:`MANIFEST_ENV` environment variable is set, the registry is loaded from the plugin manifest
+    at that path, or generated and written to it. Otherwise, all plugins are imported to generate the registry.
+    """
     global PLUGINS, GENERATED
 
     if not GENERATED:
         try:
             from dissect.target.plugins._pluginlist import PLUGINS
         except ImportError:
-            PLUGINS = generate()
+            if manifest_path := os.environ.get(MANIFEST_ENV):
+                PLUGINS = _load_or_generate_manifest(Path(manifest_path))
+            else:
+                PLUGINS = generate()
 
         GENERATED = True
 
     return PLUGINS
 
 
+def manifest_fingerprint() -> str:
+    """Return a fingerprint of the in-tree plugins, which changes when any of the plugin files change."""
+    plugins_dir = Path(__file__).parent / "plugins"
+
+    digest = hashlib.sha256(f"{MANIFEST_VERSION}".encode())
+    for path in sorted([Path(__file__), *_find_py_files(plugins_dir)]):
+        stat = path.stat()
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+
+    return digest.hexdigest()
+
+
+def save_manifest(path: Path, registry: PluginRegistry, fingerprint: str | None = None) -> None:
+    """Write the plugin registry to a plugin manifest at ``path``.
+
+    Args:
+        path: The path to write the manifest to.
+        registry: The plugin registry to write, usually the result of :func:`generate`.
+        fingerprint: The fingerprint of the plugins the registry was generated from, see :func:`manifest_fingerprint`.
+    """
+    data = {
+        "version": MANIFEST_VERSION,
+        "fingerprint": fingerprint or manifest_fingerprint(),
+        "registry": dataclasses.asdict(registry),
+    }
+
+    with atomic_write(path) as temp:
+        temp.write_text(json.dumps(data))
+
+
+def load_manifest(path: Path, fingerprint: str | None = None) -> PluginRegistry | None:
+    """Load a plugin registry from the plugin manifest at ``path``.
+
+    The manifest contains all function and plugin descriptors, including the arguments and output types of all
+    functions and the OS plugin tree, so functions can be resolved without importing any plugin. Only the modules of
+    the plugins that are actually used are imported.
+
+    Args:
+        path: The path of the manifest.
+        fingerprint: The fingerprint the manifest must match, see :func:`manifest_fingerprint`.
+
+    Returns:
+        The plugin registry, or ``None`` if the manifest doesn't exist or doesn't match the in-tree plugins.
+    """
+    try:
+        data = json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning("Ignoring invalid plugin manifest %s", path)
+        log.debug("", exc_info=e)
+        return None
+
+    if data.get("version") != MANIFEST_VERSION or data.get("fingerprint") != (fingerprint or manifest_fingerprint()):
+        log.debug("Ignoring outdated plugin manifest %s", path)
+        return None
+
+    registry = data["registry"]
+    plugins = registry["__plugins__"]
+    functions = registry["__functions__"]
+
+    return PluginRegistry(
+        __plugins__=PluginDescriptorLookup(
+            **{
+                index: {key: PluginDescriptor(**desc) for key, desc in plugins[index].items()}
+                for index in ("__regular__", "__os__", "__child__")
+            }
+        ),
+        __functions__=FunctionDescriptorLookup(
+            **{
+                index: {
+                    name: {key: FunctionDescriptor(**desc) for key, desc in descriptors.items()}
+                    for name, descriptors in functions[index].items()
+                }
+                for index in ("__regular__", "__os__", "__child__")
+            }
+        ),
+        __ostree__=registry["__ostree__"],
+        __failed__=[FailureDescriptor(**failure) for failure in registry["__failed__"]],
+    )
+
+
+def _load_or_generate_manifest(path: Path) -> PluginRegistry:
+    fingerprint = manifest_fingerprint()
+
+    if (registry := load_manifest(path, fingerprint)) is not None:
+        # Keep the plugins that were registered before the manifest was loaded, e.g. from external plugin paths
+        for name in ("__regular__", "__os__", "__child__"):
+            getattr(registry.__plugins__, name).update(getattr(PLUGINS.__plugins__, name))
+            for function_name, descriptors in getattr(PLUGINS.__functions__, name).items():
+                getattr(registry.__functions__, name).setdefault(function_name, {}).update(descriptors)
+        _merge_ostree(registry.__ostree__, PLUGINS.__ostree__)
+        registry.__failed__.extend(PLUGINS.__failed__)
+
+        log.debug("Loaded plugin manifest %s", path)
+        return registry
+
+    registry = generate()
+
+    try:
+        save_manifest(path, registry, fingerprint)
+    except Exception as e:
+        log.warning("Unable to write plugin manifest %s: %s", path, e)
+        log.debug("", exc_info=e)
+    else:
+        log.debug("Wrote plugin manifest %s", path)
+
+    return registry
+
+
+def _merge_ostree(tree: _OSTree, other: _OSTree) -> None:
+    for part, subtree in other.items():
+        _merge_ostree(tree.setdefault(part, {}), subtree)
+
+
 def _module_path(cls: type[Plugin] | str) -> str:
     """Returns the module path relative to ``dissect.target.plugins``."""
     if issubclass(cls, Plugin):
@@ -801,7 +970,8 @@ def load(desc: FunctionDescriptor | PluginDescriptor) -> type[Plugin]:
     module = desc.module
 
     try:
-        obj = importlib.import_module(module)
+        with profiler.phase("import", plugin=module):
+            obj = importlib.import_module(module)
         for part in desc.qualname.split("."):
             obj = getattr(obj, part)
     except Exception as e:
@@ -1167,8 +1337,7 @@ class OSPlugin(Plugin):
 
     def __init_subclass__(cls, **kwargs):
         # Note that cls is the subclass
-        super().__init_subclass__(**kwargs)
-
+        # Inherit the docstrings before registering, so they're part of the function descriptors
         for os_method in _get_nonprivate_attributes(OSPlugin):
             if isinstance(os_method, property):
                 os_method = os_method.fget
@@ -1185,6 +1354,8 @@ class OSPlugin(Plugin):
                     method = method.__func__
                 method.__doc__ = os_docstring
 
+        super().__init_subclass__(**kwargs)
+
     def check_compatible(self) -> bool:
         """OSPlugin's use a different compatibility check, override the one from the :class:`Plugin` class.
 
@@ -15,6 +15,7 @@ from dissect.util.ts import webkittimestamp
 from dissect.target.exceptions import FileNotFoundError, UnsupportedPluginError
 from dissect.target.helpers.descriptor_extensions import UserRecordDescriptorExtension
 from dissect.target.helpers.record import create_extended_descriptor
+from dissect.target.helpers.sqliteutil import RowLookup, index_entries
 from dissect.target.plugin import OperatingSystem, export
 from dissect.target.plugins.apps.browser.browser import (
     GENERIC_COOKIE_FIELDS,
@@ -219,16 +220,15 @@ class ChromiumMixin:
         """
         for user, db_file, db in self._iter_db("History"):
             try:
-                urls = {row.id: row for row in db.table("urls").rows()}
-                visits = {}
+                # Visits are joined to their URLs and "from" visits by rowid, so neither table is kept in memory
+                urls = RowLookup(db.table("urls"))
+                visits = RowLookup(db.table("visits"))
 
                 for row in db.table("visits").rows():
-                    visits[row.id] = row
-                    url = urls[row.url]
+                    url = urls.get(row.url)
 
-                    if row.from_visit and row.from_visit in visits:
-                        from_visit = visits[row.from_visit]
-                        from_url = urls[from_visit.url]
+                    if row.from_visit and (from_visit := visits.get(row.from_visit)):
+                        from_url = urls.get(from_visit.url)
                     else:
                         from_visit, from_url = None, None
 
@@ -236,13 +236,13 @@ class ChromiumMixin:
                         ts=webkittimestamp(row.visit_time),
                         browser=browser_name,
                         id=row.id,
-                        url=try_idna(url.url),
-                        title=url.title,
+                        url=try_idna(url.url) if url else None,
+                        title=url.title if url else None,
                         description=None,
                         host=None,
                         visit_type=None,
-                        visit_count=url.visit_count,
-                        hidden=url.hidden,
+                        visit_count=url.visit_count if url else None,
+                        hidden=url.hidden if url else None,
                         typed=None,
                         session=None,
                         from_visit=row.from_visit or None,
@@ -357,23 +357,20 @@ class ChromiumMixin:
         """
         for user, db_file, db in self._iter_db("History"):
             try:
-                download_chains = defaultdict(list)
-                for row in db.table("downloads_url_chains"):
-                    download_chains[row.id].append(row)
-
-                for chain in download_chains.values():
-                    chain.sort(key=lambda row: row.chain_index)
+                download_urls = self._download_urls(db)
+                download_url = next(download_urls, None)
 
                 for row in db.table("downloads").rows():
                     if download_path := row.target_path:
                         download_path = self.target.fs.path(download_path)
 
-                    url = None
-                    download_chain = download_chains.get(row.id)
+                    # Downloads and their URLs are both sorted by id, so they are joined by walking both at once
+                    while download_url and download_url[0] < row.id:
+                        download_url = next(download_urls, None)
 
-                    if download_chain:
-                        url = download_chain[-1].url
-                        url = try_idna(url)
+                    url = None
+                    if download_url and download_url[0] == row.id:
+                        url = try_idna(download_url[1])
 
                     # https://github.com/chromium/chromium/blob/main/components/download/public/common/download_item.h
                     if state := row.get("state"):
@@ -399,6 +396,26 @@ class ChromiumMixin:
                 self.target.log.warning("Error processing history file: %s", db_file)
                 self.target.log.debug("", exc_info=e)
 
+    def _download_urls(self, db: SQLite3) -> Iterator[tuple[int, str]]:
+        """Yield the final URL of the URL chain of every download, sorted by download id."""
+        chains = db.table("downloads_url_chains")
+
+        if not (index := db.index("sqlite_autoindex_downloads_url_chains_1")):
+            download_chains = defaultdict(list)
+            for row in chains.rows():
+                download_chains[row.id].append(row)
+
+            for download_id, chain in sorted(download_chains.items()):
+                yield download_id, max(chain, key=lambda row: row.chain_index).url
+            return
+
+        # The entries of the primary key index are sorted by (id, chain_index), the last entry of a chain is its end
+        rows = RowLookup(chains)
+        for download_id, entries in itertools.groupby(index_entries(db, index), key=lambda entry: entry[0]):
+            *_, (_, _, rowid) = entries
+            if row := rows.get(rowid):
+                yield download_id, row.url
+
     def extensions(self, browser_name: str | None = None) -> Iterator[BrowserExtensionRecord]:
         """Iterates over all installed extensions for a given browser.
 
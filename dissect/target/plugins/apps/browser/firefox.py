@@ -16,6 +16,7 @@ from dissect.target.exceptions import FileNotFoundError, UnsupportedPluginError
 from dissect.target.helpers.descriptor_extensions import UserRecordDescriptorExtension
 from dissect.target.helpers.logging import get_logger
 from dissect.target.helpers.record import create_extended_descriptor
+from dissect.target.helpers.sqliteutil import RowLookup
 from dissect.target.plugin import OperatingSystem, export
 from dissect.target.plugins.apps.browser.browser import (
     GENERIC_COOKIE_FIELDS,
@@ -205,16 +206,15 @@ class FirefoxPlugin(BrowserPlugin):
 
         for user_details, db_file, db in self._iter_db("places.sqlite"):
             try:
-                places = {row.id: row for row in db.table("moz_places").rows()}
-                visits = {}
+                # Visits are joined to their places and "from" visits by rowid, so neither table is kept in memory
+                places = RowLookup(db.table("moz_places"))
+                visits = RowLookup(db.table("moz_historyvisits"))
 
                 for row in db.table("moz_historyvisits").rows():
-                    visits[row.id] = row
-                    place = places[row.place_id]
+                    place = places.get(row.place_id)
 
-                    if row.from_visit and row.from_visit in visits:
-                        from_visit = visits[row.from_visit]
-                        from_place = places[from_visit.place_id]
+                    if row.from_visit and (from_visit := visits.get(row.from_visit)):
+                        from_place = places.get(from_visit.place_id)
                     else:
                         from_visit, from_place = None, None
 
@@ -222,16 +222,16 @@ class FirefoxPlugin(BrowserPlugin):
                         ts=from_timestamp(row.visit_date),
                         browser="firefox",
                         id=row.id,
-                        url=try_idna(place.url),
-                        title=place.title,
-                        description=place.description,
+                        url=try_idna(place.url) if place else None,
+                        title=place.title if place else None,
+                        description=place.description if place else None,
                         host="".join(list(reversed(try_idna(place.rev_host).decode()))).lstrip(".")
-                        if place.rev_host
+                        if place and place.rev_host
                         else None,
                         visit_type=row.visit_type,
-                        visit_count=place.visit_count,
-                        hidden=place.hidden,
-                        typed=place.typed,
+                        visit_count=place.visit_count if place else None,
+                        hidden=place.hidden if place else None,
+                        typed=place.typed if place else None,
                         session=row.session,
                         from_visit=row.from_visit or None,
                         from_url=try_idna(from_place.url) if from_place else None,
@@ -310,7 +310,7 @@ class FirefoxPlugin(BrowserPlugin):
         """
         for user_details, db_file, db in self._iter_db("places.sqlite"):
             try:
-                places = {row.id: row for row in db.table("moz_places").rows()}
+                places = RowLookup(db.table("moz_places"))
                 if not (moz_anno_attributes := db.table("moz_anno_attributes")):
                     continue
 
@@ -358,7 +358,7 @@ class FirefoxPlugin(BrowserPlugin):
                         download_path = self.target.fs.path(download_path)
 
                     place = places.get(place_id)
-                    url = place.get("url")
+                    url = place.get("url") if place else None
                     url = try_idna(url) if url else None
 
                     yield self.BrowserDownloadRecord(
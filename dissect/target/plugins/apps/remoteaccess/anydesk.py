@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 
 from dissect.target.exceptions import UnsupportedPluginError
 from dissect.target.helpers.descriptor_extensions import UserRecordDescriptorExtension
+from dissect.target.helpers.fsutil import glob_multi
 from dissect.target.helpers.record import create_extended_descriptor
 from dissect.target.plugin import export
 from dissect.target.plugins.apps.remoteaccess.remoteaccess import (
@@ -18,7 +19,7 @@ if TYPE_CHECKING:
     from collections.abc import Iterator
 
     from dissect.target.helpers.fsutil import TargetPath
-    from dissect.target.plugins.general.users import UserDetails
+    from dissect.target.plugins.general.users import UserDetails, UserRecord
     from dissect.target.target import Target
 
 
@@ -80,26 +81,22 @@ class AnydeskPlugin(RemoteAccessPlugin):
         self.trace_files: set[tuple[TargetPath, UserDetails | None]] = set()
         self.filetransfer_files: set[tuple[TargetPath, UserDetails | None]] = set()
 
-        # Anydesk trace file service globs
-        for trace_glob in self.SERVICE_GLOBS:
-            for path in self.target.fs.path().glob(trace_glob):
-                self.trace_files.add((path, None))
-
-        # Anydesk filetransfer service globs
-        for trace_glob in self.FILETRANSFER_SERVICE_LOGS:
-            for path in self.target.fs.path().glob(trace_glob):
-                self.filetransfer_files.add((path, None))
+        # Anydesk trace file and filetransfer service globs
+        for path, patterns in glob_multi(self.target.fs.path(), self.SERVICE_GLOBS + self.FILETRANSFER_SERVICE_LOGS):
+            self._add_path(path, patterns, None)
 
         for user_details in self.target.user_details.all_with_home():
-            # Anydesk trace file user globs
-            for trace_glob in self.USER_GLOBS:
-                for path in user_details.home_path.glob(trace_glob):
-                    self.trace_files.add((path, user_details.user))
-
-            # Anydesk filetransfer User globs
-            for trace_glob in self.FILETRANSFER_USER_LOGS:
-                for path in user_details.home_path.glob(trace_glob):
-                    self.filetransfer_files.add((path, user_details.user))
+            # Anydesk trace file and filetransfer user globs
+            for path, patterns in glob_multi(user_details.home_path, self.USER_GLOBS + self.FILETRANSFER_USER_LOGS):
+                self._add_path(path, patterns, user_details.user)
+
+    def _add_path(self, path: TargetPath, patterns: list[str], user: UserRecord | None) -> None:
+        if any(pattern in self.SERVICE_GLOBS or pattern in self.USER_GLOBS for pattern in patterns):
+            self.trace_files.add((path, user))
+        if any(
+            pattern in self.FILETRANSFER_SERVICE_LOGS or pattern in self.FILETRANSFER_USER_LOGS for pattern in patterns
+        ):
+            self.filetransfer_files.add((path, user))
 
     def check_compatible(self) -> None:
         if not self.trace_files and not self.filetransfer_files:
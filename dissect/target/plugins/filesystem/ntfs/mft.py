@@ -1,9 +1,24 @@
 from __future__ import annotations
 
+import math
+import os
+import pickle
+import tempfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from dataclasses import dataclass, replace
+from operator import itemgetter
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from dissect.ntfs.c_ntfs import FILE_RECORD_SEGMENT_IN_USE
+from dissect.ntfs.c_ntfs import (
+    DEFAULT_RECORD_SIZE,
+    FILE_NUMBER_MFT,
+    FILE_NUMBER_ROOT,
+    FILE_RECORD_SEGMENT_IN_USE,
+)
+from dissect.ntfs.util import segment_reference
+from flow.record import RecordPacker
 from flow.record.fieldtypes import windows_path
 
 from dissect.target.exceptions import UnsupportedPluginError
@@ -19,8 +34,9 @@ from dissect.target.plugins.filesystem.ntfs.utils import (
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterator
+    from concurrent.futures import Future
 
-    from dissect.ntfs import MftRecord
+    from dissect.ntfs import Mft, MftRecord
     from dissect.ntfs.attr import Attribute, FileName, StandardInformation
     from flow.record import Record
     from typing_extensions import Self
@@ -132,6 +148,9 @@ FORMAT_INFO = {
     InformationType.ALTERNATE_DATA_STREAM: ("F", " Is_ADS"),
 }
 
+# The maximum number of MFT segments a worker parses at once in sharded mode
+MFT_SHARD_SIZE = 65536
+
 
 class MftPlugin(Plugin):
     """NTFS MFT plugin."""
@@ -163,6 +182,17 @@ class MftPlugin(Plugin):
     @arg("--fs", type=int, help="optional filesystem index, zero indexed")
     @arg("--start", type=int, default=0, help="the first MFT segment number")
     @arg("--end", type=int, default=-1, help="the last MFT segment number")
+    @arg(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes to parse the MFT with, split into ranges of segments",
+    )
+    @arg(
+        "--ordered",
+        action="store_true",
+        help="with --workers, output records in MFT segment order instead of as they become available",
+    )
     @arg(
         "--macb",
         group="fmt",
@@ -170,7 +200,14 @@ class MftPlugin(Plugin):
         help="compacts MFT timestamps into MACB bitfield (format: MACB[standard|ads]/MACB[filename])",
     )
     def records(
-        self, compact: bool = False, fs: int | None = None, start: int = 0, end: int = -1, macb: bool = False
+        self,
+        compact: bool = False,
+        fs: int | None = None,
+        start: int = 0,
+        end: int = -1,
+        macb: bool = False,
+        workers: int = 1,
+        ordered: bool = False,
     ) -> Iterator[
         FilesystemStdRecord | FilesystemFilenameRecord | FilesystemStdCompactRecord | FilesystemFilenameCompactRecord
     ]:
@@ -184,15 +221,17 @@ class MftPlugin(Plugin):
         available.
         When no drive letter can be determined, the path will show as e.g. ``\\$fs$\\fs0``.
 
+        With ``--workers``, the MFT is split into ranges of segments that are parsed in separate worker processes,
+        which open the target again. The paths of all directories are resolved once up front, so the workers don't
+        have to walk the parent directories of every file. The records are output as they become available, or in
+        MFT segment order with ``--ordered``. This requires a target that can be opened again from its path,
+        otherwise the MFT is parsed in the current process.
+
         References:
             - https://docs.microsoft.com/en-us/windows/win32/fileio/master-file-table
         """
 
         record_formatter = default_formatter
-
-        def noop_aggregator(records: Iterator[Record]) -> Iterator[Record]:
-            yield from records
-
         aggregator = noop_aggregator
 
         if compact:
@@ -200,48 +239,66 @@ class MftPlugin(Plugin):
         elif macb:
             aggregator = macb_aggregator
 
-        filesystems: list[NtfsFilesystem] = []
+        filesystems: list[tuple[int, NtfsFilesystem]] = []
         if fs is not None:
             try:
-                filesystems = [self.ntfs_filesystems[fs]]
+                filesystems = [(fs, self.ntfs_filesystems[fs])]
             except KeyError:
                 self.target.log.error("NTFS filesystem with index number %s does not exist", fs)  # noqa: TRY400
                 return
         else:
-            filesystems = self.ntfs_filesystems.values()
+            filesystems = self.ntfs_filesystems.items()
 
-        for filesystem in filesystems:
+        if workers > 1 and not (isinstance(self.target.path, Path) and self.target.path.exists()):
+            self.target.log.warning("Target can't be opened in worker processes, parsing the MFT without workers")
+            workers = 1
+
+        for index, filesystem in filesystems:
             info = _Info.init(self.target, filesystem)
 
             try:
-                for record in filesystem.ntfs.mft.segments(start, end):
-                    try:
-                        info.update(record, filesystem)
-
-                        for path in record.full_paths():
-                            path = f"{info.drive_letter}{path}"
-                            yield from aggregator(
-                                iter_records(
-                                    record=record,
-                                    segment=record.segment,
-                                    path=path,
-                                    owner=info.owner,
-                                    size=info.size,
-                                    resident=info.resident,
-                                    inuse=info.in_use,
-                                    drive_letter=info.drive_letter,
-                                    volume_uuid=info.volume_uuid,
-                                    record_formatter=record_formatter,
-                                    target=self.target,
-                                )
-                            )
-                    except Exception as e:  # noqa: PERF203
-                        self.target.log.warning("An error occured parsing MFT segment %d: %s", record.segment, str(e))
-                        self.target.log.debug("", exc_info=e)
-
+                if workers > 1:
+                    yield from self._sharded_records(
+                        index, filesystem, info, start, end, record_formatter, aggregator, workers, ordered
+                    )
+                else:
+                    yield from iter_mft_records(
+                        self.target,
+                        filesystem,
+                        info,
+                        filesystem.ntfs.mft.segments(start, end),
+                        record_formatter,
+                        aggregator,
+                    )
             except Exception:
                 self.target.log.exception("An error occured constructing FilesystemRecords")
 
+    def _sharded_records(
+        self,
+        index: int,
+        filesystem: NtfsFilesystem,
+        info: _Info,
+        start: int,
+        end: int,
+        record_formatter: Callable,
+        aggregator: Callable[[Iterator[Record]], Iterator[Record]],
+        workers: int,
+        ordered: bool,
+    ) -> Iterator[Record]:
+        with ShardedMftParser(self.target, index, info, record_formatter, aggregator, workers) as parser:
+            try:
+                parser.prepare()
+            except Exception as e:
+                self.target.log.warning("Unable to parse the MFT with workers, parsing it without workers: %s", e)
+                self.target.log.debug("", exc_info=e)
+            else:
+                yield from parser.records(start, end, ordered)
+                return
+
+        yield from iter_mft_records(
+            self.target, filesystem, info, filesystem.ntfs.mft.segments(start, end), record_formatter, aggregator
+        )
+
     # Make calling the `mft` namespace backwards compatible with the old `mft` function
     __call__ = records
 
@@ -408,6 +465,7 @@ def iter_records(
     volume_uuid: str,
     record_formatter: Callable,
     target: Target,
+    resolve_path: Callable[[FileName], str] | None = None,
 ) -> Iterator[Record]:
     for attr in record.attributes.STANDARD_INFORMATION:
         yield from record_formatter(
@@ -424,7 +482,7 @@ def iter_records(
         )
 
     for idx, attr in enumerate(record.attributes.FILE_NAME):
-        filepath = f"{drive_letter}{attr.full_path()}"
+        filepath = f"{drive_letter}{resolve_path(attr) if resolve_path else attr.full_path()}"
 
         yield from record_formatter(
             attr=attr,
@@ -465,6 +523,344 @@ def iter_records(
         )
 
 
+def iter_mft_records(
+    target: Target,
+    filesystem: NtfsFilesystem,
+    info: _Info,
+    segments: Iterator[MftRecord],
+    record_formatter: Callable,
+    aggregator: Callable[[Iterator[Record]], Iterator[Record]],
+    resolve_path: Callable[[FileName], str] | None = None,
+) -> Iterator[Record]:
+    """Yield the records of the given MFT segments.
+
+    Args:
+        target: The target the filesystem belongs to.
+        filesystem: The NTFS filesystem of the MFT segments.
+        info: The filesystem information of the records, updated for every segment.
+        segments: The MFT segments to yield the records of.
+        record_formatter: The formatter to create the records of a single attribute with.
+        aggregator: The aggregator of the records of a single path.
+        resolve_path: An optional function to resolve the full path of a ``$FILE_NAME`` attribute with.
+    """
+    for record in segments:
+        try:
+            info.update(record, filesystem)
+
+            if resolve_path:
+                paths = [(attr.flags, resolve_path(attr)) for attr in record.attributes.FILE_NAME]
+                paths = [path for _, path in sorted(paths, key=itemgetter(0))]
+            else:
+                paths = record.full_paths()
+
+            for path in paths:
+                path = f"{info.drive_letter}{path}"
+                yield from aggregator(
+                    iter_records(
+                        record=record,
+                        segment=record.segment,
+                        path=path,
+                        owner=info.owner,
+                        size=info.size,
+                        resident=info.resident,
+                        inuse=info.in_use,
+                        drive_letter=info.drive_letter,
+                        volume_uuid=info.volume_uuid,
+                        record_formatter=record_formatter,
+                        target=target,
+                        resolve_path=resolve_path,
+                    )
+                )
+        except Exception as e:  # noqa: PERF203
+            target.log.warning("An error occured parsing MFT segment %d: %s", record.segment, str(e))
+            target.log.debug("", exc_info=e)
+
+
+def get_last_segment(mft: Mft) -> int:
+    """Return the number of the last segment of an MFT, like :meth:`~dissect.ntfs.mft.Mft.segments` determines it."""
+    record_size = mft.ntfs._record_size if mft.ntfs else DEFAULT_RECORD_SIZE
+    return mft.get(FILE_NUMBER_MFT).size() // record_size
+
+
+def shard_ranges(start: int, end: int, shard_size: int) -> list[tuple[int, int]]:
+    """Split the inclusive range of segments from ``start`` to ``end`` into ranges of at most ``shard_size`` segments.
+
+    The ranges are returned in the order of the segments, which is descending if ``start`` is larger than ``end``.
+    """
+    step = 1 if start <= end else -1
+
+    ranges = []
+    for shard_start in range(start, end + step, shard_size * step):
+        shard_end = shard_start + (shard_size - 1) * step
+        ranges.append((shard_start, min(shard_end, end) if step == 1 else max(shard_end, end)))
+
+    return ranges
+
+
+def resolve_directory_paths(directories: dict[int, tuple[int, str, int, int]]) -> dict[int, tuple[int, str]]:
+    """Resolve the full paths of directories in an MFT.
+
+    The paths are resolved the same way :meth:`~dissect.ntfs.attr.FileName.full_path` does, but every directory is
+    only visited once. Directories of which the path can't be resolved from the given directories alone, like those
+    with a parent that is not a directory or that have a cyclic parent reference, are left out.
+
+    Args:
+        directories: A mapping of segment numbers of directories to their sequence number, file name and the segment
+                     and sequence number of their parent directory.
+
+    Returns:
+        A mapping of segment numbers of directories to their sequence number and full path.
+    """
+    paths: dict[int, str | None] = {}
+
+    for segment in directories:
+        chain = []
+        seen = set()
+        current = segment
+
+        while current not in paths:
+            if current in seen:
+                base = None
+                break
+
+            seen.add(current)
+            chain.append(current)
+
+            _, _, parent_segment, parent_sequence = directories[current]
+            if parent_segment == FILE_NUMBER_ROOT:
+                base = ""
+                break
+
+            if (parent := directories.get(parent_segment)) is None:
+                base = None
+                break
+
+            if parent[0] != parent_sequence:
+                base = f"<broken_reference_0x{parent_segment:x}#{parent_sequence}>"
+                break
+
+            current = parent_segment
+        else:
+            base = paths[current]
+
+        for current in reversed(chain):
+            name = directories[current][1]
+            if base is not None:
+                base = f"{base}\\{name}" if base else name
+            paths[current] = base
+
+    return {segment: (directories[segment][0], path) for segment, path in paths.items() if path is not None}
+
+
+# The state of a worker process of a ShardedMftParser
+_shard_worker: dict[str, Any] = {}
+
+
+def _init_shard_worker(
+    path: Path,
+    index: int,
+    serial: int,
+    info: _Info,
+    record_formatter: Callable,
+    aggregator: Callable[[Iterator[Record]], Iterator[Record]],
+) -> None:
+    from dissect.target.target import Target
+
+    target = Target.open(path)
+    filesystem = target.filesystems[index]
+    if filesystem.__type__ != "ntfs" or filesystem.ntfs.serial != serial:
+        raise ValueError(f"Filesystem with index {index} is not the same NTFS filesystem in the worker process")
+
+    _shard_worker.update(
+        target=target,
+        filesystem=filesystem,
+        info=info,
+        record_formatter=record_formatter,
+        aggregator=aggregator,
+        directories={},
+        directories_path=None,
+        packer=RecordPacker(),
+    )
+
+
+def _collect_directories(start: int, end: int) -> list[tuple[int, int, str, int, int]]:
+    result = []
+
+    for record in _shard_worker["filesystem"].ntfs.mft.segments(start, end):
+        try:
+            if not record.is_dir() or not record.filename:
+                continue
+
+            parent = record.attributes.FILE_NAME.attr.ParentDirectory
+            result.append(
+                (
+                    record.segment,
+                    int(record.header.SequenceNumber),
+                    str(record.filename),
+                    int(segment_reference(parent)),
+                    int(parent.SequenceNumber),
+                )
+            )
+        except Exception:
+            continue
+
+    return result
+
+
+def _resolve_path(attr: FileName) -> str:
+    parent = attr.attr.ParentDirectory
+    parent_segment = segment_reference(parent)
+    if parent_segment == FILE_NUMBER_ROOT:
+        return attr.file_name
+
+    if (directory := _shard_worker["directories"].get(parent_segment)) is None:
+        return attr.full_path()
+
+    sequence, path = directory
+    if sequence != parent.SequenceNumber:
+        return f"<broken_reference_0x{parent_segment:x}#{parent.SequenceNumber}>\\{attr.file_name}"
+
+    return f"{path}\\{attr.file_name}"
+
+
+def _parse_shard(start: int, end: int, directories_path: str) -> list[bytes]:
+    state = _shard_worker
+
+    if state["directories_path"] != directories_path:
+        with Path(directories_path).open("rb") as fh:
+            state["directories"] = pickle.load(fh)
+        state["directories_path"] = directories_path
+
+    filesystem = state["filesystem"]
+    records = iter_mft_records(
+        state["target"],
+        filesystem,
+        replace(state["info"]),
+        filesystem.ntfs.mft.segments(start, end),
+        state["record_formatter"],
+        state["aggregator"],
+        resolve_path=_resolve_path,
+    )
+
+    return [state["packer"].pack(record) for record in records]
+
+
+class ShardedMftParser:
+    """Parse the MFT of an NTFS filesystem of a target in multiple worker processes.
+
+    Every worker process opens the target from its path again. The MFT is split into ranges of segments, which are
+    parsed by the workers. The full paths of the directories are resolved once in :meth:`prepare`, so the workers
+    only have to look up the parent directory of a file to determine its path.
+
+    Args:
+        target: The target to parse the MFT of, which must be able to be opened again from its path.
+        index: The index of the NTFS filesystem in the filesystems of the target.
+        info: The filesystem information of the records.
+        record_formatter: The formatter to create the records of a single attribute with.
+        aggregator: The aggregator of the records of a single path.
+        workers: The number of worker processes.
+    """
+
+    def __init__(
+        self,
+        target: Target,
+        index: int,
+        info: _Info,
+        record_formatter: Callable,
+        aggregator: Callable[[Iterator[Record]], Iterator[Record]],
+        workers: int,
+    ):
+        self.target = target
+        self.filesystem: NtfsFilesystem = target.filesystems[index]
+        self.workers = workers
+
+        self.directories: dict[int, tuple[int, str]] | None = None
+        self._directories_path = None
+
+        self._packer = RecordPacker()
+        for descriptor in (*RECORD_TYPES.values(), *COMPACT_RECORD_TYPES.values(), FilesystemMACBRecord):
+            self._packer.register(descriptor)
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_shard_worker,
+            initargs=(target.path, index, self.filesystem.ntfs.serial, info, record_formatter, aggregator),
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+        if self._directories_path:
+            Path(self._directories_path).unlink(missing_ok=True)
+            self._directories_path = None
+
+    def prepare(self) -> None:
+        """Collect the directories of the MFT in the worker processes and resolve their full paths."""
+        last_segment = get_last_segment(self.filesystem.ntfs.mft)
+
+        directories = {}
+        for result in self._map(_collect_directories, self._shards(0, last_segment), ordered=False):
+            for segment, *values in result:
+                directories[segment] = tuple(values)
+
+        self.directories = resolve_directory_paths(directories)
+
+        fd, self._directories_path = tempfile.mkstemp(prefix="mft-directories-", suffix=".pickle")
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(self.directories, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def records(self, start: int = 0, end: int = -1, ordered: bool = False) -> Iterator[Record]:
+        """Yield the records of the MFT segments from ``start`` to ``end``.
+
+        Args:
+            start: The first MFT segment number, ``-1`` for the last segment.
+            end: The last MFT segment number, ``-1`` for the last segment.
+            ordered: Whether to yield the records in MFT segment order instead of as they become available.
+        """
+        if self.directories is None:
+            self.prepare()
+
+        last_segment = get_last_segment(self.filesystem.ntfs.mft)
+        start = last_segment if start == -1 else start
+        end = last_segment if end == -1 else end
+
+        for result in self._map(_parse_shard, self._shards(start, end), self._directories_path, ordered=ordered):
+            for packed in result:
+                yield self._packer.unpack(packed)
+
+    def _shards(self, start: int, end: int) -> list[tuple[int, int]]:
+        # Use enough shards to keep all workers busy, even with a small MFT
+        shard_size = math.ceil((abs(end - start) + 1) / (self.workers * 4))
+        return shard_ranges(start, end, max(1, min(shard_size, MFT_SHARD_SIZE)))
+
+    def _map(self, func: Callable, shards: list[tuple[int, int]], *args, ordered: bool = False) -> Iterator[Any]:
+        # Limit the amount of shards that are submitted at once, so finished shards don't pile up in memory
+        shards = iter(shards)
+        pending: deque[Future] = deque()
+
+        def submit() -> None:
+            while len(pending) < self.workers * 2 and (shard := next(shards, None)) is not None:
+                pending.append(self._executor.submit(func, *shard, *args))
+
+        submit()
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = next(future for future in pending if future in done)
+                pending.remove(future)
+
+            yield future.result()
+            submit()
+
+
 def compact_formatter(
     attr: Attribute, record_type: InformationType, **kwargs
 ) -> Iterator[FilesystemStdCompactRecord | FilesystemFilenameCompactRecord]:
@@ -491,6 +887,10 @@ def default_formatter(
         yield record_desc(ts=timestamp, ts_type=type, **kwargs)
 
 
+def noop_aggregator(records: Iterator[Record]) -> Iterator[Record]:
+    yield from records
+
+
 def macb_aggregator(records: Iterator[Record]) -> Iterator[Record]:
     def macb_set(bitfield: str, index: int, letter: str) -> str:
         return bitfield[:index] + letter + bitfield[index + 1 :]
@@ -5,13 +5,18 @@ from typing import TYPE_CHECKING
 from dissect.ntfs.util import segment_reference
 
 from dissect.target.exceptions import UnsupportedPluginError
-from dissect.target.helpers.record import TargetRecordDescriptor
+from dissect.target.helpers.record import BatchedRecords, TargetRecordDescriptor, batched
 from dissect.target.plugin import Plugin, export
 from dissect.target.plugins.filesystem.ntfs.utils import get_drive_letter
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+    from dissect.ntfs.usnjrnl import UsnJrnl
+
+    from dissect.target.filesystem import Filesystem
+    from dissect.target.helpers.record import RecordBatch
+
 UsnjrnlRecord = TargetRecordDescriptor(
     "filesystem/ntfs/usnjrnl",
     [
@@ -53,7 +58,9 @@ class UsnjrnlPlugin(Plugin):
             - https://en.wikipedia.org/wiki/USN_Journal
             - https://velociraptor.velocidex.com/the-windows-usn-journal-f0c55c9010e
         """
-        target = self.target
+        return BatchedRecords(self._batches())
+
+    def _batches(self) -> Iterator[RecordBatch]:
         for fs in self.target.filesystems:
             if fs.__type__ != "ntfs":
                 continue
@@ -62,37 +69,41 @@ class UsnjrnlPlugin(Plugin):
             if not usnjrnl:
                 continue
 
-            # If this filesystem is a "fake" NTFS filesystem, used to enhance a
-            # VirtualFilesystem, The driveletter (more accurate mount point)
-            # returned will be that of the VirtualFilesystem. This makes sure
-            # the paths returned in the records are actually reachable.
-            drive_letter = get_drive_letter(self.target, fs)
-            for record in usnjrnl.records():
+            yield from batched(UsnjrnlRecord, self._rows(fs, usnjrnl), _target=self.target)
+
+    def _rows(self, fs: Filesystem, usnjrnl: UsnJrnl) -> Iterator[dict]:
+        target = self.target
+
+        # If this filesystem is a "fake" NTFS filesystem, used to enhance a
+        # VirtualFilesystem, The driveletter (more accurate mount point)
+        # returned will be that of the VirtualFilesystem. This makes sure
+        # the paths returned in the records are actually reachable.
+        drive_letter = get_drive_letter(self.target, fs)
+        for record in usnjrnl.records():
+            try:
+                ts = None
                 try:
-                    ts = None
-                    try:
-                        ts = record.timestamp
-                    except ValueError as e:
-                        target.log.error(  # noqa: TRY400
-                            "Error occured during parsing of timestamp in usnjrnl: %x", record.record.TimeStamp
-                        )
-                        target.log.debug("", exc_info=e)
-
-                    path = f"{drive_letter}{record.full_path}"
-                    segment = segment_reference(record.record.FileReferenceNumber)
-                    yield UsnjrnlRecord(
-                        ts=ts,
-                        usn=record.Usn,
-                        segment_id=f"{segment}#{record.FileReferenceNumber.SequenceNumber}",
-                        path=self.target.fs.path(path),
-                        reason=str(record.Reason).replace("USN_REASON.", ""),
-                        security_id=record.SecurityId,
-                        source=str(record.SourceInfo).replace("USN_SOURCE.", ""),
-                        attr=str(record.FileAttributes).replace("FILE_ATTRIBUTE.", ""),
-                        major=record.MajorVersion,
-                        minor=record.MinorVersion,
-                        _target=target,
+                    ts = record.timestamp
+                except ValueError as e:
+                    target.log.error(  # noqa: TRY400
+                        "Error occured during parsing of timestamp in usnjrnl: %x", record.record.TimeStamp
                     )
-                except Exception as e:  # noqa: PERF203
-                    target.log.error("Error during processing of usnjrnl record: %s", record.record)  # noqa: TRY400
                     target.log.debug("", exc_info=e)
+
+                path = f"{drive_letter}{record.full_path}"
+                segment = segment_reference(record.record.FileReferenceNumber)
+                yield {
+                    "ts": ts,
+                    "usn": record.Usn,
+                    "segment_id": f"{segment}#{record.FileReferenceNumber.SequenceNumber}",
+                    "path": self.target.fs.path(path),
+                    "reason": str(record.Reason).replace("USN_REASON.", ""),
+                    "security_id": record.SecurityId,
+                    "source": str(record.SourceInfo).replace("USN_SOURCE.", ""),
+                    "attr": str(record.FileAttributes).replace("FILE_ATTRIBUTE.", ""),
+                    "major": record.MajorVersion,
+                    "minor": record.MinorVersion,
+                }
+            except Exception as e:  # noqa: PERF203
+                target.log.error("Error during processing of usnjrnl record: %s", record.record)  # noqa: TRY400
+                target.log.debug("", exc_info=e)
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 
 from dissect.target.exceptions import UnsupportedPluginError
 from dissect.target.helpers.record import TargetRecordDescriptor
+from dissect.target.helpers.sharedwalk import WalkConsumer, WalkResult
 from dissect.target.plugin import Plugin, export
 
 if TYPE_CHECKING:
@@ -103,10 +104,14 @@ class CapabilityPlugin(Plugin):
         References:
             - https://github.com/torvalds/linux/blob/master/include/uapi/linux/capability.h
         """
+        return WalkResult(CapabilityConsumer(self.target))
 
-        for entry in self.target.fs.recurse("/"):
-            if not entry.is_file(follow_symlinks=False):
-                continue
+
+class CapabilityConsumer(WalkConsumer):
+    """Generate :class:`CapabilityRecord` for the files of a (shared) filesystem walk."""
+
+    def consume(self, entry: FilesystemEntry) -> Iterator[CapabilityRecord]:
+        if entry.is_file(follow_symlinks=False):
             yield from parse_entry(entry, self.target)
 
 
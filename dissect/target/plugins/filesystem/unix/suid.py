@@ -5,12 +5,15 @@ from typing import TYPE_CHECKING
 
 from dissect.target.exceptions import UnsupportedPluginError
 from dissect.target.helpers.record import TargetRecordDescriptor
+from dissect.target.helpers.sharedwalk import WalkResult
 from dissect.target.plugin import Plugin, export
-from dissect.target.plugins.filesystem.walkfs import FilesystemRecord
+from dissect.target.plugins.filesystem.walkfs import FilesystemRecord, WalkFsConsumer
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+    from dissect.target.filesystem import FilesystemEntry
+
 SuidRecord = TargetRecordDescriptor(
     "filesystem/unix/suid",
     FilesystemRecord.target_fields,
@@ -35,9 +38,19 @@ class SuidPlugin(Plugin):
         References:
             - https://steflan-security.com/linux-privilege-escalation-suid-binaries/
         """
-        for record in self.target.walkfs():
-            if record.mode & stat.S_ISUID:
-                yield SuidRecord(
-                    **record._asdict(),
-                    _target=self.target,
-                )
+        return WalkResult(SuidConsumer(self.target))
+
+
+class SuidConsumer(WalkFsConsumer):
+    """Generate :class:`SuidRecord` for the SUID binaries of a (shared) filesystem walk."""
+
+    def consume(self, entry: FilesystemEntry) -> Iterator[SuidRecord]:
+        # Only generate the complete walkfs record of SUID binaries
+        if not entry.lstat().st_mode & stat.S_ISUID:
+            return
+
+        for record in super().consume(entry):
+            yield SuidRecord(
+                **record._asdict(),
+                _target=self.target,
+            )
@@ -8,6 +8,7 @@ from dissect.util.ts import from_unix
 from dissect.target.exceptions import FileNotFoundError, UnsupportedPluginError
 from dissect.target.filesystem import FilesystemEntry, LayerFilesystemEntry
 from dissect.target.helpers.record import TargetRecordDescriptor
+from dissect.target.helpers.sharedwalk import WalkConsumer, WalkResult
 from dissect.target.plugin import Plugin, arg, export
 from dissect.target.plugins.filesystem.unix.capability import parse_entry as parse_capability_entry
 
@@ -79,26 +80,38 @@ class WalkFsPlugin(Plugin):
             fs_types (string[]): list of filesystem type(s) of the entry.
         """
 
-        path = self.target.fs.path(walkfs_path)
+        return WalkResult(WalkFsConsumer(self.target, walkfs_path, capability))
+
+
+class WalkFsConsumer(WalkConsumer):
+    """Generate :class:`FilesystemRecord` for every entry of a (shared) filesystem walk."""
+
+    def __init__(self, target: Target, path: str = "/", capability: bool = False):
+        super().__init__(target, path)
+        self.capability = capability
+
+    def start(self) -> bool:
+        path = self.target.fs.path(self.path)
 
         if not path.exists():
-            self.target.log.error("No such directory: '%s'", walkfs_path)
-            return
+            self.target.log.error("No such directory: '%s'", self.path)
+            return False
 
         if not path.is_dir():
-            self.target.log.error("Not a directory: '%s'", walkfs_path)
-            return
-
-        for entry in self.target.fs.recurse(walkfs_path):
-            try:
-                yield from generate_record(self.target, entry, capability)
-            except FileNotFoundError as e:  # noqa: PERF203
-                self.target.log.warning("File not found: %s", entry)
-                self.target.log.debug("", exc_info=e)
-            except Exception as e:
-                self.target.log.warning("Exception generating walkfs record for %s: %s", entry, e)
-                self.target.log.debug("", exc_info=e)
-                continue
+            self.target.log.error("Not a directory: '%s'", self.path)
+            return False
+
+        return True
+
+    def consume(self, entry: FilesystemEntry) -> Iterator[FilesystemRecord]:
+        try:
+            yield from generate_record(self.target, entry, self.capability)
+        except FileNotFoundError as e:
+            self.target.log.warning("File not found: %s", entry)
+            self.target.log.debug("", exc_info=e)
+        except Exception as e:
+            self.target.log.warning("Exception generating walkfs record for %s: %s", entry, e)
+            self.target.log.debug("", exc_info=e)
 
 
 def generate_record(target: Target, entry: FilesystemEntry, capability: bool) -> Iterator[FilesystemRecord]:
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import hashlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from io import BytesIO
 from pathlib import Path
 
@@ -19,10 +21,15 @@ from typing import TYPE_CHECKING
 
 from dissect.target.exceptions import FileNotFoundError, UnsupportedPluginError
 from dissect.target.helpers.record import TargetRecordDescriptor
+from dissect.target.helpers.sharedwalk import WalkConsumer, WalkResult
 from dissect.target.plugin import Plugin, arg, export
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
+
+    from dissect.target.filesystem import FilesystemEntry
+    from dissect.target.helpers.fsutil import stat_result
+    from dissect.target.target import Target
 
 
 log = get_logger(__name__)
@@ -40,7 +47,14 @@ YaraMatchRecord = TargetRecordDescriptor(
     ],
 )
 
-DEFAULT_MAX_SCAN_SIZE = 10 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 10 * 1024 * 1024
+DEFAULT_SCAN_WORKERS = 4
+
+# Max. number of bytes that are read ahead of the scanning threads
+MAX_IN_FLIGHT = 256 * 1024 * 1024
+
+# Number of bytes that consecutive chunks of a large file overlap, so strings on the boundary of a chunk are matched
+CHUNK_OVERLAP = 1024 * 1024
 
 
 class YaraPlugin(Plugin):
@@ -52,72 +66,294 @@ class YaraPlugin(Plugin):
 
     @arg("-r", "--rules", required=True, nargs="*", help="path(s) to YARA rule file(s) or folder(s)")
     @arg("-p", "--path", default="/", help="path on target(s) to recursively scan")
-    @arg("-m", "--max-size", type=int, default=DEFAULT_MAX_SCAN_SIZE, help="maximum file size in bytes to scan")
+    @arg(
+        "-m",
+        "--max-size",
+        type=int,
+        help="maximum file size in bytes to scan, files of any size are scanned by default",
+    )
     @arg("-c", "--check", action="store_true", help="check if every YARA rule is valid")
+    @arg("--workers", type=int, default=DEFAULT_SCAN_WORKERS, help="number of threads to scan files with")
+    @arg(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="maximum number of bytes to scan at once, larger files are scanned in chunks",
+    )
     @export(record=YaraMatchRecord)
     def yara(
         self,
         rules: list[str | Path],
         path: str = "/",
-        max_size: int = DEFAULT_MAX_SCAN_SIZE,
+        max_size: int | None = None,
         check: bool = False,
+        workers: int = DEFAULT_SCAN_WORKERS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
     ) -> Iterator[YaraMatchRecord]:
-        """Scan files inside the target up to a given maximum size with YARA rule file(s).
+        """Scan files inside the target with YARA rule file(s).
+
+        Files are matched on multiple threads while the filesystem is walked. Files larger than ``chunk_size`` are
+        matched in overlapping chunks of ``chunk_size`` bytes. Conditions on the size of a file or the offset of a
+        string are evaluated per chunk for those files.
 
         Args:
             rules: ``list`` of strings or ``Path`` objects pointing to rule files to use.
             path: ``string`` of absolute target path to scan.
-            max_size: Files larger than this size will not be scanned.
+            max_size: Files larger than this size will not be scanned, ``None`` scans files of any size.
             check: Check if provided rules are valid, only compiles valid rules.
+            workers: The number of threads to match files with, ``0`` matches files on the calling thread.
+            chunk_size: Files larger than this size are scanned in chunks of this size.
 
         Returns:
             Iterator yields ``YaraMatchRecord``.
         """
 
-        compiled_rules = process_rules(rules, check)
+        return WalkResult(YaraConsumer(self.target, rules, path, max_size, check, workers, chunk_size))
 
-        if not rules:
-            self.target.log.error("No working rules found in '%s'", ",".join(rules))
-            return
 
-        if hasattr(compiled_rules, "warnings") and (num_warns := len(compiled_rules.warnings)) > 0:
+class YaraConsumer(WalkConsumer):
+    """Scan the files of a (shared) filesystem walk with YARA rules."""
+
+    def __init__(
+        self,
+        target: Target,
+        rules: list[str | Path],
+        path: str = "/",
+        max_size: int | None = None,
+        check: bool = False,
+        workers: int = DEFAULT_SCAN_WORKERS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        super().__init__(target, path)
+        self.rules = rules
+        self.max_size = max_size
+        self.check = check
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.compiled_rules = None
+        self.scanner = None
+
+    def start(self) -> bool:
+        self.compiled_rules = process_rules(self.rules, self.check)
+
+        if not self.rules:
+            self.target.log.error("No working rules found in '%s'", ",".join(self.rules))
+            return False
+
+        if hasattr(self.compiled_rules, "warnings") and (num_warns := len(self.compiled_rules.warnings)) > 0:
             self.target.log.warning("YARA generated %s warnings while compiling rules", num_warns)
-            for warning in compiled_rules.warnings:
+            for warning in self.compiled_rules.warnings:
                 self.target.log.info(warning)
 
-        self.target.log.warning("Will not scan files larger than %s MB", max_size // 1024 // 1024)
-
-        for _, _, files in self.target.fs.walk_ext(path):
-            for file in files:
-                try:
-                    if (file_size := file.stat().st_size) > max_size:
-                        self.target.log.info("Not scanning file of %s MB: '%s'", (file_size // 1024 // 1024), file)
-                        continue
-
-                    buf = file.open().read()
-                    for match in compiled_rules.match(data=buf):
-                        string_matches: list[str] = []
-                        for string in match.strings:
-                            string_matches.extend(f"{string}={instance}" for instance in string.instances)
-
-                        yield YaraMatchRecord(
-                            ts_mtime=file.stat().st_mtime,
-                            path=self.target.fs.path(file.path),
-                            rule=match.rule,
-                            matches=string_matches,
-                            tags=match.tags,
-                            digest=hashutil.common(BytesIO(buf)),
-                            namespace=match.namespace,
-                            _target=self.target,
-                        )
-
-                except FileNotFoundError:
-                    continue
-                except RuntimeWarning as e:
-                    self.target.log.warning("Runtime warning while scanning file '%s': %s", file, e)
-                except Exception as e:
-                    self.target.log.error("Exception scanning file '%s'", file)  # noqa: TRY400
-                    self.target.log.debug("", exc_info=e)
+        if self.max_size is not None:
+            self.target.log.warning("Will not scan files larger than %s MB", self.max_size // 1024 // 1024)
+        self.target.log.info("Scanning files larger than %s MB in chunks", self.chunk_size // 1024 // 1024)
+        self.scanner = YaraScanner(self.target, self.compiled_rules, self.chunk_size, self.workers)
+        return True
+
+    def consume(self, entry: FilesystemEntry) -> Iterator[YaraMatchRecord]:
+        # Scan the same entries as a walk_ext() of the path, which lists symlinks to directories as directories
+        if entry.is_dir():
+            return
+
+        try:
+            st = entry.stat()
+            if self.max_size is not None and st.st_size > self.max_size:
+                self.target.log.info("Not scanning file of %s MB: '%s'", (st.st_size // 1024 // 1024), entry)
+                return
+
+            yield from self.scanner.scan(entry, st)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            self.target.log.error("Exception scanning file '%s'", entry)  # noqa: TRY400
+            self.target.log.debug("", exc_info=e)
+
+    def finish(self) -> Iterator[YaraMatchRecord]:
+        yield from self.scanner.close()
+
+
+class YaraScanner:
+    """Matches files with YARA rules on a pool of threads, producing the matches in the order of the files.
+
+    The files are read by the thread that calls :meth:`scan`, since the filesystems of a target aren't thread-safe.
+    The worker threads match the data of the files and compute the digests of matching files, both of which release
+    the GIL. At most ``max_in_flight`` bytes are read ahead of the workers, after which :meth:`scan` waits for the
+    oldest files, or the oldest chunks of the file that is being read, to be matched.
+
+    Args:
+        target: The target the files belong to.
+        rules: The compiled YARA rules to match.
+        chunk_size: The maximum number of bytes to match at once, larger files are matched in chunks.
+        workers: The number of worker threads, ``0`` matches files on the calling thread.
+        max_in_flight: The maximum number of bytes that have been read but not matched yet.
+    """
+
+    def __init__(
+        self,
+        target: Target,
+        rules: yara.Rules,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = DEFAULT_SCAN_WORKERS,
+        max_in_flight: int = MAX_IN_FLIGHT,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1 byte")
+
+        self.target = target
+        self.rules = rules
+        self.chunk_size = chunk_size
+        self.overlap = min(CHUNK_OVERLAP, chunk_size // 2)
+        self.max_in_flight = max_in_flight
+
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="yara") if workers > 0 else None
+        self._pending: deque[_PendingScan] = deque()
+        self._in_flight = 0
+
+    def scan(self, entry: FilesystemEntry, st: stat_result | None = None) -> Iterator[YaraMatchRecord]:
+        """Submit a file to be matched, returns the matches of the files before it that have been matched.
+
+        Args:
+            entry: The file to match.
+            st: The stat result of ``entry``, if it's already known.
+        """
+        scan = _PendingScan(entry, st or entry.stat())
+        self._pending.append(scan)
+
+        try:
+            yield from self._read(scan)
+        except Exception:
+            # Don't report the matches of a file that couldn't be read completely
+            self._pending.remove(scan)
+            self._in_flight -= scan.in_flight
+            raise
+
+        yield from self._collect(wait=False)
+
+    def _read(self, scan: _PendingScan) -> Iterator[YaraMatchRecord]:
+        # Some files don't know their size, so the file is read until the end instead of up to its size
+        size = scan.stat.st_size
+        offset = 0
+        with scan.entry.open() as fh:
+            while True:
+                yield from self._wait(scan, min(self.chunk_size, size - offset) if size else self.chunk_size)
+
+                fh.seek(offset)
+                buf = fh.read(self.chunk_size)
+                last = len(buf) < self.chunk_size or (size and offset + len(buf) >= size)
+
+                # The digest of a file that is read at once is computed by the worker, so it's read only once
+                scan.futures.append(self._submit(self._match, offset, buf, offset == 0 and last))
+                scan.sizes.append(len(buf))
+                self._in_flight += len(buf)
+
+                if last:
+                    break
+                offset += self.chunk_size - self.overlap
+
+    def close(self) -> Iterator[YaraMatchRecord]:
+        """Return the matches of all remaining files and stop the worker threads."""
+        yield from self._collect(wait=True)
+
+        if self._executor:
+            self._executor.shutdown()
+
+    def _submit(self, func: Callable, *args) -> Future:
+        if self._executor:
+            return self._executor.submit(func, *args)
+
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _match(self, offset: int, buf: bytes, whole: bool) -> tuple[int, list[yara.Match], tuple[str] | None]:
+        matches = self.rules.match(data=buf)
+        return offset, matches, hashutil.common(BytesIO(buf)) if matches and whole else None
+
+    def _wait(self, scan: _PendingScan, size: int) -> Iterator[YaraMatchRecord]:
+        # Make room for the next read by finishing the oldest files first, then the oldest chunks of the current file
+        while self._in_flight + size > self.max_in_flight:
+            if self._pending[0] is not scan:
+                yield from self._finish(self._pending.popleft())
+            elif scan.released < len(scan.futures):
+                # The data of a chunk is released once it has been matched, its result is kept until the file is done
+                wait([scan.futures[scan.released]])
+                self._in_flight -= scan.sizes[scan.released]
+                scan.released += 1
+            else:
+                break
+
+    def _collect(self, wait: bool) -> Iterator[YaraMatchRecord]:
+        while self._pending and (wait or self._pending[0].done()):
+            yield from self._finish(self._pending.popleft())
+
+    def _finish(self, scan: _PendingScan) -> Iterator[YaraMatchRecord]:
+        self._in_flight -= scan.in_flight
+
+        try:
+            matches = self._combine(scan)
+        except RuntimeWarning as e:
+            self.target.log.warning("Runtime warning while scanning file '%s': %s", scan.entry, e)
+            return
+        except Exception as e:
+            self.target.log.error("Exception scanning file '%s'", scan.entry)  # noqa: TRY400
+            self.target.log.debug("", exc_info=e)
+            return
+
+        for match, string_matches, digest in matches:
+            yield YaraMatchRecord(
+                ts_mtime=scan.stat.st_mtime,
+                path=self.target.fs.path(scan.entry.path),
+                rule=match.rule,
+                matches=string_matches,
+                tags=match.tags,
+                digest=digest,
+                namespace=match.namespace,
+                _target=self.target,
+            )
+
+    def _combine(self, scan: _PendingScan) -> list[tuple[yara.Match, list[str], tuple[str]]]:
+        # Combine the matches of all chunks, strings in the overlap of two chunks are matched twice
+        rules: dict[tuple[str, str], tuple[yara.Match, list[str]]] = {}
+        seen = set()
+        digest = None
+        for offset, matches, chunk_digest in (future.result() for future in scan.futures):
+            digest = digest or chunk_digest
+            for match in matches:
+                _, string_matches = rules.setdefault((match.namespace, match.rule), (match, []))
+                for string in match.strings:
+                    for instance in string.instances:
+                        if (key := (match.namespace, match.rule, string.identifier, offset + instance.offset)) in seen:
+                            continue
+                        seen.add(key)
+                        string_matches.append(f"{string}={instance}")
+
+        if rules and digest is None:
+            with scan.entry.open() as fh:
+                digest = hashutil.common(fh)
+
+        return [(match, string_matches, digest) for match, string_matches in rules.values()]
+
+
+class _PendingScan:
+    def __init__(self, entry: FilesystemEntry, stat: stat_result):
+        self.entry = entry
+        self.stat = stat
+        self.futures: list[Future] = []
+        self.sizes: list[int] = []
+        # The number of chunks of which the data is no longer counted as in flight
+        self.released = 0
+
+    @property
+    def in_flight(self) -> int:
+        """The number of bytes of this file that are counted as in flight."""
+        return sum(self.sizes[self.released :])
+
+    def done(self) -> bool:
+        return all(future.done() for future in self.futures)
 
 
 def process_rules(paths: list[str | Path], check: bool = False) -> yara.Rules | None:
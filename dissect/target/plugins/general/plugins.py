@@ -58,25 +58,11 @@ def generate_functions_json(functions: list[plugin.FunctionDescriptor] | None =
     failed = []
 
     for desc in functions or _get_default_functions():
-        docstring = desc.func.__doc__.split("\n\n", 1)[0].strip() if desc.func.__doc__ else None
-        arguments = []
-
-        for name, _arg in desc.args:
-            is_bool_action = _arg.get("action", "") in ("store_true", "store_false")
-            arg_desc = {
-                "name": name[0],
-                # infer the type either by store_*, type argument and fallback to default str.
-                # See: https://docs.python.org/3/library/argparse.html#type
-                "type": "bool" if is_bool_action else getattr(_arg.get("type"), "__name__", "str"),
-                "help": _arg.get("help"),
-                "default": _arg.get("action") == "store_false"
-                if is_bool_action
-                else (_arg.get("default") or _arg.get("const")),
-                # required can either be set explicitly or is implied with '--' style arguments.
-                "required": _arg.get("required", False),
-            }
-
-            arguments.append(arg_desc)
+        if desc.arguments is not None:
+            # Use the summary from the plugin registry, so the plugin doesn't have to be imported
+            docstring, arguments = desc.description, desc.arguments
+        else:
+            docstring, arguments = plugin.get_function_description(desc.func), plugin.get_function_arguments(desc.func)
 
         loaded.append(
             {
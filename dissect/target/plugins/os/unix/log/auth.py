@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Any, Final
 from dissect.target.exceptions import UnsupportedPluginError
 from dissect.target.helpers.record import DynamicDescriptor, TargetRecordDescriptor
 from dissect.target.helpers.regex.ipaddress import extract_ips
+from dissect.target.helpers.timerange import TimeRange, time_range_args
 from dissect.target.helpers.utils import year_rollover_helper
 from dissect.target.plugin import Plugin, alias, export
 from dissect.target.plugins.os.unix.log.helpers import (
@@ -16,6 +17,7 @@ from dissect.target.plugins.os.unix.log.helpers import (
     RE_TS,
     is_iso_fmt,
     iso_readlines,
+    lines_in_range,
 )
 
 if TYPE_CHECKING:
@@ -348,8 +350,9 @@ class AuthPlugin(Plugin):
         return chain(var_log.glob("auth.log*"), var_log.glob("secure*"))
 
     @alias("securelog")
+    @time_range_args
     @export(record=DynamicDescriptor(["datetime", "path", "string"]))
-    def authlog(self) -> Iterator[Any]:
+    def authlog(self, since: str | datetime | None = None, until: str | datetime | None = None) -> Iterator[Any]:
         """Yield contents of ``/var/log/auth.log*`` and ``/var/log/secure*`` files.
 
         Order of returned events is not guaranteed to be chronological because of year
@@ -361,6 +364,9 @@ class AuthPlugin(Plugin):
 
         ISO formatted authlog entries are parsed as can be found in Ubuntu 24.04 and later.
 
+        With ``--since`` and ``--until``, log files that were last written before the time range are skipped and
+        only the lines within the time range are returned.
+
         .. code-block:: text
 
             CentOS format: Jan 12 13:37:00 hostname daemon: message
@@ -371,12 +377,18 @@ class AuthPlugin(Plugin):
             - https://help.ubuntu.com/community/LinuxLogFiles
         """
         target_tz = self.target.datetime.tzinfo
+        time_range = TimeRange(since, until)
 
         for auth_file in self.get_paths():
+            if time_range.excludes_file(auth_file):
+                continue
+
             if is_iso_fmt(auth_file):
-                iterable = iso_readlines(auth_file)
+                iterable = lines_in_range(iso_readlines(auth_file), time_range)
             else:
-                iterable = year_rollover_helper(auth_file, RE_TS, "%b %d %H:%M:%S", target_tz)
+                iterable = lines_in_range(
+                    year_rollover_helper(auth_file, RE_TS, "%b %d %H:%M:%S", target_tz), time_range
+                )
 
             for ts, line in iterable:
                 yield self._auth_log_builder.build_record(ts, auth_file, line)
@@ -8,9 +8,11 @@ from dissect.target.helpers.fsutil import open_decompress
 from dissect.target.helpers.logging import get_logger
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
     from pathlib import Path
 
+    from dissect.target.helpers.timerange import TimeRange
+
 
 log = get_logger(__name__)
 
@@ -56,3 +58,18 @@ def is_iso_fmt(file: Path) -> bool:
     # We do not want to iterate of the entire file so we limit iso_readlines to the first few lines.
     # We can not use islice here since that would only work if the file is ISO formatted and thus yields results.
     return any(iso_readlines(file, max_lines=3))
+
+
+def lines_in_range(lines: Iterable[tuple[datetime, str]], time_range: TimeRange) -> Iterator[tuple[datetime, str]]:
+    """Return the timestamped lines of a log file that fall within ``time_range``.
+
+    The lines of a log file aren't guaranteed to be in chronological order, e.g. because of delayed writes, clock
+    adjustments or year rollover detection, so every line of the log file is checked.
+    """
+    if not time_range:
+        yield from lines
+        return
+
+    for ts, line in lines:
+        if ts in time_range:
+            yield ts, line
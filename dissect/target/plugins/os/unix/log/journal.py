@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import bisect
+import io
 import lzma
+import mmap
 import sys
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, BinaryIO
 
 from dissect.cstruct import cstruct
@@ -11,11 +15,13 @@ from dissect.util.compression import lz4
 from dissect.target.exceptions import UnsupportedPluginError
 from dissect.target.helpers.logging import get_logger
 from dissect.target.helpers.record import TargetRecordDescriptor
+from dissect.target.helpers.timerange import TimeRange, time_range_args
 from dissect.target.helpers.utils import IntEnumMissing
 from dissect.target.plugin import Plugin, export
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterator
+    from datetime import datetime
 
     from dissect.target.target import Target
 
@@ -27,6 +33,15 @@ else:
 
 log = get_logger(__name__)
 
+# Max. number of decoded DATA objects that are cached per journal file
+DATA_CACHE_SIZE = 8192
+
+# Size of the read buffer for journal files that can't be memory-mapped
+READ_BUFFER_SIZE = 1024 * 1024
+
+# Offset of the realtime member of an ENTRY object
+ENTRY_REALTIME_OFFSET = 24
+
 # The events have undocumented fields that are not part of the record
 JournalRecord = TargetRecordDescriptor(
     "linux/log/journal",
@@ -319,9 +334,13 @@ class JournalFile:
     """
 
     def __init__(self, fh: BinaryIO, target: Target):
-        self.fh = fh
+        self.fh = open_reader(fh)
+        self.name = getattr(fh, "name", None)
         self.target = target
 
+        # Entries reference the same DATA objects for fields such as _HOSTNAME and _BOOT_ID over and over
+        self._read_data_object = lru_cache(DATA_CACHE_SIZE)(self._read_data_object)
+
         try:
             self.header = c_journal.Header(self.fh)
         except EOFError as e:
@@ -339,6 +358,24 @@ class JournalFile:
 
     def __iter__(self) -> Iterator[dict[str, int | str]]:
         "Iterate over the entry objects to read payloads."
+        return self.entries()
+
+    @property
+    def time_span(self) -> tuple[datetime | None, datetime | None]:
+        """The realtime of the first and the last entry of this journal file, as recorded in the header."""
+        if not self.header.n_entries:
+            return None, None
+        return ts.from_unix_us(self.header.head_entry_realtime), ts.from_unix_us(self.header.tail_entry_realtime)
+
+    def entries(self, time_range: TimeRange | None = None) -> Iterator[dict[str, int | str]]:
+        """Iterate over the entry objects to read payloads, optionally only those within ``time_range``.
+
+        The entry arrays list the entries in the order they were written, which is ordered by realtime. Entries
+        before the start of the time range are skipped with a binary search on the realtime of the entries, so their
+        DATA objects are never read. Iteration stops at the first entry after the end of the time range.
+        """
+        since_us = time_range.since_us if time_range else None
+        until_us = time_range.until_us if time_range else None
 
         offset = self.header.entry_array_offset
         while offset != 0:
@@ -361,12 +398,33 @@ class JournalFile:
             else:
                 entry_array_object = c_journal.EntryArrayObject(self.fh)
 
-            for entry_object_offset in entry_array_object.entry_object_offsets:
-                if entry_object_offset:
-                    yield from self._parse_entry_object(offset=entry_object_offset)
+            # Entry arrays are preallocated, unused slots at the end are zero
+            entry_object_offsets = [
+                entry_offset for entry_offset in entry_array_object.entry_object_offsets if entry_offset
+            ]
+
+            if since_us is not None and entry_object_offsets:
+                if self._entry_realtime(entry_object_offsets[-1]) < since_us:
+                    # The whole array lies before the time range
+                    entry_object_offsets = []
+                else:
+                    start = bisect.bisect_left(entry_object_offsets, since_us, key=self._entry_realtime)
+                    entry_object_offsets = entry_object_offsets[start:]
+                    # All following entries are written after this one
+                    since_us = None
+
+            for entry_object_offset in entry_object_offsets:
+                if until_us is not None and self._entry_realtime(entry_object_offset) > until_us:
+                    return
+                yield from self._parse_entry_object(offset=entry_object_offset)
 
             offset = entry_array_object.next_entry_array_offset
 
+    def _entry_realtime(self, offset: int) -> int:
+        """Read only the realtime of the ENTRY object at ``offset``."""
+        self.fh.seek(offset + ENTRY_REALTIME_OFFSET)
+        return int.from_bytes(self.fh.read(8).ljust(8, b"\x00"), "little")
+
     def _parse_entry_object(self, offset: int) -> Iterator[dict]:
         self.fh.seek(offset)
 
@@ -384,44 +442,67 @@ class JournalFile:
         event = {"ts": ts.from_unix_us(entry.realtime)}
         for item in entry.items:
             try:
-                self.fh.seek(item.object_offset)
-
-                if self.fh.read(1)[0] != c_journal.ObjectType.OBJECT_DATA:
-                    continue
-
-                if self.header.incompatible_flags & c_journal.IncompatibleFlag.HEADER_INCOMPATIBLE_COMPACT:
-                    data_object = c_journal.DataObject_Compact(self.fh)
-                else:
-                    data_object = c_journal.DataObject(self.fh)
-
-                if not data_object.payload:
+                if (field := self._read_data_object(item.object_offset)) is None:
                     continue
 
-                data = data_object.payload
-
-                if data_object.flags & c_journal.ObjectFlag.OBJECT_COMPRESSED_XZ:
-                    data = lzma.decompress(data)
-
-                elif data_object.flags & c_journal.ObjectFlag.OBJECT_COMPRESSED_LZ4:
-                    data = lz4.decompress(data[8:])
-
-                elif data_object.flags & c_journal.ObjectFlag.OBJECT_COMPRESSED_ZSTD:
-                    data = zstd.decompress(data)
-
-                key, value = self.decode_value(data)
+                key, value = field
                 event[key] = value
 
             except Exception as e:
                 self.target.log.warning(
                     "Journal DataObject could not be parsed at offset %s in %s",
                     item.object_offset,
-                    getattr(self.fh, "name", None),
+                    self.name,
                 )
                 self.target.log.debug("", exc_info=e)
                 continue
 
         yield event
 
+    def _read_data_object(self, offset: int) -> tuple[str, str] | None:
+        """Read, decompress and decode the DATA object at ``offset`` into a key value pair."""
+        self.fh.seek(offset)
+
+        if self.fh.read(1)[0] != c_journal.ObjectType.OBJECT_DATA:
+            return None
+
+        if self.header.incompatible_flags & c_journal.IncompatibleFlag.HEADER_INCOMPATIBLE_COMPACT:
+            data_object = c_journal.DataObject_Compact(self.fh)
+        else:
+            data_object = c_journal.DataObject(self.fh)
+
+        if not data_object.payload:
+            return None
+
+        data = data_object.payload
+
+        if data_object.flags & c_journal.ObjectFlag.OBJECT_COMPRESSED_XZ:
+            data = lzma.decompress(data)
+
+        elif data_object.flags & c_journal.ObjectFlag.OBJECT_COMPRESSED_LZ4:
+            data = lz4.decompress(data[8:])
+
+        elif data_object.flags & c_journal.ObjectFlag.OBJECT_COMPRESSED_ZSTD:
+            data = zstd.decompress(data)
+
+        return self.decode_value(data)
+
+
+def open_reader(fh: BinaryIO) -> BinaryIO | mmap.mmap:
+    """Return a reader for a journal file that makes the many small reads of the parser cheap.
+
+    Files on the local filesystem are memory-mapped, other files are read with a large read buffer.
+    """
+    try:
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        pass
+
+    if isinstance(fh, io.RawIOBase) and fh.readable():
+        return io.BufferedReader(fh, buffer_size=READ_BUFFER_SIZE)
+
+    return fh
+
 
 class JournalPlugin(Plugin):
     """Systemd Journal plugin."""
@@ -440,21 +521,31 @@ class JournalPlugin(Plugin):
         if not self.journal_files:
             raise UnsupportedPluginError("No journald files found")
 
+    @time_range_args
     @export(record=JournalRecord)
-    def journal(self) -> Iterator[JournalRecord]:
+    def journal(
+        self, since: str | datetime | None = None, until: str | datetime | None = None
+    ) -> Iterator[JournalRecord]:
         """Return the contents of Systemd Journal log files.
 
+        With ``--since`` and ``--until``, journal files that lie outside of the time range are skipped based on the
+        realtime of their first and last entries, and only the entries within the time range are parsed.
+
         References:
             - https://wiki.archlinux.org/title/Systemd/Journal
             - https://github.com/systemd/systemd/blob/9203abf79f1d05fdef9b039e7addf9fc5a27752d/man/systemd.journal-fields.xml
         """
         path_function = self.target.fs.path
+        time_range = TimeRange(since, until)
 
         for journal_file in self.journal_files:
             if not journal_file.is_file():
                 self.target.log.warning("Unable to parse journal file as it is not a file: %s", journal_file)
                 continue
 
+            if time_range.excludes_file(journal_file):
+                continue
+
             try:
                 fh = journal_file.open()
                 journal = JournalFile(fh, self.target)
@@ -464,7 +555,10 @@ class JournalPlugin(Plugin):
                 self.target.log.debug("", exc_info=e)
                 continue
 
-            for entry in journal:
+            if time_range and not time_range.overlaps(*journal.time_span):
+                continue
+
+            for entry in journal.entries(time_range):
                 priority = int_or_none(entry.get("priority"))
                 yield JournalRecord(
                     ts=entry.get("ts"),
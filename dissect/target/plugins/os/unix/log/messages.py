@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 from dissect.target.exceptions import UnsupportedPluginError
 from dissect.target.helpers.fsutil import open_decompress
 from dissect.target.helpers.record import TargetRecordDescriptor
+from dissect.target.helpers.timerange import TimeRange, time_range_args
 from dissect.target.helpers.utils import year_rollover_helper
 from dissect.target.plugin import Plugin, alias, export
 from dissect.target.plugins.os.unix.log.helpers import (
@@ -14,6 +15,7 @@ from dissect.target.plugins.os.unix.log.helpers import (
     RE_TS,
     is_iso_fmt,
     iso_readlines,
+    lines_in_range,
 )
 
 if TYPE_CHECKING:
@@ -58,8 +60,11 @@ class MessagesPlugin(Plugin):
             raise UnsupportedPluginError("No log files found")
 
     @alias("syslog")
+    @time_range_args
     @export(record=MessagesRecord)
-    def messages(self) -> Iterator[MessagesRecord]:
+    def messages(
+        self, since: str | datetime.datetime | None = None, until: str | datetime.datetime | None = None
+    ) -> Iterator[MessagesRecord]:
         """Return contents of /var/log/messages*, /var/log/syslog* and cloud-init logs.
 
         Due to year rollover detection, the log contents could be returned in reversed or mixed chronological order.
@@ -68,23 +73,32 @@ class MessagesPlugin(Plugin):
         startups and shutdowns, change in the network configuration, etc. Aims to store valuable, non-debug and
         non-critical messages. This log should be considered the "general system activity" log.
 
+        With ``--since`` and ``--until``, log files that were last written before the time range are skipped and
+        only the lines within the time range are returned.
+
         References:
             - https://geek-university.com/linux/var-log-messages-file/
             - https://www.geeksforgeeks.org/file-timestamps-mtime-ctime-and-atime-in-linux/
             - https://cloudinit.readthedocs.io/en/latest/development/logging.html#logging-command-output
         """
         target_tz = self.target.datetime.tzinfo
+        time_range = TimeRange(since, until)
 
         for log_file in self.log_files:
+            if time_range.excludes_file(log_file):
+                continue
+
             if "cloud-init" in log_file.name:
-                yield from self._parse_cloud_init_log(log_file, target_tz)
+                yield from self._parse_cloud_init_log(log_file, target_tz, time_range)
                 continue
 
             if is_iso_fmt(log_file):
-                iterable = iso_readlines(log_file)
+                iterable = lines_in_range(iso_readlines(log_file), time_range)
 
             else:
-                iterable = year_rollover_helper(log_file, RE_TS, DEFAULT_TS_LOG_FORMAT, target_tz)
+                iterable = lines_in_range(
+                    year_rollover_helper(log_file, RE_TS, DEFAULT_TS_LOG_FORMAT, target_tz), time_range
+                )
 
             for ts, line in iterable:
                 match = RE_LINE.search(line)
@@ -101,7 +115,10 @@ class MessagesPlugin(Plugin):
                 )
 
     def _parse_cloud_init_log(
-        self, log_file: Path, tzinfo: datetime.tzinfo | None = datetime.timezone.utc
+        self,
+        log_file: Path,
+        tzinfo: datetime.tzinfo | None = datetime.timezone.utc,
+        time_range: TimeRange | None = None,
     ) -> Iterator[MessagesRecord]:
         """Parse a cloud-init.log file.
 
@@ -112,6 +129,8 @@ class MessagesPlugin(Plugin):
 
         Args:
             ``log_file``: path to cloud-init.log file.
+            ``tzinfo``: the timezone of the timestamps.
+            ``time_range``: only return the lines within this time range.
 
         Returns: ``MessagesRecord``
         """
@@ -145,6 +164,9 @@ class MessagesPlugin(Plugin):
                     self.target.log.debug("", exc_info=e)
                     ts = datetime.datetime(1970, 1, 1, 0, 0, 0, 0, tzinfo=datetime.timezone.utc)
 
+                if time_range and ts not in time_range:
+                    continue
+
                 yield MessagesRecord(
                     ts=ts,
                     service=values["service"],
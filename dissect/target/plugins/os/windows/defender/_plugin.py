@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import datetime
 import re
+from itertools import chain
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, TextIO
 
 from dissect.target.exceptions import UnsupportedPluginError
 from dissect.target.helpers.record import TargetRecordDescriptor
+from dissect.target.helpers.timerange import TimeRange, time_range_args
 from dissect.target.plugin import Plugin, arg, export
 from dissect.target.plugins.os.windows.defender.mplog import (
     DEFENDER_MPLOG_BLOCK_PATTERNS,
@@ -427,7 +429,11 @@ class MicrosoftDefenderPlugin(Plugin):
                 yield from getattr(self, f"_mplog_{record.name.split('/')[-1:][0]}")(data, tzinfo=tzinfo)
 
     def _mplog(
-        self, mplog: TextIO, source: Path, tzinfo: datetime.tzinfo = datetime.timezone.utc
+        self,
+        mplog: TextIO,
+        source: Path,
+        tzinfo: datetime.tzinfo = datetime.timezone.utc,
+        time_range: TimeRange | None = None,
     ) -> Iterator[
         DefenderMPLogProcessImageRecord
         | DefenderMPLogMinFilUSSRecord
@@ -445,9 +451,22 @@ class MicrosoftDefenderPlugin(Plugin):
         | DefenderMPLogRTPRecord
     ]:
         while mplog_line := mplog.readline():
-            yield from self._mplog_line(mplog_line, source, tzinfo=tzinfo)
-            yield from self._mplog_block(mplog_line, mplog, source, tzinfo=tzinfo)
+            records = chain(
+                self._mplog_line(mplog_line, source, tzinfo=tzinfo),
+                self._mplog_block(mplog_line, mplog, source, tzinfo=tzinfo),
+            )
+            if not time_range:
+                yield from records
+                continue
 
+            # MPLog files are written in chronological order, so reading stops at the first record past the range
+            for record in records:
+                if record.ts is not None and time_range.after(record.ts):
+                    return
+                if record.ts in time_range:
+                    yield record
+
+    @time_range_args
     @export(
         record=[
             DefenderMPLogProcessImageRecord,
@@ -467,7 +486,7 @@ class MicrosoftDefenderPlugin(Plugin):
         ]
     )
     def mplog(
-        self,
+        self, since: str | datetime.datetime | None = None, until: str | datetime.datetime | None = None
     ) -> Iterator[
         DefenderMPLogProcessImageRecord
         | DefenderMPLogMinFilUSSRecord
@@ -486,6 +505,9 @@ class MicrosoftDefenderPlugin(Plugin):
     ]:
         """Return the contents of the Defender MPLog file.
 
+        With ``--since`` and ``--until``, MPLog files that were last written before the time range are skipped.
+        Reading the other files stops at the first record after the time range.
+
         References:
             - https://www.crowdstrike.com/blog/how-to-use-microsoft-protection-logging-for-forensic-investigations/
             - https://www.intrinsec.com/hunt-mplogs/
@@ -498,11 +520,18 @@ class MicrosoftDefenderPlugin(Plugin):
         if not (mplog_directory.exists() and mplog_directory.is_dir()):
             return
 
+        time_range = TimeRange(since, until)
+
         for mplog_file in mplog_directory.glob("MPLog-*"):
+            if time_range.excludes_file(mplog_file):
+                continue
+
             for encoding in ["UTF-16", "UTF-8"]:
                 try:
                     with mplog_file.open("rt", encoding=encoding) as mplog:
-                        yield from self._mplog(mplog, self.target.fs.path(mplog_file), tzinfo=target_tz)
+                        yield from self._mplog(
+                            mplog, self.target.fs.path(mplog_file), tzinfo=target_tz, time_range=time_range
+                        )
                     break
                 except UnicodeError:
                     continue
@@ -6,17 +6,21 @@ from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
 from dissect.eventlog import evtx
+from dissect.eventlog.evtx.c_evtx import c_evtx
 from dissect.eventlog.exceptions import MalformedElfChnkException
+from dissect.util.ts import wintimestamp
 from flow.record import Record, utils
 
 from dissect.target.exceptions import FilesystemError
 from dissect.target.helpers.record import DynamicDescriptor, TargetRecordDescriptor
+from dissect.target.helpers.timerange import TimeRange, time_range_args
 from dissect.target.plugin import Plugin, arg, export
 from dissect.target.plugins.os.windows.log.evt import WindowsEventlogsMixin
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
     from pathlib import Path
+    from typing import BinaryIO
 
     from dissect.target.target import Target
 
@@ -25,6 +29,9 @@ re_illegal_characters = re.compile(r"[\(\): \.\-#\/\>\<]")
 
 EVTX_GLOB = "*.evtx"
 
+# Offset of the written time in an EVTX record header
+EVTX_RECORD_TIME_OFFSET = 16
+
 
 class EvtxPlugin(WindowsEventlogsMixin, Plugin):
     """Plugin for fetching and parsing Windows Eventlog Files (``*.evtx``)."""
@@ -41,14 +48,24 @@ class EvtxPlugin(WindowsEventlogsMixin, Plugin):
 
     @arg("--logs-dir", help="logs directory to scan")
     @arg("--log-file-glob", default=EVTX_GLOB, help="glob pattern to match a log file name")
+    @time_range_args
     @export(record=DynamicDescriptor(["datetime"]))
-    def evtx(self, log_file_glob: str = EVTX_GLOB, logs_dir: str | None = None) -> Iterator[DynamicDescriptor]:
+    def evtx(
+        self,
+        log_file_glob: str = EVTX_GLOB,
+        logs_dir: str | None = None,
+        since: str | datetime.datetime | None = None,
+        until: str | datetime.datetime | None = None,
+    ) -> Iterator[DynamicDescriptor]:
         """Return entries from Windows Event log files (``*.evtx``).
 
         Windows Event log is a detailed record of system, security and application notifications. It can be used to
         diagnose a system or find future issues. Up until Windows XP the extension .evt was used, hereafter ``.evtx``
         became the new standard.
 
+        With ``--since``, log files that were last written before the time range and chunks of which the last event
+        was written before the time range are skipped without parsing their events.
+
         References:
             - https://www.techtarget.com/searchwindowsserver/definition/Windows-event-log
             - https://serverfault.com/questions/441050/what-are-the-differences-between-windows-evt-and-evtx-log-files
@@ -65,6 +82,8 @@ class EvtxPlugin(WindowsEventlogsMixin, Plugin):
             EventID (int): The EventID of the event.
         """
 
+        time_range = TimeRange(since, until)
+
         if logs_dir:
             log_paths = self.get_logs_from_dir(logs_dir, filename_glob=log_file_glob)
         else:
@@ -75,6 +94,9 @@ class EvtxPlugin(WindowsEventlogsMixin, Plugin):
                 self.target.log.warning("Event log file does not exist: %s", entry)
                 continue
 
+            if time_range.excludes_file(entry):
+                continue
+
             try:
                 entry_data = entry.open()
             except FilesystemError:
@@ -83,7 +105,7 @@ class EvtxPlugin(WindowsEventlogsMixin, Plugin):
 
             self.target.log.info("Processing event log file %s", entry)
             try:
-                for event in evtx.Evtx(entry_data):
+                for event in self._read_events(entry_data, time_range):
                     try:
                         yield self._build_record(event, entry)
                     except Exception as e:  # noqa: PERF203
@@ -93,6 +115,49 @@ class EvtxPlugin(WindowsEventlogsMixin, Plugin):
                 self.target.log.warning("Unable to parse event log file %s: %s", entry, e)
                 self.target.log.debug("", exc_info=e)
 
+    def _read_events(self, fh: BinaryIO, time_range: TimeRange) -> Iterator[dict]:
+        """Read the events of an EVTX file, skipping the chunks that only hold events from before the time range.
+
+        Every chunk header holds the offset of the last record of the chunk, of which the written time is the latest
+        time of the chunk. Chunks written before the start of the time range are skipped without reading them.
+        Chunks can't be skipped on the end of the time range, since the creation time of a forwarded event can lie
+        long before the time it was written.
+        """
+        if not time_range:
+            yield from evtx.Evtx(fh)
+            return
+
+        header = c_evtx.EVTX_HEADER(fh)
+        offset = header.header_block_size
+
+        while True:
+            fh.seek(offset)
+            chunk_header = fh.read(len(c_evtx.EVTX_CHUNK))
+            if len(chunk_header) != len(c_evtx.EVTX_CHUNK):
+                break
+
+            chunk_header = c_evtx.EVTX_CHUNK(chunk_header)
+            if chunk_header.magic == b"ElfChnk\x00" and chunk_header.last_record_offset < self.CHUNK_SIZE:
+                fh.seek(offset + chunk_header.last_record_offset + EVTX_RECORD_TIME_OFFSET)
+                last_written = int.from_bytes(fh.read(8), "little")
+
+                if last_written and time_range.before(wintimestamp(last_written)):
+                    offset += self.CHUNK_SIZE
+                    continue
+
+            fh.seek(offset)
+            chunk = fh.read(self.CHUNK_SIZE)
+            if len(chunk) != self.CHUNK_SIZE:
+                break
+            offset += self.CHUNK_SIZE
+
+            try:
+                for event in evtx.ElfChnk(chunk).read():
+                    if format_value(event["TimeCreated_SystemTime"]) in time_range:
+                        yield event
+            except MalformedElfChnkException:
+                continue
+
     @export(record=DynamicDescriptor(["datetime"]))
     def scraped_evtx(self) -> Iterator[DynamicDescriptor]:
         """Return EVTX log file records scraped from target disks."""
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 from dissect.target.helpers.record import TargetRecordDescriptor
+from dissect.target.helpers.scrape import NeedleSet
 from dissect.target.plugin import Plugin, arg, export
 
 if TYPE_CHECKING:
@@ -135,17 +136,16 @@ class QFindPlugin(Plugin):
             self.target.log.error("No needles to search for (use '--needles' or '--needle-file')")
             return
 
-        if ignore_case or regex:
+        if regex:
             tmp = {}
             for encoded_needle, _ in needle_lookup.items():
-                encoded_needle = encoded_needle if regex else re.escape(encoded_needle)
                 tmp[re.compile(encoded_needle, re.IGNORECASE if ignore_case else re_NOFLAG)] = _
             needle_lookup = tmp
 
+        needle_set = NeedleSet(list(needle_lookup.keys()), ignore_case=ignore_case)
+
         seen = set()
-        for disk, stream, needle, offset, match in self.target.scrape.find(
-            list(needle_lookup.keys()), progress=progress
-        ):
+        for disk, stream, needle, offset, match in self.target.scrape.find(needle_set, progress=progress):
             original_needle, codec = needle_lookup[needle]
             needle_len = len(needle.pattern if isinstance(needle, re.Pattern) else needle)
             before_offset = max(0, offset - window)
@@ -159,7 +159,13 @@ class QFindPlugin(Plugin):
                     continue
                 seen.add(digest)
 
-            match = match.group() if match else original_needle.encode()
+            if match:
+                match = match.group()
+            elif ignore_case:
+                # Use the bytes as they occur on disk, which can differ in case from the needle
+                match = buf[offset - before_offset : offset - before_offset + needle_len]
+            else:
+                match = original_needle.encode()
 
             yield QFindMatchRecord(
                 disk=repr(disk),
@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING, BinaryIO
 
 from dissect.util.stream import MappingStream
 
-from dissect.target.helpers.scrape import Needle, find_needles, scrape_chunks
+from dissect.target.helpers.scrape import Needle, NeedleSet, find_needles, scrape_chunks
 from dissect.target.plugin import Plugin, internal
 from dissect.target.volume import EncryptedVolumeSystem, LogicalVolumeSystem, Volume
 
@@ -112,7 +112,7 @@ class ScrapePlugin(Plugin):
     @internal
     def find(
         self,
-        needles: Needle | list[Needle],
+        needles: Needle | list[Needle] | NeedleSet,
         lock_seek: bool = True,
         block_size: int = io.DEFAULT_BUFFER_SIZE,
         progress: Callable[[Container | Volume, int, int], None] | None = None,
@@ -120,12 +120,15 @@ class ScrapePlugin(Plugin):
         """Yields needles, their offsets and an optional regex match found in all disks and volumes of a target.
 
         Args:
-            needles: The needle or list of needles to search for.
+            needles: The needle, list of needles or precompiled :class:`NeedleSet` to search for.
             lock_seek:  Whether the file position is maintained by the scraper or the consumer.
                         Setting this to ``False`` wil allow the consumer to seek the file pointer, i.e. to skip forward.
             block_size: The block size to use for reading from the byte stream.
             progress: A function to call with the current disk, offset and size of the stream.
         """
+        if not isinstance(needles, NeedleSet):
+            needles = NeedleSet(needles)
+
         for disk, stream in self.create_streams():
             for needle, offset, match in find_needles(
                 stream,
@@ -197,8 +200,7 @@ class ScrapePlugin(Plugin):
         elif not needle and not needles:
             raise ValueError("At least one needle value must be provided")
 
-        if needle:
-            needles = [needle]
+        needles = NeedleSet(needles or needle)
 
         for disk in self.target.disks:
             disk.seek(0)
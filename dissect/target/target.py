@@ -5,7 +5,7 @@ import traceback
 import urllib.parse
 from collections import defaultdict
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, BinaryIO, Generic, TypeVar
 
 from dissect.target import container, filesystem, loader, plugin, volume
 from dissect.target.exceptions import (
@@ -17,7 +17,8 @@ from dissect.target.exceptions import (
     UnsupportedPluginError,
     VolumeSystemError,
 )
-from dissect.target.helpers import config
+from dissect.target.helpers import config, layout, probe, profiler
+from dissect.target.helpers.blockcache import BlockCache, CachedStream
 from dissect.target.helpers.fsutil import TargetPath
 from dissect.target.helpers.loaderutil import parse_path_uri
 from dissect.target.helpers.logging import TargetLogAdapter, get_logger
@@ -96,6 +97,8 @@ class Target:
         self._cache = {}
         self._errors = []
         self._applied = False
+        # The layout snapshot that is recorded or replayed while applying, see dissect.target.helpers.layout
+        self._layout: layout.LayoutSnapshot | None = None
 
         # We do not want to look for config files at the Target path if it is actually a child Target.
         config_paths = [Path.cwd(), Path.home()]
@@ -109,6 +112,9 @@ class Target:
             self.log.debug("", exc_info=e)
             self._config = config.load(None)  # This loads an empty config.
 
+        # An optional cache of the blocks read from the disks and volumes, shared by all of them
+        self.block_cache = BlockCache.from_target(self)
+
         # Fill the disks and/or volumes and/or filesystems and apply() will
         # make sure that volumes/filesystems gets filled and the filesystems
         # get auto mounted on top of fs.
@@ -127,6 +133,8 @@ class Target:
         self.filesystems = FilesystemCollection(self)
 
         self.fs = filesystem.RootFilesystem(self)
+        if index_size := getattr(self._config, "FS_INDEX_SIZE", None):
+            self.fs.enable_index(int(index_size))
 
     def __repr__(self) -> str:
         return f"<Target {self.path}>"
@@ -210,12 +218,27 @@ class Target:
                 self.log.warning("Can't send event %s to %s", event_type, callback, exc_info=True)
 
     def apply(self) -> None:
-        """Resolve all disks, volumes and filesystems and load an operating system on the current ``Target``."""
-        self.disks.apply()
-        self.volumes.apply()
-        self.filesystems.apply()
-        self._init_os()
-        self._mount_others()
+        """Resolve all disks, volumes and filesystems and load an operating system on the current ``Target``.
+
+        If ``LAYOUT_SNAPSHOT_DIR`` is configured, the resolved layout is recorded in a snapshot and replayed the next
+        time the same evidence is opened, skipping the probing of volumes and filesystems and the OS detection.
+        """
+        self._layout = layout.open_snapshot(self)
+
+        with profiler.phase("disks", self):
+            self.disks.apply()
+        with profiler.phase("volumes", self):
+            self.volumes.apply()
+        with profiler.phase("filesystems", self):
+            self.filesystems.apply()
+        with profiler.phase("os", self):
+            self._init_os()
+        with profiler.phase("mount", self):
+            self._mount_others()
+
+        if self._layout:
+            layout.save_snapshot(self, self._layout)
+
         self._applied = True
 
     @property
@@ -609,7 +632,8 @@ class Target:
         target = cls(path)
 
         try:
-            ldr.map(target)
+            with profiler.phase("map", target, ldr.__class__.__name__):
+                ldr.map(target)
             target._loader = ldr
 
             if apply:
@@ -639,6 +663,26 @@ class Target:
         if not len(self.disks) and not len(self.volumes) and not len(self.filesystems):
             raise TargetError(f"Failed to load target. No disks, volumes or filesystems: {self.path}")
 
+        if self._layout and (recorded := self._layout.get_os(self)):
+            os_plugin, fs = recorded
+            try:
+                # Only the recorded OS plugin is detected, which must still detect the recorded filesystem
+                if os_plugin.detect(self) is not fs:
+                    self.log.info("OS plugin %s from layout snapshot doesn't match, detecting OS", os_plugin)
+                    self._layout.invalid = True
+                else:
+                    os_plugin = os_plugin.create(self, fs)
+            except Exception as e:
+                self.log.info("Failed to replay OS plugin %s from layout snapshot, detecting OS", os_plugin)
+                self.log.debug("", exc_info=e)
+                self._layout.invalid = True
+
+            if not self._layout.invalid:
+                self.log.debug("Replayed OS plugin from layout snapshot: %s", os_plugin)
+                self._os_plugin = os_plugin.__class__
+                self._os = self.add_plugin(os_plugin)
+                return
+
         candidates: list[tuple[plugin.PluginDescriptor, type[plugin.OSPlugin], filesystem.Filesystem]] = []
 
         for plugin_desc in plugin.os_plugins():
@@ -656,8 +700,9 @@ class Target:
             qualname = plugin_desc.qualname
             self.log.trace("Loading OS plugin: %s", qualname)
             try:
-                os_plugin: type[plugin.OSPlugin] = plugin.load(plugin_desc)
-                fs = os_plugin.detect(self)
+                with profiler.phase("detect", self, qualname):
+                    os_plugin: type[plugin.OSPlugin] = plugin.load(plugin_desc)
+                    fs = os_plugin.detect(self)
             except PluginError:
                 self.log.exception("Failed to load OS plugin: %s", qualname)
                 continue
@@ -686,6 +731,9 @@ class Target:
             # No OS detected
             self.log.warning("Failed to find OS plugin, falling back to default")
 
+        if self._layout:
+            self._layout.record_os(self, os_plugin, fs)
+
         self._os_plugin = os_plugin
         self._os = self.add_plugin(os_plugin.create(self, fs))
 
@@ -726,7 +774,8 @@ class Target:
 
         if not isinstance(plugin_cls, plugin.Plugin):
             try:
-                p = plugin_cls(self)
+                with profiler.phase("init", self, f"{plugin_cls.__module__}.{plugin_cls.__qualname__}"):
+                    p = plugin_cls(self)
             except PluginError:
                 raise
             except Exception as e:
@@ -739,7 +788,8 @@ class Target:
 
         if check_compatible and not self.is_direct:
             try:
-                p.check_compatible()
+                with profiler.phase("check_compatible", self, f"{p.__class__.__module__}.{p.__class__.__qualname__}"):
+                    p.check_compatible()
             except PluginError:
                 self.send_event(Event.INCOMPATIBLE_PLUGIN, plugin_cls=plugin_cls)
                 raise
@@ -899,90 +949,110 @@ class Collection(Generic[T]):
 
 class DiskCollection(Collection[container.Container]):
     def apply(self) -> None:
-        """Identify (basic) volume systems on all disks and add their volumes to the volume collection."""
-        for disk in self.entries:
-            # Some LVM configurations (i.e. RAID with the metadata at the end of the disk)
-            # may be misidentified as having a valid MBR/GPT on some of the disks
-            # To counter this, first check if the disk is part of any LVM configurations that we support
-            if not volume.is_lvm_volume(disk):
-                try:
-                    if not hasattr(disk, "vs") or disk.vs is None:
-                        disk.vs = volume.open(disk)
-                        self.target.log.debug("Opened volume system: %s on %s", disk.vs, disk)
+        """Identify (basic) volume systems on all disks and add their volumes to the volume collection.
 
-                    if not len(disk.vs.volumes):
-                        raise VolumeSystemError("Volume system has no volumes")  # noqa: TRY301
-
-                    for vol in disk.vs.volumes:
-                        self.target.volumes.add(vol)
-                    continue
-                except Exception as e:
-                    self.target.log.warning(
-                        "Can't identify volume system or no volumes found, adding as raw volume instead: %s", disk
-                    )
-                    self.target.log.debug("", exc_info=e)
+        The disks are probed concurrently, see :mod:`dissect.target.helpers.probe`.
+        """
+        fhs = {}
+        for disk in self.entries:
+            profiler.track(disk)
+
+            # Volume systems and raw volumes read the disk through the block cache, if configured
+            fhs[id(disk)] = self.target.block_cache.open(disk, size=disk.size) if self.target.block_cache else disk
+
+        results = probe.map_probes(
+            lambda disk: self._open_volume_system(disk, fhs[id(disk)]),
+            self.entries,
+            probe.probe_workers(self.target),
+        )
+
+        for disk, volumes in zip(self.entries, results, strict=True):
+            fh = fhs[id(disk)]
+            if volumes:
+                for vol in volumes:
+                    self.target.volumes.add(vol)
+                continue
 
             # Fallthrough case for error and if we're part of a logical volume set
-            vol = volume.Volume(disk, 1, 0, disk.size, None, None, disk=disk)
+            vol = volume.Volume(fh, 1, 0, disk.size, None, None, disk=disk)
             self.target.volumes.add(vol)
 
+    def _open_volume_system(self, disk: container.Container, fh: BinaryIO) -> list[volume.Volume] | None:
+        """Open the volume system on a disk and return its volumes, or ``None`` to add the disk as a raw volume."""
+        # Some LVM configurations (i.e. RAID with the metadata at the end of the disk)
+        # may be misidentified as having a valid MBR/GPT on some of the disks
+        # To counter this, first check if the disk is part of any LVM configurations that we support
+        if volume.is_lvm_volume(disk):
+            return None
+
+        try:
+            if not hasattr(disk, "vs") or disk.vs is None:
+                # Keep the container as the disk of the volume system when reading through the block cache
+                disk.vs = volume.open(fh, disk=disk) if fh is not disk else volume.open(disk)
+                self.target.log.debug("Opened volume system: %s on %s", disk.vs, disk)
+
+            if not len(disk.vs.volumes):
+                raise VolumeSystemError("Volume system has no volumes")  # noqa: TRY301
+        except Exception as e:
+            self.target.log.warning(
+                "Can't identify volume system or no volumes found, adding as raw volume instead: %s", disk
+            )
+            self.target.log.debug("", exc_info=e)
+            return None
+
+        return list(disk.vs.volumes)
+
 
 class VolumeCollection(Collection[volume.Volume]):
     def apply(self, *, filesystems: bool = True) -> None:
         """Identify logical and encrypted volumes on all volumes and add their volumes to the volume collection.
         Additionally, identify filesystems on all volumes and add them to the filesystem collection.
 
+        The volumes are probed concurrently, see :mod:`dissect.target.helpers.probe`.
+
         Args:
             filesystems: Whether to identify filesystems on the volumes.
         """
         # We don't want later additions to modify the todo, so make a copy
         todo = self.entries[:]
+
+        for vol in todo:
+            # Volumes that were added without a disk (e.g. by a loader) are read from directly
+            if vol.disk is None:
+                profiler.track(vol.fh)
+
+        if self.target.block_cache:
+            # Volumes on disks already read through the block cache, others (e.g. added by a loader) need wrapping
+            for vol in todo:
+                if vol.disk is None and not isinstance(vol.fh, CachedStream):
+                    vol.fh = self.target.block_cache.open(vol.fh, size=vol.size)
         fs_volumes = []
         lvm_volumes = []
         encrypted_volumes = []
 
+        # A layout snapshot records the kind of every volume, or replays it without probing
+        snapshot = self.target._layout
+        workers = probe.probe_workers(self.target)
+
         while todo:
             new_volumes = []
             lvm_volumes = []
             encrypted_volumes = []
 
-            for vol in todo:
-                if volume.is_lvm_volume(vol):
+            results = probe.map_probes(lambda vol: self._probe_volume(vol, snapshot), todo, workers)
+
+            for vol, (kind, vs) in zip(todo, results, strict=True):
+                if kind == layout.VOLUME_LVM:
                     lvm_volumes.append(vol)
-                elif volume.is_encrypted(vol):
+                elif kind == layout.VOLUME_ENCRYPTED:
                     encrypted_volumes.append(vol)
                 else:
-                    # We could be getting "regular" volume systems out of LVM or encrypted volumes
-                    # Try to open each volume as a regular volume system, or add as a filesystem if it fails
-                    # There are a few scenarios were we want to discard the opened volume, though
-                    #
-                    # If the current volume offset is 0 and originates from a "regular" volume system, we're likely
-                    # opening a volume system on the same disk again
-                    # Sometimes BSD systems are configured this way and an FFS volume "starts" at offset 0
-                    #
-                    # If we opened an empty volume system, it might also be the case that a filesystem actually
-                    # "starts" at offset 0
-
                     # Regardless of what happens, we want to try to open it as a filesystem later on
                     fs_volumes.append(vol)
 
-                    if vol.offset == 0 and vol.vs and vol.vs.__type__ == "disk":
-                        # We are going to re-open a volume system on itself, bail out
-                        self.target.log.info("Found volume with offset 0, opening as raw volume instead")
-                        continue
-
-                    try:
-                        vs = volume.open(vol)
-                    except Exception:
-                        # If opening a volume system fails, there's likely none, so open as a filesystem instead
-                        continue
-
-                    if not len(vs.volumes):
-                        # We opened an empty volume system, discard
-                        continue
-
-                    self.entries.extend(vs.volumes)
-                    new_volumes.extend(vs.volumes)
+                    if vs is not None:
+                        self.entries.extend(vs.volumes)
+                        new_volumes.extend(vs.volumes)
 
             self.target.log.debug("LVM volumes found: %s", lvm_volumes)
             self.target.log.debug("Encrypted volumes found: %s", encrypted_volumes)
@@ -1006,31 +1076,124 @@ class VolumeCollection(Collection[volume.Volume]):
             return
 
         mv_fs_volumes = []
-        for vol in fs_volumes:
-            try:
-                if getattr(vol, "fs", None) is None:
-                    if filesystem.is_multi_volume_filesystem(vol):
-                        mv_fs_volumes.append(vol)
-                    else:
-                        vol.fs = filesystem.open(vol)
-                        self.target.log.debug("Opened filesystem: %s on %s", vol.fs, vol)
-
-                if getattr(vol, "fs", None) is not None:
-                    self.target.filesystems.add(vol.fs)
-            except FilesystemError as e:  # noqa: PERF203
-                vol.seek(0)
-                if not vol.read(8 * 1024 * 1024).strip(b"\x00"):
-                    # If the first 8MB is empty, don't log a warning
-                    self.target.log.debug("Skipping empty volume: %s", vol)
-                else:
-                    self.target.log.warning("Can't identify filesystem: %s", vol)
-                    self.target.log.debug("", exc_info=e)
+        results = probe.map_probes(lambda vol: self._open_filesystem(vol, snapshot), fs_volumes, workers)
+
+        for vol, (fs, multi) in zip(fs_volumes, results, strict=True):
+            if multi:
+                mv_fs_volumes.append(vol)
+            elif fs is not None:
+                self.target.filesystems.add(fs)
 
         for fs in filesystem.open_multi_volume(mv_fs_volumes):
             self.target.filesystems.add(fs)
             for vol in fs.volume:
                 vol.fs = fs
 
+    def _probe_volume(
+        self, vol: volume.Volume, snapshot: layout.LayoutSnapshot | None
+    ) -> tuple[str, volume.VolumeSystem | None]:
+        """Determine the kind of a volume and open the volume system on it, if any."""
+        entry = snapshot.get_volume(self.target, vol) if snapshot else None
+
+        if entry:
+            kind = entry["kind"]
+        elif volume.is_lvm_volume(vol):
+            kind = layout.VOLUME_LVM
+        elif volume.is_encrypted(vol):
+            kind = layout.VOLUME_ENCRYPTED
+        else:
+            kind = layout.VOLUME_PLAIN
+
+        if snapshot:
+            snapshot.record_volume(self.target, vol, kind=kind, vs=False)
+
+        if kind != layout.VOLUME_PLAIN:
+            return kind, None
+
+        # We could be getting "regular" volume systems out of LVM or encrypted volumes
+        # Try to open each volume as a regular volume system, or add as a filesystem if it fails
+        # There are a few scenarios were we want to discard the opened volume, though
+        #
+        # If the current volume offset is 0 and originates from a "regular" volume system, we're likely
+        # opening a volume system on the same disk again
+        # Sometimes BSD systems are configured this way and an FFS volume "starts" at offset 0
+        #
+        # If we opened an empty volume system, it might also be the case that a filesystem actually
+        # "starts" at offset 0
+        if vol.offset == 0 and vol.vs and vol.vs.__type__ == "disk":
+            # We are going to re-open a volume system on itself, bail out
+            self.target.log.info("Found volume with offset 0, opening as raw volume instead")
+            return kind, None
+
+        if entry and not entry.get("vs"):
+            # The snapshot recorded that there's no volume system on this volume
+            return kind, None
+
+        try:
+            vs = volume.open(vol)
+        except Exception:
+            # If opening a volume system fails, there's likely none, so open as a filesystem instead
+            return kind, None
+
+        if not len(vs.volumes):
+            # We opened an empty volume system, discard
+            return kind, None
+
+        if snapshot:
+            snapshot.record_volume(self.target, vol, vs=True)
+
+        return kind, vs
+
+    def _open_filesystem(
+        self, vol: volume.Volume, snapshot: layout.LayoutSnapshot | None
+    ) -> tuple[filesystem.Filesystem | None, bool]:
+        """Open the filesystem on a volume.
+
+        Returns:
+            The filesystem, if any, and whether the volume is part of a multi-volume filesystem.
+        """
+        if getattr(vol, "fs", None) is not None:
+            return vol.fs, False
+
+        entry = snapshot.get_volume(self.target, vol) if snapshot else None
+
+        try:
+            if entry and entry.get("multi"):
+                return None, True
+
+            if entry and "filesystem" in entry:
+                if entry["filesystem"] is None:
+                    self.target.log.debug("Skipping volume without filesystem in layout snapshot: %s", vol)
+                    return None, False
+
+                # Fall back to identifying the filesystem if the recorded one fails to open
+                vol.fs = snapshot.open_filesystem(self.target, vol, entry) or filesystem.open(vol)
+                self.target.log.debug("Opened filesystem: %s on %s", vol.fs, vol)
+                return vol.fs, False
+
+            if filesystem.is_multi_volume_filesystem(vol):
+                if snapshot:
+                    snapshot.record_volume(self.target, vol, multi=True)
+                return None, True
+
+            if snapshot:
+                snapshot.record_volume(self.target, vol, filesystem=None)
+            vol.fs = filesystem.open(vol)
+            self.target.log.debug("Opened filesystem: %s on %s", vol.fs, vol)
+            if snapshot:
+                snapshot.record_filesystem(self.target, vol, vol.fs)
+        except FilesystemError as e:
+            vol.seek(0)
+            if not vol.read(8 * 1024 * 1024).strip(b"\x00"):
+                # If the first 8MB is empty, don't log a warning
+                self.target.log.debug("Skipping empty volume: %s", vol)
+            else:
+                self.target.log.warning("Can't identify filesystem: %s", vol)
+                self.target.log.debug("", exc_info=e)
+            return None, False
+
+        return vol.fs, False
+
 
 class FilesystemCollection(Collection[filesystem.Filesystem]):
     def apply(self) -> None:
@@ -4,6 +4,7 @@ from __future__ import annotations
 import argparse
 import logging
 import textwrap
+from pathlib import Path
 
 from dissect.target import plugin
 
@@ -11,6 +12,12 @@ from dissect.target import plugin
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("-v", "--verbose", action="count", default=0, help="increase output verbosity")
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        metavar="PATH",
+        help=f"write a plugin manifest to PATH instead, to be used with the {plugin.MANIFEST_ENV} environment variable",
+    )
     args = parser.parse_args()
 
     if args.verbose == 1:
@@ -25,6 +32,11 @@ def main() -> int:
         logging.basicConfig(level=logging.CRITICAL)
 
     pluginlist = plugin.generate()
+
+    if args.manifest:
+        plugin.save_manifest(args.manifest, pluginlist)
+        return 0
+
     template = """
     from dissect.target.plugin import (
         FailureDescriptor,
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import logging
+import pathlib
+from datetime import datetime, timezone
+
+from dissect.target.exceptions import TargetError, UnsupportedPluginError
+from dissect.target.helpers import cache
+from dissect.target.helpers.logging import get_logger
+from dissect.target.tools.utils.cli import (
+    catch_sigpipe,
+    configure_generic_arguments,
+    execute_function_on_target,
+    find_and_filter_plugins,
+    open_targets,
+    process_generic_arguments,
+)
+from dissect.target.tools.utils.fs import human_size
+
+log = get_logger(__name__)
+logging.lastResort = None
+logging.raiseExceptions = False
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(value: str) -> int:
+    """Parse a size with an optional ``K``, ``M``, ``G`` or ``T`` suffix into a number of bytes."""
+    value = value.strip().upper().removesuffix("B")
+    unit = value[-1] if value and value[-1] in SIZE_UNITS else ""
+
+    try:
+        return int(float(value.removesuffix(unit)) * SIZE_UNITS[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {value!r}")
+
+
+def list_entries(args: argparse.Namespace, rest: list[str]) -> int:
+    total_size = 0
+
+    for entry in sorted(cache.iter_entries(args.cache_dir), key=lambda entry: (entry.target, entry.last_used)):
+        if args.target and entry.target != args.target:
+            continue
+
+        last_used = datetime.fromtimestamp(entry.last_used, tz=timezone.utc).isoformat(timespec="seconds")
+        print(f"{human_size(entry.size):>6} {last_used} {entry.target} {entry.fingerprint} {entry.function}")
+        total_size += entry.size
+
+    print(f"total {human_size(total_size)}")
+    return 0
+
+
+def prune_entries(args: argparse.Namespace, rest: list[str]) -> int:
+    max_age = args.max_age * 24 * 60 * 60 if args.max_age is not None else None
+
+    removed = cache.prune(args.cache_dir, max_size=args.max_size, max_age=max_age, target=args.target)
+    for entry in removed:
+        log.info("Removed cache entry %s", entry.path)
+
+    print(f"removed {len(removed)} entries ({human_size(sum(entry.size for entry in removed))})")
+    return 0
+
+
+def warm_entries(args: argparse.Namespace, rest: list[str]) -> int:
+    if args.rewrite:
+        cache.REWRITE_CACHE = True
+
+    try:
+        for target in open_targets(args):
+            if args.cache_dir:
+                target._config.CACHE_DIR = str(args.cache_dir)
+
+            if not getattr(target._config, "CACHE_DIR", None):
+                target.log.error("No cache directory configured, use --cache-dir or set CACHE_DIR in the config")
+                continue
+
+            for func_def in find_and_filter_plugins(args.function, target):
+                try:
+                    output_type, result = execute_function_on_target(target, func_def, rest)
+
+                    # File based caches are written once the output has been consumed completely
+                    if output_type in ("record", "yield"):
+                        for _ in result:
+                            pass
+                except UnsupportedPluginError as e:  # noqa: PERF203
+                    target.log.error("Unsupported plugin for %s: %s", func_def.name, e.root_cause_str())  # noqa: TRY400
+                    target.log.debug("", exc_info=e)
+                except Exception as e:
+                    target.log.error("Exception while warming cache of %s: %s", func_def.name, e)  # noqa: TRY400
+                    target.log.debug("", exc_info=e)
+                else:
+                    target.log.info("Warmed cache of %s", func_def.name)
+    except TargetError as e:
+        log.error(e)  # noqa: TRY400
+        log.debug("", exc_info=e)
+        return 1
+
+    return 0
+
+
+@catch_sigpipe
+def main() -> int:
+    help_formatter = argparse.ArgumentDefaultsHelpFormatter
+    parser = argparse.ArgumentParser(
+        description="dissect.target",
+        fromfile_prefix_chars="@",
+        formatter_class=help_formatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="subcommand", help="subcommands for managing the plugin result cache")
+
+    parser_list = subparsers.add_parser("list", help="list the entries in a cache directory")
+    parser_list.add_argument("cache_dir", type=pathlib.Path, metavar="CACHE_DIR", help="cache directory")
+    parser_list.add_argument("-t", "--target", help="only list the entries of the target with this name")
+    parser_list.set_defaults(handler=list_entries)
+
+    parser_prune = subparsers.add_parser("prune", help="remove least recently used entries from a cache directory")
+    parser_prune.add_argument("cache_dir", type=pathlib.Path, metavar="CACHE_DIR", help="cache directory")
+    parser_prune.add_argument("--max-size", type=parse_size, help="maximum total size of the cache (e.g. 10G)")
+    parser_prune.add_argument("--max-age", type=float, help="remove entries that were not used for this many days")
+    parser_prune.add_argument("-t", "--target", help="only remove entries of the target with this name")
+    parser_prune.set_defaults(handler=prune_entries)
+
+    parser_warm = subparsers.add_parser("warm", help="execute functions on targets to fill the cache")
+    parser_warm.add_argument("targets", metavar="TARGETS", nargs="*", help="targets to load")
+    parser_warm.add_argument("-f", "--function", required=True, help="comma separated functions to cache")
+    parser_warm.add_argument("--cache-dir", type=pathlib.Path, help="cache directory, overrides CACHE_DIR")
+    parser_warm.add_argument("--rewrite", action="store_true", help="rewrite existing cache entries")
+    configure_generic_arguments(parser_warm)
+    parser_warm.set_defaults(handler=warm_entries)
+
+    args, rest = parser.parse_known_args()
+
+    if args.subcommand is None:
+        parser.error("No subcommand specified")
+
+    if args.subcommand == "warm":
+        process_generic_arguments(parser, args)
+
+        if not args.targets:
+            parser.error("too few arguments - missing targets")
+
+    return args.handler(args, rest)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,15 @@ import datetime
 import enum
 import functools
 import gzip
+import hashlib
 import itertools
 import json
+import shutil
 import sys
 from collections import deque
 from contextlib import contextmanager
 from dataclasses import dataclass
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, BinaryIO, TextIO
 
@@ -51,6 +54,7 @@ from dissect.target.tools.utils.cli import (
     process_generic_arguments,
     process_plugin_arguments,
 )
+from dissect.target.tools.utils.parquet import HAS_PYARROW, ParquetWriter
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterable, Iterator
@@ -63,6 +67,11 @@ if TYPE_CHECKING:
 
 log = structlog.get_logger(__name__)
 
+try:
+    _VERSION = version("dissect.target")
+except PackageNotFoundError:
+    _VERSION = "unknown"
+
 
 @dataclass
 class RecordStreamElement:
@@ -130,13 +139,53 @@ def execute_function(
         return
 
 
+def get_input_fingerprint(target: Target, function: FunctionDescriptor) -> str | None:
+    """Return a fingerprint of the input files of function ``function`` on target ``target``.
+
+    The fingerprint is based on the paths, sizes and modification times of the files returned by
+    :meth:`~dissect.target.plugin.Plugin.get_paths` of the plugin of the function, and the version of
+    ``dissect.target``. Directories are represented by all files below them, since the size and modification time
+    of a directory don't change when the contents of its files do. ``None`` is returned if the plugin does not
+    implement ``get_paths``.
+    """
+    try:
+        plugin_obj, _ = target.get_function(function.name)
+        paths = list(plugin_obj.get_paths())
+    except NotImplementedError:
+        return None
+    except Exception as e:
+        log.debug("Unable to determine input files", target=target.path, func=function.name, exc=e)
+        return None
+
+    inputs = []
+    for path in paths:
+        try:
+            files = [file for file in path.rglob("*") if file.is_file()] if path.is_dir() else [path]
+        except Exception:
+            files = [path]
+
+        for file in files:
+            try:
+                stat = file.stat()
+                inputs.append((str(file), stat.st_size, stat.st_mtime))
+            except Exception:  # noqa: PERF203
+                inputs.append((str(file), None, None))
+
+    blob = json.dumps([_VERSION, function.name, sorted(inputs)])
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
 def produce_target_func_pairs(
     targets: Iterable[Target],
     state: DumpState,
+    previous_state: DumpState | None = None,
 ) -> Iterator[tuple[Target, FunctionDescriptor]]:
     """Return a generator with target and function pairs for execution.
 
     Target and function pairs that correspond to finished sinks in provided state ``state`` are skipped.
+
+    If a ``previous_state`` of an earlier run is provided, target and function pairs of which the input files did not
+    change since that run are skipped as well, and the sinks of the earlier run are reused instead.
     """
     pairs_to_skip = set()
     if state:
@@ -153,9 +202,32 @@ def produce_target_func_pairs(
                 )
                 continue
 
+            # Fingerprints are always stored, so every run can serve as the previous run of an incremental run
+            fingerprint = get_input_fingerprint(target, func_def)
+            if (
+                fingerprint
+                and previous_state
+                and previous_state.get_input_fingerprint(target, func_def.name) == fingerprint
+            ):
+                sinks = state.reuse_sinks(previous_state, target, func_def.name)
+                state.set_input_fingerprint(target, func_def.name, fingerprint)
+                log.info(
+                    "Skipping target/func pair since its input files did not change since the previous run",
+                    target=target.path,
+                    func=func_def.name,
+                    sinks=len(sinks),
+                    previous_state=previous_state.path,
+                )
+                continue
+
             yield (target, func_def)
             state.mark_as_finished(target, func_def.name)
 
+            # Only store the fingerprint once the sinks are finished, an interrupted or limited run must not cause
+            # the next incremental run to skip the function
+            if fingerprint:
+                state.set_input_fingerprint(target, func_def.name, fingerprint)
+
 
 def execute_functions(
     target_func_stream: Iterable[tuple[Target, FunctionDescriptor]], dry_run: bool, arguments: list[str]
@@ -265,6 +337,7 @@ class Sink:
     is_dirty: bool = True
     record_count: int = 0
     size_bytes: int = 0
+    target_name: str | None = None
 
     def __post_init__(self):
         self.func = getattr(self.func, "name", self.func)
@@ -282,6 +355,9 @@ class DumpState:
 
     sinks: list[Sink] = dataclasses.field(default_factory=list)
 
+    # Fingerprints of the input files of every function, by target name and function name
+    input_fingerprints: dict[str, dict[str, str]] = dataclasses.field(default_factory=dict)
+
     # Volatile properties
     output_dir: Path | None = None
     pending_updates_count: int | None = 0
@@ -349,10 +425,43 @@ class DumpState:
             path=sink_path,
             target_path=str(stream_element.target.path),
             func=stream_element.func,
+            target_name=stream_element.target.name,
         )
         self.sinks.append(sink)
         return sink
 
+    def get_input_fingerprint(self, target: Target, func: str) -> str | None:
+        """Return the fingerprint of the input files of ``func`` on a target with the same name as ``target``."""
+        return self.input_fingerprints.get(target.name, {}).get(func)
+
+    def set_input_fingerprint(self, target: Target, func: str, fingerprint: str) -> None:
+        """Store the fingerprint of the input files of ``func`` on ``target``."""
+        self.input_fingerprints.setdefault(target.name, {})[func] = fingerprint
+
+    def reuse_sinks(self, previous_state: DumpState, target: Target, func: str) -> list[Sink]:
+        """Copy the finished sinks of ``func`` on a target with the same name as ``target`` from a previous state.
+
+        The sink files are copied into the output directory of this state, unless both states share the same output
+        directory, and the sinks are added as finished sinks of ``target``.
+        """
+        sinks = []
+        for previous_sink in previous_state.finished_sinks:
+            if previous_sink.target_name != target.name or previous_sink.func != func:
+                continue
+
+            src = previous_state.get_full_sink_path(previous_sink)
+            dst = self.get_full_sink_path(previous_sink)
+            if src.resolve() != dst.resolve():
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(src, dst)
+
+            sink = dataclasses.replace(previous_sink, target_path=str(target.path))
+            self.sinks.append(sink)
+            sinks.append(sink)
+
+        self.pending_updates_count += 1
+        return sinks
+
     def update(self, stream_element: RecordStreamElement, fp_position: int) -> None:
         """Update a sink instance for provided ``stream_element``."""
         sink = self.get_sink(stream_element.sink_path)
@@ -383,9 +492,11 @@ class DumpState:
                     record_count=sink["record_count"],
                     size_bytes=sink["size_bytes"],
                     is_dirty=sink["is_dirty"],
+                    target_name=sink.get("target_name"),
                 )
                 for sink in state_dict["sinks"]
             ],
+            input_fingerprints=state_dict.get("input_fingerprints", {}),
         )
 
     @classmethod
@@ -416,7 +527,7 @@ class DumpState:
                 continue
 
             # recorded file size for a clean sink is incorrect
-            if not sink.is_dirty and sink.size_bytes != sink.path.stat().st_size:
+            if not sink.is_dirty and sink.size_bytes != self.get_full_sink_path(sink).stat().st_size:
                 invalid_sinks.append(sink)
                 continue
 
@@ -526,6 +637,7 @@ class Serialization(str, enum.Enum):
 
     JSONLINES = "jsonlines"
     MSGPACK = "msgpack"
+    PARQUET = "parquet"
 
 
 COMPRESSION_TO_EXT = {
@@ -536,6 +648,14 @@ COMPRESSION_TO_EXT = {
     Compression.NONE: "",
 }
 
+# Parquet files are compressed internally, per column
+COMPRESSION_TO_PARQUET_CODEC = {
+    Compression.GZIP: "gzip",
+    Compression.LZ4: "lz4",
+    Compression.ZSTD: "zstd",
+    Compression.NONE: "none",
+}
+
 
 DEST_DIR_CACHE_SIZE = 10
 DEST_FILENAME_CACHE_SIZE = 10
@@ -578,7 +698,7 @@ def get_sink_filename(
     parts = [record_type, serialization_ext]
 
     compression_ext = COMPRESSION_TO_EXT[compression]
-    if compression_ext:
+    if compression_ext and not serialization_details.get("native_compression"):
         parts.append(compression_ext)
 
     return ".".join(parts)
@@ -653,6 +773,13 @@ SERIALIZERS = {
         "writer": RecordStreamWriter,
         "ext": "rec",
     },
+    # Parquet files can't be appended to and are only complete once their writer is closed
+    Serialization.PARQUET: {
+        "writer": ParquetWriter,
+        "ext": "parquet",
+        "appendable": False,
+        "native_compression": True,
+    },
 }
 
 
@@ -661,14 +788,23 @@ def get_sink_writer(
     serialization: Serialization,
     compression: Compression | None = None,
     new_sink: bool = True,
-) -> JsonfileWriter | RecordStreamWriter:
+) -> JsonfileWriter | RecordStreamWriter | ParquetWriter:
+    serialization_details = SERIALIZERS[serialization]
+    if not new_sink and not serialization_details.get("appendable", True):
+        raise ValueError(f"Can not append to an existing {serialization.value} sink")
+
     # create parent directories if they are missing
     full_sink_path.parent.mkdir(parents=True, exist_ok=True)
 
     mode = "wb" if new_sink else "ab"
 
+    writer_cls = serialization_details["writer"]
+    if serialization == Serialization.PARQUET:
+        if compression not in COMPRESSION_TO_PARQUET_CODEC:
+            raise ValueError(f"Compression method {compression.value} is not supported for Parquet")
+        return writer_cls(full_sink_path.open(mode), compression=COMPRESSION_TO_PARQUET_CODEC[compression])
+
     fh = open_path(full_sink_path, mode=mode, compression=compression)
-    writer_cls = SERIALIZERS[serialization]["writer"]
     return writer_cls(fh)
 
 
@@ -678,13 +814,28 @@ def cached_sink_writers(state: DumpState) -> Iterator[Callable]:
     # The cache is needed to reduce file handler open/close flickering for unsorted records stream.
     writers_cache = {}
 
+    # Sinks that can't be appended to are kept open until all records of their target and function are written
+    appendable = SERIALIZERS[state.serialization].get("appendable", True)
+    current_pair = None
+
     def close_writers() -> None:
         for path, writer in writers_cache.items():
             writer.close()
             log.debug("Sink writer closed", writer=writer, path=path)
+
+            if not appendable:
+                # The file is only complete after closing the writer
+                sink = state.get_sink(path)
+                sink.size_bytes = state.get_full_sink_path(sink).stat().st_size
         writers_cache.clear()
 
     def write_element(element: RecordStreamElement) -> int:
+        nonlocal current_pair
+
+        if not appendable and (element.target, element.func) != current_pair:
+            close_writers()
+            current_pair = (element.target, element.func)
+
         sink_path = get_relative_sink_path(
             element,
             state.serialization,
@@ -726,7 +877,7 @@ def cached_sink_writers(state: DumpState) -> Iterator[Callable]:
             new_sink=new_sink,
         )
 
-        if len(writers_cache) >= OPEN_WRITERS_LIMIT:
+        if appendable and len(writers_cache) >= OPEN_WRITERS_LIMIT:
             close_writers()
 
         return fh_position
@@ -751,10 +902,11 @@ def execute_pipeline(
     dry_run: bool,
     arguments: list[str],
     limit: int | None = None,
+    previous_state: DumpState | None = None,
 ) -> None:
     """Run the record generation, processing and sinking pipeline."""
 
-    target_func_pairs_stream = produce_target_func_pairs(targets, state)
+    target_func_pairs_stream = produce_target_func_pairs(targets, state, previous_state=previous_state)
     record_stream = itertools.islice(execute_functions(target_func_pairs_stream, dry_run, arguments), limit)
     record_stream = sink_records(record_stream, state)
     record_stream = log_progress(record_stream)
@@ -808,12 +960,28 @@ def parse_arguments() -> tuple[argparse.Namespace, list[str]]:
         help="output directory",
     )
     parser.add_argument("--limit", type=int, help="limit number of records produced")
+    parser.add_argument(
+        "--incremental",
+        type=Path,
+        metavar="PREVIOUS_OUTPUT",
+        help=(
+            "output directory of a previous run (e.g. of an earlier acquisition of the same host), "
+            "reuse its output for functions of which the input files did not change"
+        ),
+    )
 
     configure_generic_arguments(parser)
 
     args, rest = parser.parse_known_args()
     process_generic_arguments(parser, args)
 
+    if args.serialization == Serialization.PARQUET:
+        if not HAS_PYARROW:
+            parser.error("parquet serialization requires pyarrow to be installed: pip install pyarrow")
+
+        if args.compression not in COMPRESSION_TO_PARQUET_CODEC:
+            parser.error(f"compression method {args.compression.value} is not supported for parquet serialization")
+
     if not args.function and ("-h" in rest or "--help" in rest):
         parser.print_help()
         parser.exit(0)
@@ -827,6 +995,13 @@ def main() -> None:
     args, rest = parse_arguments()
 
     try:
+        previous_state = None
+        if args.incremental:
+            previous_state = load_state(output_dir=args.incremental)
+            if previous_state is None:
+                log.error("No state found in the previous output directory", path=args.incremental)
+                return
+
         state = configure_state(args)
         if state is None:
             # Error was already shown above, stopping execution
@@ -838,6 +1013,7 @@ def main() -> None:
             arguments=rest,
             dry_run=args.dry_run,
             limit=args.limit,
+            previous_state=previous_state,
         )
     except Exception:
         log.exception("Exception while running the pipeline")
@@ -31,6 +31,10 @@ log = get_logger(__name__)
 logging.lastResort = None
 logging.raiseExceptions = False
 
+# Cache budgets of the performance mode
+DEFAULT_READAHEAD = 1024 * 1024
+DEFAULT_DIR_CACHE_SIZE = 4096
+
 
 @catch_sigpipe
 def main() -> int:
@@ -43,6 +47,24 @@ def main() -> int:
     parser.add_argument("target", metavar="TARGET", help="target to load")
     parser.add_argument("mount", metavar="MOUNT", help="path to mount to")
     parser.add_argument("-o", "--options", help="additional FUSE options")
+    parser.add_argument(
+        "--performance",
+        action="store_true",
+        help="handle FUSE requests with multiple threads and enable readahead and the directory cache",
+    )
+    parser.add_argument(
+        "--readahead",
+        type=int,
+        metavar="BYTES",
+        help="maximum readahead per open file, 0 disables readahead (default: 1 MiB with --performance)",
+    )
+    parser.add_argument(
+        "--dir-cache",
+        type=int,
+        metavar="ENTRIES",
+        help="maximum number of cached directory listings (default: 4096 with --performance)",
+    )
+    parser.add_argument("--cache-size", type=int, metavar="ENTRIES", help="maximum number of cached file entries")
     configure_generic_arguments(parser)
 
     args, _ = parser.parse_known_args()
@@ -90,7 +112,7 @@ def main() -> int:
     # This is kinda silly because fusepy will convert this back into string arguments
     options = parse_options_string(args.options) if args.options else {}
 
-    options["nothreads"] = True
+    options["nothreads"] = not args.performance
     options["ro"] = True
     # Check if the allow other option is either not set (None) or set to True with -o allow_other=True
     if (allow_other := options.get("allow_other")) is None or str(allow_other).lower() == "true":
@@ -102,9 +124,22 @@ def main() -> int:
     elif str(allow_other).lower() == "false":
         options["allow_other"] = False
 
+    mount_options = {
+        "readahead": DEFAULT_READAHEAD if args.performance else 0,
+        "dir_cache_size": DEFAULT_DIR_CACHE_SIZE if args.performance else 0,
+    }
+    if args.readahead is not None:
+        mount_options["readahead"] = args.readahead
+    if args.dir_cache is not None:
+        mount_options["dir_cache_size"] = args.dir_cache
+    if args.cache_size is not None:
+        mount_options["cache_size"] = args.cache_size
+
+    mount = DissectMount(vfs, **mount_options)
+
     log.info("Mounting to %s with options: %s", args.mount, _format_options(options))
     try:
-        FUSE(DissectMount(vfs), args.mount, **options)
+        FUSE(mount, args.mount, **options)
     except RuntimeError as e:
         log.error("Mounting target %s failed", t)  # noqa: TRY400
         log.debug("", exc_info=e)
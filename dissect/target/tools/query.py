@@ -2,13 +2,19 @@
 from __future__ import annotations
 
 import argparse
+import json as jsonlib
 import logging
+import multiprocessing
 import pathlib
 import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from itertools import islice
+from queue import Empty
+from typing import TYPE_CHECKING, Any
 
-from flow.record import Record, RecordPrinter, RecordStreamWriter, RecordWriter
+from flow.record import GroupedRecord, Record, RecordPacker, RecordPrinter, RecordStreamWriter, RecordWriter
 
 from dissect.target.exceptions import (
     FatalError,
@@ -16,11 +22,14 @@ from dissect.target.exceptions import (
     TargetError,
     UnsupportedPluginError,
 )
-from dissect.target.helpers import cache, record_modifier
+from dissect.target.helpers import cache, keychain, profiler, record_modifier, sharedwalk
 from dissect.target.helpers.logging import get_logger
+from dissect.target.helpers.record import BatchedRecords, RecordBatch
 from dissect.target.plugin import (
     PLUGINS,
     FunctionDescriptor,
+    get_external_module_paths,
+    load_modules_from_paths,
 )
 from dissect.target.target import Target
 from dissect.target.tools.utils.cli import (
@@ -34,10 +43,12 @@ from dissect.target.tools.utils.cli import (
     process_generic_arguments,
     process_plugin_arguments,
 )
+from dissect.target.tools.utils.logging import configure_logging
+from dissect.target.tools.utils.parquet import HAS_PYARROW, ParquetDirectoryWriter
 from dissect.target.tools.utils.report import ExecutionReport
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
 
     from flow.record.adapter import AbstractWriter
 
@@ -47,7 +58,10 @@ logging.lastResort = None
 logging.raiseExceptions = False
 
 
-def record_output(strings: bool = False, json: bool = False) -> AbstractWriter:
+def record_output(strings: bool = False, json: bool = False, parquet: pathlib.Path | None = None) -> AbstractWriter:
+    if parquet:
+        return ParquetDirectoryWriter(parquet)
+
     if json:
         return RecordWriter("jsonfile://-")
 
@@ -59,6 +73,442 @@ def record_output(strings: bool = False, json: bool = False) -> AbstractWriter:
     return RecordStreamWriter(fp)
 
 
+def query_target(
+    target: Target,
+    args: argparse.Namespace,
+    default_output_type: str | None = None,
+    *,
+    output: Callable[[], AbstractWriter] | None = None,
+    echo: Callable[..., None] = print,
+    function_args: list[str] | None = None,
+) -> int | None:
+    """Execute the functions requested in ``args`` on a single target and write their results.
+
+    Args:
+        target: The target to execute the functions on.
+        args: The parsed ``target-query`` arguments.
+        default_output_type: Only execute functions with this output type, if set.
+        output: Factory for the record writer, defaults to :func:`record_output`.
+        echo: Function used for printing non-record output.
+        function_args: Arguments for the functions, parsed from ``sys.argv`` if not set.
+
+    Returns:
+        An exit code if processing of further targets should stop, ``None`` otherwise.
+    """
+    record_entries: list[tuple[FunctionDescriptor, Iterator[Record]]] = []
+    basic_entries = []
+    yield_entries = []
+
+    if args.dry_run:
+        echo("Dry run on:", target)
+
+    first_seen_output_type = default_output_type
+
+    for func_def in find_and_filter_plugins(args.function, target, args.excluded_functions):
+        # If the default type is record (meaning we skip everything else)
+        # and actual output type is not record, continue.
+        # We perform this check here because plugins that require output files/dirs
+        # will exit if we attempt to exec them without (because they are implied by the wildcard).
+        # Also this saves cycles of course.
+        if default_output_type == "record" and func_def.output != "record":
+            continue
+
+        if args.dry_run:
+            echo(f"  execute: {func_def.name} ({func_def.path})")
+            continue
+
+        try:
+            output_type, result = execute_function_on_target(target, func_def, function_args)
+        except UnsupportedPluginError as e:
+            target.log.error(  # noqa: TRY400
+                "Unsupported plugin for %s: %s",
+                func_def.name,
+                e.root_cause_str(),
+            )
+            target.log.debug("%s", func_def, exc_info=e)
+            continue
+        except PluginNotFoundError:
+            target.log.error("Cannot find plugin `%s`", func_def)  # noqa: TRY400
+            continue
+        except FatalError as e:
+            e.emit_last_message(target.log.error)
+            return 1
+        except Exception as e:
+            target.log.error("Exception while executing function %s (%s): %s", func_def.name, func_def.path, e)  # noqa: TRY400
+            target.log.debug("", exc_info=e)
+            target.log.debug("Function info: %s", func_def)
+            continue
+
+        if first_seen_output_type and output_type != first_seen_output_type:
+            target.log.error(
+                (
+                    "Can't mix functions that generate different outputs: output type `%s` from `%s` "
+                    "does not match first seen output `%s`."
+                ),
+                output_type,
+                func_def,
+                first_seen_output_type,
+            )
+            return 0
+
+        if not first_seen_output_type:
+            first_seen_output_type = output_type
+
+        if output_type == "record":
+            record_entries.append((func_def, result))
+        elif output_type == "yield":
+            yield_entries.append(result)
+        elif output_type == "none":
+            target.log.info("No result for function `%s` (output type is set to 'none')", func_def)
+            continue
+        else:
+            basic_entries.append(result)
+
+    # Write basic functions
+    if len(basic_entries) > 0:
+        basic_entries_delim = args.delimiter.join(map(str, basic_entries))
+        if not args.cmdb:
+            echo(f"{target} {basic_entries_delim}")
+        else:
+            echo(f"{target.path}{args.delimiter}{basic_entries_delim}")
+
+    # Write yield functions
+    for entry in yield_entries:
+        for e in entry:
+            echo(e)
+
+    # Write records
+    count = 0
+    break_out = False
+
+    modifier_type = None
+
+    if args.resolve:
+        modifier_type = record_modifier.Modifier.RESOLVE
+
+    if args.hash:
+        modifier_type = record_modifier.Modifier.HASH
+
+    modifier_func = record_modifier.get_modifier_function(modifier_type)
+
+    if not record_entries:
+        return None
+
+    record_entries = share_walks(target, record_entries)
+
+    rs = output() if output else record_output(args.strings, args.json)
+
+    # Writers that support it write record batches directly, unless every record needs to be modified or counted
+    write_batches = hasattr(rs, "write_batch") and modifier_type is None and args.limit is None
+
+    for func_def, record_generator in record_entries:
+        try:
+            if isinstance(record_generator, BatchedRecords):
+                if write_batches:
+                    write_record_batches(target, func_def, record_generator, rs)
+                    continue
+
+                record_generator = profiler.iterate(record_generator, "records", target, func_def.name)
+
+            if args.limit is not None:
+                # Don't read records past the limit, e.g. to hash their files
+                record_generator = islice(record_generator, args.limit - count)
+
+            for record in record_modifier.modify_records(target, record_generator, modifier_func):
+                rs.write(record)
+                count += 1
+                if args.limit is not None and count >= args.limit:
+                    break_out = True
+                    break
+
+        except Exception as e:
+            # Ignore errors if multiple functions or multiple targets
+            if len(record_entries) > 1 or len(args.targets) > 1:
+                target.log.error(  # noqa: TRY400
+                    "Exception occurred while processing output of %s.%s: %s",
+                    func_def.qualname,
+                    func_def.name,
+                    e,
+                )
+                target.log.debug("", exc_info=e)
+            else:
+                raise
+
+        if break_out:
+            break
+
+    return None
+
+
+def write_record_batches(
+    target: Target, func_def: FunctionDescriptor, result: BatchedRecords, writer: AbstractWriter
+) -> None:
+    """Write the record batches of a function to a writer that supports batches."""
+    batches = profiler.iterate(
+        result.batches(),
+        "records",
+        target,
+        func_def.name,
+        count=lambda item: len(item) if isinstance(item, RecordBatch) else 1,
+    )
+    for item in batches:
+        if isinstance(item, RecordBatch):
+            writer.write_batch(item)
+        else:
+            writer.write(item)
+
+
+def share_walks(
+    target: Target, record_entries: list[tuple[FunctionDescriptor, Iterator[Record]]]
+) -> list[tuple[FunctionDescriptor, Iterator[Record]]]:
+    """Combine the record entries of all functions that walk the filesystem into a single entry.
+
+    Instead of walking the filesystem once for every function, the filesystem is walked once per path and every
+    entry is dispatched to all of these functions, see :mod:`dissect.target.helpers.sharedwalk`. The combined entry
+    takes the place of the first walking function.
+    """
+    walks = [(func_def, result) for func_def, result in record_entries if isinstance(result, sharedwalk.WalkResult)]
+    if not walks:
+        return record_entries
+
+    name = ",".join(func_def.name for func_def, _ in walks)
+    shared = profiler.iterate(sharedwalk.merge(result for _, result in walks), "records", target, name)
+
+    entries = []
+    for func_def, result in record_entries:
+        if not isinstance(result, sharedwalk.WalkResult):
+            entries.append((func_def, result))
+        elif func_def is walks[0][0]:
+            entries.append((func_def, shared))
+    return entries
+
+
+_MSG_DESCRIPTOR = 0
+_MSG_RECORD = 1
+_MSG_LINE = 2
+_MSG_DONE = 3
+_MSG_PROFILE = 4
+_MSG_REPORT = 5
+
+# Amount of messages a worker collects before sending them to the main process
+_WORKER_BATCH_SIZE = 256
+
+_worker_queue: multiprocessing.Queue | None = None
+_worker_args: argparse.Namespace | None = None
+
+
+class _WorkerOutput:
+    """Sends the output of :func:`query_target` in a worker process to the main process.
+
+    Records are packed with a :class:`~flow.record.RecordPacker`, and the descriptor of every record type is sent
+    once before the first record that uses it.
+    """
+
+    def __init__(self, index: int, queue: multiprocessing.Queue):
+        self.index = index
+        self.queue = queue
+        self.packer = RecordPacker()
+        self.descriptors = set()
+        self.messages = []
+
+    def write(self, record: Record) -> None:
+        descriptors = record.descriptors if isinstance(record, GroupedRecord) else [record._desc]
+        for descriptor in descriptors:
+            if descriptor.identifier not in self.descriptors:
+                self.descriptors.add(descriptor.identifier)
+                self._send(_MSG_DESCRIPTOR, self.packer.pack(descriptor))
+
+        self._send(_MSG_RECORD, self.packer.pack(record))
+
+    def echo(self, *values: Any) -> None:
+        self._send(_MSG_LINE, " ".join(map(str, values)))
+
+    def profile(self, data: dict[str, Any]) -> None:
+        self._send(_MSG_PROFILE, data)
+
+    def report(self, data: list[dict[str, Any]]) -> None:
+        self._send(_MSG_REPORT, data)
+
+    def done(self, exit_code: int | None) -> None:
+        self._send(_MSG_DONE, exit_code)
+        self.flush()
+
+    def flush(self) -> None:
+        if self.messages:
+            self.queue.put((self.index, self.messages))
+            self.messages = []
+
+    def _send(self, kind: int, payload: Any) -> None:
+        self.messages.append((kind, payload))
+        if len(self.messages) >= _WORKER_BATCH_SIZE:
+            self.flush()
+
+
+def _init_worker(queue: multiprocessing.Queue, args: argparse.Namespace) -> None:
+    global _worker_queue, _worker_args
+    _worker_queue = queue
+    _worker_args = args
+
+    cache.IGNORE_CACHE = args.no_cache
+    cache.ONLY_READ_CACHE = args.only_read_cache
+    cache.REWRITE_CACHE = args.rewrite_cache
+
+    if multiprocessing.get_start_method() != "fork":
+        # Forked workers inherit this state from the main process, other start methods need to set it up again
+        configure_logging(args.verbose, args.quiet, as_plain_text=True)
+
+        if args.keychain_file:
+            keychain.register_keychain_file(args.keychain_file)
+
+        if args.keychain_value:
+            keychain.register_wildcard_value(args.keychain_value)
+
+        load_modules_from_paths(get_external_module_paths(args.plugin_path or []))
+
+
+def _query_worker(index: int, default_output_type: str | None) -> None:
+    args = _worker_args
+    output = _WorkerOutput(index, _worker_queue)
+    exit_code = None
+
+    if args.profile:
+        profiler.enable(trace_memory=args.profile_memory)
+
+    # Events of the target are collected in a report of this worker, which is merged into the report of the main
+    # process. Forked workers would otherwise add them to their copy of the report of the main process.
+    Target.event_callbacks = defaultdict(set)
+    execution_report = ExecutionReport()
+    execution_report.set_event_callbacks(Target)
+
+    try:
+        # Every worker only opens its own target, but keeps the complete list of targets in ``args``
+        # so query_target() treats errors the same as in a non-parallel run
+        target_args = argparse.Namespace(**{**vars(args), "targets": [args.targets[index]]})
+        for target in open_targets(target_args):
+            exit_code = query_target(target, args, default_output_type, output=lambda: output, echo=output.echo)
+            if exit_code is not None:
+                break
+    except Exception as e:
+        log.error("Exception while querying target %s: %s", args.targets[index], e)  # noqa: TRY400
+        log.debug("", exc_info=e)
+        exit_code = 1
+    finally:
+        if (worker_profiler := profiler.disable()) is not None:
+            output.profile(worker_profiler.as_dict())
+        if execution_report.target_reports:
+            output.report([report.as_dict() for report in execution_report.target_reports])
+        output.done(exit_code)
+
+
+def query_targets_parallel(
+    args: argparse.Namespace,
+    default_output_type: str | None = None,
+    output: Callable[[], AbstractWriter] | None = None,
+    execution_report: ExecutionReport | None = None,
+) -> int:
+    """Query every target in ``args.targets`` in a separate worker process.
+
+    At most ``args.workers`` targets are queried at the same time. The results of all workers are written to a single
+    record output in the main process, either as they become available or, if ``args.ordered`` is set, in the order
+    of the given targets.
+
+    Args:
+        args: The parsed ``target-query`` arguments.
+        default_output_type: Only execute functions with this output type, if set.
+        output: Factory for the record writer, defaults to :func:`record_output`.
+        execution_report: The report to add the target reports of the workers to, if set.
+
+    Returns:
+        The highest exit code of the workers.
+    """
+    queue = multiprocessing.Queue(maxsize=args.workers * 4)
+    packer = RecordPacker()
+    writer = None
+
+    num_targets = len(args.targets)
+    buffered = defaultdict(list)
+    finished = set()
+    failed = set()
+    exit_code = 0
+    next_index = 0
+
+    def write(messages: list[tuple[int, Any]], index: int) -> None:
+        nonlocal writer, exit_code
+
+        for kind, payload in messages:
+            if kind == _MSG_DESCRIPTOR:
+                packer.register(packer.unpack(payload))
+            elif kind == _MSG_RECORD:
+                if writer is None:
+                    writer = output() if output else record_output(args.strings, args.json)
+                writer.write(packer.unpack(payload))
+            elif kind == _MSG_LINE:
+                print(payload)
+            elif kind == _MSG_PROFILE:
+                if (main_profiler := profiler.get_profiler()) is not None:
+                    main_profiler.merge(payload)
+            elif kind == _MSG_REPORT:
+                if execution_report is not None:
+                    for target_report in payload:
+                        execution_report.add_target_report_dict(target_report)
+            elif kind == _MSG_DONE:
+                finished.add(index)
+                exit_code = max(exit_code, payload or 0)
+
+    def process(index: int, messages: list[tuple[int, Any]]) -> None:
+        nonlocal next_index
+
+        if not args.ordered:
+            write(messages, index)
+            return
+
+        # Only write the output of the oldest unfinished target, hold on to the rest until it's their turn
+        buffered[index].extend(messages)
+        while next_index < num_targets:
+            write(buffered.pop(next_index, []), next_index)
+            if next_index not in finished:
+                break
+            next_index += 1
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(queue, args),
+    ) as executor:
+        futures = {executor.submit(_query_worker, index, default_output_type): index for index in range(num_targets)}
+
+        while len(finished) < num_targets:
+            try:
+                index, messages = queue.get(timeout=1)
+            except Empty:
+                # Account for workers that died without being able to report back
+                for future, future_index in futures.items():
+                    if future_index in failed or future_index in finished:
+                        continue
+
+                    if future.done() and future.exception() is not None:
+                        failed.add(future_index)
+                        log.error("Worker for target %s failed: %s", args.targets[future_index], future.exception())  # noqa: TRY400
+                        process(future_index, [(_MSG_DONE, 1)])
+                continue
+
+            process(index, messages)
+
+    if writer is not None:
+        writer.flush()
+
+    return exit_code
+
+
+def write_profile(path: pathlib.Path) -> None:
+    """Stop the profiler, write its profile as JSON to ``path`` and print a summary table to ``stderr``."""
+    if (query_profiler := profiler.disable()) is None:
+        return
+
+    path.write_text(jsonlib.dumps(query_profiler.as_dict(), indent=4))
+    print(query_profiler.format_summary(), file=sys.stderr)
+
+
 @catch_sigpipe
 def main() -> int:
     help_formatter = argparse.ArgumentDefaultsHelpFormatter
@@ -76,8 +526,26 @@ def main() -> int:
     parser.add_argument("-s", "--strings", action="store_true", help="print output as string")
     parser.add_argument("-d", "--delimiter", default=" ", action="store", metavar="','")
     parser.add_argument("-j", "--json", action="store_true", help="output records as json")
+    parser.add_argument(
+        "--parquet",
+        type=pathlib.Path,
+        metavar="OUTPUT_DIR",
+        help="write records as Parquet files into OUTPUT_DIR, one file per record type",
+    )
 
     parser.add_argument("--limit", type=int, help="limit number of produced records")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes to query multiple targets in parallel with",
+    )
+    parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="with --workers, output results in the order of the given targets instead of as they become available",
+    )
     parser.add_argument("--no-cache", "--ignore-cache", action="store_true", help="do not use file based caching")
     parser.add_argument(
         "--only-read-cache",
@@ -99,6 +567,20 @@ def main() -> int:
         type=pathlib.Path,
         help="write the query report file to the given directory",
     )
+    parser.add_argument(
+        "--profile",
+        type=pathlib.Path,
+        metavar="PROFILE_FILE",
+        help=(
+            "profile the loading of targets and the execution of functions, write the profile as JSON to "
+            "PROFILE_FILE and print a summary to stderr"
+        ),
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="with --profile, also trace the peak memory usage of every phase (slow)",
+    )
     configure_generic_arguments(parser)
 
     args, rest = parser.parse_known_args()
@@ -131,6 +613,15 @@ def main() -> int:
     if not args.targets:
         parser.error("too few arguments - missing targets")
 
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.workers > 1 and args.direct:
+        parser.error("--workers can't be used in combination with --direct")
+
+    if args.parquet and not HAS_PYARROW:
+        parser.error("--parquet requires pyarrow to be installed: pip install pyarrow")
+
     if args.report_dir and not args.report_dir.is_dir():
         parser.error(f"--report-dir {args.report_dir} is not a valid directory")
 
@@ -139,141 +630,46 @@ def main() -> int:
         log.warning("Mixed output types detected: %s, only outputting records", ",".join(different_output_types))
         default_output_type = "record"
 
+    if args.profile_memory and not args.profile:
+        parser.error("--profile-memory can only be used in combination with --profile")
+
+    if args.profile:
+        profiler.enable(trace_memory=args.profile_memory)
+
     execution_report = ExecutionReport()
     execution_report.set_cli_args(args)
     execution_report.set_event_callbacks(Target)
 
-    try:
-        for target in open_targets(args):
-            record_entries: list[tuple[FunctionDescriptor, Iterator[Record]]] = []
-            basic_entries = []
-            yield_entries = []
-
-            if args.dry_run:
-                print("Dry run on:", target)
-
-            first_seen_output_type = default_output_type
-
-            for func_def in find_and_filter_plugins(args.function, target, args.excluded_functions):
-                # If the default type is record (meaning we skip everything else)
-                # and actual output type is not record, continue.
-                # We perform this check here because plugins that require output files/dirs
-                # will exit if we attempt to exec them without (because they are implied by the wildcard).
-                # Also this saves cycles of course.
-                if default_output_type == "record" and func_def.output != "record":
-                    continue
-
-                if args.dry_run:
-                    print(f"  execute: {func_def.name} ({func_def.path})")
-                    continue
-
-                try:
-                    output_type, result = execute_function_on_target(target, func_def)
-                except UnsupportedPluginError as e:
-                    target.log.error(  # noqa: TRY400
-                        "Unsupported plugin for %s: %s",
-                        func_def.name,
-                        e.root_cause_str(),
-                    )
-                    target.log.debug("%s", func_def, exc_info=e)
-                    continue
-                except PluginNotFoundError:
-                    target.log.error("Cannot find plugin `%s`", func_def)  # noqa: TRY400
-                    continue
-                except FatalError as e:
-                    e.emit_last_message(target.log.error)
-                    return 1
-                except Exception as e:
-                    target.log.error("Exception while executing function %s (%s): %s", func_def.name, func_def.path, e)  # noqa: TRY400
-                    target.log.debug("", exc_info=e)
-                    target.log.debug("Function info: %s", func_def)
-                    continue
-
-                if first_seen_output_type and output_type != first_seen_output_type:
-                    target.log.error(
-                        (
-                            "Can't mix functions that generate different outputs: output type `%s` from `%s` "
-                            "does not match first seen output `%s`."
-                        ),
-                        output_type,
-                        func_def,
-                        first_seen_output_type,
-                    )
-                    return 0
-
-                if not first_seen_output_type:
-                    first_seen_output_type = output_type
-
-                if output_type == "record":
-                    record_entries.append((func_def, result))
-                elif output_type == "yield":
-                    yield_entries.append(result)
-                elif output_type == "none":
-                    target.log.info("No result for function `%s` (output type is set to 'none')", func_def)
-                    continue
-                else:
-                    basic_entries.append(result)
-
-            # Write basic functions
-            if len(basic_entries) > 0:
-                basic_entries_delim = args.delimiter.join(map(str, basic_entries))
-                if not args.cmdb:
-                    print(f"{target} {basic_entries_delim}")
-                else:
-                    print(f"{target.path}{args.delimiter}{basic_entries_delim}")
-
-            # Write yield functions
-            for entry in yield_entries:
-                for e in entry:
-                    print(e)
-
-            # Write records
-            count = 0
-            break_out = False
-
-            modifier_type = None
-
-            if args.resolve:
-                modifier_type = record_modifier.Modifier.RESOLVE
-
-            if args.hash:
-                modifier_type = record_modifier.Modifier.HASH
+    # Records of all targets are written to the same Parquet files
+    writer = record_output(parquet=args.parquet) if args.parquet else None
 
-            modifier_func = record_modifier.get_modifier_function(modifier_type)
-
-            if not record_entries:
-                continue
-
-            rs = record_output(args.strings, args.json)
-            for func_def, record_generator in record_entries:
-                try:
-                    for record in record_generator:
-                        rs.write(modifier_func(target, record))
-                        count += 1
-                        if args.limit is not None and count >= args.limit:
-                            break_out = True
-                            break
-
-                except Exception as e:
-                    # Ignore errors if multiple functions or multiple targets
-                    if len(record_entries) > 1 or len(args.targets) > 1:
-                        target.log.error(  # noqa: TRY400
-                            "Exception occurred while processing output of %s.%s: %s",
-                            func_def.qualname,
-                            func_def.name,
-                            e,
-                        )
-                        target.log.debug("", exc_info=e)
-                    else:
-                        raise
-
-                if break_out:
-                    break
+    def output() -> AbstractWriter:
+        return writer
 
+    try:
+        if args.workers > 1 and len(args.targets) > 1:
+            exit_code = query_targets_parallel(
+                args,
+                default_output_type,
+                output=output if writer is not None else None,
+                execution_report=execution_report,
+            )
+        else:
+            exit_code = 0
+            for target in open_targets(args):
+                result = query_target(target, args, default_output_type, output=output if writer is not None else None)
+                if result is not None:
+                    return result
     except TargetError as e:
         log.error(e)  # noqa: TRY400
         log.debug("", exc_info=e)
         return 1
+    finally:
+        if writer is not None:
+            writer.close()
+
+        if args.profile:
+            write_profile(args.profile)
 
     timestamp = datetime.now(tz=timezone.utc)
 
@@ -289,7 +685,7 @@ def main() -> int:
             timestamp=timestamp,
         )
 
-    return 0
+    return exit_code
 
 
 if __name__ == "__main__":
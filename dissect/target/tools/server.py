@@ -0,0 +1,371 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import logging
+import socketserver
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, NoReturn
+
+from flow.record import RecordPrinter, RecordStreamWriter
+from flow.record.jsonpacker import JsonRecordPacker
+
+from dissect.target.helpers.logging import get_logger
+from dissect.target.plugin import find_functions
+from dissect.target.target import Target
+from dissect.target.tools.query import query_target
+from dissect.target.tools.utils.cli import (
+    _add_args_to_parser,
+    catch_sigpipe,
+    configure_generic_arguments,
+    process_generic_arguments,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from flow.record import Record
+    from flow.record.adapter import AbstractWriter
+
+log = get_logger(__name__)
+logging.lastResort = None
+logging.raiseExceptions = False
+
+DEFAULT_PORT = 9099
+DEFAULT_MAX_TARGETS = 64
+
+USAGE_EPILOG = """
+Queries are sent as a JSON object to /query, with the target and the target-query arguments of the query:
+
+  curl -d '{"target": "/path/to/image.vmdk", "args": ["-f", "users", "-j"]}' http://127.0.0.1:9099/query
+
+Records are returned as a record stream that can be read with rdump, or as JSON lines or strings with -j or -s.
+The targets that are currently open are listed by /targets.
+"""
+
+
+class TargetPool:
+    """Keeps opened targets between queries, so queries don't have to load their target from scratch.
+
+    At most ``max_targets`` targets are kept open. When a target is opened while the pool is full, the least recently
+    used target that isn't being queried is dropped. A target is used by a single query at a time, because targets
+    aren't thread-safe. Queries on different targets run concurrently.
+
+    Args:
+        max_targets: The maximum number of targets to keep open.
+        open_target: The function to open a target with.
+    """
+
+    def __init__(self, max_targets: int = DEFAULT_MAX_TARGETS, open_target: Callable[[str], Target] = Target.open):
+        self.max_targets = max_targets
+        self.open_target = open_target
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[str, _PoolEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def targets(self) -> list[str]:
+        """The targets that are open, from least to most recently used."""
+        with self._lock:
+            return [path for path, entry in self._entries.items() if entry.target is not None]
+
+    @contextlib.contextmanager
+    def acquire(self, path: str) -> Iterator[Target]:
+        """Return the opened target of ``path``, opening it if necessary, for exclusive use within the context."""
+        with self._lock:
+            if (entry := self._entries.get(path)) is None:
+                entry = self._entries[path] = _PoolEntry()
+            self._entries.move_to_end(path)
+            entry.users += 1
+
+        try:
+            with entry.lock:
+                if entry.target is None:
+                    with self._lock:
+                        self.misses += 1
+                    try:
+                        entry.target = self.open_target(path)
+                    except Exception:
+                        with self._lock:
+                            if self._entries.get(path) is entry and entry.users == 1:
+                                del self._entries[path]
+                        raise
+                else:
+                    with self._lock:
+                        self.hits += 1
+
+                yield entry.target
+        finally:
+            with self._lock:
+                entry.users -= 1
+                self._evict()
+
+    def _evict(self) -> None:
+        # Targets that are being queried are dropped once their queries have finished
+        for path in list(self._entries):
+            if len(self._entries) <= self.max_targets:
+                break
+
+            if self._entries[path].users == 0:
+                log.debug("Dropping target %s from the pool", path)
+                del self._entries[path]
+
+
+class _PoolEntry:
+    def __init__(self):
+        self.target: Target | None = None
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+class JobError(Exception):
+    pass
+
+
+class JobArgumentParser(argparse.ArgumentParser):
+    def error(self, message: str) -> NoReturn:
+        raise JobError(message)
+
+
+def parse_job(job: dict[str, Any]) -> tuple[str, argparse.Namespace, list[str]]:
+    """Parse a query job into its target, the ``target-query`` style arguments and the arguments for the functions.
+
+    Raises:
+        JobError: If the job is invalid, or the arguments aren't valid for the functions of the query.
+    """
+    if not isinstance(job, dict) or not isinstance(job.get("target"), str):
+        raise JobError("a query requires a target")
+
+    if not isinstance(job_args := job.get("args", []), list) or not all(isinstance(arg, str) for arg in job_args):
+        raise JobError("the arguments of a query must be a list of strings")
+
+    parser = JobArgumentParser(add_help=False)
+    parser.add_argument("-f", "--function", required=True)
+    parser.add_argument("-xf", "--excluded-functions", default="")
+    parser.add_argument("-s", "--strings", action="store_true")
+    parser.add_argument("-d", "--delimiter", default=" ")
+    parser.add_argument("-j", "--json", action="store_true")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--cmdb", action="store_true")
+    parser.add_argument("--hash", action="store_true")
+    parser.add_argument("--resolve", action="store_true")
+
+    args, rest = parser.parse_known_args(job_args)
+
+    funcs, invalid_funcs = find_functions(args.function)
+    if invalid_funcs:
+        raise JobError(f"invalid function(s): {', '.join(invalid_funcs)}")
+
+    # The response has already started when the functions are executed, so their arguments are validated up front
+    for func in funcs:
+        func_parser = JobArgumentParser(add_help=False)
+        _add_args_to_parser(func_parser, [(names, dict(kwargs)) for names, kwargs in func.args])
+        try:
+            func_parser.parse_known_args(rest)
+        except JobError as e:
+            raise JobError(f"invalid arguments for function {func.name}: {e}") from e
+
+    excluded_funcs, invalid_excluded_funcs = find_functions(args.excluded_functions)
+    if invalid_excluded_funcs:
+        raise JobError(f"invalid excluded function(s): {', '.join(invalid_excluded_funcs)}")
+
+    args.excluded_functions = list({excluded.path for excluded in excluded_funcs})
+    args.targets = [job["target"]]
+    args.dry_run = False
+
+    return job["target"], args, rest
+
+
+class JsonLinesWriter:
+    """Writes records as JSON lines to a binary stream."""
+
+    def __init__(self, fh: BinaryIO):
+        self.fh = fh
+        self.packer = JsonRecordPacker(pack_descriptors=False)
+
+    def write(self, record: Record) -> None:
+        self.fh.write(self.packer.pack(record).encode() + b"\n")
+
+    def flush(self) -> None:
+        self.fh.flush()
+
+
+def record_output(fh: BinaryIO, strings: bool = False, json: bool = False) -> AbstractWriter | JsonLinesWriter:
+    """Return a record writer for the response of a query."""
+    if json:
+        return JsonLinesWriter(fh)
+
+    if strings:
+        return RecordPrinter(fh)
+
+    return RecordStreamWriter(fh)
+
+
+def content_type(strings: bool = False, json: bool = False) -> str:
+    """Return the content type of the response of a query."""
+    if json:
+        return "application/x-ndjson"
+
+    if strings:
+        return "text/plain; charset=utf-8"
+
+    return "application/octet-stream"
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """Handles the requests to a :class:`QueryServer` or :class:`UnixQueryServer`."""
+
+    server: QueryServer | UnixQueryServer
+
+    def do_GET(self) -> None:
+        if self.path != "/targets":
+            self.send_json(404, {"error": "not found"})
+            return
+
+        pool = self.server.pool
+        self.send_json(200, {"targets": pool.targets, "hits": pool.hits, "misses": pool.misses})
+
+    def do_POST(self) -> None:
+        if self.path != "/query":
+            self.send_json(404, {"error": "not found"})
+            return
+
+        try:
+            job = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            path, args, rest = parse_job(job)
+        except (ValueError, JobError) as e:
+            self.send_json(400, {"error": str(e)})
+            return
+
+        with contextlib.ExitStack() as stack:
+            try:
+                target = stack.enter_context(self.server.pool.acquire(path))
+            except Exception as e:
+                log.error("Unable to open target %s: %s", path, e)  # noqa: TRY400
+                log.debug("", exc_info=e)
+                self.send_json(500, {"error": f"unable to open target {path}: {e}"})
+                return
+
+            writer = None
+
+            def output() -> AbstractWriter | JsonLinesWriter:
+                nonlocal writer
+                if writer is None:
+                    writer = record_output(self.wfile, args.strings, args.json)
+                return writer
+
+            # Records are streamed as they are produced, the end of the response is marked by closing the connection
+            self.send_response(200)
+            self.send_header("Content-Type", content_type(args.strings, args.json))
+            self.end_headers()
+
+            try:
+                query_target(target, args, output=output, echo=self.echo, function_args=rest)
+                if writer is not None:
+                    writer.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                log.debug("Client disconnected during query on %s", path)
+            except Exception as e:
+                log.error("Exception while querying %s: %s", path, e)  # noqa: TRY400
+                log.debug("", exc_info=e)
+
+    def echo(self, *values: Any) -> None:
+        self.wfile.write((" ".join(map(str, values)) + "\n").encode())
+
+    def send_json(self, code: int, data: dict[str, Any]) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        log.debug(format, *args)
+
+
+class QueryServer(ThreadingHTTPServer):
+    """A HTTP server that executes queries on the targets of a :class:`TargetPool`."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], pool: TargetPool):
+        super().__init__(address, QueryRequestHandler)
+        self.pool = pool
+
+
+class UnixQueryServer(socketserver.ThreadingUnixStreamServer):
+    """A HTTP server on a Unix socket that executes queries on the targets of a :class:`TargetPool`."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, pool: TargetPool):
+        super().__init__(path, QueryRequestHandler)
+        self.pool = pool
+
+
+@catch_sigpipe
+def main() -> int:
+    help_formatter = argparse.RawDescriptionHelpFormatter
+    parser = argparse.ArgumentParser(
+        description="dissect.target query server, keeps targets open between queries",
+        epilog=USAGE_EPILOG,
+        fromfile_prefix_chars="@",
+        formatter_class=help_formatter,
+    )
+    parser.add_argument("targets", metavar="TARGETS", nargs="*", help="targets to open when the server starts")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT, help="port to listen on")
+    parser.add_argument("--socket", type=Path, help="listen on this Unix socket instead of a TCP port")
+    parser.add_argument(
+        "--max-targets",
+        type=int,
+        default=DEFAULT_MAX_TARGETS,
+        help="maximum number of targets to keep open, the least recently used target is dropped first",
+    )
+    configure_generic_arguments(parser)
+
+    args, _ = parser.parse_known_args()
+    process_generic_arguments(parser, args)
+
+    if args.max_targets < 1:
+        parser.error("--max-targets must be at least 1")
+
+    pool = TargetPool(args.max_targets)
+
+    for path in args.targets:
+        try:
+            with pool.acquire(path):
+                pass
+        except Exception as e:  # noqa: PERF203
+            log.error("Unable to open target %s: %s", path, e)  # noqa: TRY400
+            log.debug("", exc_info=e)
+
+    if args.socket:
+        server = UnixQueryServer(str(args.socket), pool)
+        log.warning("Listening on %s", args.socket)
+    else:
+        server = QueryServer((args.host, args.port), pool)
+        log.warning("Listening on http://%s:%d", *server.server_address[:2])
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket:
+            args.socket.unlink(missing_ok=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
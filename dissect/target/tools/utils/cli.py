@@ -14,8 +14,9 @@ from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from dissect.target.helpers import docs, keychain
+from dissect.target.helpers import docs, keychain, profiler, sharedwalk
 from dissect.target.helpers.docs import get_docstring
+from dissect.target.helpers.record import BatchedRecords
 from dissect.target.loader import LOADERS_BY_SCHEME
 from dissect.target.plugin import (
     OSPlugin,
@@ -419,18 +420,23 @@ def execute_function_on_target(
     If no explicit arguments are provided, they will be parsed from ``sys.argv``.
     """
 
-    func_cls, func_obj = target.get_function(func.name)
-    plugin_method, parser = plugin_function_with_argparser(func_obj)
+    with profiler.phase("execute", target, func.name):
+        func_cls, func_obj = target.get_function(func.name)
+        plugin_method, parser = plugin_function_with_argparser(func_obj)
 
-    if parser:
-        known_args, _ = parser.parse_known_args(args)
-        value = plugin_method(**vars(known_args))
-    elif isinstance(func_obj, property):
-        value = func_obj.__get__(func_cls)
-    else:
-        value = func_obj
+        if parser:
+            known_args, _ = parser.parse_known_args(args)
+            value = plugin_method(**vars(known_args))
+        elif isinstance(func_obj, property):
+            value = func_obj.__get__(func_cls)
+        else:
+            value = func_obj
 
     output_type = getattr(plugin_method, "__output__", "default") if plugin_method else "default"
+    # Walk results and record batches are profiled by the caller, once it decided how to consume them
+    if output_type in ("record", "yield") and not isinstance(value, (sharedwalk.WalkResult, BatchedRecords)):
+        value = profiler.iterate(value, "records", target, func.name)
+
     return (output_type, value)
 
 
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from flow.record.adapter import AbstractWriter
+
+from dissect.target.helpers.logging import get_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from flow.record import Record, RecordDescriptor
+
+    from dissect.target.helpers.record import RecordBatch
+
+log = get_logger(__name__)
+
+# Amount of records that are converted to Arrow arrays at once
+CHUNK_SIZE = 1024
+# Maximum amount of records in a single row group
+ROW_GROUP_SIZE = 128 * 1024
+# Maximum size in bytes of the converted records that are kept in memory before they're written as a row group
+MAX_BUFFER_SIZE = 64 * 1024 * 1024
+
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+
+def _to_str(value: Any) -> str:
+    return str(value)
+
+
+class _Int64Converter:
+    """Convert values to 64-bit integers, values that don't fit are converted to ``None`` and counted."""
+
+    def __init__(self):
+        self.overflows = 0
+
+    def __call__(self, value: int) -> int | None:
+        if INT64_MIN <= value <= INT64_MAX:
+            return int(value)
+
+        self.overflows += 1
+        return None
+
+
+class _ListConverter:
+    """Convert the values of a list field with the converter of its value type."""
+
+    def __init__(self, convert: Callable[[Any], Any]):
+        self.convert = convert
+
+    def __call__(self, values: list[Any]) -> list[Any]:
+        return [None if value is None else self.convert(value) for value in values]
+
+    @property
+    def overflows(self) -> int:
+        return getattr(self.convert, "overflows", 0)
+
+
+def _to_command(value: Any) -> str:
+    return value._join()
+
+
+def _to_digest(value: Any) -> dict[str, str | None]:
+    return {"md5": value.md5, "sha1": value.sha1, "sha256": value.sha256}
+
+
+def _field_type(typename: str) -> tuple[pa.DataType, Callable[[Any], Any] | None]:
+    """Return the Arrow type of a record field type and the function to convert its (non-``None``) values with."""
+    if typename.endswith("[]"):
+        value_type, convert = _field_type(typename[:-2])
+        if convert is None:
+            return pa.list_(value_type), None
+        return pa.list_(value_type), _ListConverter(convert)
+
+    if typename == "boolean":
+        return pa.bool_(), bool
+
+    if typename == "datetime":
+        return pa.timestamp("us", tz="UTC"), None
+
+    if typename in ("varint", "filesize", "unix_file_mode"):
+        return pa.int64(), _Int64Converter()
+
+    if typename == "uint16":
+        return pa.uint16(), int
+
+    if typename == "uint32":
+        return pa.uint32(), int
+
+    if typename == "float":
+        return pa.float64(), float
+
+    if typename == "bytes":
+        return pa.binary(), bytes
+
+    if typename == "digest":
+        return pa.struct([("md5", pa.string()), ("sha1", pa.string()), ("sha256", pa.string())]), _to_digest
+
+    if typename == "command":
+        return pa.string(), _to_command
+
+    # Paths, network addresses and everything else is stored as its string representation
+    return pa.string(), _to_str
+
+
+def descriptor_to_schema(descriptor: RecordDescriptor) -> pa.Schema:
+    """Map the fields of a record descriptor to an Arrow schema."""
+    fields = []
+    for name, field in descriptor.get_all_fields().items():
+        fields.append(pa.field(name, _field_type(field.typename)[0]))
+
+    return pa.schema(fields, metadata={"descriptor": descriptor.name})
+
+
+class ParquetWriter(AbstractWriter):
+    """Write records of a single record descriptor to a Parquet file.
+
+    Records are converted to Arrow arrays in chunks of :data:`CHUNK_SIZE` records, and written as a row group once
+    ``row_group_size`` records or ``max_buffer_size`` bytes of converted records are buffered.
+
+    The schema of the file is determined by the first written record, or ``descriptor`` if given. Records of
+    another descriptor are written using this schema, missing fields are written as null.
+
+    Args:
+        fh: The file-like object to write to.
+        descriptor: The record descriptor of the records, determined from the first record if not given.
+        compression: The Parquet compression codec to use.
+        row_group_size: The maximum amount of records in a row group.
+        max_buffer_size: The maximum size in bytes of the buffered records.
+    """
+
+    def __init__(
+        self,
+        fh: BinaryIO,
+        descriptor: RecordDescriptor | None = None,
+        compression: str = "zstd",
+        row_group_size: int = ROW_GROUP_SIZE,
+        max_buffer_size: int = MAX_BUFFER_SIZE,
+    ):
+        if not HAS_PYARROW:
+            raise ValueError("Python module pyarrow is not available")
+
+        self.fp = fh
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.max_buffer_size = max_buffer_size
+
+        self.descriptor = None
+        self.schema = None
+        self.writer = None
+        self.record_count = 0
+
+        self._converters = []
+        self._rows: list[Record] = []
+        self._batches: list[pa.RecordBatch] = []
+        self._buffer_rows = 0
+        self._buffer_size = 0
+        self._warned = set()
+
+        if descriptor is not None:
+            self._init_descriptor(descriptor)
+
+    def _init_descriptor(self, descriptor: RecordDescriptor) -> None:
+        self.descriptor = descriptor
+        self.schema = descriptor_to_schema(descriptor)
+        self._converters = [
+            (name, _field_type(field.typename)[1]) for name, field in descriptor.get_all_fields().items()
+        ]
+
+    @property
+    def buffer_size(self) -> int:
+        """The size in bytes of the converted records that are buffered."""
+        return self._buffer_size
+
+    def write(self, record: Record) -> None:
+        if self.descriptor is None:
+            self._init_descriptor(record._desc)
+        elif record._desc != self.descriptor and record._desc.identifier not in self._warned:
+            self._warned.add(record._desc.identifier)
+            log.warning(
+                "Writing records of %s with the schema of %s, fields that don't match are lost",
+                record._desc,
+                self.descriptor,
+            )
+
+        self._rows.append(record)
+        if len(self._rows) >= CHUNK_SIZE:
+            self._convert()
+
+    def write_batch(self, batch: RecordBatch) -> None:
+        """Write a batch of records directly from its columns, without creating a record for every row."""
+        if self.descriptor is not None and batch.descriptor != self.descriptor:
+            for record in batch:
+                self.write(record)
+            return
+
+        if self.descriptor is None:
+            self._init_descriptor(batch.descriptor)
+
+        # Keep the order of records that were written before the batch
+        self._convert()
+        if batch.num_rows:
+            self._append([batch.column(name) for name, _ in self._converters])
+
+    def _convert(self) -> None:
+        if not self._rows:
+            return
+
+        rows, self._rows = self._rows, []
+        self._append([[getattr(record, name, None) for record in rows] for name, _ in self._converters])
+
+    def _append(self, columns: list[list[Any]]) -> None:
+        for idx, (_, convert) in enumerate(self._converters):
+            if convert is not None:
+                columns[idx] = [None if value is None else convert(value) for value in columns[idx]]
+
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, self.schema, strict=True)],
+            schema=self.schema,
+        )
+
+        self._batches.append(batch)
+        self._buffer_rows += batch.num_rows
+        self._buffer_size += batch.nbytes
+        self.record_count += batch.num_rows
+
+        if self._buffer_rows >= self.row_group_size or self._buffer_size >= self.max_buffer_size:
+            self.flush_row_group()
+
+    def flush_row_group(self) -> None:
+        """Write the buffered records as a row group."""
+        self._convert()
+
+        if not self._batches:
+            return
+
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.fp, self.schema, compression=self.compression)
+
+        self.writer.write_table(pa.Table.from_batches(self._batches, schema=self.schema))
+        self._batches = []
+        self._buffer_rows = 0
+        self._buffer_size = 0
+
+    def flush(self) -> None:
+        self.flush_row_group()
+        if self.fp and not self.fp.closed:
+            self.fp.flush()
+
+    def close(self) -> None:
+        if self.fp is None:
+            return
+
+        self.flush_row_group()
+
+        if self.writer is None and self.schema is not None:
+            # Always write a valid file, even if it doesn't contain any rows
+            self.writer = pq.ParquetWriter(self.fp, self.schema, compression=self.compression)
+
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+        for name, convert in self._converters:
+            if overflows := getattr(convert, "overflows", 0):
+                log.warning("Wrote %d values of field %s that do not fit in 64 bits as null", overflows, name)
+
+        self.fp.close()
+        self.fp = None
+
+
+def descriptor_filename(descriptor: RecordDescriptor) -> str:
+    """Return a filename for the Parquet file of a record descriptor."""
+    return re.sub(r"[^\w.-]", "_", descriptor.name) + ".parquet"
+
+
+class ParquetDirectoryWriter(AbstractWriter):
+    """Write records to Parquet files in a directory, one file per record descriptor.
+
+    The buffers of all files share a single memory budget of ``max_buffer_size`` bytes. When it's exceeded, the
+    largest buffer is written as a row group.
+
+    Args:
+        path: The directory to write the Parquet files to.
+        compression: The Parquet compression codec to use.
+        row_group_size: The maximum amount of records in a row group.
+        max_buffer_size: The maximum total size in bytes of the buffered records of all files.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        compression: str = "zstd",
+        row_group_size: int = ROW_GROUP_SIZE,
+        max_buffer_size: int = MAX_BUFFER_SIZE,
+    ):
+        if not HAS_PYARROW:
+            raise ValueError("Python module pyarrow is not available")
+
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.max_buffer_size = max_buffer_size
+
+        self.writers: dict[tuple[str, int], ParquetWriter] = {}
+        self._filenames = set()
+
+    def _get_writer(self, descriptor: RecordDescriptor) -> ParquetWriter:
+        if (writer := self.writers.get(descriptor.identifier)) is not None:
+            return writer
+
+        filename = descriptor_filename(descriptor)
+        if filename in self._filenames:
+            # Another descriptor with the same name but different fields
+            filename = f"{filename.removesuffix('.parquet')}.{descriptor.identifier[1]:08x}.parquet"
+        self._filenames.add(filename)
+
+        writer = self.writers[descriptor.identifier] = ParquetWriter(
+            self.path.joinpath(filename).open("wb"),
+            descriptor,
+            compression=self.compression,
+            row_group_size=self.row_group_size,
+            # Every single buffer may use the whole budget, the total is checked in write()
+            max_buffer_size=self.max_buffer_size,
+        )
+        return writer
+
+    def write(self, record: Record) -> None:
+        writer = self._get_writer(record._desc)
+
+        buffer_size = writer.buffer_size
+        writer.write(record)
+        self._check_budget(writer, buffer_size)
+
+    def write_batch(self, batch: RecordBatch) -> None:
+        """Write a batch of records directly from its columns, see :meth:`ParquetWriter.write_batch`."""
+        writer = self._get_writer(batch.descriptor)
+
+        buffer_size = writer.buffer_size
+        writer.write_batch(batch)
+        self._check_budget(writer, buffer_size)
+
+    def _check_budget(self, writer: ParquetWriter, buffer_size: int) -> None:
+        if writer.buffer_size != buffer_size:
+            # A chunk of records was converted, check the total memory budget
+            while sum(writer.buffer_size for writer in self.writers.values()) > self.max_buffer_size:
+                max(self.writers.values(), key=lambda writer: writer.buffer_size).flush_row_group()
+
+    def flush(self) -> None:
+        for writer in self.writers.values():
+            writer.flush()
+
+    def close(self) -> None:
+        for writer in self.writers.values():
+            writer.close()
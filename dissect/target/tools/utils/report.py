@@ -16,7 +16,7 @@ BLOCK_INDENT = 4 * " "
 
 @dataclasses.dataclass
 class TargetExecutionReport:
-    target: Target
+    target: Target | str
 
     incompatible_plugins: set[str] = dataclasses.field(default_factory=set)
     registered_plugins: set[str] = dataclasses.field(default_factory=set)
@@ -42,6 +42,16 @@ class TargetExecutionReport:
             "func_execs": sorted(self.func_execs),
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TargetExecutionReport:
+        return cls(
+            target=data["target"],
+            incompatible_plugins=set(data["incompatible_plugins"]),
+            registered_plugins=set(data["registered_plugins"]),
+            func_errors=dict(data["func_errors"]),
+            func_execs=set(data["func_execs"]),
+        )
+
 
 @dataclasses.dataclass
 class ExecutionReport:
@@ -72,6 +82,12 @@ class ExecutionReport:
         self.target_reports.append(target_report)
         return target_report
 
+    def add_target_report_dict(self, data: dict[str, Any]) -> TargetExecutionReport:
+        """Add a target report that was created by another process, as returned by its ``as_dict``."""
+        target_report = TargetExecutionReport.from_dict(data)
+        self.target_reports.append(target_report)
+        return target_report
+
     def get_target_report(self, target: Target, create: bool = False) -> TargetExecutionReport:
         target_report = next(filter(lambda r: r.target == target, self.target_reports), None)
         if target_report is None and create:
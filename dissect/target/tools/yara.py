@@ -48,7 +48,7 @@ def main() -> int:
     try:
         for target in open_targets(args):
             rs = record_output(args.strings, False)
-            for record in target.yara(args.rules, args.path, args.max_size, args.check):
+            for record in target.yara(args.rules, args.path, args.max_size, args.check, args.workers, args.chunk_size):
                 rs.write(record)
 
     except TargetError as e:
@@ -336,7 +336,7 @@ def open(fh: BinaryIO, *args, **kwargs) -> DissectVolumeSystem:
     fh.seek(0)
 
     try:
-        return disk.DissectVolumeSystem(fh)
+        return disk.DissectVolumeSystem(fh, *args, **kwargs)
     except Exception as e:
         raise VolumeSystemError(f"Failed to load volume system for {fh}") from e
     finally:
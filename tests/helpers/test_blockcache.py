@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import io
+import random
+import threading
+from typing import TYPE_CHECKING
+
+from dissect.target.containers.raw import RawContainer
+from dissect.target.helpers.blockcache import BlockCache, CachedStream
+
+if TYPE_CHECKING:
+    from dissect.target.target import Target
+
+
+class CountingIO(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, n: int = -1) -> bytes:
+        self.reads += 1
+        return super().read(n)
+
+
+def test_block_cache_read() -> None:
+    rng = random.Random(1337)
+    data = rng.randbytes(100_000)
+
+    cache = BlockCache(1024 * 1024, block_size=512)
+    fh = cache.open(io.BytesIO(data))
+
+    assert fh.size == len(data)
+    assert fh.read() == data
+
+    for _ in range(1000):
+        offset = rng.randrange(len(data))
+        length = rng.randrange(2048)
+        fh.seek(offset)
+        assert fh.read(length) == data[offset : offset + length]
+
+
+def test_block_cache_hits() -> None:
+    source = CountingIO(b"".join(bytes([i]) * 512 for i in range(16)))
+    cache = BlockCache(1024 * 1024, block_size=512, max_readahead=0)
+    fh = cache.open(source)
+
+    assert fh.readoffset(1024, 1024) == b"\x02" * 512 + b"\x03" * 512
+    assert cache.stats["misses"] == 2
+    assert source.reads == 1
+
+    # Reading the same region again is served from the cache
+    fh.readoffset(1024, 1024)
+    assert fh.readoffset(1000, 600) == b"\x01" * 24 + b"\x02" * 512 + b"\x03" * 64
+    assert cache.stats["hits"] == 4
+    assert cache.stats["misses"] == 3
+    assert cache.stats["hit_rate"] == 4 / 7
+    assert source.reads == 2
+
+    # Streams don't share each other's blocks
+    other = cache.open(io.BytesIO(b"\xff" * 2048))
+    assert other.readoffset(1024, 512) == b"\xff" * 512
+
+
+def test_block_cache_readahead() -> None:
+    source = CountingIO(bytes(512 * 64))
+    cache = BlockCache(1024 * 1024, block_size=512, max_readahead=4)
+    fh = cache.open(source)
+
+    # A random read doesn't read ahead
+    fh.readoffset(512 * 32, 512)
+    assert cache.stats["readahead"] == 0
+
+    # Sequential reads read ahead an increasing amount of blocks
+    fh.seek(0)
+    for _ in range(16):
+        fh.read(512)
+
+    assert cache.stats["readahead"] > 0
+    assert cache.stats["misses"] + cache.stats["hits"] == 17
+    assert source.reads < 16
+
+
+def test_block_cache_threads() -> None:
+    cache = BlockCache(1024 * 1024, block_size=512, max_readahead=0)
+
+    def read() -> None:
+        fh = cache.open(io.BytesIO(bytes(512 * 16)))
+        for _ in range(100):
+            fh.readoffset(0, 512 * 16)
+
+    # Streams of different threads share the counters of the cache
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.stats["misses"] == 4 * 16
+    assert cache.stats["hits"] == 4 * 99 * 16
+
+
+def test_block_cache_eviction() -> None:
+    cache = BlockCache(2048, block_size=512)
+    fh = cache.open(io.BytesIO(bytes(512 * 16)))
+
+    fh.seek(0)
+    for _ in range(16):
+        fh.read(512)
+
+    assert cache.size <= 2048
+    assert cache.stats["evictions"] > 0
+
+    cache.clear()
+    assert cache.size == 0
+    assert cache.stats["blocks"] == 0
+
+
+def test_block_cache_target(target_bare: Target) -> None:
+    target_bare._config.BLOCK_CACHE_SIZE = 1024 * 1024
+    target_bare._config.BLOCK_CACHE_BLOCK_SIZE = 4096
+    target_bare.block_cache = BlockCache.from_target(target_bare)
+    assert target_bare.block_cache.block_size == 4096
+
+    disk = RawContainer(io.BytesIO(bytes(8192)))
+    target_bare.disks.add(disk)
+    target_bare.disks.apply()
+
+    vol = target_bare.volumes[0]
+    assert isinstance(vol.fh, CachedStream)
+    assert vol.disk is disk
+    assert vol.read(100) == bytes(100)
+    assert target_bare.block_cache.stats["misses"] > 0
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import io
+import logging
+import os
+import time
 from typing import TYPE_CHECKING
 
+from dissect.target.containers.raw import RawContainer
+from dissect.target.helpers import cache
 from dissect.target.helpers.cache import Cache
+from dissect.target.plugins.general.example import ExamplePlugin
 from dissect.target.plugins.os.windows.amcache import AmcachePlugin
 from dissect.target.plugins.os.windows.ual import UalPlugin
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
     from dissect.target.target import Target
 
 
@@ -56,3 +67,78 @@ def test_cache_filename(target_win: Target) -> None:
     assert (
         cache4.cache_path(target_win, ()).stem == "dissect.target.plugins.os.windows.ual.UalPlugin.client_access.KCk="
     )
+
+
+def test_cache_fingerprint(target_bare: Target) -> None:
+    target_bare._config.CACHE_DIR = "/tmp"
+
+    fingerprint = cache.fingerprint(target_bare)
+    assert len(fingerprint) == 16
+    assert cache.fingerprint(target_bare) == fingerprint
+    assert Cache(ExamplePlugin.example_record).cache_path(target_bare, ()).parent.name == fingerprint
+
+    # Different evidence results in a different fingerprint
+    target_bare._cache.clear()
+    target_bare.disks.add(RawContainer(io.BytesIO(b"\x00" * 512)))
+    assert cache.fingerprint(target_bare) != fingerprint
+
+
+def test_cache_write_read(target_bare: Target, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    cache_dir = tmp_path.joinpath("cache")
+    target_bare._config.CACHE_DIR = str(cache_dir)
+    target_bare.add_plugin(ExamplePlugin)
+
+    records = list(target_bare.example_record())
+    entries = list(cache.iter_entries(cache_dir))
+
+    assert len(entries) == 1
+    assert entries[0].target == target_bare.path.name
+    assert entries[0].fingerprint == cache.fingerprint(target_bare)
+    assert entries[0].function == "dissect.target.plugins.general.example.ExamplePlugin.example_record"
+    # No temporary files should remain
+    assert [path.name for path in entries[0].path.parent.iterdir()] == [entries[0].path.name]
+
+    with caplog.at_level(logging.INFO, target_bare.log.name):
+        assert [str(record) for record in target_bare.example_record()] == [str(record) for record in records]
+
+    assert "Using cache for function" in caplog.text
+
+
+def test_cache_write_interrupted(target_bare: Target, tmp_path: Path) -> None:
+    cache_dir = tmp_path.joinpath("cache")
+    target_bare._config.CACHE_DIR = str(cache_dir)
+    target_bare.add_plugin(ExamplePlugin)
+
+    records = iter(target_bare.example_yield())
+    next(records)
+    records.close()
+
+    # An interrupted write leaves neither a cache entry nor a temporary file behind
+    assert list(cache.iter_entries(cache_dir)) == []
+    assert [path for path in cache_dir.rglob("*") if path.is_file()] == []
+
+
+def test_cache_prune(tmp_path: Path) -> None:
+    now = time.time()
+
+    paths = []
+    for i, name in enumerate(["a", "b", "c"]):
+        path = tmp_path.joinpath("target", "0123456789abcdef", f"module.Plugin.{name}.KCk=.rec")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"\x00" * 100)
+        os.utime(path, (now - 3600 * (3 - i), now - 3600 * (3 - i)))
+        paths.append(path)
+
+    stale_temp = tmp_path.joinpath("target", "0123456789abcdef", "_12345678_module.Plugin.d.KCk=.rec")
+    stale_temp.write_bytes(b"\x00")
+    os.utime(stale_temp, (now - cache.STALE_TEMP_AGE - 1, now - cache.STALE_TEMP_AGE - 1))
+
+    assert [entry.path for entry in cache.prune(tmp_path, target="other", max_size=0)] == []
+    assert not stale_temp.exists()
+
+    assert [entry.path for entry in cache.prune(tmp_path, max_size=250)] == [paths[0]]
+    assert [entry.path for entry in cache.prune(tmp_path, max_age=1.5 * 3600)] == [paths[1]]
+    assert [entry.path for entry in cache.iter_entries(tmp_path)] == [paths[2]]
+
+    assert [entry.path for entry in cache.prune(tmp_path, max_size=0)] == [paths[2]]
+    assert list(tmp_path.iterdir()) == []
@@ -1000,3 +1000,62 @@ def test_glob_ext(glob_fs: VirtualFilesystem, start_path: str, pattern: str, res
 
     entries = sorted([entry.path for entry in entries])
     assert entries == sorted(results)
+
+
+@pytest.mark.parametrize("case_sensitive", [True, False])
+def test_glob_ext_multi(glob_fs: VirtualFilesystem, case_sensitive: bool) -> None:
+    glob_fs.case_sensitive = case_sensitive
+    glob_fs.map_file_entry("/foo/.hidden.txt", VirtualFile(glob_fs, "foo/.hidden.txt", None))
+
+    patterns = [
+        "foo/bar/bla/file.*",
+        "foo/bar/*/file.ini",
+        "*/bar/bla/file.ini",
+        "*/BAR/bla/*.ini",
+        "*/bar/bla/",
+        "*/*.txt",
+        "*/.*",
+        "boo/bla/*",
+        "bar",
+    ]
+
+    expected = {}
+    for pattern in patterns:
+        for entry in fsutil.glob_ext(glob_fs.get("/"), pattern):
+            expected.setdefault(entry.path, []).append(pattern)
+
+    results = {entry.path: matched for entry, matched in glob_fs.glob_ext_multi(patterns)}
+    assert results == expected
+    assert results["foo/bar/bla/file.ini"] == ["foo/bar/bla/file.*", "foo/bar/*/file.ini", "*/bar/bla/file.ini"] + (
+        [] if case_sensitive else ["*/BAR/bla/*.ini"]
+    )
+    assert "foo/.hidden.txt" in results
+    assert results["foo/.hidden.txt"] == ["*/.*"]
+
+    bar = glob_fs.get("/foo/bar")
+    assert [(entry.path, matched) for entry, matched in bar.glob_ext_multi(["*/other.txt"])] == [
+        ("foo/bar/bla/other.txt", ["*/other.txt"])
+    ]
+
+
+def test_glob_multi(glob_fs: VirtualFilesystem) -> None:
+    patterns = ["*/bla/*.txt", "bla/file.*", "missing/*"]
+    results = [(str(path), matched) for path, matched in fsutil.glob_multi(glob_fs.path("/bar"), patterns)]
+    assert sorted(results) == [
+        ("/bar/bla/file.ini", ["bla/file.*"]),
+        ("/bar/bla/file.txt", ["bla/file.*"]),
+    ]
+
+    results = sorted((str(path), matched) for path, matched in fsutil.glob_multi(glob_fs.path("/foo"), patterns))
+    assert results == [
+        ("/foo/bar/bla/file.txt", ["*/bla/*.txt"]),
+        ("/foo/bar/bla/other.txt", ["*/bla/*.txt"]),
+    ]
+    assert all(path.exists() for path, _ in fsutil.glob_multi(glob_fs.path("/"), ["*/bar/bla/*"]))
+    assert list(fsutil.glob_multi(glob_fs.path("/nonexistent"), patterns)) == []
+
+    # Like TargetPath.glob(), hidden files are matched by glob parts that don't start with a dot
+    glob_fs.map_file_entry("/bar/bla/.hidden.txt", VirtualFile(glob_fs, "bar/bla/.hidden.txt", None))
+    results = sorted(str(path) for path, _ in fsutil.glob_multi(glob_fs.path("/bar"), ["bla/*.txt"]))
+    assert results == sorted(str(path) for path in glob_fs.path("/bar").glob("bla/*.txt"))
+    assert "/bar/bla/.hidden.txt" in results
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import io
+import json
+import tarfile
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from dissect.target.filesystems.tar import TarFilesystem
+from dissect.target.helpers import layout
+from dissect.target.helpers.config import CONFIG_NAME
+from dissect.target.plugins.os.unix.linux._os import LinuxPlugin
+from dissect.target.target import Target
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _create_image(tmp_path: Path, hostname: bytes = b"myhost\n") -> Path:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tf:
+        for name in ("etc", "var", "opt"):
+            info = tarfile.TarInfo(name)
+            info.type = tarfile.DIRTYPE
+            tf.addfile(info)
+
+        info = tarfile.TarInfo("etc/hostname")
+        info.size = len(hostname)
+        tf.addfile(info, io.BytesIO(hostname))
+
+    path = tmp_path.joinpath("disk.img")
+    path.write_bytes(buf.getvalue().ljust(2 * 1024 * 1024, b"\x00"))
+
+    snapshot_dir = tmp_path.joinpath("layout")
+    tmp_path.joinpath(CONFIG_NAME).write_text(f"LAYOUT_SNAPSHOT_DIR = {str(snapshot_dir)!r}\n")
+
+    return path
+
+
+def test_layout_snapshot_record_and_replay(tmp_path: Path) -> None:
+    path = _create_image(tmp_path)
+
+    target = Target.open(f"raw://{path}")
+    assert target._os_plugin is LinuxPlugin
+    assert not target._layout.replay
+
+    snapshots = list(tmp_path.joinpath("layout").glob(f"*{layout.SNAPSHOT_SUFFIX}"))
+    assert len(snapshots) == 1
+
+    data = json.loads(snapshots[0].read_text())
+    assert data["os_plugin"] == "dissect.target.plugins.os.unix.linux._os.LinuxPlugin"
+    assert data["os_filesystem"] == 0
+    assert list(data["volumes"].values()) == [
+        {
+            "kind": layout.VOLUME_PLAIN,
+            "vs": False,
+            "filesystem": "dissect.target.filesystems.tar.TarFilesystem",
+        }
+    ]
+
+    # Replaying the snapshot doesn't probe the volume and only detects the recorded OS plugin
+    with (
+        patch("dissect.target.filesystem.open", side_effect=AssertionError) as filesystem_open,
+        patch("dissect.target.volume.is_encrypted", side_effect=AssertionError) as is_encrypted,
+        patch("dissect.target.plugin.os_plugins", side_effect=AssertionError) as os_plugins,
+    ):
+        target = Target.open(f"raw://{path}")
+
+    filesystem_open.assert_not_called()
+    is_encrypted.assert_not_called()
+    os_plugins.assert_not_called()
+
+    assert target._layout.replay
+    assert not target._layout.invalid
+    assert target._os_plugin is LinuxPlugin
+    assert isinstance(target.filesystems[0], TarFilesystem)
+    assert target.fs.path("/etc/hostname").read_text() == "myhost\n"
+
+
+def test_layout_snapshot_changed_evidence(tmp_path: Path) -> None:
+    path = _create_image(tmp_path)
+    Target.open(f"raw://{path}")
+
+    # A change in the header of the evidence results in a new fingerprint, so the snapshot isn't replayed
+    path = _create_image(tmp_path, b"otherhost\n")
+    target = Target.open(f"raw://{path}")
+
+    assert not target._layout.replay
+    assert target.fs.path("/etc/hostname").read_text() == "otherhost\n"
+    assert len(list(tmp_path.joinpath("layout").glob(f"*{layout.SNAPSHOT_SUFFIX}"))) == 2
+
+
+def test_layout_snapshot_invalid(tmp_path: Path) -> None:
+    path = _create_image(tmp_path)
+    Target.open(f"raw://{path}")
+
+    snapshot_path = next(tmp_path.joinpath("layout").glob(f"*{layout.SNAPSHOT_SUFFIX}"))
+    data = json.loads(snapshot_path.read_text())
+    for entry in data["volumes"].values():
+        entry["filesystem"] = "dissect.target.filesystems.extfs.ExtFilesystem"
+    snapshot_path.write_text(json.dumps(data))
+
+    # The recorded filesystem fails to open, so the filesystem is identified and the snapshot is removed
+    target = Target.open(f"raw://{path}")
+
+    assert target._layout.invalid
+    assert isinstance(target.filesystems[0], TarFilesystem)
+    assert target._os_plugin is LinuxPlugin
+    assert not snapshot_path.exists()
+
+
+def test_layout_snapshot_os_mismatch(tmp_path: Path) -> None:
+    path = _create_image(tmp_path)
+    Target.open(f"raw://{path}")
+
+    snapshot_path = next(tmp_path.joinpath("layout").glob(f"*{layout.SNAPSHOT_SUFFIX}"))
+
+    # The recorded OS plugin no longer detects the recorded filesystem, so the OS is detected and the snapshot removed
+    with patch.object(LinuxPlugin, "detect", return_value=None):
+        target = Target.open(f"raw://{path}")
+
+    assert target._layout.invalid
+    assert target._os_plugin is not LinuxPlugin
+    assert not snapshot_path.exists()
+
+
+def test_layout_snapshot_disabled(target_bare: Target) -> None:
+    assert layout.open_snapshot(target_bare) is None
@@ -1,22 +1,33 @@
 from __future__ import annotations
 
+import hashlib
+import stat
+from io import BytesIO
 from typing import TYPE_CHECKING
 from unittest.mock import Mock, mock_open, patch
 
 import pytest
+from flow.record import RecordDescriptor
 from flow.record.fieldtypes import command, digest, path
 
 from dissect.target.exceptions import FileNotFoundError, IsADirectoryError
-from dissect.target.helpers.fsutil import TargetPath
+from dissect.target.filesystem import VirtualFile, VirtualFilesystem
+from dissect.target.helpers.fsutil import TargetPath, stat_result
+from dissect.target.helpers.hashutil import common
 from dissect.target.helpers.record_modifier import (
+    HASH_WINDOW,
     Modifier,
     ModifierFunc,
     get_modifier_function,
+    modify_records,
 )
 from tests.helpers.test_hashutil import HASHES
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from flow.record import Record
+    from pytest_benchmark.fixture import BenchmarkFixture
 
     from dissect.target.target import Target
 
@@ -152,3 +163,92 @@ def test_resolved_modifier(record: Record, target_win: Target, resolve_function:
     for _record in resolved_record.records[1:]:
         assert _record.name_resolved is not None
         assert not hasattr(_record, "name_digest")
+
+
+@pytest.fixture
+def target_files(target_unix: Target, fs_unix: VirtualFilesystem, tmp_path: Path) -> Target:
+    for idx in range(3):
+        tmp_path.joinpath(f"file{idx}").write_bytes(b"file %d" % idx * 100_000)
+        fs_unix.map_file(f"/bin/file{idx}", str(tmp_path.joinpath(f"file{idx}")))
+    return target_unix
+
+
+def _path_records(count: int) -> list[Record]:
+    descriptor = RecordDescriptor("test/record", [("path", "path"), ("varint", "idx")])
+    return [descriptor(path=f"/bin/file{idx % 3}", idx=idx) for idx in range(count)]
+
+
+@pytest.mark.parametrize("workers", [0, 4])
+def test_hash_path_records_cache(target_files: Target, workers: int) -> None:
+    """Test if every distinct file is hashed once and records keep their order."""
+    modifier_func = get_modifier_function(Modifier.HASH)
+    modifier_func.hasher.workers = workers
+
+    with patch("dissect.target.helpers.record_modifier.common", side_effect=common) as mocked_common:
+        results = list(modify_records(target_files, _path_records(100), modifier_func))
+
+    assert mocked_common.call_count == 3
+    assert modifier_func.hasher.misses == 3
+
+    assert [result.records[0].idx for result in results] == list(range(100))
+    for result in results:
+        digest_record = result.records[1]
+        with target_files.fs.path(digest_record.path_resolved).open() as fh:
+            assert digest_record.path_digest.sha256 == hashlib.sha256(fh.read()).hexdigest()
+
+    # The digest records of all rows share a descriptor
+    assert len({result.records[1]._desc for result in results}) == 1
+
+
+def test_hash_path_records_changed_file(target_files: Target, tmp_path: Path) -> None:
+    """Test if a file with the same path but a different size is hashed again."""
+    modifier_func = get_modifier_function(Modifier.HASH)
+    first = modifier_func(target_files, _path_records(1)[0])
+
+    tmp_path.joinpath("file0").write_bytes(b"changed")
+    second = modifier_func(target_files, _path_records(1)[0])
+
+    assert first.records[1].path_digest.sha256 != second.records[1].path_digest.sha256
+    assert second.records[1].path_digest.sha256 == hashlib.sha256(b"changed").hexdigest()
+
+
+def test_hash_path_records_layers(target_unix: Target) -> None:
+    """Test if files of different filesystems of the root filesystem are told apart."""
+    for name in ("a", "b"):
+        fs = VirtualFilesystem()
+        fs.map_file_fh("file", BytesIO(name.encode() * 100))
+        target_unix.fs.mount(f"/{name}", fs)
+
+    st = stat_result([stat.S_IFREG, 1, 1, 1, 0, 0, 100, 0, 1, 0])
+    descriptor = RecordDescriptor("test/record", [("path", "path")])
+    records = [descriptor(path=f"/{name}/file") for name in ("a", "b", "a")]
+
+    modifier_func = get_modifier_function(Modifier.HASH)
+    with patch.object(VirtualFile, "stat", return_value=st):
+        results = list(modify_records(target_unix, records, modifier_func))
+
+    assert [result.records[1].path_digest.md5 for result in results] == [
+        hashlib.md5(b"a" * 100).hexdigest(),
+        hashlib.md5(b"b" * 100).hexdigest(),
+        hashlib.md5(b"a" * 100).hexdigest(),
+    ]
+    assert modifier_func.hasher.misses == 2
+
+
+def test_hash_path_records_resolve_once(target_files: Target) -> None:
+    """Test if the paths of a record are resolved once and records are produced before reading all records."""
+    modifier_func = get_modifier_function(Modifier.HASH)
+    records = iter(_path_records(100))
+
+    with patch.object(target_files, "resolve", wraps=target_files.resolve) as mocked_resolve:
+        results = modify_records(target_files, records, modifier_func)
+        next(results)
+
+        assert mocked_resolve.call_count == HASH_WINDOW
+        assert len(list(records)) == 100 - HASH_WINDOW
+
+
+@pytest.mark.benchmark
+def test_benchmark_hash_path_records(benchmark: BenchmarkFixture, target_files: Target) -> None:
+    records = _path_records(1000)
+    benchmark(lambda: list(modify_records(target_files, records, get_modifier_function(Modifier.HASH))))
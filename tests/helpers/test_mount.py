@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import io
+import threading
+
+import pytest
+
+from dissect.target.filesystem import VirtualFilesystem
+
+try:
+    from dissect.target.helpers.mount import DissectMount, MountStats, ReadaheadFile
+
+    HAS_FUSE = True
+except Exception:
+    HAS_FUSE = False
+
+pytestmark = pytest.mark.skipif(not HAS_FUSE, reason="requires fusepy and libfuse")
+
+
+class CountingIO(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads = []
+
+    def read(self, size: int = -1) -> bytes:
+        self.reads.append((self.tell(), size))
+        return super().read(size)
+
+
+def test_mount_stats() -> None:
+    stats = MountStats()
+
+    def update() -> None:
+        for _ in range(10000):
+            stats.add(reads=1, bytes_read=2)
+
+    threads = [threading.Thread(target=update) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stats.as_dict() == {
+        "reads": 40000,
+        "read_hits": 0,
+        "bytes_requested": 0,
+        "bytes_read": 80000,
+        "readdirs": 0,
+        "readdir_hits": 0,
+    }
+
+
+def test_readahead_file() -> None:
+    data = bytes(range(256)) * 1024
+    fh = CountingIO(data)
+    stats = MountStats()
+    rfh = ReadaheadFile(fh, 64 * 1024, threading.RLock(), stats)
+
+    # A random read doesn't read ahead
+    assert rfh.read(4096, 100_000) == data[100_000:104_096]
+    assert fh.reads == [(100_000, 4096)]
+
+    # Sequential reads grow the readahead window up to the maximum
+    chunks = [rfh.read(4096, offset) for offset in range(0, len(data), 4096)]
+    assert b"".join(chunks) == data
+    assert max(size for _, size in fh.reads) == 64 * 1024
+    assert len(fh.reads) < len(chunks) // 4
+    assert stats.read_hits == len(chunks) - (len(fh.reads) - 1)
+
+    # Reads past the end of the file are served from the buffer
+    assert rfh.read(4096, len(data) - 100) == data[-100:]
+    assert rfh.read(4096, len(data)) == b""
+
+
+def test_dissect_mount_caches() -> None:
+    vfs = VirtualFilesystem()
+    vfs.map_file_fh("dir/file", io.BytesIO(b"a" * 300_000))
+    vfs.map_file_fh("dir/other", io.BytesIO(b"b"))
+
+    mount = DissectMount(vfs, readahead=128 * 1024, dir_cache_size=1)
+
+    for _ in range(2):
+        fh = mount.opendir("/dir")
+        assert list(mount.readdir("/dir", fh)) == [".", "..", "file", "other"]
+        mount.releasedir("/dir", fh)
+
+    fh = mount.open("/dir/file", 0)
+    assert b"".join(mount.read("/dir/file", 4096, offset, fh) for offset in range(0, 300_000, 4096)) == b"a" * 300_000
+    mount.release("/dir/file", fh)
+
+    assert mount.getattr("/dir/file") == mount.getattr("/dir/file")
+
+    stats = mount.get_stats()
+    assert stats["readdirs"] == 2
+    assert stats["readdir_hits"] == 1
+    assert stats["reads"] == 74
+    assert stats["read_hits"] > 60
+    assert stats["bytes_read"] == 300_000
+    assert stats["getattr_hits"] == 1
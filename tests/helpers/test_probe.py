@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import io
+import tarfile
+import threading
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from dissect.util.stream import AlignedStream
+
+from dissect.target.containers.raw import RawContainer
+from dissect.target.filesystems.tar import TarFilesystem
+from dissect.target.helpers import probe
+from dissect.target.loaders.remote import RemoteStream, RemoteStreamConnection
+from dissect.target.volume import Volume
+
+if TYPE_CHECKING:
+    from dissect.target.target import Target
+
+
+def _disk(size: int = 4096) -> RawContainer:
+    return RawContainer(io.BytesIO(b"\x00" * size))
+
+
+def _volume(disk: RawContainer | list | None, offset: int = 0) -> Volume:
+    return Volume(io.BytesIO(b"\x00" * 512), 1, offset, 512, None, None, disk=disk)
+
+
+def test_stream_roots() -> None:
+    disk1 = _disk()
+    disk2 = _disk()
+
+    roots1 = probe.stream_roots(disk1)
+    roots2 = probe.stream_roots(disk2)
+    assert {id(disk1), id(disk1.fh)} <= roots1
+    assert not roots1 & roots2
+
+    assert probe.stream_roots(_volume(disk1)) == roots1
+    # Volumes on volumes, e.g. decrypted volumes, and volumes spanning multiple disks, e.g. LVM
+    assert probe.stream_roots(_volume(_volume(disk1))) == roots1
+    assert probe.stream_roots(_volume([_volume(disk1), _volume(disk2)])) == roots1 | roots2
+    # Volumes added by a loader
+    assert probe.stream_roots(_volume(None)) is None
+    assert probe.stream_roots(_volume([_volume(disk1), io.BytesIO()])) is None
+
+
+def test_stream_roots_shared_source() -> None:
+    class Stream(AlignedStream):
+        def __init__(self, stream: object):
+            self.stream = stream
+            super().__init__(4096)
+
+        def _read(self, offset: int, length: int) -> bytes:
+            return b"\x00" * length
+
+    # Disks of a loader that share a connection, e.g. the remote and MQTT loaders
+    connection = object()
+    disk1 = RawContainer(Stream(connection))
+    disk2 = RawContainer(Stream(connection))
+    assert id(connection) in probe.stream_roots(disk1) & probe.stream_roots(disk2)
+    assert not probe.stream_roots(disk1) & probe.stream_roots(RawContainer(Stream(object())))
+
+    # Disks inside the same tar file, e.g. the OVA loader
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tf:
+        for name in ("disk1", "disk2"):
+            info = tarfile.TarInfo(name)
+            info.size = 4096
+            tf.addfile(info, io.BytesIO(b"\x00" * 4096))
+
+    fs = TarFilesystem(buf)
+    tar_disk1 = RawContainer(fs.path("disk1").open())
+    tar_disk2 = RawContainer(fs.path("disk2").open())
+    assert probe.stream_roots(tar_disk1) & probe.stream_roots(tar_disk2)
+
+    results = probe.map_probes(lambda disk: threading.current_thread().name, [disk1, disk2], workers=2)
+    assert len(set(results)) == 1
+
+
+def test_stream_roots_remote() -> None:
+    with (
+        patch.object(RemoteStreamConnection, "CONFIG_KEY", None),
+        patch.object(RemoteStreamConnection, "CONFIG_CRT", None),
+    ):
+        connection = RemoteStreamConnection("127.0.0.1", 0, options={"noverify": "1"})
+
+    # The disks of the remote loader all read through the same connection
+    disks = [RawContainer(RemoteStream(connection, disk_id, 4096)) for disk_id in range(3)]
+    roots = [probe.stream_roots(disk) for disk in disks]
+    assert all(id(connection) in disk_roots for disk_roots in roots)
+
+    results = probe.map_probes(lambda disk: threading.current_thread().name, disks, workers=3)
+    assert len(set(results)) == 1
+
+
+def test_map_probes_concurrent() -> None:
+    disk1 = _disk()
+    disk2 = _disk()
+    items = [_volume(disk1), _volume(disk2), _volume(disk1, 512), _volume(disk2, 512)]
+
+    # Both disks must be probed at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    active = {id(disk1): 0, id(disk2): 0}
+    lock = threading.Lock()
+
+    def func(vol: Volume) -> tuple[int, int]:
+        with lock:
+            active[id(vol.disk)] += 1
+            assert active[id(vol.disk)] == 1, "Volumes of the same disk are probed concurrently"
+
+        if vol.offset == 0:
+            barrier.wait()
+
+        with lock:
+            active[id(vol.disk)] -= 1
+
+        return id(vol.disk), vol.offset
+
+    results = probe.map_probes(func, items, workers=4)
+    assert results == [(id(vol.disk), vol.offset) for vol in items]
+
+
+def test_map_probes_sequential() -> None:
+    disk1 = _disk()
+    disk2 = _disk()
+    lvm = _volume([_volume(disk1), _volume(disk2)])
+    items = [_volume(None), _volume(disk1), lvm, _volume(disk2)]
+
+    order = []
+
+    def func(vol: Volume) -> str:
+        order.append(vol)
+        return threading.current_thread().name
+
+    # The LVM volume merges the groups of both disks, so everything is probed in the same thread
+    results = probe.map_probes(func, items, workers=4)
+    assert len(set(results)) == 1
+    # Volumes added by a loader are probed last
+    assert order == [items[1], lvm, items[3], items[0]]
+
+    # A single worker probes in the calling thread
+    results = probe.map_probes(func, [_volume(disk1), _volume(disk2)], workers=1)
+    assert results == [threading.current_thread().name] * 2
+
+
+def test_map_probes_exception() -> None:
+    def func(vol: Volume) -> None:
+        raise ValueError("probe failed")
+
+    with pytest.raises(ValueError, match="probe failed"):
+        probe.map_probes(func, [_volume(_disk()), _volume(_disk())], workers=2)
+
+
+def _tar_disk(name: str) -> RawContainer:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tf:
+        info = tarfile.TarInfo(name)
+        tf.addfile(info, io.BytesIO(b""))
+
+    return RawContainer(io.BytesIO(buf.getvalue().ljust(1024 * 1024, b"\x00")))
+
+
+def test_target_probe_order(target_bare: Target) -> None:
+    names = [f"disk{idx}" for idx in range(6)]
+    for name in names:
+        target_bare.disks.add(_tar_disk(name))
+
+    target_bare.disks.apply()
+    target_bare.volumes.apply()
+
+    assert [vol.disk for vol in target_bare.volumes] == target_bare.disks.entries
+    assert all(isinstance(fs, TarFilesystem) for fs in target_bare.filesystems)
+    assert [next(iter(fs.path("/").iterdir())).name for fs in target_bare.filesystems] == names
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import io
+from typing import TYPE_CHECKING
+
+import pytest
+from dissect.util.stream import AlignedStream
+
+from dissect.target.helpers import profiler
+from dissect.target.helpers.profiler import Profiler
+from dissect.target.plugins.general.example import ExamplePlugin
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from dissect.target.target import Target
+
+
+@pytest.fixture
+def global_profiler() -> Iterator[Profiler]:
+    try:
+        yield profiler.enable()
+    finally:
+        profiler.disable()
+
+
+def test_profiler_disabled() -> None:
+    assert profiler.get_profiler() is None
+
+    items = [1, 2, 3]
+    assert profiler.iterate(items, "records") is items
+
+    with profiler.phase("execute"):
+        pass
+
+
+def test_profiler_phase() -> None:
+    prof = Profiler()
+
+    with prof.phase("execute", "target", "func") as stats:
+        prof.bytes_read += 10
+    with prof.phase("execute", "target", "func"):
+        prof.bytes_read += 5
+
+    assert stats.calls == 2
+    assert stats.bytes_read == 15
+    assert stats.wall_time > 0
+    assert stats.peak_memory is None
+    assert prof.stats == {("target", "execute", "func"): stats}
+
+
+def test_profiler_iterate() -> None:
+    prof = Profiler()
+
+    def generate() -> Iterator[int]:
+        for i in range(3):
+            prof.bytes_read += 1
+            yield i
+
+    assert list(prof.iterate(generate(), "records", "target", "func")) == [0, 1, 2]
+
+    stats = prof.get_stats("records", "target", "func")
+    assert stats.calls == 1
+    assert stats.records == 3
+    assert stats.bytes_read == 3
+
+
+def test_profiler_trace_memory() -> None:
+    prof = Profiler(trace_memory=True)
+    prof.start()
+
+    try:
+        with prof.phase("execute", plugin="outer") as outer, prof.phase("check_compatible", plugin="inner") as inner:
+            data = bytearray(4 * 1024 * 1024)
+            del data
+    finally:
+        prof.stop()
+
+    assert inner.peak_memory >= 4 * 1024 * 1024
+    # Peak memory is inclusive of nested phases
+    assert outer.peak_memory >= inner.peak_memory
+
+
+def test_profiler_track() -> None:
+    prof = Profiler()
+
+    class Stream(io.BytesIO):
+        pass
+
+    fh = Stream(b"\x00" * 100)
+    prof.track(fh)
+    prof.track(fh)
+
+    fh.read(10)
+    fh.readinto(bytearray(40))
+    fh.read()
+    assert prof.bytes_read == 100
+
+    # The original methods are restored when the profiler is stopped
+    prof.stop()
+    assert "read" not in vars(fh)
+    assert "readinto" not in vars(fh)
+    fh.seek(0)
+    fh.read()
+    assert prof.bytes_read == 100
+
+
+def test_profiler_track_nested_read() -> None:
+    prof = Profiler()
+
+    fh = AlignedStream(100)
+    fh._read = lambda offset, length: b"\x00" * length
+    prof.track(fh)
+
+    # AlignedStream implements readinto using read, which must only be counted once
+    fh.readinto(bytearray(40))
+    assert prof.bytes_read == 40
+
+
+def test_profiler_merge_and_summary() -> None:
+    prof = Profiler()
+    with prof.phase("execute", "one", "func"):
+        pass
+
+    other = Profiler()
+    with other.phase("execute", "two", "func"):
+        pass
+    list(other.iterate(range(5), "records", "two", "func"))
+
+    prof.merge(other.as_dict())
+
+    data = prof.as_dict()
+    assert [(entry["target"], entry["phase"]) for entry in data["phases"]] == [
+        ("one", "execute"),
+        ("two", "execute"),
+        ("two", "records"),
+    ]
+    assert data["phases"][2]["records"] == 5
+
+    summary = prof.format_summary().splitlines()
+    assert summary[0].split()[:3] == ["phase", "plugin", "wall"]
+    # Phases of all targets are combined in the summary
+    rows = sorted(line.split() for line in summary[2:4])
+    assert [(row[0], row[1], row[3]) for row in rows] == [("execute", "func", "2"), ("records", "func", "1")]
+    assert summary[-1].startswith("total wall time")
+
+
+def test_profiler_target(global_profiler: Profiler, target_bare: Target) -> None:
+    target_bare.add_plugin(ExamplePlugin)
+
+    plugin_name = "dissect.target.plugins.general.example.ExamplePlugin"
+    assert global_profiler.get_stats("init", target_bare, plugin_name).calls == 1
+    assert global_profiler.get_stats("check_compatible", target_bare, plugin_name).calls == 1
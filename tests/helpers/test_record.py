@@ -11,9 +11,12 @@ from dissect.target.helpers.descriptor_extensions import (
     UserRecordDescriptorExtension,
 )
 from dissect.target.helpers.record import (
+    BatchedRecords,
+    RecordBatch,
     TargetRecordDescriptor,
     UnixUserRecord,
     WindowsUserRecord,
+    batched,
     create_extended_descriptor,
 )
 
@@ -184,3 +187,47 @@ def test_user_record_descriptor_extension(mock_windows_user: WindowsUserRecord,
     assert test_record.username == "some-name"
     assert test_record.user_id == "1337"
     assert test_record.user_home == "some-home"
+
+
+def test_record_batch() -> None:
+    batch = RecordBatch(TestRecord, {"foo": ["a", "b", 1]}, _target=MockTarget())
+
+    assert len(batch) == 3
+    assert batch.defaults == {"hostname": "some-host", "domain": "some.domain", "_source": "/some/path"}
+    assert batch.column("foo") == ["a", "b", "1"]
+    assert batch.column("bar") == [None, None, None]
+    assert batch.column("hostname") == ["some-host"] * 3
+    assert batch.column("_generated") == [batch.generated] * 3
+
+    records = list(batch)
+    assert [record.foo for record in records] == ["a", "b", "1"]
+    assert records[0] == TestRecord(foo="a", _target=MockTarget(), _generated=records[0]._generated)
+
+    with pytest.raises(ValueError, match="same length"):
+        RecordBatch(TestRecord, {"foo": ["a"], "bar": []})
+
+
+def test_batched_records() -> None:
+    rows = ({"foo": str(i), "bar": "bar"} for i in range(5))
+    batches = list(batched(TestRecord, rows, size=2, _target=MockTarget()))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    # Iterating the result yields records, regardless of how they were produced
+    extra = TestRecord(foo="extra")
+    result = BatchedRecords([*batches, extra])
+    assert [record.foo for record in result] == ["0", "1", "2", "3", "4", "extra"]
+
+    with pytest.raises(ValueError, match="after the records have been iterated"):
+        result.batches()
+
+    result = BatchedRecords([*batches, extra])
+    assert list(result.batches()) == [*batches, extra]
+    assert list(result) == []
+
+
+def test_batched_records_missing_fields() -> None:
+    rows = [{"foo": "a"}, {"foo": "b", "bar": "b"}, {"bar": "c"}]
+    (batch,) = batched(TestRecord, rows, _target=MockTarget())
+
+    # Fields that only appear in later rows aren't dropped
+    assert [(record.foo, record.bar) for record in batch] == [("a", None), ("b", "b"), (None, "c")]
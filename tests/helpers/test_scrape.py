@@ -3,6 +3,7 @@ from __future__ import annotations
 import io
 import os
 import random
+import re
 from typing import TYPE_CHECKING, BinaryIO
 from unittest.mock import Mock
 
@@ -277,8 +278,62 @@ def test_recover_string(buf: bytes, encoding: str, reverse: bool, ascii: bool, e
     assert scrape.recover_string(buf, encoding, reverse=reverse, ascii=ascii) == expected
 
 
+@pytest.mark.parametrize(
+    "threshold",
+    [
+        pytest.param(1, id="automaton"),
+        pytest.param(1_000_000, id="individual"),
+    ],
+)
+def test_needle_set(monkeypatch: pytest.MonkeyPatch, threshold: int) -> None:
+    if threshold == 1 and not scrape.HAS_AHOCORASICK:
+        pytest.skip("pyahocorasick is not installed")
+
+    monkeypatch.setattr(scrape, "AUTOMATON_THRESHOLD", threshold)
+
+    buf = b"xxABCDxxabcxxABxxCABCx"
+    pattern = re.compile(b"C[A-Z]+")
+    needle_set = scrape.NeedleSet([b"ABC", b"ABCD", b"AB", b"BC", pattern])
+
+    assert len(needle_set) == 5
+    assert needle_set.max_len == 7
+    assert [(offset, needle) for offset, needle, _ in needle_set.search(buf)] == [
+        (2, b"AB"),
+        (3, b"BC"),
+        (4, pattern),
+        (13, b"AB"),
+        (17, pattern),
+        (18, b"AB"),
+        (19, b"BC"),
+    ]
+    assert [offset for offset, _, _ in needle_set.search(buf, 14)] == [17, 18, 19]
+
+    needle_set = scrape.NeedleSet([b"ABC", b"xCa"], ignore_case=True)
+    assert list(needle_set.search(buf)) == [
+        (2, b"ABC", None),
+        (8, b"ABC", None),
+        (16, b"xCa", None),
+        (18, b"ABC", None),
+    ]
+
+    with pytest.raises(ValueError, match="At least one needle value must be provided"):
+        scrape.NeedleSet([])
+
+
 @pytest.mark.benchmark
 def test_benchmark_find_needles(benchmark: BenchmarkFixture) -> None:
     buf = b"A" * 100 + b"needle" + b"B" * 100
     needles = [b"needle"]
     benchmark(lambda: list(scrape.find_needles(io.BytesIO(buf), needles)))
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [10, 1_000, 50_000])
+def test_benchmark_find_many_needles(benchmark: BenchmarkFixture, count: int) -> None:
+    if count > 1_000 and not scrape.HAS_AHOCORASICK:
+        pytest.skip("pyahocorasick is not installed")
+
+    rng = random.Random(1337)
+    buf = rng.randbytes(1024 * 1024)
+    needles = scrape.NeedleSet([rng.randbytes(rng.randint(8, 16)) for _ in range(count)])
+    benchmark(lambda: list(scrape.find_needles(io.BytesIO(buf), needles, block_size=1024 * 64)))
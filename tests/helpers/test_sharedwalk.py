@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import stat
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import pytest
+
+from dissect.target.filesystem import VirtualDirectory, VirtualFile, VirtualFilesystem
+from dissect.target.helpers import fsutil, sharedwalk
+from dissect.target.plugins.filesystem.unix.suid import SuidPlugin
+from dissect.target.plugins.filesystem.walkfs import WalkFsPlugin
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from dissect.target.filesystem import FilesystemEntry
+    from dissect.target.target import Target
+
+
+class PathConsumer(sharedwalk.WalkConsumer):
+    def __init__(self, target: Target, path: str = "/", fail: str | None = None):
+        super().__init__(target, path)
+        self.fail = fail
+        self.finished = False
+
+    def consume(self, entry: FilesystemEntry) -> Iterator[str]:
+        if entry.path == self.fail:
+            raise ValueError("consumer failed")
+        yield entry.path
+
+    def finish(self) -> Iterator[str]:
+        self.finished = True
+        yield "done"
+
+
+@pytest.fixture
+def target_walk(target_unix: Target, fs_unix: VirtualFilesystem) -> Target:
+    vfile = VirtualFile(fs_unix, "binary", None)
+    vfile.lstat = Mock()
+    vfile.lstat.return_value = fsutil.stat_result([stat.S_IFREG | stat.S_ISUID, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+    fs_unix.map_file_entry("/path/to/suid/binary", vfile)
+    fs_unix.map_file_entry("/path/to/file", VirtualFile(fs_unix, "file", None))
+
+    target_unix.add_plugin(WalkFsPlugin)
+    target_unix.add_plugin(SuidPlugin)
+    return target_unix
+
+
+def test_walk_result(target_walk: Target) -> None:
+    result = sharedwalk.WalkResult(PathConsumer(target_walk, "/path"))
+    assert not result.started
+
+    assert next(result) == "/path"
+    assert result.started
+    assert list(result) == ["/path/to", "/path/to/suid", "/path/to/suid/binary", "/path/to/file", "done"]
+
+    with pytest.raises(ValueError, match="after it has been iterated"):
+        sharedwalk.merge([result])
+
+
+def test_merge_single_walk(target_walk: Target) -> None:
+    expected_walkfs = [record.path for record in target_walk.walkfs()]
+    expected_suid = [record.path for record in target_walk.suid_binaries()]
+
+    walkfs = target_walk.walkfs()
+    suid = target_walk.suid_binaries()
+
+    with patch.object(VirtualDirectory, "scandir", autospec=True, side_effect=VirtualDirectory.scandir) as scandir:
+        list(target_walk.walkfs())
+        single_count = scandir.call_count
+        scandir.reset_mock()
+
+        records = list(sharedwalk.merge([walkfs, suid]))
+
+    # Both functions are served by a single walk
+    assert scandir.call_count == single_count
+
+    assert [r.path for r in records if r._desc.name == "filesystem/entry"] == expected_walkfs
+    assert (
+        [r.path for r in records if r._desc.name == "filesystem/unix/suid"] == expected_suid == ["/path/to/suid/binary"]
+    )
+
+    # The merged results don't produce anything anymore
+    assert list(walkfs) == []
+    assert list(suid) == []
+
+
+def test_merge_paths_and_errors(target_walk: Target, caplog: pytest.LogCaptureFixture) -> None:
+    failing = PathConsumer(target_walk, "/path", fail="/path/to")
+    other = PathConsumer(target_walk, "/path/to/")
+    results = list(sharedwalk.merge([sharedwalk.WalkResult(failing), sharedwalk.WalkResult(other)]))
+
+    # A failing consumer doesn't affect the other consumers, consumers of different paths walk separately
+    assert "Exception in <PathConsumer path=/path> for" in caplog.text
+    assert results == [
+        "/path",
+        "/path/to/suid",
+        "/path/to/suid/binary",
+        "/path/to/file",
+        "/path/to",
+        "/path/to/suid",
+        "/path/to/suid/binary",
+        "/path/to/file",
+        "done",
+        "done",
+    ]
+    assert failing.finished
+    assert other.finished
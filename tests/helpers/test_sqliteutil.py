@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import TYPE_CHECKING
+
+import pytest
+from dissect.database.sqlite3 import SQLite3
+
+from dissect.target.helpers.sqliteutil import RowLookup, index_entries
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def sqlite_db(tmp_path: Path) -> SQLite3:
+    path = tmp_path.joinpath("test.sqlite")
+
+    # Small pages and padded rows, so the table and index span multiple levels of interior pages
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA page_size = 512")
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, padding TEXT)")
+        conn.execute("CREATE TABLE chains (id INTEGER NOT NULL, idx INTEGER NOT NULL, PRIMARY KEY (id, idx))")
+        conn.executemany(
+            "INSERT INTO items VALUES (?, ?, ?)", [(i * 2, f"item {i * 2}", "x" * 100) for i in range(1, 5001)]
+        )
+        conn.executemany("INSERT INTO chains VALUES (?, ?)", [(i % 500, i // 500) for i in range(5000)])
+    conn.close()
+
+    return SQLite3(path.open("rb"))
+
+
+def test_row_lookup(sqlite_db: SQLite3) -> None:
+    rows = RowLookup(sqlite_db.table("items"), cache_size=16)
+
+    for rowid in (2, 4, 1000, 5002, 9998, 10000):
+        row = rows.get(rowid)
+        assert row.id == rowid
+        assert row.name == f"item {rowid}"
+
+    for rowid in (None, 0, 1, 5001, 10002):
+        assert rows.get(rowid) is None
+
+    assert rows.get.cache_info().currsize == 11
+
+
+def test_index_entries(sqlite_db: SQLite3) -> None:
+    entries = list(index_entries(sqlite_db, sqlite_db.index("sqlite_autoindex_chains_1")))
+    rows = {row._cell.key: (row.id, row.idx) for row in sqlite_db.table("chains").rows()}
+
+    assert len(entries) == 5000
+    assert [(id_, idx) for id_, idx, _ in entries] == sorted(rows.values())
+    assert all(rows[rowid] == (id_, idx) for id_, idx, rowid in entries)
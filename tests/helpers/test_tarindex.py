@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import gzip
+import io
+import os
+import random
+import tarfile
+from typing import TYPE_CHECKING
+
+import pytest
+
+from dissect.target.helpers import tarindex
+from dissect.target.helpers.tarindex import SeekPointStream, TarIndex, index_path, open_tar
+from dissect.target.loaders.tar import TarLoader
+from dissect.target.target import Target
+from tests.filesystems.test_tar import _mkdir, _mkfile, _mksym
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+FILES = {f"dir/file{i}.bin": random.Random(i).randbytes(64 * 1024 * (i % 5)) for i in range(20)}
+
+
+def _create_tar() -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tf:
+        _mkdir(tf, "dir")
+        for name, content in FILES.items():
+            _mkfile(tf, name, content)
+        _mksym(tf, "link", "dir/file1.bin")
+    return buf.getvalue()
+
+
+def _split(data: bytes, size: int = 256 * 1024) -> list[bytes]:
+    return [data[offset : offset + size] for offset in range(0, len(data), size)]
+
+
+def _gzip_members(data: bytes) -> bytes:
+    return b"".join(gzip.compress(part) for part in _split(data))
+
+
+def _zstd_frames(data: bytes) -> bytes:
+    zstd = pytest.importorskip("backports.zstd")
+    return b"".join(zstd.compress(part) for part in _split(data))
+
+
+COMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    "none": lambda data: data,
+    "gzip": gzip.compress,
+    "gzip-members": _gzip_members,
+    "zstd-frames": _zstd_frames,
+}
+
+
+@pytest.fixture(params=[True, False], ids=["zran", "no-zran"])
+def zran(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> bool:
+    if request.param:
+        pytest.importorskip("indexed_gzip")
+    else:
+        monkeypatch.setattr(tarindex, "HAS_INDEXED_GZIP", False)
+    return request.param
+
+
+def _check_tar(tar: tarfile.TarFile) -> None:
+    assert [member.name for member in tar.getmembers()] == ["dir", *FILES, "link"]
+
+    names = list(FILES)
+    random.Random(0).shuffle(names)
+    for name in names:
+        assert tar.extractfile(name).read() == FILES[name]
+
+    assert tar.extractfile("link").read() == FILES["dir/file1.bin"]
+
+
+@pytest.mark.parametrize("compression", COMPRESSORS.keys())
+def test_open_tar(tmp_path: Path, zran: bool, compression: str) -> None:
+    path = tmp_path.joinpath("test.tar")
+    path.write_bytes(COMPRESSORS[compression](_create_tar()))
+
+    with path.open("rb") as fh:
+        _check_tar(open_tar(path, fh, "1"))
+
+    assert index_path(path).exists()
+
+    with path.open("rb") as fh:
+        index = TarIndex.load(index_path(path), fh)
+        assert len(index.members) == len(FILES) + 2
+
+        if compression in ("gzip-members", "zstd-frames") and not (compression == "gzip-members" and zran):
+            # A seek point at the member or frame boundaries, at least SEEK_POINT_SPACING bytes apart
+            expected = list(range(0, len(_create_tar()), tarindex.SEEK_POINT_SPACING))
+            assert [uncompressed for _, uncompressed in index.seek_points] == expected
+
+        tar = index.open(fh)
+        assert tar._loaded
+        _check_tar(tar)
+
+
+def test_open_tar_location(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path.joinpath("test.tar.gz")
+    path.write_bytes(gzip.compress(_create_tar()))
+    index_dir = tmp_path.joinpath("index")
+
+    # Without a location, no index is written
+    with path.open("rb") as fh:
+        _check_tar(open_tar(path, fh))
+    assert list(tmp_path.iterdir()) == [path]
+
+    with path.open("rb") as fh:
+        _check_tar(open_tar(path, fh, str(index_dir)))
+    assert index_path(path, str(index_dir)) in index_dir.iterdir()
+
+    # The location "0" disables indexes completely
+    monkeypatch.setenv("DISSECT_TAR_INDEX", "0")
+    with path.open("rb") as fh:
+        assert isinstance(open_tar(path, fh).fileobj, gzip.GzipFile)
+
+
+def test_index_outdated(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("test.tar")
+    path.write_bytes(_create_tar())
+
+    with path.open("rb") as fh:
+        open_tar(path, fh, "1")
+        assert TarIndex.load(index_path(path), fh) is not None
+
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+    with path.open("rb") as fh:
+        assert TarIndex.load(index_path(path), fh) is None
+
+    index_path(path).write_bytes(b"invalid")
+    assert TarIndex.load(index_path(path)) is None
+
+
+def test_index_without_source(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("test.tar")
+    path.write_bytes(_create_tar())
+
+    with path.open("rb") as fh:
+        open_tar(path, fh, "1")
+
+    # A file-like object without a file can't be validated against an index, nor can its index be saved
+    fh = io.BytesIO(_create_tar())
+    assert TarIndex.load(index_path(path), fh) is None
+
+    index, _ = TarIndex.build(fh)
+    assert index.source is None
+    with pytest.raises(ValueError, match="without a source"):
+        index.save(tmp_path.joinpath("other.tar.tarindex"))
+
+    path.unlink()
+    index_path(path).unlink()
+    _check_tar(open_tar(path, fh, "1"))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_seek_point_stream() -> None:
+    data = random.Random(0).randbytes(4 * 1024 * 1024)
+    compressed = b"".join(gzip.compress(part) for part in _split(data, 1024 * 1024)) + b"\x00" * 512
+
+    stream = SeekPointStream(io.BytesIO(compressed), "gzip")
+    assert stream.read() == data
+    assert stream.size == len(data)
+    assert [uncompressed for _, uncompressed in stream.seek_points] == [
+        0,
+        1024 * 1024,
+        2 * 1024 * 1024,
+        3 * 1024 * 1024,
+    ]
+
+    # Reads resume from the closest seek point
+    stream.seek(3 * 1024 * 1024 + 10)
+    assert stream.read(100) == data[3 * 1024 * 1024 + 10 : 3 * 1024 * 1024 + 110]
+    assert stream._compressed_pos <= stream.seek_points[3][0] + tarindex.READ_SIZE
+
+    stream.seek(1234)
+    assert stream.read(100) == data[1234:1334]
+
+
+def test_tar_loader_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path.joinpath("test.tar.gz")
+    path.write_bytes(gzip.compress(_create_tar()))
+
+    monkeypatch.setenv("DISSECT_TAR_INDEX", "1")
+
+    target = Target.open(path)
+    assert isinstance(target._loader, TarLoader)
+    assert index_path(path).exists()
+    assert target.fs.path("dir/file3.bin").read_bytes() == FILES["dir/file3.bin"]
+
+    with monkeypatch.context() as m:
+        # The second open only uses the index
+        m.setattr(TarIndex, "build", lambda *args: pytest.fail("index was rebuilt"))
+        target = Target.open(path)
+        assert target.fs.path("dir/file4.bin").read_bytes() == FILES["dir/file4.bin"]
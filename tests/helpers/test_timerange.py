@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from dissect.target.helpers.timerange import TimeRange, parse_datetime, time_range_args
+from dissect.target.tools.utils.cli import generate_argparse_for_method
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("2024-01-02", datetime(2024, 1, 2, tzinfo=timezone.utc)),
+        ("2024-01-02T13:37:00", datetime(2024, 1, 2, 13, 37, tzinfo=timezone.utc)),
+        ("2024-01-02T13:37:00+02:00", datetime(2024, 1, 2, 11, 37, tzinfo=timezone.utc)),
+    ],
+)
+def test_parse_datetime(value: str, expected: datetime) -> None:
+    assert parse_datetime(value) == expected
+
+
+def test_time_range() -> None:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    time_range = TimeRange(start, end)
+
+    assert time_range
+    assert TimeRange("2024-01-01", "2024-01-02T00:00:00+00:00") == time_range
+    assert not TimeRange()
+    assert start in time_range
+    assert end in time_range
+    assert start - timedelta(microseconds=1) not in time_range
+    assert None not in time_range
+    assert None in TimeRange()
+
+    assert time_range.before(start - timedelta(seconds=1))
+    assert time_range.after(end + timedelta(seconds=1))
+    assert time_range.overlaps(start - timedelta(days=1), start)
+    assert time_range.overlaps(None, None)
+    assert not time_range.overlaps(start - timedelta(days=2), start - timedelta(days=1))
+    assert not time_range.overlaps(end + timedelta(days=1), None)
+
+    assert time_range.since_us == 1704067200_000000
+    assert time_range.until_us == 1704153600_000000
+
+    with pytest.raises(ValueError, match="--since must be before --until"):
+        TimeRange(end, start)
+
+
+def test_time_range_args(capsys: pytest.CaptureFixture) -> None:
+    @time_range_args
+    def func(since: str | datetime | None = None, until: str | datetime | None = None) -> None:
+        """Test function."""
+
+    parser = generate_argparse_for_method(func)
+
+    args = parser.parse_args(["--since", "2024-01-01", "--until", "2024-01-02T12:00:00+02:00"])
+    assert args.since == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert args.until == datetime(2024, 1, 2, 10, tzinfo=timezone.utc)
+
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--since", "yesterday"])
+    assert "argument --since: invalid datetime value: 'yesterday'" in capsys.readouterr().err
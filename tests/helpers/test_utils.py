@@ -4,11 +4,17 @@ import datetime
 import io
 import stat
 import textwrap
+from typing import TYPE_CHECKING
 from unittest.mock import mock_open, patch
 
+import pytest
+
 from dissect.target.filesystem import VirtualFilesystem
 from dissect.target.helpers import fsutil, utils
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 
 def test_to_list_single_value() -> None:
     assert utils.to_list(1) == [1]
@@ -26,6 +32,27 @@ def test_slugify() -> None:
     assert utils.slugify("foo/bar\\baz bla") == "foo_bar_baz_bla"
 
 
+def test_atomic_write(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("dir", "file.txt")
+
+    with utils.atomic_write(path) as temp:
+        temp.write_text("data")
+        assert not path.exists()
+    assert path.read_text() == "data"
+
+    def interrupted_write() -> None:
+        with utils.atomic_write(path) as temp:
+            temp.write_text("partial")
+            raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        interrupted_write()
+
+    # The original file is left untouched and the temporary file is removed
+    assert path.read_text() == "data"
+    assert list(path.parent.iterdir()) == [path]
+
+
 def test_filesystem_readinto() -> None:
     data = b"hello_world"
     mocked_file = mock_open(read_data=b"hello_world")
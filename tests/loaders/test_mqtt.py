@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import argparse
+import random
 import sys
+import threading
 import time
 from dataclasses import dataclass
 from struct import pack
@@ -15,6 +17,10 @@ from dissect.target.target import Target
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+    from dissect.target.loaders.mqtt import MqttConnection
+
 
 class MqttMock(MagicMock):
     def __init__(self, *args, **kwargs):
@@ -55,6 +61,26 @@ class MqttMock(MagicMock):
         self.on_message(self, None, response)
 
 
+class LatencyMqttMock(MqttMock):
+    """An in-process broker and agent that answers read requests after ``latency`` seconds."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latency: float = 0
+        self.seeks: list[str] = []
+
+    def publish(self, topic: str, *args) -> None:
+        if "/SEEK/" not in topic:
+            super().publish(topic, *args)
+            return
+
+        self.seeks.append(topic)
+        if self.latency:
+            threading.Timer(self.latency, super().publish, (topic, *args)).start()
+        else:
+            super().publish(topic, *args)
+
+
 @pytest.fixture
 def mock_paho(monkeypatch: pytest.MonkeyPatch) -> Iterator[MagicMock]:
     with monkeypatch.context() as m:
@@ -157,6 +183,81 @@ def test_mqtt_loader_prefetch(mock_broker: MockBroker, mock_paho: MagicMock) ->
     assert connection.prev == 1200
 
 
+@pytest.fixture
+def mqtt_connection(mock_paho: MagicMock) -> MqttConnection:
+    mock_paho.mqtt.client.Client.return_value = LatencyMqttMock()
+
+    from dissect.target.loaders.mqtt import Broker, MqttConnection
+
+    broker = Broker("0.0.0.0", "1884", "key", "crt", "ca", "case1", "user", "pass")
+    broker.connect()
+    broker.mqtt_client.disks = [random.Random(1337).randbytes(256 * 1024)]
+
+    connection = MqttConnection(broker, "host1")
+    connection.info()
+    return connection
+
+
+def test_mqtt_prefetch_sequential(mqtt_connection: MqttConnection) -> None:
+    disk = mqtt_connection.broker.mqtt_client.disks[0]
+
+    data = b"".join(mqtt_connection.read(0, offset, 512, 0) for offset in range(0, len(disk), 512))
+    assert data == disk
+
+    # The next range is requested before it's read, so only the first reads miss
+    seeks = mqtt_connection.broker.mqtt_client.seeks
+    assert mqtt_connection.misses == 2
+    assert mqtt_connection.hits == len(disk) // 512 - 2
+    assert len(seeks) < 10
+    # Requests don't extend past the end of the disk
+    assert seeks[-1].endswith(f"/{hex(len(disk) - int(seeks[-1].split('/')[-1], 16))}/{seeks[-1].split('/')[-1]}")
+    assert mqtt_connection.inflight == 0
+
+
+@pytest.mark.parametrize(("stride", "coalesced"), [(2048, True), (16 * 512, False)])
+def test_mqtt_prefetch_strided(mqtt_connection: MqttConnection, stride: int, coalesced: bool) -> None:
+    disk = mqtt_connection.broker.mqtt_client.disks[0]
+
+    for offset in range(0, len(disk), stride):
+        assert mqtt_connection.read(0, offset, 512, 0) == disk[offset : offset + 512]
+
+    seeks = [int(topic.split("/")[-1], 16) for topic in mqtt_connection.broker.mqtt_client.seeks]
+    # The first three reads establish the stride, the remaining blocks are requested ahead
+    assert mqtt_connection.misses == 3
+    if coalesced:
+        assert len(seeks) < 20
+        assert max(seeks) == (mqtt_connection.stride_prefetch - 1) * stride + 512
+    else:
+        assert set(seeks) == {512}
+
+
+def test_mqtt_prefetch_deduplicate(mqtt_connection: MqttConnection) -> None:
+    disk = mqtt_connection.broker.mqtt_client.disks[0]
+    mqtt_connection.broker.mqtt_client.latency = 0.01
+
+    data = b"".join(mqtt_connection.read(0, offset, 512, 0) for offset in range(0, len(disk), 512))
+    assert data == disk
+
+    # Reads of blocks that are requested already wait for the outstanding request instead of sending another one
+    seeks = mqtt_connection.broker.mqtt_client.seeks
+    assert mqtt_connection.deduplicated > 0
+    assert len(seeks) == len(set(seeks))
+
+
+@pytest.mark.benchmark
+def test_benchmark_mqtt_sequential_read(mqtt_connection: MqttConnection, benchmark: BenchmarkFixture) -> None:
+    mqtt_connection.broker.mqtt_client.latency = 0.005
+    disk_size = len(mqtt_connection.broker.mqtt_client.disks[0])
+
+    def read() -> None:
+        mqtt_connection.broker.clear_cache()
+        mqtt_connection.read.cache_clear()
+        for offset in range(0, disk_size, 512):
+            mqtt_connection.read(0, offset, 512, 0)
+
+    benchmark(read)
+
+
 @pytest.mark.parametrize(
     ("case_name", "parse_result"),
     [
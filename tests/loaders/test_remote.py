@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import queue
+import random
 import socket
 import ssl
+import threading
+import time
 from pathlib import Path
-from struct import unpack
+from struct import pack, unpack
 from typing import TYPE_CHECKING
 from unittest.mock import call, patch
 
@@ -14,7 +18,9 @@ from dissect.target.loaders.remote import RemoteLoader, RemoteStream, RemoteStre
 from dissect.target.target import Target
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator
+
+    from pytest_benchmark.fixture import BenchmarkFixture
 
 
 @pytest.mark.parametrize(
@@ -99,3 +105,181 @@ def test_stream_embedded() -> None:
         RemoteStreamConnection.configure("K", "C")
         RemoteStreamConnection("remote://127.0.0.1", 9001)
         mock_ssl_context.assert_has_calls([call().load_cert_chain_str(certfile="C", keyfile="K")])
+
+
+class AgentServer:
+    """A local stand-in for a remote agent, which answers requests over plain TCP after ``latency`` seconds.
+
+    Requests are answered in order, but the latency of requests that are sent before the previous response is
+    received overlaps, like on a real network connection.
+    """
+
+    def __init__(self, data: bytes, latency: float = 0):
+        self.data = data
+        self.latency = latency
+        self.requests = []
+
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self.port = self._server.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+
+            responses = queue.Queue()
+            threading.Thread(target=self._respond, args=(conn, responses), daemon=True).start()
+
+            with conn:
+                try:
+                    self._handle(conn, responses)
+                except OSError:
+                    pass
+                responses.put(None)
+
+    def _handle(self, conn: socket.socket, responses: queue.Queue) -> None:
+        while len(request := conn.recv(17, socket.MSG_WAITALL)) == 17:
+            command, offset, length = unpack(">BQQ", request)
+            self.requests.append((command, offset, length))
+
+            if command == RemoteStreamConnection.COMMAND_QUIT:
+                break
+            if command == RemoteStreamConnection.COMMAND_INFO:
+                response = pack("<B", 1) + pack("<QQ", len(self.data), 512)
+            else:
+                response = self.data[offset : offset + length]
+            responses.put((time.monotonic() + self.latency, response))
+
+    def _respond(self, conn: socket.socket, responses: queue.Queue) -> None:
+        while (item := responses.get()) is not None:
+            due, response = item
+            time.sleep(max(0, due - time.monotonic()))
+            try:
+                conn.sendall(response)
+            except OSError:
+                return
+
+    def connection(self, pipeline: int = 0) -> RemoteStreamConnection:
+        with (
+            patch.object(RemoteStreamConnection, "CONFIG_KEY", None),
+            patch.object(RemoteStreamConnection, "CONFIG_CRT", None),
+        ):
+            rsc = RemoteStreamConnection("127.0.0.1", self.port, options={"noverify": "1", "pipeline": pipeline})
+
+        def open_socket() -> socket.socket:
+            # The agent speaks plain TCP, so the socket isn't wrapped
+            rsc._socket = socket.create_connection(("127.0.0.1", self.port))
+            return rsc._socket
+
+        rsc._open_socket = open_socket
+        return rsc
+
+    def close(self) -> None:
+        self._server.close()
+
+
+@pytest.fixture
+def agent_data() -> bytes:
+    return random.Random(1337).randbytes(4 * 1024 * 1024)
+
+
+@pytest.fixture
+def agent(agent_data: bytes) -> Iterator[AgentServer]:
+    server = AgentServer(agent_data)
+    yield server
+    server.close()
+
+
+@pytest.mark.parametrize("pipeline", [0, 8])
+def test_stream_agent(agent: AgentServer, agent_data: bytes, pipeline: int) -> None:
+    """Test reading a ``RemoteStream`` from a local agent, with and without pipelining."""
+    rsc = agent.connection(pipeline)
+    (rs,) = rsc.info()
+    assert rs.size == len(agent_data)
+
+    # Sequential reads
+    assert rs.read(8192) == agent_data[:8192]
+    assert rs.read(100_000) == agent_data[8192:108192]
+    # Random reads
+    rng = random.Random(1)
+    for _ in range(50):
+        offset = rng.randrange(len(agent_data))
+        rs.seek(offset)
+        assert rs.read(rng.randrange(1, 65536)) == agent_data[offset : offset + 65536][: rs.tell() - offset]
+    # Read up to the end of the disk
+    rs.seek(len(agent_data) - 1000)
+    assert rs.read() == agent_data[-1000:]
+    rs.close()
+
+
+def test_stream_pipeline(agent: AgentServer, agent_data: bytes) -> None:
+    """Test that sequential reads are prefetched with multiple requests in flight."""
+    rsc = agent.connection(4)
+    (rs,) = rsc.info()
+    rs.align = 4096
+
+    chunks = [rs.read(4096) for _ in range(256)]
+    assert b"".join(chunks) == agent_data[: 256 * 4096]
+
+    reads = [(offset, length) for command, offset, length in agent.requests if command == rsc.COMMAND_READ]
+    # The first two reads are requested separately, after which the reads are served from prefetched blocks
+    assert reads[:2] == [(0, 4096), (4096, 4096)]
+    assert all(length == rsc.PREFETCH_SIZE for _, length in reads[2:])
+    assert len(reads) <= 2 + 4 + 256 * 4096 // rsc.PREFETCH_SIZE
+    assert len(rsc._inflight) <= 4
+
+
+def test_stream_pipeline_reconnect(agent: AgentServer, agent_data: bytes) -> None:
+    """Test that requests that are in flight when the connection breaks are requested again."""
+    rsc = agent.connection(4)
+    rsc._reconnect_wait = 0
+    (rs,) = rsc.info()
+    rs.align = 4096
+
+    assert rs.read(4096) == agent_data[:4096]
+    assert rs.read(4096) == agent_data[4096:8192]
+    assert rsc._inflight
+
+    rsc._ssl_sock.close()
+    assert rs.read(rsc.PREFETCH_SIZE * 2) == agent_data[8192 : 8192 + rsc.PREFETCH_SIZE * 2]
+    assert rsc.is_connected()
+
+
+def test_stream_pipeline_unreachable(agent: AgentServer) -> None:
+    """Test that a read gives up when the agent can't be reached anymore."""
+    rsc = agent.connection(4)
+    rsc._reconnect_wait = 0
+    rsc._max_reconnects = 2
+    # Disconnecting before connecting is a no-op
+    rsc._disconnect()
+
+    (rs,) = rsc.info()
+
+    agent.close()
+    rsc._disconnect()
+
+    with pytest.raises(ConnectionError):
+        rs.read(4096)
+    assert not rsc.is_connected()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("pipeline", [0, 8])
+def test_benchmark_stream_latency(agent_data: bytes, benchmark: BenchmarkFixture, pipeline: int) -> None:
+    """Benchmark sequential reads from an agent with 5ms of latency."""
+    server = AgentServer(agent_data, latency=0.005)
+    rsc = server.connection(pipeline)
+    (rs,) = rsc.info()
+    rs.align = 4096
+
+    def read() -> None:
+        rs.seek(0)
+        for _ in range(256):
+            rs.read(4096)
+
+    benchmark(read)
+    server.close()
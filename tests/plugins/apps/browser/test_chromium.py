@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sqlite3
 from typing import TYPE_CHECKING
 
 import pytest
@@ -9,6 +10,8 @@ from dissect.target.plugins.apps.browser.chromium import ChromiumPlugin, decrypt
 from tests._utils import absolute_path
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from dissect.target.filesystem import VirtualFilesystem
     from dissect.target.target import Target
 
@@ -111,6 +114,64 @@ def test_chromium_extensions(target_platform: Target, request: pytest.FixtureReq
     assert records[0].extension_id == "ahfgeienlihckogmohjhadlkjgocpleb"
 
 
+def test_chromium_history_large(target_unix_users: Target, fs_unix: VirtualFilesystem, tmp_path: Path) -> None:
+    """Test if visits and downloads are joined correctly on a database that spans many pages."""
+    path = tmp_path.joinpath("History")
+    with sqlite3.connect(path) as conn:
+        conn.executescript(
+            """
+            PRAGMA page_size = 1024;
+            CREATE TABLE urls (id INTEGER PRIMARY KEY, url LONGVARCHAR, title LONGVARCHAR, visit_count INTEGER,
+                hidden INTEGER);
+            CREATE TABLE visits (id INTEGER PRIMARY KEY, url INTEGER, visit_time INTEGER, from_visit INTEGER);
+            CREATE TABLE downloads (id INTEGER PRIMARY KEY, target_path LONGVARCHAR, start_time INTEGER,
+                end_time INTEGER, state INTEGER, tab_url VARCHAR, tab_referrer_url VARCHAR);
+            CREATE TABLE downloads_url_chains (id INTEGER NOT NULL, chain_index INTEGER NOT NULL,
+                url LONGVARCHAR NOT NULL, PRIMARY KEY (id, chain_index));
+            """
+        )
+
+        conn.executemany(
+            "INSERT INTO urls VALUES (?, ?, ?, ?, ?)",
+            [(i, f"https://example.com/{i}", f"title {i}", 1, 0) for i in range(1, 1001)],
+        )
+        conn.executemany(
+            "INSERT INTO visits VALUES (?, ?, ?, ?)",
+            [(i, (i % 1000) + 1, 13317000000000000 + i, i - 1) for i in range(1, 3001)],
+        )
+        conn.executemany(
+            "INSERT INTO downloads VALUES (?, ?, ?, ?, ?, ?, ?)", [(i, None, 0, 0, 1, "", "") for i in range(1, 301)]
+        )
+        # The URL chains are inserted out of order, and download 150 has no URL chain
+        conn.executemany(
+            "INSERT INTO downloads_url_chains VALUES (?, ?, ?)",
+            [
+                (i, idx, f"https://example.com/download/{i}/{idx}")
+                for idx in (1, 0)
+                for i in range(300, 0, -1)
+                if i != 150
+            ],
+        )
+    conn.close()
+
+    fs_unix.map_file("/root/.config/chromium/Default/History", path)
+    target_unix_users.add_plugin(ChromiumPlugin)
+
+    records = list(target_unix_users.chromium.history())
+    assert len(records) == 3000
+    assert records[0].url == "https://example.com/2"
+    assert records[0].from_url is None
+    assert records[1500].url == "https://example.com/502"
+    assert records[1500].title == "title 502"
+    assert records[1500].from_url == "https://example.com/501"
+
+    records = list(target_unix_users.chromium.downloads())
+    assert len(records) == 300
+    assert records[0].url == "https://example.com/download/1/1"
+    assert records[149].url is None
+    assert records[299].url == "https://example.com/download/300/1"
+
+
 def test_windows_chromium_passwords(target_chromium_win: Target) -> None:
     records = list(target_chromium_win.chromium.passwords())
 
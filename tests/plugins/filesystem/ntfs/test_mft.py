@@ -16,18 +16,22 @@ from dissect.target.plugins.filesystem.ntfs.mft import (
     FilesystemStdRecord,
     MftPlugin,
     macb_aggregator,
+    resolve_directory_paths,
+    shard_ranges,
 )
 from dissect.target.plugins.filesystem.ntfs.utils import (
     get_drive_letter,
     get_owner_and_group,
     get_volume_identifier,
 )
+from dissect.target.target import Target
 from tests._utils import absolute_path
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
+    from pathlib import Path
 
-    from dissect.target.target import Target
+    from flow.record import Record
 
 
 @pytest.fixture(params=[True, False])
@@ -263,3 +267,65 @@ def test_mft_plugin_last_entries(target_win_mft: Target) -> None:
 def test_mft_plugin_owner(target_win_mft: Target) -> None:
     for mft_entry in target_win_mft.mft():
         assert mft_entry.owner is None
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "shard_size", "expected"),
+    [
+        (0, 9, 4, [(0, 3), (4, 7), (8, 9)]),
+        (0, 7, 4, [(0, 3), (4, 7)]),
+        (5, 5, 4, [(5, 5)]),
+        (9, 0, 4, [(9, 6), (5, 2), (1, 0)]),
+    ],
+)
+def test_shard_ranges(start: int, end: int, shard_size: int, expected: list[tuple[int, int]]) -> None:
+    assert shard_ranges(start, end, shard_size) == expected
+
+
+def test_resolve_directory_paths() -> None:
+    directories = {
+        5: (5, ".", 5, 5),
+        16: (1, "Windows", 5, 5),
+        17: (2, "System32", 16, 1),
+        18: (1, "drivers", 17, 2),
+        # Parent with a different sequence number
+        19: (1, "Old", 17, 1),
+        20: (1, "Older", 19, 1),
+        # Parent that is not a directory
+        21: (1, "Orphan", 100, 1),
+        # Cyclic parent references
+        22: (1, "Cycle", 23, 1),
+        23: (1, "Cycle", 22, 1),
+        24: (1, "InCycle", 23, 1),
+    }
+
+    assert resolve_directory_paths(directories) == {
+        5: (5, "."),
+        16: (1, "Windows"),
+        17: (2, "Windows\\System32"),
+        18: (1, "Windows\\System32\\drivers"),
+        19: (1, "<broken_reference_0x11#1>\\Old"),
+        20: (1, "<broken_reference_0x11#1>\\Old\\Older"),
+    }
+
+
+def test_mft_plugin_workers(tmp_path: Path) -> None:
+    root = tmp_path.joinpath("C")
+    root.joinpath("Windows/System32").mkdir(parents=True)
+    root.joinpath("$MFT").write_bytes(absolute_path("_data/plugins/filesystem/ntfs/mft/mft.raw").read_bytes())
+
+    target = Target.open(tmp_path)
+
+    def values(records: Iterator[Record]) -> list[dict]:
+        return [{k: v for k, v in record._asdict().items() if k != "_generated"} for record in records]
+
+    expected = values(target.mft.records())
+    assert expected
+
+    assert values(target.mft.records(workers=2, ordered=True)) == expected
+    assert sorted(map(repr, values(target.mft.records(workers=2)))) == sorted(map(repr, expected))
+
+
+def test_mft_plugin_workers_fallback(target_win_mft: Target, caplog: pytest.LogCaptureFixture) -> None:
+    assert len(list(target_win_mft.mft(workers=2))) == check_output_amount(76, False)
+    assert "Target can't be opened in worker processes" in caplog.text
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import tempfile
 from io import BytesIO
 from typing import TYPE_CHECKING
@@ -7,12 +8,20 @@ from typing import TYPE_CHECKING
 import pytest
 
 from dissect.target.filesystem import VirtualFilesystem
-from dissect.target.plugins.filesystem.yara import HAS_YARA, YaraPlugin, is_valid_yara
+from dissect.target.plugins.filesystem.yara import (
+    DEFAULT_CHUNK_SIZE,
+    HAS_YARA,
+    YaraPlugin,
+    YaraScanner,
+    is_valid_yara,
+)
 from tests._utils import absolute_path
 
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from pytest_benchmark.fixture import BenchmarkFixture
+
     from dissect.target.target import Target
 
 if HAS_YARA:
@@ -119,3 +128,112 @@ def test_yara_plugin_multiple_matches(target_default: Target) -> None:
 
     assert results[0].path == "/files/first.txt"
     assert results[0].matches == ["$a=t\x00e\x00s\x00t\x00", "$b=This", "$c=\\xaa\\xbb\\xcc\\xdd\\xee\\xff"]
+
+
+@pytest.fixture
+def target_yara_many(target_default: Target, tmp_path: Path) -> tuple[Target, Path]:
+    vfs = VirtualFilesystem()
+    for i in range(100):
+        content = b"needle" if i % 3 == 0 else b"haystack"
+        vfs.map_file_fh(f"/dir{i % 10}/file{i}", BytesIO(content * (i + 1)))
+    target_default.fs.mount("/", vfs)
+    target_default.add_plugin(YaraPlugin)
+
+    rule = tmp_path.joinpath("needle.yar")
+    rule.write_text('rule needle { strings: $ = "needle" condition: all of them }')
+    return target_default, rule
+
+
+@pytest.mark.skipif(not HAS_YARA, reason="requires python-yara")
+def test_yara_plugin_workers(target_yara_many: tuple[Target, Path]) -> None:
+    target, rule = target_yara_many
+
+    expected = [(str(record.path), record.matches, record.digest.sha256) for record in target.yara([rule], workers=0)]
+    assert len(expected) == 34
+    assert [path for path, _, _ in expected] == [str(target.fs.path(path)) for path, _, _ in expected]
+
+    for workers in (1, 4):
+        results = list(target.yara([rule], workers=workers))
+        assert [(str(record.path), record.matches, record.digest.sha256) for record in results] == expected
+
+
+@pytest.mark.skipif(not HAS_YARA, reason="requires python-yara")
+def test_yara_plugin_chunks(target_default: Target, tmp_path: Path) -> None:
+    # The needle crosses the boundary of the first chunk and is also in the overlap of the second and third chunk
+    buf = b"A" * 14 + b"needle" + b"A" * 10 + b"needle" + b"A" * 10
+    tmp_path.joinpath("large").write_bytes(buf)
+    vfs = VirtualFilesystem()
+    vfs.map_file("/large", str(tmp_path.joinpath("large")))
+    target_default.fs.mount("/", vfs)
+    target_default.add_plugin(YaraPlugin)
+
+    rule = tmp_path.joinpath("needle.yar")
+    rule.write_text('rule needle { strings: $a = "needle" condition: $a }')
+
+    results = list(target_default.yara([rule], chunk_size=16))
+    assert len(results) == 1
+    assert results[0].matches == ["$a=needle", "$a=needle"]
+    assert results[0].digest.sha256 == hashlib.sha256(buf).hexdigest()
+
+    # The whole file is matched at once if it fits
+    results = list(target_default.yara([rule], chunk_size=len(buf)))
+    assert results[0].matches == ["$a=needle", "$a=needle"]
+
+    # Files larger than the maximum size aren't scanned at all
+    assert list(target_default.yara([rule], max_size=len(buf) - 1, chunk_size=16)) == []
+
+
+@pytest.mark.skipif(not HAS_YARA, reason="requires python-yara")
+def test_yara_plugin_large_file(target_default: Target, tmp_path: Path) -> None:
+    # With the default arguments, large files are scanned in chunks instead of being skipped
+    offset = DEFAULT_CHUNK_SIZE + 512 * 1024
+    buf = bytearray(DEFAULT_CHUNK_SIZE + 1024 * 1024)
+    buf[offset : offset + 6] = b"needle"
+    tmp_path.joinpath("large").write_bytes(buf)
+
+    vfs = VirtualFilesystem()
+    vfs.map_file("/large", str(tmp_path.joinpath("large")))
+    target_default.fs.mount("/", vfs)
+    target_default.add_plugin(YaraPlugin)
+
+    rule = tmp_path.joinpath("needle.yar")
+    rule.write_text('rule needle { strings: $a = "needle" condition: $a }')
+
+    results = list(target_default.yara([rule]))
+    assert len(results) == 1
+    assert results[0].path == "/large"
+    assert results[0].matches == ["$a=needle"]
+    assert results[0].digest.sha256 == hashlib.sha256(buf).hexdigest()
+
+
+@pytest.mark.skipif(not HAS_YARA, reason="requires python-yara")
+def test_yara_scanner_in_flight(target_yara_many: tuple[Target, Path]) -> None:
+    target, rule = target_yara_many
+    scanner = YaraScanner(target, yara.compile(str(rule)), chunk_size=16, workers=2, max_in_flight=64)
+
+    results = []
+    for entry in target.fs.recurse("/"):
+        if entry.is_file():
+            results.extend(scanner.scan(entry))
+            # The chunks of the file that is being read count towards the limit too
+            assert scanner._in_flight <= 64
+            assert scanner._in_flight == sum(scan.in_flight for scan in scanner._pending)
+    results.extend(scanner.close())
+
+    assert len(results) == 34
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not HAS_YARA, reason="requires python-yara")
+def test_benchmark_yara_plugin(benchmark: BenchmarkFixture, target_default: Target, tmp_path: Path) -> None:
+    vfs = VirtualFilesystem()
+    for i in range(10_000):
+        vfs.map_file_fh(f"/dir{i % 100}/file{i}", BytesIO(b"needle" if i % 100 == 0 else b"haystack" * 512))
+    target_default.fs.mount("/", vfs)
+    target_default.add_plugin(YaraPlugin)
+
+    rule = tmp_path.joinpath("needle.yar")
+    rule.write_text('rule needle { strings: $ = "needle" condition: all of them }')
+
+    results = benchmark(lambda: list(target_default.yara([rule])))
+    assert len(results) == 100
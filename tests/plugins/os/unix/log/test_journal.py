@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import io
 import logging
+import lzma
+import mmap
+import struct
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 from flow.record.fieldtypes import datetime as dt
 
-from dissect.target.plugins.os.unix.log.journal import JournalMessagePriority, JournalPlugin
+from dissect.target.plugins.os.unix.log import journal
+from dissect.target.plugins.os.unix.log.journal import JournalFile, JournalMessagePriority, JournalPlugin
 from tests._utils import absolute_path
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from pytest_benchmark.fixture import BenchmarkFixture
 
     from dissect.target.filesystem import VirtualFilesystem
@@ -96,3 +104,117 @@ def test_journal_plugin_priority_enum(input: int, expected_name: str, expected_v
     priority = JournalMessagePriority(input)
     assert priority.name == expected_name
     assert priority.value == expected_value
+
+
+def _build_journal(entries: list[list[bytes]], start: int = 0, array_size: int | None = None) -> bytes:
+    """Build a journal file with an entry object per item of ``entries``, which are lists of ``KEY=value`` fields.
+
+    Fields are stored as XZ compressed DATA objects, which are shared by all entries that contain them. The entries
+    are written one second apart from the ``start`` realtime, in chained entry arrays of ``array_size`` entries.
+    """
+    buf = bytearray(len(journal.c_journal.Header))
+    data_offsets = {}
+    entry_offsets = []
+
+    for fields in entries:
+        for field in fields:
+            if field not in data_offsets:
+                payload = lzma.compress(field)
+                data_offsets[field] = len(buf)
+                buf += struct.pack("<BB6xQ6Q", journal.c_journal.ObjectType.OBJECT_DATA, 1, 64 + len(payload), *[0] * 6)
+                buf += payload
+
+    for idx, fields in enumerate(entries):
+        entry_offsets.append(len(buf))
+        realtime = start + idx * 1_000_000
+        buf += struct.pack(
+            "<BB6xQQQQ16xQ", journal.c_journal.ObjectType.OBJECT_ENTRY, 0, 64 + 16 * len(fields), idx, realtime, idx, 0
+        )
+        for field in fields:
+            buf += struct.pack("<QQ", data_offsets[field], 0)
+
+    entry_array_offset = len(buf)
+    array_size = array_size or len(entries)
+    arrays = [entry_offsets[idx : idx + array_size] for idx in range(0, len(entries), array_size)]
+    for idx, offsets in enumerate(arrays):
+        size = 24 + 8 * len(offsets)
+        next_offset = len(buf) + size if idx < len(arrays) - 1 else 0
+        buf += struct.pack("<BB6xQQ", journal.c_journal.ObjectType.OBJECT_ENTRY_ARRAY, 0, size, next_offset)
+        buf += struct.pack(f"<{len(offsets)}Q", *offsets)
+
+    header = journal.c_journal.Header(bytes(len(journal.c_journal.Header)))
+    header.signature = journal.c_journal.HEADER_SIGNATURE
+    header.entry_array_offset = entry_array_offset
+    header.n_entries = len(entries)
+    header.head_entry_realtime = start
+    header.tail_entry_realtime = start + (len(entries) - 1) * 1_000_000
+    buf[: len(header)] = header.dumps()
+
+    return bytes(buf)
+
+
+@pytest.fixture
+def journal_data() -> bytes:
+    return _build_journal(
+        [[b"_HOSTNAME=host", b"_BOOT_ID=1337", f"MESSAGE=message {idx}".encode()] for idx in range(100)]
+    )
+
+
+def test_journal_file_data_cache(target_unix: Target, journal_data: bytes) -> None:
+    """Test if DATA objects that are shared by entries are decoded once."""
+    with patch.object(journal.lzma, "decompress", side_effect=lzma.decompress) as decompress:
+        entries = list(JournalFile(io.BytesIO(journal_data), target_unix))
+
+    assert len(entries) == 100
+    assert all(entry["hostname"] == "host" and entry["boot_id"] == "1337" for entry in entries)
+    assert [entry["message"] for entry in entries] == [f"message {idx}" for idx in range(100)]
+    # Two shared fields and a unique message per entry
+    assert decompress.call_count == 2 + 100
+
+
+def test_journal_file_reader(target_unix: Target, journal_data: bytes, tmp_path: Path) -> None:
+    """Test if local journal files are memory-mapped and other streams are buffered."""
+    path = tmp_path.joinpath("system.journal")
+    path.write_bytes(journal_data)
+
+    with path.open("rb") as fh:
+        journal_file = JournalFile(fh, target_unix)
+        assert isinstance(journal_file.fh, mmap.mmap)
+        assert journal_file.name == str(path)
+        mapped = list(journal_file)
+
+    raw = io.FileIO(path, "rb")
+    with patch.object(journal.mmap, "mmap", side_effect=OSError):
+        journal_file = JournalFile(raw, target_unix)
+    assert isinstance(journal_file.fh, io.BufferedReader)
+    assert list(journal_file) == mapped
+
+    assert list(JournalFile(io.BytesIO(journal_data), target_unix)) == mapped
+
+
+@pytest.mark.parametrize(
+    ("since", "until", "expected"),
+    [
+        (None, None, range(100)),
+        ("2024-01-01T00:00:30", None, range(30, 100)),
+        (None, "2024-01-01T00:00:20.5", range(21)),
+        ("2024-01-01T00:00:40", "2024-01-01T00:00:49", range(40, 50)),
+        ("2024-01-01T02:00:00+01:00", None, []),
+        ("2023-12-31", "2024-01-01T00:00:00", [0]),
+    ],
+)
+def test_journal_time_range(
+    target_unix: Target, fs_unix: VirtualFilesystem, since: str | None, until: str | None, expected: range
+) -> None:
+    """Test if only the entries within the time range are parsed."""
+    start = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp() * 1_000_000)
+    data = _build_journal([[b"_HOSTNAME=host", f"MESSAGE=message {idx}".encode()] for idx in range(100)], start, 16)
+    fs_unix.map_file_fh("var/log/journal/1337/system.journal", io.BytesIO(data))
+    target_unix.add_plugin(JournalPlugin)
+
+    with patch.object(journal.lzma, "decompress", side_effect=lzma.decompress) as decompress:
+        results = list(target_unix.journal(since=since, until=until))
+
+    assert [record.message for record in results] == [f"message {idx}" for idx in expected]
+    # Only the DATA objects of the entries within the time range are read
+    assert decompress.call_count == (len(expected) + 1 if expected else 0)
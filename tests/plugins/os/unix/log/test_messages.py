@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import contextlib
 import gzip
 import tarfile
 import textwrap
@@ -205,3 +206,52 @@ def test_linux_messages_kernel_logs(target_unix: Target, fs_unix: VirtualFilesys
 
     assert results[3].service == "kernel"
     assert results[3].message is None
+
+
+def test_unix_messages_time_range(target_unix: Target, fs_unix: VirtualFilesystem) -> None:
+    """Test if only the lines and log files within the time range are read."""
+    fs_unix.map_file_fh("/etc/timezone", BytesIO(b"UTC"))
+    # Both files contain a line that is out of chronological order, which doesn't end the time range
+    fs_unix.map_file_fh(
+        "var/log/messages",
+        BytesIO(
+            b"".join(
+                b"Jun  1 %02d:00:00 localhost systemd[1]: Line %d\n" % (h, h) for h in [*range(12), 2, *range(12, 24)]
+            )
+        ),
+    )
+    fs_unix.map_file_fh(
+        "var/log/syslog",
+        BytesIO(
+            b"".join(
+                b"2022-06-01T%02d:00:00.000000+00:00 localhost cron[2]: Line %d\n" % (h, h)
+                for h in [*range(11), 13, *range(11, 24)]
+            )
+        ),
+    )
+    # The modification time of this file lies before the time range, so it's never read
+    fs_unix.map_file_fh("var/log/messages.1", BytesIO(b"Jun  1 12:00:00 localhost systemd[1]: Rotated\n"))
+
+    stack = contextlib.ExitStack()
+    for path, mtime in (("var/log/messages", 2), ("var/log/syslog", 2), ("var/log/messages.1", 1)):
+        entry = fs_unix.get(path)
+        stat = entry.stat()
+        stat.st_mtime = datetime(2022, 6, mtime, tzinfo=timezone.utc).timestamp()
+        stack.enter_context(patch.object(entry, "stat", return_value=stat))
+
+    with stack:
+        target_unix.add_plugin(MessagesPlugin)
+        results = list(
+            target_unix.messages(
+                since=datetime(2022, 6, 1, 10, tzinfo=timezone.utc), until=datetime(2022, 6, 1, 12, tzinfo=timezone.utc)
+            )
+        )
+
+    assert sorted((r.source, r.message) for r in results) == [
+        ("/var/log/messages", "Line 10"),
+        ("/var/log/messages", "Line 11"),
+        ("/var/log/messages", "Line 12"),
+        ("/var/log/syslog", "Line 10"),
+        ("/var/log/syslog", "Line 11"),
+        ("/var/log/syslog", "Line 12"),
+    ]
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import io
 import shutil
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
+from dissect.eventlog.evtx.c_evtx import c_evtx
+from dissect.util.ts import wintimestamp
 
 from dissect.target.exceptions import RegistryKeyNotFoundError, UnsupportedPluginError
 from dissect.target.helpers.regutil import VirtualKey, VirtualValue
@@ -14,6 +18,7 @@ from dissect.target.target import Target
 from tests._utils import absolute_path
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
 
     from dissect.target.filesystem import VirtualFilesystem
@@ -189,3 +194,50 @@ def test_evtx_build_record_illegal_characters(target_win: Target) -> None:
     )
 
     assert record.pSubStatus__PrimaryBlob_______Status == "1"
+
+
+def test_evtx_time_range(target_win: Target, fs_win: VirtualFilesystem) -> None:
+    """Test if chunks of which all events were written before the time range are skipped without parsing them."""
+    start = datetime(2025, 3, 4, tzinfo=timezone.utc)
+
+    def filetime(hours: float) -> int:
+        return int((start.timestamp() + hours * 3600 + 11644473600) * 10_000_000)
+
+    header = c_evtx.EVTX_HEADER(bytes(len(c_evtx.EVTX_HEADER)))
+    header.magic = b"ElfFile\x00"
+    header.header_block_size = 0x1000
+    data = header.dumps().ljust(0x1000, b"\x00")
+
+    # Four chunks with two records each, written at hour N and N:30
+    for idx in range(4):
+        chunk = bytearray(0x10000)
+        chunk_header = c_evtx.EVTX_CHUNK(bytes(len(c_evtx.EVTX_CHUNK)))
+        chunk_header.magic = b"ElfChnk\x00"
+        chunk_header.last_record_offset = 0x300
+        chunk[: len(chunk_header)] = chunk_header.dumps()
+        chunk[0x200 + 16 : 0x200 + 24] = filetime(idx).to_bytes(8, "little")
+        chunk[0x300 + 16 : 0x300 + 24] = filetime(idx + 0.5).to_bytes(8, "little")
+        data += bytes(chunk)
+
+    class ElfChnk:
+        def __init__(self, chunk: bytes):
+            self.chunk = chunk
+            parsed.append(self)
+
+        def read(self) -> Iterator[dict]:
+            for offset in (0x200, 0x300):
+                written = int.from_bytes(self.chunk[offset + 16 : offset + 24], "little")
+                yield {"TimeCreated_SystemTime": wintimestamp(written), "EventID": 4624}
+
+    parsed = []
+    fs_win.map_file_fh("Windows/System32/winevt/Logs/Security.evtx", io.BytesIO(data))
+    target_win.add_plugin(evtx.EvtxPlugin)
+
+    with patch.object(evtx.evtx, "ElfChnk", ElfChnk):
+        records = list(
+            target_win.evtx(since=start + timedelta(hours=1, minutes=45), until=start + timedelta(hours=3, minutes=10))
+        )
+
+    assert [record.ts for record in records] == [start + timedelta(hours=hours) for hours in (2, 2.5, 3)]
+    # The first two chunks are never parsed
+    assert len(parsed) == 2
@@ -4,6 +4,7 @@ import io
 from datetime import datetime, timezone
 from io import BytesIO
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 from dissect.ntfs.secure import ACL, SecurityDescriptor
@@ -502,3 +503,32 @@ def test_defender_mpcmdrunlog(target_win_users: Target, fs_win: VirtualFilesyste
         '"C:\\ProgramData\\Microsoft\\Windows Defender\\platform\\4.18.2203.5-0\\MpCmdRun.exe"'
         " SignaturesUpdateService -ScheduleJob -UncDownload"
     )
+
+
+def test_defender_mplogs_time_range(target_win: Target, fs_win: VirtualFilesystem, tmp_path: Path) -> None:
+    """Test if MPLog files written before the time range are skipped and reading stops after the time range."""
+    fs_win.map_dir("windows/system32/winevt/logs", tmp_path)
+
+    mplog_dir = "ProgramData/Microsoft/Windows Defender/Support"
+    lines = "".join(
+        f"2024-01-0{day}T10:00:00.000Z [Exclusion] C:\\Day{day} -> \\Device\\HarddiskVolume3\\Day{day}\n"
+        # Reading stops at the first record after the time range, so the last line isn't returned
+        for day in (1, 2, 3, 2)
+    )
+    fs_win.map_file_fh(f"{mplog_dir}/MPLog-20240101-000000.log", BytesIO(lines.encode()))
+    fs_win.map_file_fh(f"{mplog_dir}/MPLog-20231201-000000.log", BytesIO(lines.replace("2024-01", "2023-12").encode()))
+
+    old_log = fs_win.get(f"{mplog_dir}/MPLog-20231201-000000.log")
+    stat = old_log.stat()
+    stat.st_mtime = datetime(2023, 12, 31, tzinfo=timezone.utc).timestamp()
+
+    target_win.add_plugin(MicrosoftDefenderPlugin)
+    with patch.object(old_log, "stat", return_value=stat), patch.object(old_log, "open") as open_old_log:
+        records = list(
+            target_win.defender.mplog(
+                since=datetime(2024, 1, 2, tzinfo=timezone.utc), until=datetime(2024, 1, 2, 23, tzinfo=timezone.utc)
+            )
+        )
+
+    assert [record.full_path_with_drive_letter for record in records] == ["C:\\Day2"]
+    open_old_log.assert_not_called()
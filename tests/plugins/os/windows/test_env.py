@@ -98,6 +98,10 @@ def env_plugin() -> Iterator[EnvironmentVariablePlugin]:
 
     mock_target.path = "mock"
     mock_target._config.CACHE_DIR = "cache"
+    mock_target._cache = {}
+    mock_target._loader = None
+    mock_target.disks = []
+    mock_target.filesystems = []
 
     with (
         mock.patch.object(EnvironmentVariablePlugin, "VARIABLES", TEST_VARIABLES),
@@ -1282,6 +1282,47 @@ def test_layer_filesystem_mount() -> None:
     assert lfs.path("/vfs/file2").read_text() == "value2"
 
 
+def test_layer_filesystem_index() -> None:
+    lfs = LayerFilesystem()
+    lfs.case_sensitive = False
+    lfs.enable_index(max_size=2)
+
+    vfs1 = VirtualFilesystem(case_sensitive=False)
+    vfs1.map_file_fh("Windows/file1", BytesIO(b"value1"))
+    vfs1.symlink("Windows", "link")
+    lfs.mount("/", vfs1)
+
+    assert lfs.path("/Windows/file1").read_text() == "value1"
+    assert lfs.index_stats == {"hits": 0, "misses": 1, "size": 1}
+
+    entry = lfs.get("/windows/FILE1")
+    assert entry.path == "/windows/FILE1"
+    assert entry.open().read() == b"value1"
+    assert lfs.index_stats == {"hits": 1, "misses": 1, "size": 1}
+
+    # Failed lookups are not indexed and the oldest path is evicted when the index is full
+    with pytest.raises(FileNotFoundError):
+        lfs.get("/windows/file2")
+    assert lfs.get("/windows").is_dir()
+    assert lfs.get("/link").is_symlink()
+    assert lfs.get("/windows/file1").open().read() == b"value1"
+    assert lfs.index_stats == {"hits": 1, "misses": 5, "size": 2}
+
+    # Changes to the layers or any virtual filesystem invalidate the index
+    vfs2 = VirtualFilesystem(case_sensitive=False)
+    vfs2.map_file_fh("windows/file1", BytesIO(b"value2"))
+    lfs.append_fs_layer(vfs2)
+    assert lfs.index_stats["size"] == 0
+    assert lfs.get("/windows/file1").open().read() == b"value2"
+
+    vfs2.map_file_fh("windows/file1", BytesIO(b"value3"))
+    assert lfs.get("/windows/file1").open().read() == b"value3"
+
+    lfs.disable_index()
+    assert lfs.get("/windows/file1").open().read() == b"value3"
+    assert lfs.index_stats == {"hits": 1, "misses": 7, "size": 0}
+
+
 def test_layer_filesystem_relative_link() -> None:
     """Test relative symlinks from a filesystem mounted at a subdirectory."""
     lfs = LayerFilesystem()
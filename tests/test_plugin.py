@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import json
 import os
+import subprocess
 import sys
 import textwrap
 from functools import reduce
@@ -17,6 +19,7 @@ from dissect.target.exceptions import PluginError, UnsupportedPluginError
 from dissect.target.helpers.descriptor_extensions import UserRecordDescriptorExtension
 from dissect.target.helpers.record import EmptyRecord, create_extended_descriptor
 from dissect.target.plugin import (
+    MANIFEST_ENV,
     FunctionDescriptor,
     FunctionDescriptorLookup,
     InternalNamespacePlugin,
@@ -28,6 +31,7 @@ from dissect.target.plugin import (
     PluginDescriptorLookup,
     PluginRegistry,
     _find_py_files,
+    _get_plugins,
     _save_plugin_import_failure,
     alias,
     environment_variable_paths,
@@ -36,9 +40,12 @@ from dissect.target.plugin import (
     find_functions_by_record_field_type,
     functions,
     get_external_module_paths,
+    get_function_arguments,
+    load_manifest,
     load_modules_from_paths,
     lookup,
     plugins,
+    save_manifest,
 )
 from dissect.target.plugins.apps.other.env import EnvironmentFilePlugin
 from dissect.target.plugins.general.users import UsersPlugin
@@ -1390,9 +1397,9 @@ def test_function_required_arguments(target_default: Target) -> None:
     """Test if functions with required arguments are tagged as such correctly."""
 
     # function without any arguments should have an args property with an empty list
-    syslog_fd = find_functions("syslog", target_default)[0][0]
-    assert syslog_fd
-    assert not syslog_fd.args
+    users_fd = find_functions("users", target_default)[0][0]
+    assert users_fd
+    assert not users_fd.args
 
     # function with an argument should have an args property filled
     envfile_fd = find_functions("envfile", target_default)[0][0]
@@ -1941,3 +1948,87 @@ def test_namespace_class_usage(descriptor: PluginDescriptor) -> None:
     assert descriptor.cls.__subclasses__(), (
         f"NamespacePlugin {descriptor.module}.{descriptor.qualname} has no subclasses, are you sure you're using NamespacePlugin correctly?"  # noqa: E501
     )
+
+
+def test_plugin_manifest(tmp_path: Path) -> None:
+    registry = _get_plugins()
+    manifest_path = tmp_path.joinpath("manifest.json")
+    save_manifest(manifest_path, registry)
+
+    loaded = load_manifest(manifest_path)
+    assert loaded == registry
+
+    # The arguments and description of functions are available without importing the plugin
+    descriptor = next(iter(loaded.__functions__.__regular__["walkfs"].values()))
+    assert descriptor.arguments
+    assert descriptor.arguments == get_function_arguments(descriptor.func)
+    assert descriptor.description
+
+    assert load_manifest(manifest_path, "outdated") is None
+    assert load_manifest(tmp_path.joinpath("missing.json")) is None
+
+
+def test_plugin_manifest_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    manifest_path = tmp_path.joinpath("manifest.json")
+    monkeypatch.setenv(MANIFEST_ENV, str(manifest_path))
+    # Restore the current plugin registry afterwards
+    monkeypatch.setattr("dissect.target.plugin.PLUGINS", _get_plugins())
+
+    # The manifest is generated if it doesn't exist yet
+    monkeypatch.setattr("dissect.target.plugin.GENERATED", False)
+    registry = _get_plugins()
+    assert manifest_path.exists()
+
+    # And loaded on the next start
+    monkeypatch.setattr("dissect.target.plugin.GENERATED", False)
+    loaded = _get_plugins()
+    assert loaded is not registry
+    assert loaded == registry
+
+
+def test_plugin_manifest_lazy_imports(tmp_path: Path) -> None:
+    """Test that resolving functions from a plugin manifest doesn't import any plugins."""
+    manifest_path = tmp_path.joinpath("manifest.json")
+    save_manifest(manifest_path, _get_plugins())
+
+    code = textwrap.dedent(
+        """
+        import json
+        import sys
+
+        from dissect.target import plugin
+
+        def plugin_modules():
+            return sorted(name for name in sys.modules if name.startswith("dissect.target.plugins."))
+
+        before = plugin_modules()
+        functions, _ = plugin.find_functions("hostname,users,walkfs,apps.browser.*")
+        print(json.dumps({"functions": len(functions), "before": before, "after": plugin_modules()}))
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, MANIFEST_ENV: str(manifest_path)},
+        capture_output=True,
+        check=True,
+    )
+    output = json.loads(result.stdout)
+
+    assert output["functions"] > 4
+    assert output["after"] == output["before"]
+
+
+@pytest.mark.benchmark
+def test_benchmark_load_manifest(tmp_path: Path, benchmark: BenchmarkFixture) -> None:
+    """Benchmark the startup time of resolving functions from a plugin manifest."""
+    manifest_path = tmp_path.joinpath("manifest.json")
+    save_manifest(manifest_path, _get_plugins())
+
+    def startup() -> None:
+        with (
+            patch("dissect.target.plugin.PLUGINS", load_manifest(manifest_path)),
+            patch("dissect.target.plugin.GENERATED", True),
+        ):
+            find_functions("hostname,users,walkfs")
+
+    benchmark(startup)
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import argparse
+from typing import TYPE_CHECKING
 from unittest.mock import patch
 
-from dissect.target.plugin import PluginRegistry
+from dissect.target.plugin import PluginRegistry, load_manifest
 from dissect.target.tools import build_pluginlist
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 
 def test_main_output() -> None:
     with (
-        patch("argparse.ArgumentParser.parse_args", return_value=argparse.Namespace(verbose=0)),
+        patch("argparse.ArgumentParser.parse_args", return_value=argparse.Namespace(verbose=0, manifest=None)),
         patch("dissect.target.tools.build_pluginlist.plugin.generate", return_value=PluginRegistry()),
         patch("builtins.print") as mock_print,
     ):
@@ -29,3 +33,17 @@ PLUGINS = PluginRegistry(__plugins__=PluginDescriptorLookup(__regular__={}, __os
 """  # noqa: E501
 
     mock_print.assert_called_with(expected_output)
+
+
+def test_main_manifest(tmp_path: Path) -> None:
+    manifest_path = tmp_path.joinpath("manifest.json")
+
+    with (
+        patch("argparse.ArgumentParser.parse_args", return_value=argparse.Namespace(verbose=0, manifest=manifest_path)),
+        patch("dissect.target.tools.build_pluginlist.plugin.generate", return_value=PluginRegistry()),
+        patch("builtins.print") as mock_print,
+    ):
+        assert build_pluginlist.main() == 0
+
+    mock_print.assert_not_called()
+    assert load_manifest(manifest_path) == PluginRegistry()
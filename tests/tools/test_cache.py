@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from dissect.target.tools.cache import main as target_cache
+from dissect.target.tools.cache import parse_size
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("100", 100),
+        ("1K", 1024),
+        ("1.5M", 1536 * 1024),
+        ("10GB", 10 * 1024**3),
+    ],
+)
+def test_parse_size(value: str, expected: int) -> None:
+    assert parse_size(value) == expected
+
+
+def test_target_cache(tmp_path: Path, capsys: pytest.CaptureFixture, monkeypatch: pytest.MonkeyPatch) -> None:
+    target_path = tmp_path.joinpath("target")
+    target_path.joinpath("etc").mkdir(parents=True)
+    target_path.joinpath("var").mkdir()
+    cache_dir = tmp_path.joinpath("cache")
+
+    with monkeypatch.context() as m:
+        m.setattr(
+            "sys.argv",
+            ["target-cache", "warm", str(target_path), "-f", "example_record", "--cache-dir", str(cache_dir)],
+        )
+        assert target_cache() == 0
+
+        m.setattr("sys.argv", ["target-cache", "list", str(cache_dir)])
+        assert target_cache() == 0
+        out, _ = capsys.readouterr()
+
+        lines = out.splitlines()
+        assert len(lines) == 2
+
+        _, _, target, _, function = lines[0].split()
+        assert target == "target"
+        assert function == "dissect.target.plugins.general.example.ExamplePlugin.example_record"
+        assert lines[1].startswith("total ")
+
+        m.setattr("sys.argv", ["target-cache", "prune", str(cache_dir), "--max-size", "0"])
+        assert target_cache() == 0
+        out, _ = capsys.readouterr()
+
+        assert out.startswith("removed 1 entries")
+        assert list(cache_dir.iterdir()) == []
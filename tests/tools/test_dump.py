@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import pathlib
 from typing import TYPE_CHECKING, Any
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -16,7 +16,12 @@ from dissect.target.tools.dump import (
     Compression,
     Serialization,
     create_state,
+    execute_function,
     execute_pipeline,
+    get_input_fingerprint,
+    get_sink_writer,
+    load_state,
+    produce_target_func_pairs,
 )
 from dissect.target.tools.dump import main as target_dump
 from tests._utils import absolute_path
@@ -328,3 +333,147 @@ def test_dump_excluded_plugins(monkeypatch: pytest.MonkeyPatch, tmp_path: pathli
         assert "test-file.txt" in entry.read_text()
 
         assert not tmp_path.joinpath("test-archive.tar.gz/mft").exists()
+
+
+def test_execute_pipeline_incremental(target_unix: Target, fs_unix: VirtualFilesystem, tmp_path: pathlib.Path) -> None:
+    auth_log = tmp_path / "auth.log"
+    auth_log.write_text("Jan  1 13:37:00 host sshd[1]: Accepted password for root from 10.0.0.1 port 22 ssh2\n")
+    fs_unix.map_file("/var/log/auth.log", auth_log)
+
+    def run(output_dir: pathlib.Path, previous_dir: pathlib.Path | None = None) -> dict:
+        state = create_state(
+            output_dir=output_dir,
+            target_paths=["dummy"],
+            functions="authlog,example_record",
+            excluded_functions=[],
+            serialization=Serialization.JSONLINES,
+            compression=Compression.NONE,
+        )
+
+        with patch("dissect.target.tools.dump.execute_function", wraps=execute_function) as mock_execute:
+            execute_pipeline(
+                state=state,
+                targets=iter([target_unix]),
+                arguments=[],
+                dry_run=False,
+                previous_state=load_state(previous_dir) if previous_dir else None,
+            )
+
+        return {
+            "executed": sorted(call.args[1].name for call in mock_execute.call_args_list),
+            "state": json.loads((output_dir / STATE_FILE_NAME).read_text()),
+        }
+
+    sink_path = pathlib.Path(target_unix.name) / "authlog" / "linux_log_auth.jsonl"
+
+    first = run(tmp_path / "first")
+    assert first["executed"] == ["authlog", "example_record"]
+    # Functions without get_paths() have no fingerprint
+    assert list(first["state"]["input_fingerprints"][target_unix.name]) == ["authlog"]
+    assert (tmp_path / "first" / sink_path).exists()
+
+    # The input of authlog did not change, so its sink is reused
+    second = run(tmp_path / "second", tmp_path / "first")
+    assert second["executed"] == ["example_record"]
+    assert second["state"]["input_fingerprints"] == first["state"]["input_fingerprints"]
+    assert (tmp_path / "second" / sink_path).read_bytes() == (tmp_path / "first" / sink_path).read_bytes()
+
+    reused_sink = next(sink for sink in second["state"]["sinks"] if sink["func"] == "authlog")
+    assert reused_sink["is_dirty"] is False
+    assert reused_sink["record_count"] == 1
+
+    # A changed input file means the function is executed again
+    auth_log.write_text(auth_log.read_text() * 2)
+    third = run(tmp_path / "third", tmp_path / "second")
+    assert third["executed"] == ["authlog", "example_record"]
+    assert third["state"]["input_fingerprints"] != first["state"]["input_fingerprints"]
+
+
+def test_produce_target_func_pairs_interrupted(
+    target_unix: Target, fs_unix: VirtualFilesystem, tmp_path: pathlib.Path
+) -> None:
+    """Test if the fingerprint of a function is only stored once its sinks are finished."""
+    auth_log = tmp_path / "auth.log"
+    auth_log.write_text("Jan  1 13:37:00 host sshd[1]: Accepted password for root from 10.0.0.1 port 22 ssh2\n")
+    fs_unix.map_file("/var/log/auth.log", auth_log)
+
+    state = create_state(
+        output_dir=tmp_path / "output",
+        target_paths=["dummy"],
+        functions="authlog",
+        excluded_functions=[],
+        serialization=Serialization.JSONLINES,
+        compression=Compression.NONE,
+    )
+
+    pairs = produce_target_func_pairs(iter([target_unix]), state)
+    assert next(pairs)[1].name == "authlog"
+    # The run is interrupted while the function is being executed
+    pairs.close()
+    assert state.get_input_fingerprint(target_unix, "authlog") is None
+
+    pairs = produce_target_func_pairs(iter([target_unix]), state)
+    assert [func.name for _, func in pairs] == ["authlog"]
+    assert state.get_input_fingerprint(target_unix, "authlog") is not None
+
+
+def test_get_input_fingerprint_directory(
+    target_unix: Target, fs_unix: VirtualFilesystem, tmp_path: pathlib.Path
+) -> None:
+    """Test if the fingerprint of a directory changes when a file in it changes."""
+    tmp_path.joinpath("nested").mkdir()
+    tmp_path.joinpath("one.log").write_text("one")
+    tmp_path.joinpath("nested", "two.log").write_text("two")
+    fs_unix.map_dir("/var/log/app", tmp_path)
+
+    plugin = Mock(get_paths=Mock(return_value=[target_unix.fs.path("/var/log/app")]))
+    func = Mock()
+    func.name = "app"
+
+    with patch.object(target_unix, "get_function", return_value=(plugin, None)):
+        fingerprint = get_input_fingerprint(target_unix, func)
+        assert get_input_fingerprint(target_unix, func) == fingerprint
+
+        tmp_path.joinpath("nested", "two.log").write_text("changed")
+        assert get_input_fingerprint(target_unix, func) != fingerprint
+
+
+def test_execute_pipeline_parquet(target_unix: Target, fs_unix: VirtualFilesystem, tmp_path: pathlib.Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    auth_log = tmp_path / "auth.log"
+    auth_log.write_text("Jan  1 13:37:00 host sshd[1]: Accepted password for root from 10.0.0.1 port 22 ssh2\n" * 3)
+    fs_unix.map_file("/var/log/auth.log", auth_log)
+
+    output_dir = tmp_path / "output"
+    state = create_state(
+        output_dir=output_dir,
+        target_paths=["dummy"],
+        functions="authlog,example_record",
+        excluded_functions=[],
+        serialization=Serialization.PARQUET,
+        compression=Compression.ZSTD,
+    )
+    execute_pipeline(state=state, targets=iter([target_unix]), arguments=[], dry_run=False)
+
+    sinks = json.loads((output_dir / STATE_FILE_NAME).read_text())["sinks"]
+    assert sorted(sink["func"] for sink in sinks) == ["authlog", "example_record"]
+
+    for sink in sinks:
+        # Parquet compresses its column data itself, so there's no compression extension
+        assert sink["path"].endswith(".parquet")
+        assert sink["is_dirty"] is False
+
+        sink_path = output_dir / sink["path"]
+        assert sink["size_bytes"] == sink_path.stat().st_size
+        assert pq.ParquetFile(sink_path).metadata.num_rows == sink["record_count"]
+
+    authlog_sink = next(sink for sink in sinks if sink["func"] == "authlog")
+    assert authlog_sink["record_count"] == 3
+
+
+def test_get_sink_writer_parquet_bzip2(tmp_path: pathlib.Path) -> None:
+    pytest.importorskip("pyarrow")
+
+    with pytest.raises(ValueError, match="bzip2"):
+        get_sink_writer(tmp_path / "test.parquet", Serialization.PARQUET, Compression.BZIP2)
@@ -78,3 +78,25 @@ def test_mounting_multi_volume_filesystem(target_bare: Target, monkeypatch: pyte
             vfs = MockDissectMount.call_args[0][0]
 
             assert vfs.listdir("/filesystems") == ["first", "second"]
+
+
+def test_performance_mode(target_bare: Target, monkeypatch: pytest.MonkeyPatch) -> None:
+    with monkeypatch.context() as m:
+        m.setattr("dissect.target.tools.mount.HAS_FUSE", True)
+
+        with (
+            patch("dissect.target.tools.mount.open_target", return_value=target_bare),
+            patch("dissect.target.tools.mount.FUSE", create=True) as MockFUSE,
+            patch("dissect.target.tools.mount.DissectMount", create=True) as MockDissectMount,
+        ):
+            m.setattr("sys.argv", ["target-mount", "mock-target", "mock-mount"])
+            target_mount()
+
+            assert MockDissectMount.call_args.kwargs == {"readahead": 0, "dir_cache_size": 0}
+            assert MockFUSE.call_args.kwargs["nothreads"] is True
+
+            m.setattr("sys.argv", ["target-mount", "mock-target", "mock-mount", "--performance", "--dir-cache", "10"])
+            target_mount()
+
+            assert MockDissectMount.call_args.kwargs == {"readahead": 1024 * 1024, "dir_cache_size": 10}
+            assert MockFUSE.call_args.kwargs["nothreads"] is False
@@ -8,11 +8,16 @@ from unittest.mock import patch
 
 import pytest
 
+from dissect.target.helpers import sharedwalk
+from dissect.target.helpers.record import BatchedRecords, RecordBatch, batched
 from dissect.target.plugin import FunctionDescriptor, Plugin, PluginRegistry, arg, export
+from dissect.target.plugins.general.example import ExampleRecordRecord
 from dissect.target.tools.query import main as target_query
 from tests._utils import absolute_path
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from dissect.target.target import Target
 
 
@@ -495,3 +500,186 @@ def test_mixed_namespace_and_regular_regression(capsys: pytest.CaptureFixture, m
         "<example/descriptor hostname=None domain=None field_a='example' field_b='record'>\n"
         "<example/descriptor hostname=None domain=None field_a='namespace_example' field_b='record'>\n"
     ) in out
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_workers(capsys: pytest.CaptureFixture, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, ordered: bool) -> None:
+    """Test if target-query with ``--workers`` outputs the records of all targets."""
+    argv = ["target-query", "-f", "example_record", "--workers", "2", "-s"]
+    if ordered:
+        argv.append("--ordered")
+
+    for name in ("one", "two", "three"):
+        root = tmp_path.joinpath(name)
+        root.joinpath("etc").mkdir(parents=True)
+        root.joinpath("var").mkdir()
+        root.joinpath("etc/hostname").write_text(name)
+        argv.append(str(root))
+
+    # A target that fails to load should not affect the other targets
+    argv.append(str(tmp_path.joinpath("missing")))
+
+    with monkeypatch.context() as m:
+        m.setattr("sys.argv", argv)
+
+        assert target_query() == 1
+        out, _ = capsys.readouterr()
+
+    lines = out.splitlines()
+    expected = [
+        f"<example/descriptor hostname='{name}' domain=None field_a='example' field_b='record'>"
+        for name in ("one", "two", "three")
+    ]
+
+    if ordered:
+        assert lines == expected
+    else:
+        assert sorted(lines) == sorted(expected)
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_parquet(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, workers: str) -> None:
+    """Test if target-query with ``--parquet`` writes the records of all targets to a single Parquet file."""
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    output_dir = tmp_path.joinpath("output")
+    argv = ["target-query", "-f", "example_record", "--parquet", str(output_dir), "--workers", workers]
+
+    for name in ("one", "two"):
+        root = tmp_path.joinpath(name)
+        root.joinpath("etc").mkdir(parents=True)
+        root.joinpath("var").mkdir()
+        root.joinpath("etc/hostname").write_text(name)
+        argv.append(str(root))
+
+    with monkeypatch.context() as m:
+        m.setattr("sys.argv", argv)
+        assert target_query() == 0
+
+    assert [path.name for path in output_dir.iterdir()] == ["example_descriptor.parquet"]
+
+    table = pq.read_table(output_dir.joinpath("example_descriptor.parquet"))
+    assert sorted(table.column("hostname").to_pylist()) == ["one", "two"]
+    assert table.column("field_a").to_pylist() == ["example", "example"]
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_profile(capsys: pytest.CaptureFixture, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, workers: str) -> None:
+    """Test if target-query with ``--profile`` writes a profile of all targets and prints a summary."""
+    profile_path = tmp_path.joinpath("profile.json")
+    argv = ["target-query", "-f", "example_record", "-s", "--profile", str(profile_path), "--workers", workers]
+
+    for name in ("one", "two"):
+        root = tmp_path.joinpath(name)
+        root.joinpath("etc").mkdir(parents=True)
+        root.joinpath("var").mkdir()
+        root.joinpath("etc/hostname").write_text(name)
+        argv.append(str(root))
+
+    with monkeypatch.context() as m:
+        m.setattr("sys.argv", argv)
+        assert target_query() == 0
+
+    _, err = capsys.readouterr()
+    assert "total wall time" in err
+
+    phases = json.loads(profile_path.read_text())["phases"]
+    for name in ("one", "two"):
+        target_phases = {entry["phase"]: entry for entry in phases if entry["target"] == str(tmp_path.joinpath(name))}
+        assert {"map", "os", "detect", "execute", "records"} <= target_phases.keys()
+        assert target_phases["records"]["records"] == 1
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_report_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, workers: str) -> None:
+    """Test if target-query with ``--report-dir`` reports the function executions of all targets."""
+    report_dir = tmp_path.joinpath("reports")
+    report_dir.mkdir()
+    argv = ["target-query", "-f", "example_record", "-s", "--report-dir", str(report_dir), "--workers", workers]
+
+    for name in ("one", "two"):
+        root = tmp_path.joinpath(name)
+        root.joinpath("etc").mkdir(parents=True)
+        root.joinpath("var").mkdir()
+        root.joinpath("etc/hostname").write_text(name)
+        argv.append(str(root))
+
+    with monkeypatch.context() as m:
+        m.setattr("sys.argv", argv)
+        assert target_query() == 0
+
+    (report_path,) = report_dir.iterdir()
+    target_reports = json.loads(report_path.read_text())["target_reports"]
+
+    assert sorted(report["target"] for report in target_reports) == sorted(
+        f"<Target {tmp_path.joinpath(name)}>" for name in ("one", "two")
+    )
+    for report in target_reports:
+        assert "dissect.target.plugins.general.example.ExamplePlugin" in report["registered_plugins"]
+        assert "hostname" in report["func_execs"]
+
+
+def test_shared_walk(capsys: pytest.CaptureFixture, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test if target-query walks the filesystem once for all functions that walk the filesystem."""
+    root = tmp_path.joinpath("root")
+    root.joinpath("etc").mkdir(parents=True)
+    root.joinpath("var").mkdir()
+    root.joinpath("etc/hostname").write_text("shared")
+
+    with monkeypatch.context() as m:
+        m.setattr("sys.argv", ["target-query", "-f", "walkfs,suid_binaries", "-s", str(root)])
+
+        with patch("dissect.target.helpers.sharedwalk.walk", side_effect=sharedwalk.walk) as walk:
+            assert target_query() == 0
+
+        out, _ = capsys.readouterr()
+
+    walk.assert_called_once()
+    assert [consumer.__class__.__name__ for consumer in walk.call_args.args[1]] == ["WalkFsConsumer", "SuidConsumer"]
+    assert "<filesystem/entry hostname='shared'" in out
+    assert "path='/etc/hostname'" in out
+
+
+@pytest.mark.parametrize("parquet", [True, False])
+def test_record_batches(
+    capsys: pytest.CaptureFixture, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, parquet: bool
+) -> None:
+    """Test if target-query writes record batches directly to writers that support them."""
+    if parquet:
+        pq = pytest.importorskip("pyarrow.parquet")
+
+    root = tmp_path.joinpath("root")
+    root.joinpath("etc").mkdir(parents=True)
+    root.joinpath("var").mkdir()
+    root.joinpath("etc/hostname").write_text("batched")
+
+    output_dir = tmp_path.joinpath("output")
+    argv = ["target-query", "-f", "example_record", str(root)]
+    argv.extend(["--parquet", str(output_dir)] if parquet else ["-s"])
+
+    def execute(
+        target: Target, func_def: FunctionDescriptor, args: list[str] | None = None
+    ) -> tuple[str, BatchedRecords]:
+        rows = ({"field_a": str(i)} for i in range(3))
+        return "record", BatchedRecords(batched(ExampleRecordRecord, rows, size=2, _target=target))
+
+    with monkeypatch.context() as m:
+        m.setattr("sys.argv", argv)
+
+        with (
+            patch("dissect.target.tools.query.execute_function_on_target", side_effect=execute),
+            patch.object(RecordBatch, "__iter__", autospec=True, side_effect=RecordBatch.__iter__) as batch_iter,
+        ):
+            assert target_query() == 0
+
+        out, _ = capsys.readouterr()
+
+    if parquet:
+        # No records are created for the batches
+        batch_iter.assert_not_called()
+
+        table = pq.read_table(output_dir.joinpath("example_descriptor.parquet"))
+        assert table.column("field_a").to_pylist() == ["0", "1", "2"]
+        assert table.column("hostname").to_pylist() == ["batched"] * 3
+    else:
+        assert out.count("<example/descriptor hostname='batched'") == 3
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import urllib.error
+import urllib.request
+from typing import TYPE_CHECKING
+
+import pytest
+
+from dissect.target.tools.server import QueryServer, TargetPool, UnixQueryServer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from dissect.target.target import Target
+
+
+def test_target_pool() -> None:
+    opened = []
+
+    def open_target(path: str) -> str:
+        if path == "broken":
+            raise ValueError("broken target")
+        opened.append(path)
+        return f"target {path}"
+
+    pool = TargetPool(2, open_target=open_target)
+
+    with pool.acquire("a") as target:
+        assert target == "target a"
+    with pool.acquire("a") as target:
+        assert target == "target a"
+    assert opened == ["a"]
+    assert (pool.hits, pool.misses) == (1, 1)
+
+    with pool.acquire("b"):
+        pass
+    with pool.acquire("a"):
+        pass
+    with pool.acquire("c"):
+        pass
+    # The least recently used target is dropped
+    assert pool.targets == ["a", "c"]
+
+    # Targets that are in use are only dropped after they are released
+    with pool.acquire("a"), pool.acquire("c"):
+        with pool.acquire("b"):
+            assert pool.targets == ["a", "c", "b"]
+        assert pool.targets == ["a", "c"]
+
+    with pytest.raises(ValueError, match="broken target"), pool.acquire("broken"):
+        pass
+    assert pool.targets == ["a", "c"]
+
+
+@pytest.fixture
+def query_server(target_unix_users: Target) -> Iterator[QueryServer]:
+    pool = TargetPool(open_target=lambda path: target_unix_users)
+    server = QueryServer(("127.0.0.1", 0), pool)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def _post(server: QueryServer, job: dict) -> bytes:
+    host, port = server.server_address[:2]
+    request = urllib.request.Request(f"http://{host}:{port}/query", data=json.dumps(job).encode())
+    with urllib.request.urlopen(request) as response:
+        return response.read()
+
+
+def test_query_server(query_server: QueryServer) -> None:
+    for _ in range(2):
+        output = _post(query_server, {"target": "unix", "args": ["-f", "users", "-j"]})
+        records = [json.loads(line) for line in output.splitlines()]
+        assert [record["name"] for record in records] == ["root", "user", "+@ngtest"]
+
+    # The target is opened once and reused by the second query
+    assert (query_server.pool.hits, query_server.pool.misses) == (1, 1)
+
+    output = _post(query_server, {"target": "unix", "args": ["-f", "users", "-s", "--limit", "1"]})
+    assert output.decode().startswith("<unix/user hostname=")
+    assert output.count(b"\n") == 1
+
+    host, port = query_server.server_address[:2]
+    with urllib.request.urlopen(f"http://{host}:{port}/targets") as response:
+        assert json.loads(response.read()) == {"targets": ["unix"], "hits": 2, "misses": 1}
+
+
+@pytest.mark.parametrize(
+    ("job", "error"),
+    [
+        ({"args": ["-f", "users"]}, "a query requires a target"),
+        ({"target": "unix", "args": "-f users"}, "must be a list of strings"),
+        ({"target": "unix", "args": []}, "the following arguments are required: -f/--function"),
+        ({"target": "unix", "args": ["-f", "invalid"]}, "invalid function(s): invalid"),
+        ({"target": "unix", "args": ["-f", "icat"]}, "invalid arguments for function icat"),
+        ({"target": "unix", "args": ["-f", "icat", "-i", "x"]}, "invalid int value: 'x'"),
+    ],
+)
+def test_query_server_invalid(query_server: QueryServer, job: dict, error: str) -> None:
+    with pytest.raises(urllib.error.HTTPError) as exc_info:
+        _post(query_server, job)
+
+    assert exc_info.value.code == 400
+    assert error in json.loads(exc_info.value.read())["error"]
+
+
+def test_query_server_unix(target_unix_users: Target, tmp_path: Path) -> None:
+    path = str(tmp_path.joinpath("server.sock"))
+    server = UnixQueryServer(path, TargetPool(open_target=lambda path: target_unix_users))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    body = json.dumps({"target": "unix", "args": ["-f", "hostname,os"]}).encode()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(b"POST /query HTTP/1.0\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+        response = b"".join(iter(lambda: sock.recv(4096), b""))
+
+    server.shutdown()
+    server.server_close()
+
+    headers, _, output = response.partition(b"\r\n\r\n")
+    assert headers.startswith(b"HTTP/1.0 200")
+    assert output == f"{target_unix_users} {target_unix_users.hostname} unix\n".encode()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from flow.record import RecordDescriptor
+
+from dissect.target.helpers.record import RecordBatch
+from dissect.target.tools.utils.parquet import ParquetDirectoryWriter, ParquetWriter, descriptor_to_schema
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+TestRecord = RecordDescriptor(
+    "test/parquet",
+    [
+        ("datetime", "ts"),
+        ("string", "name"),
+        ("path", "path"),
+        ("varint", "size"),
+        ("uint32", "count"),
+        ("boolean", "flag"),
+        ("bytes", "data"),
+        ("digest", "digest"),
+        ("net.ipaddress", "ip"),
+        ("string[]", "tags"),
+    ],
+)
+
+OtherRecord = RecordDescriptor(
+    "test/parquet/other",
+    [
+        ("string", "name"),
+    ],
+)
+
+
+def test_descriptor_to_schema() -> None:
+    schema = descriptor_to_schema(TestRecord)
+
+    assert schema.field("ts").type == pa.timestamp("us", tz="UTC")
+    assert schema.field("name").type == pa.string()
+    assert schema.field("path").type == pa.string()
+    assert schema.field("size").type == pa.int64()
+    assert schema.field("count").type == pa.uint32()
+    assert schema.field("flag").type == pa.bool_()
+    assert schema.field("data").type == pa.binary()
+    assert schema.field("digest").type.num_fields == 3
+    assert schema.field("ip").type == pa.string()
+    assert schema.field("tags").type == pa.list_(pa.string())
+    assert schema.field("_generated").type == pa.timestamp("us", tz="UTC")
+
+
+def test_parquet_writer(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("test.parquet")
+
+    writer = ParquetWriter(path.open("wb"), row_group_size=2048)
+    for i in range(5000):
+        writer.write(
+            TestRecord(
+                ts=i,
+                name=f"record {i}",
+                path="/etc/passwd",
+                size=2**70 if i == 1 else i,
+                count=i,
+                flag=i % 2 == 0,
+                data=b"\x00\x01",
+                digest=("d41d8cd98f00b204e9800998ecf8427e", None, None),
+                ip="10.0.0.1",
+                tags=["a", "b"],
+            )
+        )
+    writer.close()
+
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_rows == 5000
+    assert parquet_file.metadata.num_row_groups == 3
+
+    rows = parquet_file.read().to_pylist()
+    assert rows[0]["ts"].timestamp() == 0
+    assert rows[0]["name"] == "record 0"
+    assert rows[0]["path"] == "/etc/passwd"
+    assert rows[0]["size"] == 0
+    assert rows[0]["flag"] is True
+    assert rows[0]["data"] == b"\x00\x01"
+    assert rows[0]["digest"] == {"md5": "d41d8cd98f00b204e9800998ecf8427e", "sha1": None, "sha256": None}
+    assert rows[0]["ip"] == "10.0.0.1"
+    assert rows[0]["tags"] == ["a", "b"]
+    assert rows[4999]["count"] == 4999
+
+    # Values that don't fit in the column are written as null
+    assert rows[1]["size"] is None
+
+
+def test_parquet_writer_overflow(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    path = tmp_path.joinpath("test.parquet")
+
+    writer = ParquetWriter(path.open("wb"), row_group_size=2)
+    for i in range(10):
+        writer.write(TestRecord(size=2**70 + i))
+    writer.close()
+
+    assert pq.read_table(path).column("size").to_pylist() == [None] * 10
+
+    # A single summary per field when closing, instead of a warning per value
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages == ["Wrote 10 values of field size that do not fit in 64 bits as null"]
+
+
+def test_parquet_writer_empty(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("test.parquet")
+
+    ParquetWriter(path.open("wb"), TestRecord).close()
+
+    assert pq.ParquetFile(path).metadata.num_rows == 0
+
+
+def test_parquet_directory_writer(tmp_path: Path) -> None:
+    writer = ParquetDirectoryWriter(tmp_path, max_buffer_size=256 * 1024)
+    for i in range(10000):
+        writer.write(TestRecord(name=f"record {i}", tags=["x" * 32]))
+        writer.write(OtherRecord(name=f"other {i}"))
+
+        # The buffers of all files share the memory budget
+        assert sum(w.buffer_size for w in writer.writers.values()) <= 256 * 1024
+    writer.close()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["test_parquet.parquet", "test_parquet_other.parquet"]
+    assert pq.ParquetFile(tmp_path.joinpath("test_parquet.parquet")).metadata.num_row_groups > 1
+    assert pq.read_table(tmp_path.joinpath("test_parquet_other.parquet")).column("name").to_pylist()[-1] == "other 9999"
+
+
+def test_parquet_writer_batch(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("test.parquet")
+
+    writer = ParquetDirectoryWriter(tmp_path)
+    writer.write(TestRecord(name="record", size=1))
+    writer.write_batch(RecordBatch(TestRecord, {"name": ["batch 0", "batch 1"], "path": ["/etc/passwd", None]}))
+    # Batches of another descriptor are written to their own file
+    writer.write_batch(RecordBatch(OtherRecord, {"name": ["other"]}))
+    writer.write(TestRecord(name="last"))
+    writer.close()
+
+    path = tmp_path.joinpath("test_parquet.parquet")
+    rows = pq.read_table(path).to_pylist()
+    assert [row["name"] for row in rows] == ["record", "batch 0", "batch 1", "last"]
+    assert [row["path"] for row in rows] == [None, "/etc/passwd", None, None]
+    assert rows[1]["_generated"] is not None
+
+    assert pq.read_table(tmp_path.joinpath("test_parquet_other.parquet")).column("name").to_pylist() == ["other"]
+
+    # Batches of a descriptor that doesn't match the schema of the file are written as records
+    path = tmp_path.joinpath("single.parquet")
+    writer = ParquetWriter(path.open("wb"), TestRecord)
+    writer.write_batch(RecordBatch(OtherRecord, {"name": ["other"]}))
+    writer.close()
+
+    assert pq.read_table(path).column("name").to_pylist() == ["other"]